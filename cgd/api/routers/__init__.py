@@ -26,31 +26,13 @@ Routers:
 - restriction_mapper_router: Restriction enzyme mapping endpoints
 - homology_router: Homology/ortholog endpoints
 - literature_topic_router: Literature topic search endpoints
+
+Each name in ``__all__`` is a router module (its ``router`` attribute is the
+APIRouter), imported on first access. ``cgd.api.routers.registry`` decides
+which routers the application includes and when.
 """
 
-from .health_router import router as health_router
-from .locus_router import router as locus_router
-from .reference_router import router as reference_router
-from .go_router import router as go_router
-from .phenotype_router import router as phenotype_router
-from .search_router import router as search_router
-from .sequence_router import router as sequence_router
-from .seq_tools_router import router as seq_tools_router
-from .batch_download_router import router as batch_download_router
-from .feature_search_router import router as feature_search_router
-from .genome_version_router import router as genome_version_router
-from .colleague_router import router as colleague_router
-from .gene_registry_router import router as gene_registry_router
-from .chromosome_router import router as chromosome_router
-from .webprimer_router import router as webprimer_router
-from .go_term_finder_router import router as go_term_finder_router
-from .go_slim_mapper_router import router as go_slim_mapper_router
-from .go_annotation_summary_router import router as go_annotation_summary_router
-from .blast_router import router as blast_router
-from .patmatch_router import router as patmatch_router
-from .restriction_mapper_router import router as restriction_mapper_router
-from .homology_router import router as homology_router
-from .literature_topic_router import router as literature_topic_router
+import importlib
 
 __all__ = [
     "health_router",
@@ -77,3 +59,15 @@ __all__ = [
     "homology_router",
     "literature_topic_router",
 ]
+
+
+def __getattr__(name: str):
+    # Router modules are imported on first access, so importing one router
+    # does not load every other router and its services.
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -11,6 +11,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from cgd.core.admission import BULK, admission
 from cgd.db.deps import get_db
 from cgd.schemas.batch_download_schema import (
     DataType,
@@ -36,7 +37,11 @@ def _parse_gene_list(genes_str: str) -> List[str]:
     return [g for g in genes if g]
 
 
-@router.post("", response_class=Response)
+@router.post(
+    "",
+    response_class=Response,
+    dependencies=[Depends(admission(BULK))],
+)
 def batch_download(
     request: BatchDownloadRequest,
     db: Session = Depends(get_db),
@@ -124,7 +129,11 @@ def batch_download(
     )
 
 
-@router.get("", response_class=Response)
+@router.get(
+    "",
+    response_class=Response,
+    dependencies=[Depends(admission(BULK))],
+)
 def batch_download_get(
     genes: str = Query(
         ...,
@@ -174,7 +183,11 @@ def batch_download_get(
     return batch_download(request, db)
 
 
-@router.post("/upload", response_class=Response)
+@router.post(
+    "/upload",
+    response_class=Response,
+    dependencies=[Depends(admission(BULK))],
+)
 async def batch_download_upload(
     file: UploadFile = File(..., description="File containing gene names (one per line)"),
     data_types: str = Query(
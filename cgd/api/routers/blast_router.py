@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import PlainTextResponse, Response
 from sqlalchemy.orm import Session
 
+from cgd.core.admission import ANALYSIS, admission
 from cgd.db.deps import get_db
 from cgd.schemas.blast_schema import (
     BlastProgram,
@@ -92,7 +93,11 @@ def get_programs_for_database(database: BlastDatabase):
     return programs
 
 
-@router.post("/search", response_model=BlastSearchResponse)
+@router.post(
+    "/search",
+    response_model=BlastSearchResponse,
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def search(
     request: BlastSearchRequest,
     db: Session = Depends(get_db),
@@ -126,7 +131,11 @@ def search(
     return response
 
 
-@router.get("/search", response_model=BlastSearchResponse)
+@router.get(
+    "/search",
+    response_model=BlastSearchResponse,
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def search_get(
     sequence: Optional[str] = Query(None, alias="seq", description="Query sequence"),
     locus: Optional[str] = Query(None, description="Locus name"),
@@ -160,7 +169,11 @@ def search_get(
     return run_blast_search(db, request)
 
 
-@router.post("/search/text", response_class=PlainTextResponse)
+@router.post(
+    "/search/text",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def search_text(
     request: BlastSearchRequest,
     db: Session = Depends(get_db),
@@ -185,7 +198,11 @@ def search_text(
     return PlainTextResponse(content=text_output)
 
 
-@router.post("/search/multi", response_model=BlastSearchResponse)
+@router.post(
+    "/search/multi",
+    response_model=BlastSearchResponse,
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def search_multi_database(
     request: BlastMultiSearchRequest,
     db: Session = Depends(get_db),
@@ -226,7 +243,10 @@ def search_multi_database(
     return run_multi_database_blast(db, search_request)
 
 
-@router.post("/search/download/{format}")
+@router.post(
+    "/search/download/{format}",
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def download_search_results(
     format: DownloadFormat,
     request: BlastSearchRequest,
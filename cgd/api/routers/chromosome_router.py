@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from cgd.db.deps import get_db
-from cgd.api.services import chromosome_service
+from cgd.api.services import chromosome_service, region_service
 from cgd.schemas.chromosome_schema import (
     ChromosomeResponse,
     ChromosomeHistoryResponse,
     ChromosomeReferencesResponse,
     ChromosomeSummaryNotesResponse,
     ChromosomeListResponse,
+    RegionFeaturesResponse,
 )
 
 router = APIRouter(prefix="/api/chromosome", tags=["chromosome"])
@@ -62,3 +65,23 @@ def get_chromosome_summary_notes(name: str, db: Session = Depends(get_db)):
     Returns paragraphs that summarize information about this chromosome.
     """
     return chromosome_service.get_chromosome_summary_notes(db, name)
+
+
+@router.get("/{name}/region-features", response_model=RegionFeaturesResponse)
+def get_region_features(
+    name: str,
+    start: int = Query(..., ge=1, description="Region start (1-based)"),
+    end: Optional[int] = Query(None, ge=1, description="Region end; defaults to start"),
+    mode: str = Query(
+        "overlap",
+        description="overlap, upstream, downstream or nearest",
+    ),
+    k: int = Query(10, ge=1, le=1000, description="Features to return for upstream/downstream/nearest"),
+    db: Session = Depends(get_db),
+):
+    """
+    Get features overlapping or near a region of a chromosome/contig.
+
+    Served from an in-memory interval index over the current genome version.
+    """
+    return region_service.get_region_features(db, name, start, end, mode, k)
@@ -1,23 +1,9 @@
-"""Curation API routers for curator-only operations."""
+"""Curation API routers for curator-only operations.
 
-from .todo_list_router import router as todo_list_router
-from .go_curation_router import router as go_curation_router
-from .reference_curation_router import router as reference_curation_router
-from .phenotype_curation_router import router as phenotype_curation_router
-from .colleague_curation_router import router as colleague_curation_router
-from .locus_curation_router import router as locus_curation_router
-from .litguide_curation_router import router as litguide_curation_router
-from .note_curation_router import router as note_curation_router
-from .feature_curation_router import router as feature_curation_router
-from .link_curation_router import router as link_curation_router
-from .gene_registry_curation_router import router as gene_registry_curation_router
-from .paragraph_curation_router import router as paragraph_curation_router
-from .litreview_curation_router import router as litreview_curation_router
-from .ref_annotation_curation_router import router as ref_annotation_curation_router
-from .db_search_router import router as db_search_router
-from .sequence_curation_router import router as sequence_curation_router
-from .coordinate_curation_router import router as coordinate_curation_router
-from .seq_alignment_router import router as seq_alignment_router
+Each name in ``__all__`` is a router module, imported on first access.
+"""
+
+import importlib
 
 __all__ = [
     "todo_list_router",
@@ -39,3 +25,15 @@ __all__ = [
     "coordinate_curation_router",
     "seq_alignment_router",
 ]
+
+
+def __getattr__(name: str):
+    # Router modules are imported on first access, so importing one router
+    # does not load every other router and its services.
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
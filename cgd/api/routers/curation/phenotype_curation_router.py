@@ -7,16 +7,18 @@ Requires curator authentication.
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
 from cgd.auth.deps import CurrentUser
 from cgd.db.deps import get_db
+from cgd.api.services.cv_tree_service import cv_tree_response, get_cv_tree
 from cgd.api.services.curation.phenotype_curation_service import (
     PhenotypeCurationService,
     PhenotypeCurationError,
+    cv_term_tree,
 )
 
 logger = logging.getLogger(__name__)
@@ -198,6 +200,7 @@ def get_cv_terms(
 @router.get("/cv-tree/{cv_name}", response_model=CVTermTreeResponse)
 def get_cv_term_tree(
     cv_name: str,
+    request: Request,
     current_user: CurrentUser,
     db: Session = Depends(get_db),
 ):
@@ -209,16 +212,20 @@ def get_cv_term_tree(
     Args:
         cv_name: experiment_type, mutant_type, qualifier, or observable
     """
-    service = PhenotypeCurationService(db)
-    tree = service.get_cv_term_tree(cv_name)
+    tree = get_cv_tree(db, cv_name)
 
-    if not tree:
+    if not tree.terms:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unknown CV name or no terms found: {cv_name}",
         )
 
-    return CVTermTreeResponse(cv_name=cv_name, tree=tree)
+    return cv_tree_response(
+        request,
+        tree,
+        f"curation:{tree.cv_name}",
+        lambda t: CVTermTreeResponse(cv_name=t.cv_name, tree=cv_term_tree(t)),
+    )
 
 
 @router.get("/property-types", response_model=PropertyTypesResponse)
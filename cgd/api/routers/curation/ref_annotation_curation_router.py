@@ -189,6 +189,9 @@ class ActionResponse(BaseModel):
     messages: Optional[list[str]] = None
     warning: Optional[str] = None
     count: Optional[int] = None
+    # Bulk actions: rows changed per table, keyed by "inserted", "updated"
+    # or "deleted"
+    counts: Optional[dict[str, dict[str, int]]] = None
 
 
 # ---------------------------
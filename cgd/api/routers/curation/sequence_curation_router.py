@@ -16,7 +16,10 @@ from sqlalchemy.orm import Session
 
 from cgd.auth.deps import CurrentUser
 from cgd.db.deps import get_db
-from cgd.api.services.curation.sequence_curation_service import SequenceCurationService
+from cgd.api.services.curation.sequence_curation_service import (
+    SequenceCurationError,
+    SequenceCurationService,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -121,6 +124,9 @@ class AffectedFeature(BaseModel):
     start_coord: int
     stop_coord: int
     strand: str
+    status: str = Field(
+        ..., description="downstream, encompassing, or overlap (needs review)"
+    )
     is_overlapping: bool
     is_downstream: bool
     new_start: int
@@ -220,7 +226,9 @@ def preview_changes(
     Preview sequence changes without committing.
 
     Shows the effect of insertions, deletions, and substitutions on the
-    sequence and lists affected features that would need coordinate updates.
+    sequence and lists every feature on the sequence whose coordinates would
+    change, with its remapped coordinates. Change coordinates all refer to
+    the current sequence and must not overlap.
     """
     # Validate changes
     for change in request.changes:
@@ -250,7 +258,13 @@ def preview_changes(
 
     service = SequenceCurationService(db)
     changes_dicts = [c.model_dump() for c in request.changes]
-    result = service.preview_changes(request.feature_name, changes_dicts)
+    try:
+        result = service.preview_changes(request.feature_name, changes_dicts)
+    except SequenceCurationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
     if "error" in result:
         raise HTTPException(
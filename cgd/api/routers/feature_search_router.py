@@ -8,6 +8,8 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
+from cgd.core.admission import BULK, admission
+from cgd.core.columnar import ColumnarResponse, columnar_requested
 from cgd.db.deps import get_db
 from cgd.schemas.feature_search_schema import (
     FeatureSearchRequest,
@@ -17,6 +19,7 @@ from cgd.schemas.feature_search_schema import (
 from cgd.api.services.feature_search_service import (
     get_feature_search_config,
     search_features,
+    search_features_columnar,
     generate_download_tsv,
     _get_chromosomes_for_organism,
 )
@@ -39,9 +42,14 @@ def get_config(
     return get_feature_search_config(db, organism)
 
 
-@router.post("/search", response_model=FeatureSearchResponse)
+@router.post(
+    "/search",
+    response_model=FeatureSearchResponse,
+    dependencies=[Depends(admission(BULK))],
+)
 def search(
     request: FeatureSearchRequest,
+    columnar: bool = Depends(columnar_requested),
     db: Session = Depends(get_db),
 ):
     """
@@ -63,8 +71,12 @@ def search(
     - `sort_by`: Sort field (orf, gene, feature_type)
 
     Returns all matching results with optional position and GO term information.
+    With `?format=columnar` (or `Accept: application/vnd.cgd.columnar+json`)
+    `features` is a columnar table instead of a list of objects.
     """
     try:
+        if columnar:
+            return ColumnarResponse(search_features_columnar(db, request))
         return search_features(db, request)
     except Exception as e:
         logger.error(f"Feature search error: {e}")
@@ -85,7 +97,11 @@ def get_chromosomes(
     return _get_chromosomes_for_organism(db, organism)
 
 
-@router.post("/download", response_class=PlainTextResponse)
+@router.post(
+    "/download",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(admission(BULK))],
+)
 def download_results(
     request: FeatureSearchRequest,
     db: Session = Depends(get_db),
@@ -3,9 +3,10 @@ Genome Snapshot API Router.
 """
 import logging
 import traceback
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from cgd.core.http_compression import precompressed_response
 from cgd.db.deps import get_db
 from cgd.schemas.genome_snapshot_schema import (
     GenomeSnapshotResponse,
@@ -41,6 +42,7 @@ def list_organisms(db: Session = Depends(get_db)):
 @router.get("/{organism_abbrev}", response_model=GenomeSnapshotResponse)
 def get_snapshot(
     organism_abbrev: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """
@@ -51,23 +53,28 @@ def get_snapshot(
 
     Returns:
         Genome statistics including ORF counts, GO annotations, etc.
+        Served from the precompressed response cache.
     """
-    try:
-        result = get_genome_snapshot(db, organism_abbrev)
-        if not result.success:
-            raise HTTPException(status_code=404, detail=result.error)
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting genome snapshot for {organism_abbrev}: {e}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(e))
+    def build():
+        try:
+            result = get_genome_snapshot(db, organism_abbrev)
+            if not result.success:
+                raise HTTPException(status_code=404, detail=result.error)
+            return result
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting genome snapshot for {organism_abbrev}: {e}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return precompressed_response(request, f"genome_snapshot:{organism_abbrev}", build)
 
 
 @router.get("/{organism_abbrev}/go-slim", response_model=GoSlimDistributionResponse)
 def get_go_slim(
     organism_abbrev: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """
@@ -78,16 +85,20 @@ def get_go_slim(
 
     Returns:
         GO Slim distribution for Molecular Function, Cellular Component,
-        and Biological Process aspects.
+        and Biological Process aspects. Served from the precompressed
+        response cache.
     """
-    try:
-        result = get_go_slim_distribution(db, organism_abbrev)
-        if not result.success:
-            raise HTTPException(status_code=404, detail=result.error)
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting GO Slim distribution for {organism_abbrev}: {e}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(e))
+    def build():
+        try:
+            result = get_go_slim_distribution(db, organism_abbrev)
+            if not result.success:
+                raise HTTPException(status_code=404, detail=result.error)
+            return result
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting GO Slim distribution for {organism_abbrev}: {e}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return precompressed_response(request, f"go_slim:{organism_abbrev}", build)
@@ -9,6 +9,7 @@ import traceback
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from cgd.core.singleflight import single_flight
 from cgd.db.deps import get_db
 from cgd.api.services import go_service
 from cgd.schemas.go_schema import GoTermResponse, GoEvidenceResponse, GoHierarchyResponse
@@ -63,6 +64,7 @@ def get_go_hierarchy(
 
 
 @router.get("/{goid}", response_model=GoTermResponse)
+@single_flight("go_term")
 def get_go_term(goid: str, db: Session = Depends(get_db)):
     """
     Get GO term information and annotated genes by GOID.
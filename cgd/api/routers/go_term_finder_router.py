@@ -12,6 +12,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from cgd.core.admission import BULK, admission
+from cgd.core.columnar import ColumnarResponse, columnar_requested
 from cgd.db.deps import get_db
 from cgd.api.services import go_term_finder_service
 from cgd.schemas.go_term_finder_schema import (
@@ -28,6 +30,11 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/go-term-finder", tags=["go-term-finder"])
 
 
+def uses_custom_background(body) -> bool:
+    """Only analyses against a custom background are admission-controlled as bulk."""
+    return isinstance(body, dict) and bool(body.get("background_genes"))
+
+
 @router.get("/config", response_model=GoTermFinderConfigResponse)
 def get_config(db: Session = Depends(get_db)):
     """
@@ -62,9 +69,14 @@ def validate_genes(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze", response_model=GoTermFinderResponse)
+@router.post(
+    "/analyze",
+    response_model=GoTermFinderResponse,
+    dependencies=[Depends(admission(BULK, applies=uses_custom_background))],
+)
 def run_analysis(
     request: GoTermFinderRequest,
+    columnar: bool = Depends(columnar_requested),
     db: Session = Depends(get_db),
 ):
     """
@@ -86,17 +98,26 @@ def run_analysis(
 
     Returns:
         GoTermFinderResponse with enriched terms grouped by aspect,
-        or error details if analysis fails.
+        or error details if analysis fails. With format=columnar, the
+        terms and their gene hits as columnar tables.
     """
     try:
-        return go_term_finder_service.run_go_term_finder(db, request)
+        response = go_term_finder_service.run_go_term_finder(db, request)
+        if columnar:
+            return ColumnarResponse(
+                go_term_finder_service.columnar_go_term_finder_response(response)
+            )
+        return response
     except Exception as e:
         logger.error(f"Error in run_analysis: {e}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/download/{format}")
+@router.post(
+    "/download/{format}",
+    dependencies=[Depends(admission(BULK, applies=uses_custom_background))],
+)
 def download_results(
     format: str,
     request: GoTermFinderRequest,
@@ -201,7 +222,11 @@ def download_results(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/graph", response_model=GoEnrichmentGraphResponse)
+@router.post(
+    "/graph",
+    response_model=GoEnrichmentGraphResponse,
+    dependencies=[Depends(admission(BULK, applies=uses_custom_background))],
+)
 def get_enrichment_graph(
     request: GoTermFinderRequest,
     max_terms: int = Query(5, ge=3, le=50, description="Maximum enriched terms to show in graph"),
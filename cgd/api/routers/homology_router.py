@@ -17,6 +17,7 @@ from sqlalchemy import func
 from cgd.core.settings import settings
 from cgd.db.deps import get_db
 from cgd.models.models import Feature, HomologyGroup, FeatHomology, Seq, FeatLocation
+from cgd.utils.seqkernels import reverse_complement
 
 logger = logging.getLogger(__name__)
 
@@ -114,9 +115,7 @@ def _get_feature_sequence(
                     left_start = max(0, start - 1 - flank)
                     right_end = min(len(chr_seq), end + flank)
                     seq_region = chr_seq[left_start:right_end]
-                    # Reverse complement
-                    complement_map = str.maketrans("ACGTacgt", "TGCAtgca")
-                    sequence = seq_region.translate(complement_map)[::-1].upper()
+                    sequence = reverse_complement(seq_region).upper()
 
     # Build FASTA header
     gene_name = feature.gene_name or ""
@@ -7,11 +7,12 @@ import logging
 import traceback
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from cgd.db.deps import get_db
 from cgd.api.services import literature_topic_service
+from cgd.api.services.cv_tree_service import cv_tree_response, get_cv_tree
 from cgd.schemas.literature_topic_schema import (
     LiteratureTopicTreeResponse,
     LiteratureTopicSearchResponse,
@@ -23,7 +24,7 @@ router = APIRouter(prefix="/api/literature-topic", tags=["literature-topic"])
 
 
 @router.get("/tree", response_model=LiteratureTopicTreeResponse)
-def get_literature_topic_tree(db: Session = Depends(get_db)):
+def get_literature_topic_tree(request: Request, db: Session = Depends(get_db)):
     """
     Get hierarchical tree of literature topics.
 
@@ -35,7 +36,12 @@ def get_literature_topic_tree(db: Session = Depends(get_db)):
         Tree structure of literature topics with reference counts.
     """
     try:
-        return literature_topic_service.get_literature_topic_tree(db)
+        return cv_tree_response(
+            request,
+            get_cv_tree(db, "literature_topic"),
+            "literature_topic",
+            literature_topic_service.literature_topic_tree,
+        )
     except Exception as e:
         logger.error(f"Error in get_literature_topic_tree: {e}")
         logger.error(traceback.format_exc())
@@ -1,9 +1,11 @@
 import logging
 import traceback
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from cgd.core.http_compression import precompressed_response
+from cgd.core.singleflight import single_flight
 from cgd.db.deps import get_db
 from cgd.api.services import locus_service
 from cgd.schemas.locus_schema import (
@@ -24,6 +26,7 @@ router = APIRouter(prefix="/api/locus", tags=["locus"])
 
 
 @router.get("/{name}", response_model=LocusByOrganismResponse)
+@single_flight("locus")
 def locus(name: str, db: Session = Depends(get_db)):
     """
     Get basic locus info by name, grouped by organism.
@@ -86,11 +89,18 @@ def protein_details(name: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{name}/homology_details", response_model=HomologyDetailsResponse)
-def homology_details(name: str, db: Session = Depends(get_db)):
+def homology_details(name: str, request: Request, db: Session = Depends(get_db)):
     """
     Get homology/ortholog information for this locus, grouped by organism.
+
+    Includes the precomputed protein and coding alignments, so the response
+    is served from the precompressed response cache.
     """
-    return locus_service.get_locus_homology_details(db, name)
+    return precompressed_response(
+        request,
+        f"homology_details:{name}",
+        lambda: locus_service.get_locus_homology_details(db, name),
+    )
 
 
 @router.get("/{name}/sequence_details", response_model=SequenceDetailsResponse)
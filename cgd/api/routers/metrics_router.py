@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+
+from cgd.core.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (aggregated across gunicorn workers)."""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 
+from cgd.core.admission import ANALYSIS, admission
 from cgd.db.deps import get_db
 from cgd.schemas.patmatch_schema import (
     PatternType,
@@ -53,7 +54,11 @@ def list_datasets(
     return config.datasets
 
 
-@router.post("/search", response_model=PatmatchSearchResponse)
+@router.post(
+    "/search",
+    response_model=PatmatchSearchResponse,
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def search(
     request: PatmatchSearchRequest,
     db: Session = Depends(get_db),
@@ -83,7 +88,11 @@ def search(
     return run_patmatch_search(db, request)
 
 
-@router.get("/search", response_model=PatmatchSearchResponse)
+@router.get(
+    "/search",
+    response_model=PatmatchSearchResponse,
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def search_get(
     pattern: str = Query(..., description="Pattern to search for"),
     pattern_type: PatternType = Query(PatternType.DNA, alias="type"),
@@ -121,7 +130,11 @@ def search_get(
     return run_patmatch_search(db, request)
 
 
-@router.post("/download", response_class=PlainTextResponse)
+@router.post(
+    "/download",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(admission(ANALYSIS))],
+)
 def download_results(
     request: PatmatchDownloadRequest,
     db: Session = Depends(get_db),
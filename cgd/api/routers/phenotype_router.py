@@ -7,11 +7,12 @@ import logging
 import traceback
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from cgd.db.deps import get_db
 from cgd.api.services import phenotype_service
+from cgd.api.services.cv_tree_service import cv_tree_response, get_cv_tree
 from cgd.schemas.phenotype_schema import PhenotypeSearchResponse, PhenotypeSearchSummaryResponse, ObservableTreeResponse
 
 logger = logging.getLogger(__name__)
@@ -103,7 +104,7 @@ def search_phenotypes_summary(
 
 
 @router.get("/observables", response_model=ObservableTreeResponse)
-def get_observable_tree(db: Session = Depends(get_db)):
+def get_observable_tree(request: Request, db: Session = Depends(get_db)):
     """
     Get hierarchical tree of observable terms.
 
@@ -115,7 +116,12 @@ def get_observable_tree(db: Session = Depends(get_db)):
         Tree structure of observable terms with annotation counts.
     """
     try:
-        return phenotype_service.get_observable_tree(db)
+        return cv_tree_response(
+            request,
+            get_cv_tree(db, "observable"),
+            "observable",
+            phenotype_service.observable_tree,
+        )
     except Exception as e:
         logger.error(f"Error in get_observable_tree: {e}")
         logger.error(traceback.format_exc())
@@ -0,0 +1,270 @@
+"""
+Router registry.
+
+Lists every router the application serves, grouped by the part of the
+site it belongs to, and includes them into the app in one of two modes:
+
+- eager (default): every router is imported and included by ``create_app``,
+  in the order below
+- lazy (``CGD_LAZY_ROUTERS=true``): only the core group (health, metrics)
+  is included at startup. ``LazyRouterMiddleware`` imports and includes a
+  group when the first request for one of its path prefixes arrives, and
+  all of them when the OpenAPI schema or docs are requested.
+
+Importing the routers pulls in their services, the ORM models and their
+dependencies, which is most of the worker start-up time. Lazy mode lets a
+worker answer ``/health`` quickly and spreads that cost over the first
+requests, which suits ``--reload`` development and frequent gunicorn
+restarts.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from fastapi import APIRouter, FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Paths that need every route (schema generation, interactive docs)
+ALL_ROUTES_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+@dataclass(frozen=True)
+class RouterGroup:
+    """Routers ("module:attribute") served under a set of path prefixes."""
+
+    name: str
+    routers: tuple[str, ...]
+    prefixes: tuple[str, ...] = ()
+
+    def matches(self, path: str) -> bool:
+        return any(
+            path == prefix or path.startswith(prefix + "/")
+            for prefix in self.prefixes
+        )
+
+
+def _public(*modules: str) -> tuple[str, ...]:
+    return tuple(f"cgd.api.routers.{m}:router" for m in modules)
+
+
+def _curation(*modules: str) -> tuple[str, ...]:
+    return tuple(f"cgd.api.routers.curation.{m}:router" for m in modules)
+
+
+CORE_GROUP = RouterGroup("core", _public("health_router", "metrics_router"))
+
+# Eager mode includes the routers in exactly this order
+ROUTER_ORDER: tuple[str, ...] = (
+    ("cgd.auth.router:router",)
+    + CORE_GROUP.routers
+    + _public(
+        "locus_router",
+        "reference_router",
+        "chromosome_router",
+        "go_router",
+        "phenotype_router",
+        "search_router",
+        "sequence_router",
+        "seq_tools_router",
+        "blast_router",
+        "patmatch_router",
+        "batch_download_router",
+        "restriction_mapper_router",
+        "feature_search_router",
+        "genome_version_router",
+        "colleague_router",
+        "gene_registry_router",
+        "webprimer_router",
+        "go_term_finder_router",
+        "go_slim_mapper_router",
+        "go_annotation_summary_router",
+        "homology_router",
+        "literature_topic_router",
+        "genome_snapshot_router",
+    )
+    # Curation routers (require authentication)
+    + _curation(
+        "todo_list_router",
+        "go_curation_router",
+        "reference_curation_router",
+        "phenotype_curation_router",
+        "colleague_curation_router",
+        "locus_curation_router",
+        "litguide_curation_router",
+        "note_curation_router",
+        "feature_curation_router",
+        "link_curation_router",
+        "gene_registry_curation_router",
+        "paragraph_curation_router",
+        "litreview_curation_router",
+        "ref_annotation_curation_router",
+        "db_search_router",
+        "sequence_curation_router",
+        "coordinate_curation_router",
+        "seq_alignment_router",
+    )
+)
+
+LAZY_GROUPS: tuple[RouterGroup, ...] = (
+    RouterGroup("auth", ("cgd.auth.router:router",), ("/api/auth",)),
+    RouterGroup(
+        "locus",
+        _public(
+            "locus_router",
+            "homology_router",
+            "chromosome_router",
+            "genome_version_router",
+            "genome_snapshot_router",
+        ),
+        (
+            "/api/locus",
+            "/api/homolog-sequences",
+            "/api/homology",
+            "/api/chromosome",
+            "/api/genome-version",
+            "/api/genome-snapshot",
+        ),
+    ),
+    RouterGroup(
+        "literature",
+        _public(
+            "reference_router",
+            "literature_topic_router",
+            "colleague_router",
+            "gene_registry_router",
+        ),
+        (
+            "/api/reference",
+            "/api/literature-topic",
+            "/api/colleague",
+            "/api/gene-registry",
+        ),
+    ),
+    RouterGroup(
+        "go",
+        _public(
+            "go_router",
+            "go_term_finder_router",
+            "go_slim_mapper_router",
+            "go_annotation_summary_router",
+        ),
+        (
+            "/api/go",
+            "/api/go-term-finder",
+            "/api/go-slim-mapper",
+            "/api/go-annotation-summary",
+        ),
+    ),
+    RouterGroup("phenotype", _public("phenotype_router"), ("/api/phenotype",)),
+    RouterGroup(
+        "search",
+        _public("search_router", "feature_search_router"),
+        ("/api/search", "/api/feature-search"),
+    ),
+    RouterGroup(
+        "sequence_tools",
+        _public(
+            "sequence_router",
+            "seq_tools_router",
+            "batch_download_router",
+            "webprimer_router",
+            "restriction_mapper_router",
+            "blast_router",
+            "patmatch_router",
+        ),
+        (
+            "/api/sequence",
+            "/api/seq-tools",
+            "/api/batch-download",
+            "/api/webprimer",
+            "/api/restriction-mapper",
+            "/api/blast",
+            "/api/patmatch",
+        ),
+    ),
+    RouterGroup(
+        "curation",
+        tuple(r for r in ROUTER_ORDER if r.startswith("cgd.api.routers.curation.")),
+        ("/api/curation",),
+    ),
+)
+
+
+def load_router(target: str) -> APIRouter:
+    """Import a router given as "package.module:attribute"."""
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def include_routers(app: FastAPI, targets: Iterable[str]) -> None:
+    for target in targets:
+        app.include_router(load_router(target))
+
+
+class LazyRouterMiddleware:
+    """
+    ASGI middleware that includes router groups on first use.
+
+    Groups are imported in the thread pool so a slow first import does not
+    stall the event loop, and under a lock so concurrent first requests
+    include a group only once.
+    """
+
+    def __init__(self, app: ASGIApp, fastapi_app: FastAPI, groups: Iterable[RouterGroup]):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.pending = list(groups)
+        self._lock = threading.Lock()
+
+    def _load(self, path: str) -> None:
+        with self._lock:
+            wanted = [
+                group for group in self.pending
+                if path in ALL_ROUTES_PATHS or group.matches(path)
+            ]
+            for group in wanted:
+                started = time.perf_counter()
+                include_routers(self.fastapi_app, group.routers)
+                self.pending.remove(group)
+                logger.info(
+                    f"router_group_loaded group={group.name} "
+                    f"duration_ms={(time.perf_counter() - started) * 1000:.1f}"
+                )
+            if wanted:
+                # Regenerate the schema with the new routes on next request
+                self.fastapi_app.openapi_schema = None
+
+    def _needs_load(self, path: str) -> bool:
+        return any(
+            path in ALL_ROUTES_PATHS or group.matches(path)
+            for group in self.pending
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.pending:
+            path = scope.get("path", "")
+            if self._needs_load(path):
+                await run_in_threadpool(self._load, path)
+        await self.app(scope, receive, send)
+
+
+def register_routers(app: FastAPI, lazy: bool = False) -> None:
+    """
+    Include the application routers.
+
+    In lazy mode, call this after adding the other middleware so the lazy
+    loader runs first and per-route middleware sees the included routes.
+    """
+    if not lazy:
+        include_routers(app, ROUTER_ORDER)
+        return
+    include_routers(app, CORE_GROUP.routers)
+    app.add_middleware(LazyRouterMiddleware, fastapi_app=app, groups=LAZY_GROUPS)
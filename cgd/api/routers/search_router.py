@@ -4,7 +4,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
+from cgd.core.admission import BULK, admission
+from cgd.core.columnar import ColumnarResponse, columnar_requested
 from cgd.core.settings import settings
+from cgd.core.singleflight import single_flight
 from cgd.db.deps import get_db
 from cgd.api.crud.search_crud import dispatch
 from cgd.api.services import search_service
@@ -101,6 +104,7 @@ def search_category(
 
 
 @router.get("/text", response_model=TextSearchResponse)
+@single_flight("text_search")
 def text_search(
     query: str = Query(..., min_length=1, description="Search query string"),
     limit: int = Query(10, ge=1, le=50, description="Max results per category"),
@@ -138,7 +142,11 @@ def text_search(
     )
 
 
-@router.get("/text/category", response_model=TextSearchCategoryPagedResponse)
+@router.get(
+    "/text/category",
+    response_model=TextSearchCategoryPagedResponse,
+    dependencies=[Depends(admission(BULK))],
+)
 def text_search_category(
     query: str = Query(..., min_length=1, description="Search query string"),
     category: str = Query(..., description="Category to search"),
@@ -152,6 +160,7 @@ def text_search_category(
         description="For multi-term queries: 'all' (AND) or 'any' (OR)",
         pattern="^(all|any)$"
     ),
+    columnar: bool = Depends(columnar_requested),
     db: Session = Depends(get_db),
 ):
     """
@@ -160,7 +169,13 @@ def text_search_category(
     Returns all results for a single category.
     Use search_field to limit paper search to title, abstract, or both.
     Use match_mode to specify AND (all) or OR (any) for multi-term queries.
+    Use format=columnar for the results as a columnar table.
     """
+    if columnar:
+        return ColumnarResponse(text_search_service.text_search_category_columnar(
+            db, query, category,
+            search_field=search_field, match_mode=match_mode
+        ))
     return text_search_service.text_search_category(
         db, query, category,
         search_field=search_field, match_mode=match_mode
@@ -27,24 +27,51 @@ Services:
 - locus_service: Locus/gene information services
 - colleague_service: Colleague/researcher services
 - reference_service: Reference/publication services
+
+Service modules are imported on first use rather than with the package, so
+importing one service (``from cgd.api.services import locus_service``)
+does not load all of them. Names re-exported from the service modules
+(``cgd.api.services.<name>``) are still resolved, on first access.
 """
 
-from .phenotype_service import *  # noqa: F401, F403
-from .go_service import *  # noqa: F401, F403
-from .sequence_service import *  # noqa: F401, F403
-from .search_service import *  # noqa: F401, F403
-from .batch_download_service import *  # noqa: F401, F403
-from .seq_tools_service import *  # noqa: F401, F403
-from .feature_search_service import *  # noqa: F401, F403
-from .genome_version_service import *  # noqa: F401, F403
-from .gene_registry_service import *  # noqa: F401, F403
-from .chromosome_service import *  # noqa: F401, F403
-from .webprimer_service import *  # noqa: F401, F403
-from .go_term_finder_service import *  # noqa: F401, F403
-from .go_slim_mapper_service import *  # noqa: F401, F403
-from .blast_service import *  # noqa: F401, F403
-from .patmatch_service import *  # noqa: F401, F403
-from .restriction_mapper_service import *  # noqa: F401, F403
-from .locus_service import *  # noqa: F401, F403
-from .colleague_service import *  # noqa: F401, F403
-from .reference_service import *  # noqa: F401, F403
+import importlib
+
+_SERVICE_MODULES = (
+    "phenotype_service",
+    "go_service",
+    "sequence_service",
+    "search_service",
+    "batch_download_service",
+    "seq_tools_service",
+    "feature_search_service",
+    "genome_version_service",
+    "gene_registry_service",
+    "chromosome_service",
+    "webprimer_service",
+    "go_term_finder_service",
+    "go_slim_mapper_service",
+    "blast_service",
+    "patmatch_service",
+    "restriction_mapper_service",
+    "locus_service",
+    "colleague_service",
+    "reference_service",
+)
+
+
+def __getattr__(name: str):
+    if name in _SERVICE_MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    # Later modules win, as with the previous star imports
+    for module_name in reversed(_SERVICE_MODULES):
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        exported = getattr(module, "__all__", None)
+        if exported is not None and name not in exported:
+            continue
+        if not name.startswith("_") and hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SERVICE_MODULES))
@@ -16,6 +16,7 @@ from xml.etree import ElementTree as ET
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from cgd.core.metrics import track_subprocess
 from cgd.core.settings import settings
 from cgd.core.blast_config import (
     BLAST_ORGANISMS,
@@ -27,7 +28,8 @@ from cgd.core.blast_config import (
     build_database_names,
     get_database_type_for_dataset,
 )
-from cgd.models.models import Feature, Seq, FeatRelationship, Organism
+from cgd.models.models import Feature, Seq, Organism
+from cgd.api.services.relationship_map_service import get_relationship_map
 from cgd.schemas.blast_schema import (
     BlastProgram,
     BlastDatabase,
@@ -328,7 +330,7 @@ def _map_to_orf19_id(
     organism_tag: str
 ) -> Optional[str]:
     """
-    Map Assembly 22 feature to orf19 ID via FeatRelationship.
+    Map Assembly 22 feature to orf19 ID via the in-memory relationship map.
 
     This maps A22 features back to their Assembly 21 (orf19) identifiers.
 
@@ -345,41 +347,7 @@ def _map_to_orf19_id(
         return None
 
     try:
-        # Find the feature
-        feature = (
-            db.query(Feature)
-            .filter(
-                func.upper(Feature.feature_name) == feature_name.upper()
-            )
-            .first()
-        )
-
-        if not feature:
-            return None
-
-        # Look for Assembly 21 Primary Allele relationship
-        relationship = (
-            db.query(FeatRelationship)
-            .filter(
-                FeatRelationship.child_feature_no == feature.feature_no,
-                FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            )
-            .first()
-        )
-
-        if not relationship:
-            return None
-
-        # Get the parent feature (orf19)
-        parent_feature = (
-            db.query(Feature)
-            .filter(Feature.feature_no == relationship.parent_feature_no)
-            .first()
-        )
-
-        if parent_feature:
-            return parent_feature.feature_name
-
+        return get_relationship_map(db).orf19_for_name(feature_name)
     except Exception as e:
         logger.warning(f"Error mapping to orf19: {e}")
 
@@ -941,12 +909,13 @@ def run_blast_search(
 
             logger.info(f"Running BLAST command: {' '.join(cmd)}")
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=settings.blast_timeout,
-            )
+            with track_subprocess("blast"):
+                result = subprocess.run(
+                    cmd,
+                    capture_output=True,
+                    text=True,
+                    timeout=settings.blast_timeout,
+                )
 
             if result.returncode != 0:
                 error_msg = result.stderr or "Unknown BLAST error"
@@ -1122,12 +1091,13 @@ def run_multi_database_blast(
 
                 logger.info(f"Running multi-DB BLAST against {db_name}")
 
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=settings.blast_timeout,
-                )
+                with track_subprocess("blast"):
+                    result = subprocess.run(
+                        cmd,
+                        capture_output=True,
+                        text=True,
+                        timeout=settings.blast_timeout,
+                    )
 
                 if result.returncode != 0:
                     all_warnings.append(f"BLAST failed for {db_name}: {result.stderr}")
@@ -12,6 +12,9 @@ from typing import Optional
 from sqlalchemy import func, or_, text
 from sqlalchemy.orm import Session
 
+from cgd.api.services.region_service import invalidate_region_index
+from cgd.api.services.relationship_map_service import invalidate_relationship_map
+from cgd.core.http_compression import invalidate_precompressed
 from cgd.models.models import (
     Feature,
     FeatLocation,
@@ -281,6 +284,10 @@ class FeatureCurationService:
             )
 
         self.db.commit()
+        invalidate_region_index()
+        invalidate_relationship_map()
+        invalidate_precompressed("genome_snapshot:")
+        invalidate_precompressed("homology_details:")
 
         return feature.feature_no
 
@@ -554,6 +561,10 @@ class FeatureCurationService:
         )
 
         self.db.commit()
+        invalidate_region_index()
+        invalidate_relationship_map()
+        invalidate_precompressed("genome_snapshot:")
+        invalidate_precompressed("homology_details:")
 
         logger.info(
             f"Added new location for feature {feature.feature_no} ({feature_name}): "
@@ -671,6 +682,10 @@ class FeatureCurationService:
             # Delete the feature
             self.db.delete(feature)
             self.db.commit()
+            invalidate_region_index()
+            invalidate_relationship_map()
+            invalidate_precompressed("genome_snapshot:")
+            invalidate_precompressed("homology_details:")
 
             logger.info(f"Deleted feature {feature_no} by {curator_userid}")
 
@@ -16,6 +16,7 @@ from typing import Optional
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from cgd.core.http_compression import invalidate_precompressed
 from cgd.models.models import (
     Feature,
     Organism,
@@ -282,6 +283,7 @@ class GeneRegistryCurationService:
             )
 
         self.db.commit()
+        invalidate_precompressed("homology_details:")
 
         # Archive the submission file
         self._archive_submission(submission_id)
@@ -16,6 +16,8 @@ from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from cgd.api.services.go_dag_service import invalidate_go_dag
+from cgd.core.http_compression import invalidate_precompressed
 from cgd.models.models import (
     Dbxref,
     Feature,
@@ -429,6 +431,9 @@ class GoCurationService:
             )
 
             self.db.commit()
+            invalidate_go_dag()
+            invalidate_precompressed("genome_snapshot:")
+            invalidate_precompressed("go_slim:")
 
             logger.info(
                 f"Created GO annotation {annotation.go_annotation_no} "
@@ -582,6 +587,9 @@ class GoCurationService:
         # Now delete the annotation
         self.db.delete(annotation)
         self.db.commit()
+        invalidate_go_dag()
+        invalidate_precompressed("genome_snapshot:")
+        invalidate_precompressed("go_slim:")
 
         return True
 
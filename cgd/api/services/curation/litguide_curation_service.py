@@ -14,6 +14,8 @@ from typing import Optional
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session, joinedload
 
+from cgd.api.services.cv_tree_service import invalidate_cv_tree
+from cgd.core.metrics import record_cache_lookup
 from cgd.models.models import (
     Abstract,
     Cv,
@@ -84,7 +86,9 @@ class LitGuideCurationService:
         Caches results to avoid repeated queries.
         """
         if cv_name in self._cv_terms_cache:
+            record_cache_lookup("litguide_cv_terms", hit=True)
             return self._cv_terms_cache[cv_name]
+        record_cache_lookup("litguide_cv_terms", hit=False)
 
         cv = (
             self.db.query(Cv)
@@ -376,6 +380,7 @@ class LitGuideCurationService:
         )
         self.db.add(link)
         self.db.commit()
+        invalidate_cv_tree("literature_topic")
 
         logger.info(
             f"Added topic '{topic}' association: feature {feature_no}, "
@@ -445,6 +450,7 @@ class LitGuideCurationService:
             existing.property_value = curation_status
             existing.date_last_reviewed = datetime.now()
             self.db.commit()
+            invalidate_cv_tree("literature_topic")
             return existing.ref_property_no
 
         # Create new property
@@ -458,6 +464,7 @@ class LitGuideCurationService:
         )
         self.db.add(prop)
         self.db.commit()
+        invalidate_cv_tree("literature_topic")
 
         logger.info(
             f"Set curation status '{curation_status}' for reference {reference_no} "
@@ -1072,6 +1079,7 @@ class LitGuideCurationService:
         )
         self.db.add(ref_prop)
         self.db.commit()
+        invalidate_cv_tree("literature_topic")
 
         logger.info(
             f"Added non-gene topic '{topic}' to reference {reference_no} "
@@ -1114,6 +1122,7 @@ class LitGuideCurationService:
 
         self.db.delete(prop)
         self.db.commit()
+        invalidate_cv_tree("literature_topic")
 
         logger.info(
             f"Removed non-gene topic property {ref_property_no} by {curator_userid}"
@@ -8,10 +8,11 @@ Allows curators to review papers gathered via PubMed searches and:
 """
 
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import desc, func, text
+from sqlalchemy import desc, func, or_, text
 from sqlalchemy.orm import Session
 
 from cgd.models.models import (
@@ -33,6 +34,67 @@ NOT_YET_CURATED = "Not yet curated"
 REF_SOURCE = "Curator PubMed reference"  # Must match CODE table values
 
 
+def _chunk_list(lst: list, chunk_size: int = 900) -> list[list]:
+    """Split a list into chunks of specified size (default 900 for Oracle's 1000 limit)."""
+    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+
+
+def _reference_citation(ref_temp: RefTemp) -> str:
+    """Citation a REF_TEMP paper gets in the REFERENCE table."""
+    return (ref_temp.citation or f"PMID:{ref_temp.pubmed}")[:480]
+
+
+def _citation_year(citation: str) -> int:
+    """Parse the year from a citation ("Author et al. (YYYY) Journal ...")."""
+    if "(" in citation and ")" in citation:
+        try:
+            year_str = citation.split("(")[1].split(")")[0]
+            return int(year_str[:4])
+        except (IndexError, ValueError):
+            pass
+    return datetime.now().year
+
+
+@dataclass
+class TriagePrefetch:
+    """Database state a batch of triage actions is decided against."""
+
+    ref_temps: dict = field(default_factory=dict)   # pubmed -> RefTemp
+    references: dict = field(default_factory=dict)  # pubmed -> reference_no
+    discarded: set = field(default_factory=set)     # pubmeds in REF_BAD
+    citations: set = field(default_factory=set)     # taken reference citations
+    dbxref_ids: set = field(default_factory=set)    # taken reference dbxref_ids
+    # (feature_no, feature_name, gene_name, organism_abbrev) rows
+    features: list = field(default_factory=list)
+
+
+@dataclass
+class NewReference:
+    """A reference a batch will create from REF_TEMP, with its status and links."""
+
+    pubmed: int
+    citation: str
+    year: int
+    abstract: Optional[str]
+    status: str
+    result: dict
+    feature_nos: list = field(default_factory=list)
+    link_messages: list = field(default_factory=list)
+    reference_no: Optional[int] = None
+    ref_property_no: Optional[int] = None
+
+
+@dataclass
+class TriagePlan:
+    """Rows a batch of triage actions writes, and the per-action results."""
+
+    results: list = field(default_factory=list)
+    new_references: list = field(default_factory=list)
+    discards: list = field(default_factory=list)  # pubmeds to add to REF_BAD
+    removals: list = field(default_factory=list)  # results whose pubmed leaves REF_TEMP
+    pending: list = field(default_factory=list)   # results that depend on the write
+
+
 class LitReviewError(Exception):
     """Raised when literature review operations fail."""
 
@@ -392,6 +454,13 @@ class LitReviewCurationService:
         """
         Process multiple triage actions in one request.
 
+        The batch runs in four stages: prefetch the REF_TEMP rows, existing
+        references, discards and features for every action in a few
+        queries; decide each action and build its rows in memory; write
+        all rows with bulk DML in one transaction; return per-action
+        results. If the write fails, nothing is applied and every action
+        that would have changed the database is reported as failed.
+
         Args:
             actions: List of dicts with pubmed, action, and optional parameters
                      action can be: "add", "high_priority", "discard"
@@ -400,48 +469,366 @@ class LitReviewCurationService:
         Returns:
             Dict with results for each action
         """
-        results = []
+        prefetch = self._prefetch_triage(actions)
+        plan = self._plan_triage(actions, prefetch)
+        self._write_triage(plan, curator_userid)
+
+        results = plan.results
+        return {
+            "results": results,
+            "total_processed": len(results),
+            "successful": sum(1 for r in results if r.get("success")),
+        }
+
+    def _prefetch_triage(self, actions: list[dict]) -> TriagePrefetch:
+        """Load everything a batch of triage actions needs to be decided."""
+        prefetch = TriagePrefetch()
+        pubmeds = sorted({a["pubmed"] for a in actions if a.get("pubmed")})
+
+        for chunk in _chunk_list(pubmeds):
+            for ref_temp in self.db.query(RefTemp).filter(RefTemp.pubmed.in_(chunk)).all():
+                prefetch.ref_temps[ref_temp.pubmed] = ref_temp
+            for pubmed, reference_no in (
+                self.db.query(Reference.pubmed, Reference.reference_no)
+                .filter(Reference.pubmed.in_(chunk))
+                .all()
+            ):
+                prefetch.references[pubmed] = reference_no
+            prefetch.discarded.update(
+                pubmed for (pubmed,) in
+                self.db.query(RefBad.pubmed).filter(RefBad.pubmed.in_(chunk)).all()
+            )
+
+        # Existing references the new ones would collide with on
+        # reference_uk (citation) or ref_dbxref_id_uk
+        citations = sorted({
+            _reference_citation(ref_temp) for ref_temp in prefetch.ref_temps.values()
+        })
+        for chunk in _chunk_list(citations):
+            prefetch.citations.update(
+                citation for (citation,) in
+                self.db.query(Reference.citation).filter(Reference.citation.in_(chunk)).all()
+            )
+        dbxref_ids = [f"PMID:{pubmed}" for pubmed in prefetch.ref_temps]
+        for chunk in _chunk_list(dbxref_ids):
+            prefetch.dbxref_ids.update(
+                dbxref_id for (dbxref_id,) in
+                self.db.query(Reference.dbxref_id).filter(Reference.dbxref_id.in_(chunk)).all()
+            )
+
+        names = sorted({
+            name.strip().upper()
+            for a in actions
+            if a.get("action") == "high_priority"
+            for name in a.get("feature_names") or []
+            if name.strip()
+        })
+        for chunk in _chunk_list(names):
+            prefetch.features.extend(
+                self.db.query(
+                    Feature.feature_no,
+                    Feature.feature_name,
+                    Feature.gene_name,
+                    Organism.organism_abbrev,
+                )
+                .join(Organism, Feature.organism_no == Organism.organism_no)
+                .filter(or_(
+                    func.upper(Feature.feature_name).in_(chunk),
+                    func.upper(Feature.gene_name).in_(chunk),
+                ))
+                .order_by(Feature.feature_no)
+                .all()
+            )
+
+        return prefetch
+
+    def _plan_triage(self, actions: list[dict], prefetch: TriagePrefetch) -> TriagePlan:
+        """Decide every action and build the rows to write, without touching the database."""
+        plan = TriagePlan()
+        citations = set(prefetch.citations)
+        dbxref_ids = set(prefetch.dbxref_ids)
+        seen = set()
 
         for action_data in actions:
             pubmed = action_data.get("pubmed")
             action = action_data.get("action")
+            result = {"pubmed": pubmed, "action": action, "success": False, "messages": []}
 
             if not pubmed or not action:
-                results.append({
+                plan.results.append({
                     "pubmed": pubmed,
                     "success": False,
                     "messages": ["Missing pubmed or action"],
                 })
                 continue
-
-            if action == "add":
-                result = self.triage_add(pubmed, curator_userid)
-            elif action == "high_priority":
-                result = self.triage_high_priority(
-                    pubmed,
-                    curator_userid,
-                    feature_names=action_data.get("feature_names"),
-                    organism_abbrev=action_data.get("organism_abbrev"),
-                )
-            elif action == "discard":
-                result = self.triage_discard(pubmed, curator_userid)
-            else:
-                results.append({
+            if action not in ("add", "high_priority", "discard"):
+                plan.results.append({
                     "pubmed": pubmed,
                     "success": False,
                     "messages": [f"Unknown action: {action}"],
                 })
                 continue
 
-            result["pubmed"] = pubmed
-            result["action"] = action
-            results.append(result)
+            plan.results.append(result)
+            if pubmed in seen:
+                result["messages"].append(f"PubMed {pubmed} appears more than once in this batch")
+                continue
+            seen.add(pubmed)
+
+            existing = prefetch.references.get(pubmed)
+
+            if action == "discard":
+                if pubmed in prefetch.discarded:
+                    result["success"] = True
+                    result["messages"].append(f"PubMed {pubmed} is already in discard list")
+                    plan.removals.append(result)
+                elif existing:
+                    result["messages"].append(
+                        f"PubMed {pubmed} exists in Reference table, cannot discard"
+                    )
+                    plan.removals.append(result)
+                else:
+                    result["success"] = True
+                    result["messages"].append(f"Added PubMed {pubmed} to discard list")
+                    plan.discards.append(pubmed)
+                    plan.removals.append(result)
+                    plan.pending.append(result)
+                continue
 
-        return {
-            "results": results,
-            "total_processed": len(results),
-            "successful": sum(1 for r in results if r.get("success")),
-        }
+            result["reference_no"] = existing
+            if action == "high_priority":
+                result["linked_features"] = []
+
+            if existing:
+                result["messages"].append(
+                    f"PubMed {pubmed} already exists (reference_no: {existing})"
+                )
+                plan.removals.append(result)
+                continue
+
+            ref_temp = prefetch.ref_temps.get(pubmed)
+            if not ref_temp:
+                result["messages"].append(f"PubMed {pubmed} not found in review queue")
+                continue
+
+            citation = _reference_citation(ref_temp)
+            dbxref_id = f"PMID:{pubmed}"
+            if citation in citations or dbxref_id in dbxref_ids:
+                result["messages"].append(
+                    "Unique constraint violation - citation or dbxref_id may already exist"
+                )
+                continue
+            citations.add(citation)
+            dbxref_ids.add(dbxref_id)
+
+            new_reference = NewReference(
+                pubmed=pubmed,
+                citation=citation,
+                year=_citation_year(citation),
+                abstract=ref_temp.abstract[:4000] if ref_temp.abstract else None,
+                status=NOT_YET_CURATED if action == "add" else HIGH_PRIORITY,
+                result=result,
+            )
+            if action == "high_priority":
+                self._plan_feature_links(
+                    new_reference,
+                    action_data.get("feature_names") or [],
+                    action_data.get("organism_abbrev"),
+                    prefetch.features,
+                )
+            result["success"] = True
+            plan.new_references.append(new_reference)
+            plan.removals.append(result)
+            plan.pending.append(result)
+
+        return plan
+
+    @staticmethod
+    def _plan_feature_links(
+        new_reference: NewReference,
+        feature_names: list[str],
+        organism_abbrev: Optional[str],
+        features: list,
+    ) -> None:
+        """Resolve feature names against prefetched features, as _link_to_feature does."""
+        for name in feature_names:
+            name = name.strip().upper()
+            if not name:
+                continue
+
+            candidates = [
+                row for row in features
+                if not organism_abbrev or row.organism_abbrev == organism_abbrev
+            ]
+            feature = next(
+                (row for row in candidates if (row.feature_name or "").upper() == name),
+                None,
+            ) or next(
+                (row for row in candidates if (row.gene_name or "").upper() == name),
+                None,
+            )
+
+            if not feature:
+                new_reference.link_messages.append(
+                    f"Feature '{name}' not found" + (
+                        f" for organism {organism_abbrev}" if organism_abbrev else ""
+                    )
+                )
+                continue
+            if feature.feature_no not in new_reference.feature_nos:
+                new_reference.feature_nos.append(feature.feature_no)
+                new_reference.result["linked_features"].append(feature.feature_name)
+            new_reference.link_messages.append(f"Linked to feature {feature.feature_name}")
+
+    def _write_triage(self, plan: TriagePlan, curator_userid: str) -> None:
+        """Write a triage plan with bulk DML in one transaction."""
+        if not (plan.new_references or plan.discards or plan.removals):
+            return
+
+        created_by = curator_userid[:12]
+        new_references = plan.new_references
+        try:
+            reference_nos = self._next_sequence_values("reference_seq", len(new_references))
+            ref_property_nos = self._next_sequence_values("ref_property_seq", len(new_references))
+            for new_reference, reference_no, ref_property_no in zip(
+                new_references, reference_nos, ref_property_nos
+            ):
+                new_reference.reference_no = reference_no
+                new_reference.ref_property_no = ref_property_no
+
+            if new_references:
+                self.db.execute(
+                    text("""
+                        INSERT INTO MULTI.reference (
+                            reference_no, pubmed, source, status, pdf_status,
+                            dbxref_id, citation, year, created_by
+                        ) VALUES (
+                            :reference_no, :pubmed, :source, :status, :pdf_status,
+                            :dbxref_id, :citation, :year, :created_by
+                        )
+                    """),
+                    [
+                        {
+                            "reference_no": r.reference_no,
+                            "pubmed": r.pubmed,
+                            "source": REF_SOURCE,
+                            "status": "Published",
+                            "pdf_status": "N",
+                            "dbxref_id": f"PMID:{r.pubmed}",
+                            "citation": r.citation,
+                            "year": r.year,
+                            "created_by": created_by,
+                        }
+                        for r in new_references
+                    ],
+                )
+                self.db.execute(
+                    text("""
+                        INSERT INTO MULTI.ref_property (
+                            ref_property_no, reference_no, source, property_type,
+                            property_value, created_by
+                        ) VALUES (
+                            :ref_property_no, :reference_no, :source, :property_type,
+                            :property_value, :created_by
+                        )
+                    """),
+                    [
+                        {
+                            "ref_property_no": r.ref_property_no,
+                            "reference_no": r.reference_no,
+                            "source": "CGD",
+                            "property_type": PROPERTY_TYPE,
+                            "property_value": r.status,
+                            "created_by": created_by,
+                        }
+                        for r in new_references
+                    ],
+                )
+
+            abstracts = [
+                {"reference_no": r.reference_no, "abstract": r.abstract}
+                for r in new_references if r.abstract
+            ]
+            if abstracts:
+                self.db.execute(
+                    text("""
+                        INSERT INTO MULTI.abstract (reference_no, abstract)
+                        VALUES (:reference_no, :abstract)
+                    """),
+                    abstracts,
+                )
+
+            links = [
+                {
+                    "ref_property_no": r.ref_property_no,
+                    "feature_no": feature_no,
+                    "created_by": created_by,
+                }
+                for r in new_references for feature_no in r.feature_nos
+            ]
+            if links:
+                self.db.execute(
+                    text("""
+                        INSERT INTO MULTI.refprop_feat (
+                            refprop_feat_no, ref_property_no, feature_no, created_by
+                        ) VALUES (
+                            MULTI.refprop_feat_seq.NEXTVAL, :ref_property_no, :feature_no, :created_by
+                        )
+                    """),
+                    links,
+                )
+
+            if plan.discards:
+                self.db.execute(
+                    text("""
+                        INSERT INTO MULTI.ref_bad (pubmed, created_by)
+                        VALUES (:pubmed, :created_by)
+                    """),
+                    [{"pubmed": pubmed, "created_by": created_by} for pubmed in plan.discards],
+                )
+
+            for chunk in _chunk_list([result["pubmed"] for result in plan.removals]):
+                self.db.query(RefTemp).filter(RefTemp.pubmed.in_(chunk)).delete(
+                    synchronize_session=False
+                )
+
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Batch triage by {curator_userid} rolled back: {e}")
+            for result in plan.pending:
+                result["success"] = False
+                if "reference_no" in result:
+                    result["reference_no"] = None
+                if "linked_features" in result:
+                    result["linked_features"] = []
+                result["messages"] = [f"Batch rolled back - database error: {str(e)[:500]}"]
+            return
+
+        for r in new_references:
+            r.result["reference_no"] = r.reference_no
+            r.result["messages"] = [
+                f"Created reference {r.reference_no} from PubMed {r.pubmed}",
+                f"Set status to '{r.status}'",
+                *r.link_messages,
+            ]
+        for result in plan.removals:
+            result["messages"].append(f"Removed PubMed {result['pubmed']} from review queue")
+
+        logger.info(
+            f"Batch triage by {curator_userid}: created {len(new_references)} references, "
+            f"discarded {len(plan.discards)}, removed {len(plan.removals)} from review queue"
+        )
+
+    def _next_sequence_values(self, sequence: str, count: int) -> list[int]:
+        """Draw ``count`` values from an Oracle sequence in one round trip."""
+        if not count:
+            return []
+        result = self.db.execute(
+            text(f"SELECT MULTI.{sequence}.NEXTVAL FROM dual CONNECT BY LEVEL <= :count"),
+            {"count": count},
+        )
+        return list(result.scalars().all())
 
     def _create_reference_from_ref_temp(
         self,
@@ -463,15 +850,8 @@ class LitReviewCurationService:
         if not ref_temp:
             raise LitReviewError(f"PubMed {pubmed} not found in review queue")
 
-        # Parse citation for year (format: "Author et al. (YYYY) Journal ...")
-        year = datetime.now().year
-        citation = ref_temp.citation or f"PMID:{pubmed}"
-        if "(" in citation and ")" in citation:
-            try:
-                year_str = citation.split("(")[1].split(")")[0]
-                year = int(year_str[:4])
-            except (IndexError, ValueError):
-                pass
+        citation = _reference_citation(ref_temp)
+        year = _citation_year(citation)
 
         # Get next reference_no from Oracle sequence
         result = self.db.execute(text("SELECT MULTI.reference_seq.NEXTVAL FROM dual"))
@@ -498,7 +878,7 @@ class LitReviewCurationService:
                 "status": "Published",
                 "pdf_status": "N",
                 "dbxref_id": f"PMID:{pubmed}",
-                "citation": citation[:480],
+                "citation": citation,
                 "year": year,
                 "created_by": curator_userid[:12],
             },
@@ -31,6 +31,7 @@ from cgd.api.services.curation.reference_curation_service import (
     ReferenceCurationService,
     ReferenceCurationError,
 )
+from cgd.core.http_compression import invalidate_precompressed
 
 logger = logging.getLogger(__name__)
 
@@ -445,6 +446,9 @@ class LocusCurationService:
             )
 
         self.db.commit()
+        # Gene names appear in homology details, feature types in snapshots
+        invalidate_precompressed("homology_details:")
+        invalidate_precompressed("genome_snapshot:")
 
         logger.info(f"Updated feature {feature_no} by {curator_userid}")
 
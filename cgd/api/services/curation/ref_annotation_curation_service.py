@@ -11,8 +11,8 @@ Mirrors functionality from legacy UpdateReferenceAnnotation.pm:
 import logging
 from typing import Optional
 
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
 
 from cgd.models.models import (
     Alias,
@@ -33,6 +33,9 @@ from cgd.models.models import (
 
 logger = logging.getLogger(__name__)
 
+# REF_PROPERTY types shown in the literature guide
+LIT_GUIDE_PROPERTY_TYPES = ["Topic", "Curation status"]
+
 
 class RefAnnotationCurationError(Exception):
     """Raised when reference annotation curation fails."""
@@ -87,7 +90,7 @@ class RefAnnotationCurationService:
             self.db.query(RefProperty)
             .filter(
                 RefProperty.reference_no == reference_no,
-                RefProperty.property_type.in_(["Topic", "Curation status"]),
+                RefProperty.property_type.in_(LIT_GUIDE_PROPERTY_TYPES),
             )
             .all()
         )
@@ -818,123 +821,146 @@ class RefAnnotationCurationService:
         Bulk delete all entries of a given type for a reference.
 
         entry_type: 'lit_guide', 'go_annotation', or 'ref_link'
-        """
-        messages = []
-        count = 0
 
-        if entry_type == "lit_guide":
-            # Get all ref_property entries
-            properties = (
-                self.db.query(RefProperty)
-                .filter(
-                    RefProperty.reference_no == reference_no,
-                    RefProperty.property_type.in_(["Topic", "Curation status"]),
-                )
-                .all()
-            )
-
-            for prop in properties:
-                # Delete children first
-                children = (
-                    self.db.query(RefpropFeat)
-                    .filter(RefpropFeat.ref_property_no == prop.ref_property_no)
-                    .all()
-                )
-                for child in children:
-                    self.db.delete(child)
-                    count += 1
-                self.db.delete(prop)
-
-            messages.append(f"Deleted {count} literature guide entries")
+        Each entry type is removed with a handful of set-based statements
+        in one transaction; 'counts' reports the rows deleted per table.
+        """
+        try:
+            if entry_type == "lit_guide":
+                count, deleted, messages = self._bulk_delete_lit_guide(reference_no)
+            elif entry_type == "go_annotation":
+                count, deleted, messages = self._bulk_delete_go_refs(reference_no)
+            elif entry_type == "ref_link":
+                count, deleted, messages = self._bulk_delete_ref_links(reference_no)
+            else:
+                raise RefAnnotationCurationError(f"Invalid entry type: {entry_type}")
 
-        elif entry_type == "go_annotation":
-            go_refs = (
-                self.db.query(GoRef)
-                .filter(GoRef.reference_no == reference_no)
-                .all()
-            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
 
-            for go_ref in go_refs:
-                go_annotation_no = go_ref.go_annotation_no
+        logger.info(
+            f"Bulk deleted {entry_type} for reference {reference_no} "
+            f"by {curator_userid}: {count} entries, rows {deleted}"
+        )
 
-                # Delete qualifiers and support
-                self.db.query(GoQualifier).filter(
-                    GoQualifier.go_ref_no == go_ref.go_ref_no
-                ).delete()
-                self.db.query(GorefDbxref).filter(
-                    GorefDbxref.go_ref_no == go_ref.go_ref_no
-                ).delete()
+        return {
+            "success": True,
+            "messages": messages,
+            "count": count,
+            "counts": {"deleted": deleted},
+        }
 
-                self.db.delete(go_ref)
-                count += 1
+    def _bulk_delete_lit_guide(self, reference_no: int) -> tuple[int, dict, list[str]]:
+        """Delete a reference's literature guide topics and their feature links."""
+        topics = and_(
+            RefProperty.reference_no == reference_no,
+            RefProperty.property_type.in_(LIT_GUIDE_PROPERTY_TYPES),
+        )
+        has_features = exists().where(
+            RefpropFeat.ref_property_no == RefProperty.ref_property_no
+        )
 
-                # Check if go_annotation still in use
-                remaining = (
-                    self.db.query(func.count(GoRef.go_ref_no))
-                    .filter(GoRef.go_annotation_no == go_annotation_no)
-                    .scalar()
+        # Non-gene topics first, so they can be counted as entries
+        non_gene = self._delete(
+            self.db.query(RefProperty).filter(topics, ~has_features)
+        )
+        feature_links = self._delete(
+            self.db.query(RefpropFeat).filter(
+                RefpropFeat.ref_property_no.in_(
+                    select(RefProperty.ref_property_no).where(topics)
                 )
-                if remaining == 0:
-                    go_ann = (
-                        self.db.query(GoAnnotation)
-                        .filter(GoAnnotation.go_annotation_no == go_annotation_no)
-                        .first()
-                    )
-                    if go_ann:
-                        self.db.delete(go_ann)
-
-            messages.append(f"Deleted {count} GO annotation entries")
-
-        elif entry_type == "ref_link":
-            ref_links = (
-                self.db.query(RefLink)
-                .filter(RefLink.reference_no == reference_no)
-                .all()
             )
+        )
+        gene_topics = self._delete(self.db.query(RefProperty).filter(topics))
 
-            orphaned = []
-            for link in ref_links:
-                tab_name = link.tab_name
-                primary_key = link.primary_key
-                col_name = link.col_name
-
-                self.db.delete(link)
-                count += 1
+        count = non_gene + feature_links
+        deleted = {
+            "refprop_feat": feature_links,
+            "ref_property": non_gene + gene_topics,
+        }
+        return count, deleted, [f"Deleted {count} literature guide entries"]
 
-                # Check if data becomes orphaned
-                remaining = (
-                    self.db.query(func.count(RefLink.ref_link_no))
-                    .filter(
-                        RefLink.tab_name == tab_name,
-                        RefLink.primary_key == primary_key,
-                        RefLink.col_name == col_name,
-                    )
-                    .scalar()
-                )
-                if remaining == 0:
-                    orphaned.append({
-                        "tab_name": tab_name,
-                        "primary_key": primary_key,
-                        "col_name": col_name,
-                    })
+    def _bulk_delete_go_refs(self, reference_no: int) -> tuple[int, dict, list[str]]:
+        """
+        Delete a reference's go_refs, and the GO annotations no other
+        reference supports.
+        """
+        go_ref_nos = select(GoRef.go_ref_no).where(GoRef.reference_no == reference_no)
+        deleted = {
+            "go_qualifier": self._delete(
+                self.db.query(GoQualifier).filter(GoQualifier.go_ref_no.in_(go_ref_nos))
+            ),
+            "goref_dbxref": self._delete(
+                self.db.query(GorefDbxref).filter(GorefDbxref.go_ref_no.in_(go_ref_nos))
+            ),
+        }
 
-            messages.append(f"Deleted {count} ref_link entries")
-            if orphaned:
-                messages.append(
-                    f"Warning: {len(orphaned)} data entries are now orphaned"
-                )
+        other_ref = aliased(GoRef)
+        # go_refs whose annotation is also cited by another reference
+        shared = self._delete(
+            self.db.query(GoRef).filter(
+                GoRef.reference_no == reference_no,
+                exists().where(
+                    other_ref.go_annotation_no == GoRef.go_annotation_no,
+                    other_ref.reference_no != reference_no,
+                ),
+            )
+        )
+        # Anti-join: annotations cited by this reference and no other
+        orphaned = self._delete(
+            self.db.query(GoAnnotation).filter(
+                GoAnnotation.go_annotation_no.in_(
+                    select(GoRef.go_annotation_no).where(GoRef.reference_no == reference_no)
+                ),
+                ~exists().where(
+                    other_ref.go_annotation_no == GoAnnotation.go_annotation_no,
+                    other_ref.reference_no != reference_no,
+                ),
+            )
+        )
+        # Oracle cascades the orphaned annotations' go_refs (one each, by
+        # go_ref_uk); delete them here for databases that do not
+        remaining = self._delete(
+            self.db.query(GoRef).filter(GoRef.reference_no == reference_no)
+        )
 
-        else:
-            raise RefAnnotationCurationError(f"Invalid entry type: {entry_type}")
+        count = shared + max(remaining, orphaned)
+        deleted["go_ref"] = count
+        deleted["go_annotation"] = orphaned
 
-        self.db.commit()
+        messages = [f"Deleted {count} GO annotation entries"]
+        if orphaned:
+            messages.append(
+                f"Deleted {orphaned} GO annotations no longer linked to any reference"
+            )
+        return count, deleted, messages
 
-        logger.info(
-            f"Bulk deleted {entry_type} for reference {reference_no} "
-            f"by {curator_userid}: {count} entries"
+    def _bulk_delete_ref_links(self, reference_no: int) -> tuple[int, dict, list[str]]:
+        """Delete a reference's ref_links, reporting data left without one."""
+        other_link = aliased(RefLink)
+        orphaned = (
+            self.db.query(func.count(RefLink.ref_link_no))
+            .filter(
+                RefLink.reference_no == reference_no,
+                ~exists().where(
+                    other_link.tab_name == RefLink.tab_name,
+                    other_link.primary_key == RefLink.primary_key,
+                    other_link.col_name == RefLink.col_name,
+                    other_link.reference_no != reference_no,
+                ),
+            )
+            .scalar()
+        )
+        count = self._delete(
+            self.db.query(RefLink).filter(RefLink.reference_no == reference_no)
         )
 
-        return {"success": True, "messages": messages, "count": count}
+        messages = [f"Deleted {count} ref_link entries"]
+        if orphaned:
+            messages.append(f"Warning: {orphaned} data entries are now orphaned")
+        return count, {"ref_link": count}, messages
 
     def bulk_transfer(
         self,
@@ -947,6 +973,10 @@ class RefAnnotationCurationService:
         Bulk transfer all entries of a given type to another reference.
 
         entry_type: 'lit_guide', 'go_annotation', or 'ref_link'
+
+        Entries are copied with INSERT ... SELECT (skipping those the new
+        reference already has) and the originals deleted, in one
+        transaction; 'counts' reports the rows changed per table.
         """
         # Verify new reference exists
         new_ref = self.get_reference_by_no(new_reference_no)
@@ -954,67 +984,233 @@ class RefAnnotationCurationService:
             raise RefAnnotationCurationError(
                 f"Target reference {new_reference_no} not found"
             )
+        if new_reference_no == reference_no:
+            raise RefAnnotationCurationError(
+                "Cannot transfer entries to the same reference"
+            )
 
-        messages = []
-        count = 0
-
-        if entry_type == "lit_guide":
-            entries = self._get_literature_guide_entries(reference_no)
-            for entry in entries:
-                try:
-                    self.transfer_lit_guide_entry(
-                        refprop_feat_no=entry.get("refprop_feat_no"),
-                        ref_property_no=entry["ref_property_no"],
-                        new_reference_no=new_reference_no,
-                        curator_userid=curator_userid,
-                    )
-                    count += 1
-                except RefAnnotationCurationError as e:
-                    messages.append(f"Failed to transfer: {e}")
-
-            messages.insert(0, f"Transferred {count} literature guide entries")
-
-        elif entry_type == "go_annotation":
-            entries = self._get_go_annotation_entries(reference_no)
-            for entry in entries:
-                try:
-                    self.transfer_go_ref_entry(
-                        go_ref_no=entry["go_ref_no"],
-                        new_reference_no=new_reference_no,
-                        curator_userid=curator_userid,
-                    )
-                    count += 1
-                except RefAnnotationCurationError as e:
-                    messages.append(f"Failed to transfer: {e}")
+        created_by = curator_userid[:12]
+        try:
+            if entry_type == "lit_guide":
+                count, counts, messages = self._bulk_transfer_lit_guide(
+                    reference_no, new_reference_no, created_by
+                )
+            elif entry_type == "go_annotation":
+                count, counts, messages = self._bulk_transfer_go_refs(
+                    reference_no, new_reference_no, created_by
+                )
+            elif entry_type == "ref_link":
+                count, counts, messages = self._bulk_transfer_ref_links(
+                    reference_no, new_reference_no
+                )
+            else:
+                raise RefAnnotationCurationError(f"Invalid entry type: {entry_type}")
 
-            messages.insert(0, f"Transferred {count} GO annotation entries")
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
 
-        elif entry_type == "ref_link":
-            ref_links = (
-                self.db.query(RefLink)
-                .filter(RefLink.reference_no == reference_no)
-                .all()
-            )
+        logger.info(
+            f"Bulk transferred {entry_type} from ref {reference_no} "
+            f"to ref {new_reference_no} by {curator_userid}: {count} entries, "
+            f"rows {counts}"
+        )
 
-            for link in ref_links:
-                try:
-                    self.transfer_ref_link_entry(
-                        ref_link_no=link.ref_link_no,
-                        new_reference_no=new_reference_no,
-                        curator_userid=curator_userid,
-                    )
-                    count += 1
-                except RefAnnotationCurationError as e:
-                    messages.append(f"Failed to transfer: {e}")
+        return {"success": True, "messages": messages, "count": count, "counts": counts}
 
-            messages.insert(0, f"Transferred {count} ref_link entries")
+    def _bulk_transfer_lit_guide(
+        self, reference_no: int, new_reference_no: int, created_by: str
+    ) -> tuple[int, dict, list[str]]:
+        """Move literature guide topics and feature links to another reference."""
+        topics = and_(
+            RefProperty.reference_no == reference_no,
+            RefProperty.property_type.in_(LIT_GUIDE_PROPERTY_TYPES),
+        )
+        new_prop = aliased(RefProperty)
+        same_topic = and_(
+            new_prop.reference_no == new_reference_no,
+            new_prop.property_type == RefProperty.property_type,
+            new_prop.property_value == RefProperty.property_value,
+        )
 
-        else:
-            raise RefAnnotationCurationError(f"Invalid entry type: {entry_type}")
+        # Topics the new reference does not have yet
+        new_topics = self._insert_from_select(
+            RefProperty,
+            ["reference_no", "source", "property_type", "property_value", "created_by"],
+            select(
+                literal(new_reference_no),
+                RefProperty.source,
+                RefProperty.property_type,
+                RefProperty.property_value,
+                literal(created_by),
+            ).where(topics, ~exists().where(same_topic)),
+        )
 
-        logger.info(
-            f"Bulk transferred {entry_type} from ref {reference_no} "
-            f"to ref {new_reference_no} by {curator_userid}: {count} entries"
+        # Feature links onto the new reference's topics
+        existing_link = aliased(RefpropFeat)
+        new_links = self._insert_from_select(
+            RefpropFeat,
+            ["ref_property_no", "feature_no", "created_by"],
+            select(new_prop.ref_property_no, RefpropFeat.feature_no, literal(created_by))
+            .distinct()
+            .join_from(RefpropFeat, RefProperty, RefpropFeat.ref_property_no == RefProperty.ref_property_no)
+            .join(new_prop, same_topic)
+            .where(
+                topics,
+                ~exists().where(
+                    existing_link.ref_property_no == new_prop.ref_property_no,
+                    existing_link.feature_no == RefpropFeat.feature_no,
+                ),
+            ),
+        )
+
+        count, deleted, _ = self._bulk_delete_lit_guide(reference_no)
+        counts = {
+            "inserted": {"ref_property": new_topics, "refprop_feat": new_links},
+            "deleted": deleted,
+        }
+        messages = [
+            f"Transferred {count} literature guide entries",
+            f"Created {new_topics} topics and {new_links} feature links "
+            f"for reference {new_reference_no}",
+        ]
+        return count, counts, messages
+
+    def _bulk_transfer_go_refs(
+        self, reference_no: int, new_reference_no: int, created_by: str
+    ) -> tuple[int, dict, list[str]]:
+        """Move go_refs, with qualifiers and support, to another reference."""
+        new_ref = aliased(GoRef)
+        new_go_refs = self._insert_from_select(
+            GoRef,
+            ["reference_no", "go_annotation_no", "has_qualifier",
+             "has_supporting_evidence", "created_by"],
+            select(
+                literal(new_reference_no),
+                GoRef.go_annotation_no,
+                GoRef.has_qualifier,
+                GoRef.has_supporting_evidence,
+                literal(created_by),
+            ).where(
+                GoRef.reference_no == reference_no,
+                ~exists().where(
+                    new_ref.reference_no == new_reference_no,
+                    new_ref.go_annotation_no == GoRef.go_annotation_no,
+                ),
+            ),
+        )
+
+        # Pairs each old go_ref with the new reference's go_ref for the
+        # same annotation
+        old_ref = aliased(GoRef)
+        same_annotation = and_(
+            new_ref.go_annotation_no == old_ref.go_annotation_no,
+            new_ref.reference_no == new_reference_no,
         )
 
-        return {"success": True, "messages": messages, "count": count}
+        existing_qual = aliased(GoQualifier)
+        new_qualifiers = self._insert_from_select(
+            GoQualifier,
+            ["go_ref_no", "qualifier"],
+            select(new_ref.go_ref_no, GoQualifier.qualifier)
+            .join_from(GoQualifier, old_ref, GoQualifier.go_ref_no == old_ref.go_ref_no)
+            .join(new_ref, same_annotation)
+            .where(
+                old_ref.reference_no == reference_no,
+                old_ref.has_qualifier == "Y",
+                ~exists().where(
+                    existing_qual.go_ref_no == new_ref.go_ref_no,
+                    existing_qual.qualifier == GoQualifier.qualifier,
+                ),
+            ),
+        )
+
+        existing_sup = aliased(GorefDbxref)
+        new_supports = self._insert_from_select(
+            GorefDbxref,
+            ["go_ref_no", "dbxref_no", "support_type"],
+            select(new_ref.go_ref_no, GorefDbxref.dbxref_no, GorefDbxref.support_type)
+            .join_from(GorefDbxref, old_ref, GorefDbxref.go_ref_no == old_ref.go_ref_no)
+            .join(new_ref, same_annotation)
+            .where(
+                old_ref.reference_no == reference_no,
+                old_ref.has_supporting_evidence == "Y",
+                ~exists().where(
+                    existing_sup.go_ref_no == new_ref.go_ref_no,
+                    existing_sup.dbxref_no == GorefDbxref.dbxref_no,
+                    existing_sup.support_type == GorefDbxref.support_type,
+                ),
+            ),
+        )
+
+        # Every annotation is still cited by the new reference, so only the
+        # old go_refs and their children go
+        go_ref_nos = select(GoRef.go_ref_no).where(GoRef.reference_no == reference_no)
+        deleted = {
+            "go_qualifier": self._delete(
+                self.db.query(GoQualifier).filter(GoQualifier.go_ref_no.in_(go_ref_nos))
+            ),
+            "goref_dbxref": self._delete(
+                self.db.query(GorefDbxref).filter(GorefDbxref.go_ref_no.in_(go_ref_nos))
+            ),
+            "go_ref": self._delete(
+                self.db.query(GoRef).filter(GoRef.reference_no == reference_no)
+            ),
+        }
+
+        count = deleted["go_ref"]
+        counts = {
+            "inserted": {
+                "go_ref": new_go_refs,
+                "go_qualifier": new_qualifiers,
+                "goref_dbxref": new_supports,
+            },
+            "deleted": deleted,
+        }
+        messages = [
+            f"Transferred {count} GO annotation entries",
+            f"Created {new_go_refs} go_refs for reference {new_reference_no}",
+        ]
+        return count, counts, messages
+
+    def _bulk_transfer_ref_links(
+        self, reference_no: int, new_reference_no: int
+    ) -> tuple[int, dict, list[str]]:
+        """Repoint ref_links at another reference."""
+        new_link = aliased(RefLink)
+        # Links the new reference already has are just deleted
+        duplicates = self._delete(
+            self.db.query(RefLink).filter(
+                RefLink.reference_no == reference_no,
+                exists().where(
+                    new_link.reference_no == new_reference_no,
+                    new_link.tab_name == RefLink.tab_name,
+                    new_link.primary_key == RefLink.primary_key,
+                    new_link.col_name == RefLink.col_name,
+                ),
+            )
+        )
+        moved = (
+            self.db.query(RefLink)
+            .filter(RefLink.reference_no == reference_no)
+            .update({RefLink.reference_no: new_reference_no}, synchronize_session=False)
+        )
+
+        count = duplicates + moved
+        counts = {"updated": {"ref_link": moved}, "deleted": {"ref_link": duplicates}}
+        messages = [f"Transferred {count} ref_link entries"]
+        if duplicates:
+            messages.append(
+                f"{duplicates} ref_links already existed for reference "
+                f"{new_reference_no} and were deleted"
+            )
+        return count, counts, messages
+
+    def _delete(self, query) -> int:
+        """Bulk DELETE the rows a query matches; returns the row count."""
+        return query.delete(synchronize_session=False)
+
+    def _insert_from_select(self, model, columns: list[str], query) -> int:
+        """INSERT ... SELECT into a model's table; returns the row count."""
+        return self.db.execute(insert(model).from_select(columns, query)).rowcount
@@ -11,12 +11,11 @@ Mirrors validation rules from legacy CreateReference.pm:
 import logging
 from datetime import datetime
 from typing import Optional
-from xml.etree import ElementTree
 
-import httpx
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from cgd.core.pubmed import PubMedError, get_pubmed_client, medline_to_metadata
 from cgd.models.models import (
     Abstract,
     Author,
@@ -39,9 +38,6 @@ from cgd.models.models import (
 
 logger = logging.getLogger(__name__)
 
-# PubMed E-utilities URL
-PUBMED_EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-
 
 class ReferenceCurationError(Exception):
     """Raised when reference curation validation fails."""
@@ -117,113 +113,20 @@ class ReferenceCurationService:
         Fetch metadata from PubMed E-utilities.
 
         Returns parsed metadata including title, authors, journal, year, etc.
+        Records come from the shared PubMed client, so repeat lookups are
+        served from its cache.
         """
-        params = {
-            "db": "pubmed",
-            "id": str(pubmed),
-            "retmode": "xml",
-            "rettype": "medline",
-        }
-
         try:
-            response = httpx.get(PUBMED_EFETCH_URL, params=params, timeout=30.0)
-
-            if response.status_code != 200:
-                raise ReferenceCurationError(
-                    f"Failed to fetch PubMed metadata: {response.status_code}"
-                )
-
-            return self._parse_pubmed_xml(response.text)
-        except httpx.TimeoutException:
-            raise ReferenceCurationError(
-                f"Timeout fetching PubMed metadata for PMID:{pubmed}"
-            )
-        except httpx.RequestError as e:
+            records = get_pubmed_client().fetch_sync([pubmed])
+        except PubMedError as e:
             raise ReferenceCurationError(
-                f"Network error fetching PubMed metadata: {e}"
+                f"Failed to fetch PubMed metadata for PMID:{pubmed}: {e}"
             )
 
-    def _parse_pubmed_xml(self, xml_text: str) -> dict:
-        """Parse PubMed XML response into structured metadata."""
-        try:
-            root = ElementTree.fromstring(xml_text)
-
-            article = root.find(".//PubmedArticle/MedlineCitation/Article")
-            if article is None:
-                raise ReferenceCurationError("No article found in PubMed response")
-
-            # Title
-            title_elem = article.find("ArticleTitle")
-            title = title_elem.text if title_elem is not None else ""
-
-            # Journal
-            journal_elem = article.find("Journal/Title")
-            journal_name = journal_elem.text if journal_elem is not None else ""
-
-            journal_abbrev_elem = article.find("Journal/ISOAbbreviation")
-            journal_abbrev = (
-                journal_abbrev_elem.text if journal_abbrev_elem is not None else ""
-            )
-
-            # Year
-            year_elem = article.find("Journal/JournalIssue/PubDate/Year")
-            if year_elem is None:
-                year_elem = article.find("Journal/JournalIssue/PubDate/MedlineDate")
-            year = int(year_elem.text[:4]) if year_elem is not None else None
-
-            # Volume, Issue, Pages
-            volume_elem = article.find("Journal/JournalIssue/Volume")
-            volume = volume_elem.text if volume_elem is not None else ""
-
-            issue_elem = article.find("Journal/JournalIssue/Issue")
-            issue = issue_elem.text if issue_elem is not None else ""
-
-            pages_elem = article.find("Pagination/MedlinePgn")
-            pages = pages_elem.text if pages_elem is not None else ""
-
-            # Authors
-            authors = []
-            author_list = article.find("AuthorList")
-            if author_list is not None:
-                for author in author_list.findall("Author"):
-                    last_name = author.find("LastName")
-                    first_name = author.find("ForeName")
-                    initials = author.find("Initials")
-
-                    authors.append({
-                        "last_name": last_name.text if last_name is not None else "",
-                        "first_name": first_name.text if first_name is not None else "",
-                        "initials": initials.text if initials is not None else "",
-                    })
-
-            # Abstract
-            abstract_elem = article.find("Abstract/AbstractText")
-            abstract = abstract_elem.text if abstract_elem is not None else ""
-
-            # DOI
-            doi = None
-            for id_elem in root.findall(
-                ".//PubmedArticle/PubmedData/ArticleIdList/ArticleId"
-            ):
-                if id_elem.get("IdType") == "doi":
-                    doi = id_elem.text
-                    break
-
-            return {
-                "title": title,
-                "journal_name": journal_name,
-                "journal_abbrev": journal_abbrev,
-                "year": year,
-                "volume": volume,
-                "issue": issue,
-                "pages": pages,
-                "authors": authors,
-                "abstract": abstract,
-                "doi": doi,
-            }
-
-        except ElementTree.ParseError as e:
-            raise ReferenceCurationError(f"Failed to parse PubMed XML: {e}")
+        record = records.get(pubmed)
+        if record is None:
+            raise ReferenceCurationError(f"No article found in PubMed for PMID:{pubmed}")
+        return medline_to_metadata(record)
 
     def create_manual_reference(
         self,
@@ -9,9 +9,11 @@ import logging
 from typing import Optional
 from datetime import datetime
 
-from sqlalchemy import func, text, and_, or_
+import numpy as np
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
+from cgd.api.services.region_service import get_root_features
 from cgd.models.models import (
     Feature,
     FeatLocation,
@@ -21,6 +23,16 @@ from cgd.models.models import (
     Reference,
     Dbxref,
 )
+from cgd.utils.seqedit import (
+    DOWNSTREAM,
+    ENCOMPASSING,
+    OVERLAP,
+    STATUS_NAMES,
+    UNAFFECTED,
+    OffsetMap,
+    PieceTable,
+    SequenceEdit,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +41,12 @@ NOTE_TYPE = "Sequence change"
 SOURCE = "CGD"
 
 
+class SequenceCurationError(Exception):
+    """Custom exception for sequence curation errors."""
+
+    pass
+
+
 class SequenceCurationService:
     """Service for chromosome/contig sequence curation."""
 
@@ -177,115 +195,104 @@ class SequenceCurationService:
 
         feature, seq = result
 
-        # Process changes to compute new sequence
-        new_sequence = seq.residues
-        net_change = 0  # Track cumulative position shift
-
-        sorted_changes = sorted(changes, key=lambda c: c.get("position", 0))
-
+        # All change coordinates refer to the current sequence, so each
+        # change is identified by its span there
+        edits = [self._to_edit(change) for change in changes]
+        change_by_span = {(e.start, e.end): c for e, c in zip(edits, changes)}
+        try:
+            table = PieceTable(seq.residues, edits)
+        except ValueError as e:
+            raise SequenceCurationError(str(e))
+
+        # The edited chromosome is never built; only the context around each
+        # edit is read from the piece table
         change_details = []
+        for index, edit in enumerate(table.edits):
+            old_context = self._get_context(
+                seq.residues, edit.start, 20 + edit.end - edit.start
+            )
+            new_context = self._get_context(
+                table, table.new_start(index), 20 + len(edit.replacement)
+            )
+            change_details.append(self._change_detail(
+                change_by_span[(edit.start, edit.end)],
+                edit,
+                seq.residues[edit.start:edit.end],
+                old_context,
+                new_context,
+            ))
 
-        for change in sorted_changes:
-            change_type = change.get("type")
-            position = change.get("position", 0)
-
-            if change_type == "insertion":
-                # Insert after the given position
-                insert_seq = change.get("sequence", "").upper()
-                adjusted_pos = position + net_change
-
-                old_context = self._get_context(new_sequence, adjusted_pos, 20)
-                new_sequence = (
-                    new_sequence[:adjusted_pos] +
-                    insert_seq +
-                    new_sequence[adjusted_pos:]
-                )
-                new_context = self._get_context(new_sequence, adjusted_pos, 20 + len(insert_seq))
-
-                net_change += len(insert_seq)
-                change_details.append({
-                    "type": "insertion",
-                    "position": position,
-                    "sequence": insert_seq,
-                    "length": len(insert_seq),
-                    "old_context": old_context,
-                    "new_context": new_context,
-                })
-
-            elif change_type == "deletion":
-                # Delete from start to end (1-based, inclusive)
-                start = change.get("start", 0)
-                end = change.get("end", start)
-                adjusted_start = start + net_change - 1  # Convert to 0-based
-                adjusted_end = end + net_change
-
-                deleted_seq = new_sequence[adjusted_start:adjusted_end]
-                old_context = self._get_context(new_sequence, adjusted_start, 20 + len(deleted_seq))
-
-                new_sequence = new_sequence[:adjusted_start] + new_sequence[adjusted_end:]
-                new_context = self._get_context(new_sequence, adjusted_start, 20)
-
-                deletion_length = end - start + 1
-                net_change -= deletion_length
-                change_details.append({
-                    "type": "deletion",
-                    "start": start,
-                    "end": end,
-                    "deleted_sequence": deleted_seq,
-                    "length": deletion_length,
-                    "old_context": old_context,
-                    "new_context": new_context,
-                })
-
-            elif change_type == "substitution":
-                # Replace from start to end with new sequence
-                start = change.get("start", 0)
-                end = change.get("end", start)
-                new_seq = change.get("sequence", "").upper()
-                adjusted_start = start + net_change - 1  # Convert to 0-based
-                adjusted_end = end + net_change
-
-                old_seq = new_sequence[adjusted_start:adjusted_end]
-                old_context = self._get_context(new_sequence, adjusted_start, 20 + len(old_seq))
-
-                new_sequence = (
-                    new_sequence[:adjusted_start] +
-                    new_seq +
-                    new_sequence[adjusted_end:]
-                )
-                new_context = self._get_context(new_sequence, adjusted_start, 20 + len(new_seq))
-
-                length_diff = len(new_seq) - (end - start + 1)
-                net_change += length_diff
-                change_details.append({
-                    "type": "substitution",
-                    "start": start,
-                    "end": end,
-                    "old_sequence": old_seq,
-                    "new_sequence": new_seq,
-                    "length_change": length_diff,
-                    "old_context": old_context,
-                    "new_context": new_context,
-                })
-
-        # Get affected features
-        affected_features = self._get_affected_features(
-            seq.seq_no, changes, net_change
-        )
+        affected_features = self._get_affected_features(seq.seq_no, table.offset_map)
 
         return {
             "feature_name": feature.feature_name,
             "feature_no": feature.feature_no,
             "seq_no": seq.seq_no,
             "old_length": seq.seq_length,
-            "new_length": len(new_sequence),
-            "net_change": net_change,
+            "new_length": len(table),
+            "net_change": table.offset_map.net_change,
             "changes": change_details,
             "affected_features": affected_features,
         }
 
-    def _get_context(self, sequence: str, position: int, context_size: int) -> str:
-        """Get sequence context around a position."""
+    @staticmethod
+    def _to_edit(change: dict) -> SequenceEdit:
+        """Convert a curator change (1-based coordinates) to a SequenceEdit."""
+        change_type = change.get("type")
+        sequence = (change.get("sequence") or "").upper()
+        if change_type == "insertion":
+            return SequenceEdit.insertion(change.get("position", 0), sequence)
+        start = change.get("start", 0)
+        end = change.get("end", start)
+        if change_type == "deletion":
+            return SequenceEdit.deletion(start, end)
+        if change_type == "substitution":
+            return SequenceEdit.substitution(start, end, sequence)
+        raise SequenceCurationError(f"Invalid change type: {change_type}")
+
+    @staticmethod
+    def _change_detail(
+        change: dict,
+        edit: SequenceEdit,
+        replaced: str,
+        old_context: str,
+        new_context: str,
+    ) -> dict:
+        """Describe one applied change for the preview."""
+        change_type = change.get("type")
+        if change_type == "insertion":
+            return {
+                "type": "insertion",
+                "position": change.get("position", 0),
+                "sequence": edit.replacement,
+                "length": len(edit.replacement),
+                "old_context": old_context,
+                "new_context": new_context,
+            }
+        start, end = edit.start + 1, edit.end
+        if change_type == "deletion":
+            return {
+                "type": "deletion",
+                "start": start,
+                "end": end,
+                "deleted_sequence": replaced,
+                "length": end - start + 1,
+                "old_context": old_context,
+                "new_context": new_context,
+            }
+        return {
+            "type": "substitution",
+            "start": start,
+            "end": end,
+            "old_sequence": replaced,
+            "new_sequence": edit.replacement,
+            "length_change": edit.delta,
+            "old_context": old_context,
+            "new_context": new_context,
+        }
+
+    def _get_context(self, sequence, position: int, context_size: int) -> str:
+        """Get sequence context around a position (str or PieceTable)."""
         start = max(0, position - 10)
         end = min(len(sequence), position + context_size + 10)
         return sequence[start:end]
@@ -293,69 +300,64 @@ class SequenceCurationService:
     def _get_affected_features(
         self,
         root_seq_no: int,
-        changes: list[dict],
-        net_change: int,
+        offset_map: OffsetMap,
     ) -> list[dict]:
         """
-        Get features that would be affected by the sequence changes.
+        Remap every current feature location on the root sequence.
 
-        A feature is affected if its coordinates overlap with any change position.
+        Returns the features whose coordinates change or that contain or
+        overlap an edit, ordered by start coordinate. Features an edit
+        cuts into (status "overlap") keep their coordinates and need
+        manual review.
         """
-        # Get min and max positions of all changes
-        positions = []
-        for change in changes:
-            if change.get("type") == "insertion":
-                positions.append(change.get("position", 0))
-            else:
-                positions.append(change.get("start", 0))
-                positions.append(change.get("end", 0))
-
-        if not positions:
+        if len(offset_map.starts) == 0:
             return []
 
-        min_pos = min(positions)
-        max_pos = max(positions)
-
-        # Find features that overlap with the change region
-        results = (
-            self.db.query(Feature, FeatLocation)
+        rows = (
+            self.db.query(
+                Feature.feature_no,
+                Feature.feature_name,
+                Feature.gene_name,
+                Feature.feature_type,
+                FeatLocation.start_coord,
+                FeatLocation.stop_coord,
+                FeatLocation.strand,
+            )
             .join(FeatLocation, Feature.feature_no == FeatLocation.feature_no)
             .filter(
                 FeatLocation.root_seq_no == root_seq_no,
                 FeatLocation.is_loc_current == "Y",
-                or_(
-                    # Feature overlaps the change region
-                    and_(
-                        FeatLocation.start_coord <= max_pos,
-                        FeatLocation.stop_coord >= min_pos,
-                    ),
-                    # Feature is downstream (will have coordinates shifted)
-                    FeatLocation.start_coord > max_pos,
-                ),
             )
-            .order_by(FeatLocation.start_coord)
-            .limit(100)
             .all()
         )
+        if not rows:
+            return []
 
-        affected = []
-        for feature, loc in results:
-            is_overlapping = (loc.start_coord <= max_pos and loc.stop_coord >= min_pos)
+        new_starts, new_stops, status = offset_map.remap(
+            [row.start_coord for row in rows],
+            [row.stop_coord for row in rows],
+        )
 
+        affected = []
+        for i in np.flatnonzero(status != UNAFFECTED):
+            row = rows[i]
+            code = int(status[i])
             affected.append({
-                "feature_no": feature.feature_no,
-                "feature_name": feature.feature_name,
-                "gene_name": feature.gene_name,
-                "feature_type": feature.feature_type,
-                "start_coord": loc.start_coord,
-                "stop_coord": loc.stop_coord,
-                "strand": loc.strand,
-                "is_overlapping": is_overlapping,
-                "is_downstream": loc.start_coord > max_pos,
-                "new_start": loc.start_coord if is_overlapping else loc.start_coord + net_change,
-                "new_stop": loc.stop_coord if is_overlapping else loc.stop_coord + net_change,
+                "feature_no": row.feature_no,
+                "feature_name": row.feature_name,
+                "gene_name": row.gene_name,
+                "feature_type": row.feature_type,
+                "start_coord": row.start_coord,
+                "stop_coord": row.stop_coord,
+                "strand": row.strand,
+                "status": STATUS_NAMES[code],
+                "is_overlapping": code in (ENCOMPASSING, OVERLAP),
+                "is_downstream": code == DOWNSTREAM,
+                "new_start": int(new_starts[i]),
+                "new_stop": int(new_stops[i]),
             })
 
+        affected.sort(key=lambda f: min(f["start_coord"], f["stop_coord"]))
         return affected
 
     def get_nearby_features(
@@ -375,49 +377,13 @@ class SequenceCurationService:
         Returns:
             List of features near the position
         """
-        # Get the root sequence
-        result = (
-            self.db.query(Feature, Seq)
-            .join(Seq, Feature.feature_no == Seq.feature_no)
-            .filter(
-                func.upper(Feature.feature_name) == feature_name.upper(),
-                func.upper(Seq.seq_type) == "GENOMIC",
-                Seq.is_seq_current == "Y",
-            )
-            .first()
-        )
-
-        if not result:
+        features = get_root_features(self.db, feature_name)
+        if features is None:
             return []
 
-        feature, seq = result
-
         # Find features in range
         min_pos = max(1, position - range_size)
-        max_pos = min(seq.seq_length, position + range_size)
+        max_pos = min(features.root.seq_length, position + range_size)
 
-        results = (
-            self.db.query(Feature, FeatLocation)
-            .join(FeatLocation, Feature.feature_no == FeatLocation.feature_no)
-            .filter(
-                FeatLocation.root_seq_no == seq.seq_no,
-                FeatLocation.is_loc_current == "Y",
-                FeatLocation.start_coord <= max_pos,
-                FeatLocation.stop_coord >= min_pos,
-            )
-            .order_by(FeatLocation.start_coord)
-            .all()
-        )
-
-        return [
-            {
-                "feature_no": f.feature_no,
-                "feature_name": f.feature_name,
-                "gene_name": f.gene_name,
-                "feature_type": f.feature_type,
-                "start_coord": loc.start_coord,
-                "stop_coord": loc.stop_coord,
-                "strand": loc.strand,
-            }
-            for f, loc in results
-        ]
+        ids, _ = features.index.overlap(min_pos, max_pos)
+        return features.rows(ids)
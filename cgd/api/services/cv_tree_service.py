@@ -0,0 +1,285 @@
+"""
+CV Tree Service.
+
+Holds controlled-vocabulary term trees in memory, keyed by cv_name, for
+the observable tree (phenotype pages), the literature topic tree and the
+curation CV tree selectors. Each ``CvTree`` has the CV's terms and
+parent/child links plus the annotation counts for CVs that have them:
+
+- observable: phenotype annotations per observable
+- literature_topic: references per topic
+
+Pages render a tree to a response model once per tree version and keep
+the serialized (and precompressed) JSON on the tree, so repeated requests
+are served from bytes:
+
+    return cv_tree_response(request, get_cv_tree(db, "observable"), "observable", build)
+
+A tree's version is the row count and highest key of the CV's terms, of
+its relationships and of the table its counts come from; it is re-checked
+at most every ``CV_TREE_CHECK_INTERVAL`` seconds and the tree rebuilt
+when changed. Phenotype and literature guide curation call
+``invalidate_cv_tree`` after their writes so the curator's own worker
+reflects them at once.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from starlette.responses import Response
+
+from cgd.core.http_compression import PrecompressedEntry
+from cgd.core.metrics import record_cache_lookup
+from cgd.core.settings import settings
+from cgd.models.models import (
+    Cv,
+    CvTerm,
+    CvtermRelationship,
+    PhenoAnnotation,
+    Phenotype,
+    RefProperty,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CvTree:
+    """Terms, parent/child links and annotation counts of one CV."""
+
+    cv_name: str
+    version: tuple = ()
+    # cv_term_no -> term_name, in cv_term_no order
+    terms: dict[int, str] = field(default_factory=dict)
+    # parent cv_term_no -> child cv_term_nos, in relationship order
+    children: dict[int, list[int]] = field(default_factory=dict)
+    # Terms without a parent in the CV
+    roots: list[int] = field(default_factory=list)
+    # term_name -> annotation count, in the order the counts were read
+    counts: dict[str, int] = field(default_factory=dict)
+    # Serialized views of this tree, by view name
+    views: dict[str, PrecompressedEntry] = field(default_factory=dict)
+
+    def count(self, term_no: int) -> int:
+        return self.counts.get(self.terms[term_no], 0)
+
+    def sorted_terms(self, term_nos: Iterable[int], key: Callable[[str], str] = str) -> list[int]:
+        """``term_nos`` ordered by term name (transformed by ``key``)."""
+        return sorted(term_nos, key=lambda term_no: key(self.terms[term_no]))
+
+
+def build_cv_tree(
+    cv_name: str,
+    terms: Iterable[tuple],
+    relationships: Iterable[tuple],
+    counts: Iterable[tuple] = (),
+    version: tuple = (),
+) -> CvTree:
+    """
+    Index a CV's terms and relationships.
+
+    Terms are (cv_term_no, term_name) rows, relationships (parent
+    cv_term_no, child cv_term_no) rows and counts (term_name, count) rows.
+    Relationships to terms outside the CV are skipped.
+    """
+    tree = CvTree(cv_name=cv_name, version=version, terms=dict(terms))
+    has_parent: set[int] = set()
+    for parent_no, child_no in relationships:
+        if parent_no in tree.terms and child_no in tree.terms:
+            tree.children.setdefault(parent_no, []).append(child_no)
+            has_parent.add(child_no)
+    tree.roots = [term_no for term_no in tree.terms if term_no not in has_parent]
+    tree.counts = dict(counts)
+    return tree
+
+
+def _observable_counts(db: Session, cv_no: Optional[int]) -> list[tuple]:
+    query = (
+        db.query(
+            Phenotype.observable,
+            func.count(PhenoAnnotation.pheno_annotation_no).label('count')
+        )
+        .join(PhenoAnnotation, PhenoAnnotation.phenotype_no == Phenotype.phenotype_no)
+    )
+    if cv_no is not None:
+        query = (
+            query.join(CvTerm, CvTerm.term_name == Phenotype.observable)
+            .filter(CvTerm.cv_no == cv_no)
+        )
+    # Without CV terms, every annotated observable (listed flat)
+    return query.group_by(Phenotype.observable).order_by(Phenotype.observable).all()
+
+
+def _literature_topic_counts(db: Session, cv_no: Optional[int]) -> list[tuple]:
+    if cv_no is None:
+        return []
+    return (
+        db.query(
+            RefProperty.property_value,
+            func.count(distinct(RefProperty.reference_no)).label('count')
+        )
+        .join(CvTerm, CvTerm.term_name == RefProperty.property_value)
+        .filter(CvTerm.cv_no == cv_no)
+        .group_by(RefProperty.property_value)
+        .all()
+    )
+
+
+# cv_name -> (count query, key column whose count/max versions the counts).
+# The queries take the CV's cv_no and count only values that are its terms;
+# cv_no is None when the CV is missing or has no terms. These CVs are
+# loaded (and kept) even when missing, so their counts are still served.
+COUNTED_CVS = {
+    "observable": (_observable_counts, PhenoAnnotation.pheno_annotation_no),
+    "literature_topic": (_literature_topic_counts, RefProperty.ref_property_no),
+}
+
+
+def _cv_no(db: Session, cv_name: str) -> Optional[int]:
+    return db.query(Cv.cv_no).filter(func.lower(Cv.cv_name) == cv_name).scalar()
+
+
+def _tree_version(db: Session, cv_name: str) -> tuple:
+    cv_no = _cv_no(db, cv_name)
+    version = [cv_no]
+    version.extend(
+        db.query(func.count(CvTerm.cv_term_no), func.max(CvTerm.cv_term_no))
+        .filter(CvTerm.cv_no == cv_no)
+        .one()
+    )
+    version.extend(
+        db.query(
+            func.count(CvtermRelationship.cvterm_relationship_no),
+            func.max(CvtermRelationship.cvterm_relationship_no),
+        )
+        .join(CvTerm, CvTerm.cv_term_no == CvtermRelationship.child_cv_term_no)
+        .filter(CvTerm.cv_no == cv_no)
+        .one()
+    )
+    if cv_name in COUNTED_CVS:
+        _, key = COUNTED_CVS[cv_name]
+        version.extend(db.query(func.count(key), func.max(key)).one())
+    return tuple(version)
+
+
+def load_cv_tree(db: Session, cv_name: str, version: tuple = ()) -> CvTree:
+    """Read a CV's terms, relationships and annotation counts into a new tree."""
+    cv_no = _cv_no(db, cv_name)
+    terms, relationships = [], []
+    if cv_no is not None:
+        terms = (
+            db.query(CvTerm.cv_term_no, CvTerm.term_name)
+            .filter(CvTerm.cv_no == cv_no)
+            .order_by(CvTerm.cv_term_no)
+            .all()
+        )
+        relationships = (
+            db.query(CvtermRelationship.parent_cv_term_no, CvtermRelationship.child_cv_term_no)
+            .join(CvTerm, CvTerm.cv_term_no == CvtermRelationship.child_cv_term_no)
+            .filter(CvTerm.cv_no == cv_no)
+            .order_by(CvtermRelationship.cvterm_relationship_no)
+            .all()
+        )
+    counts = []
+    if cv_name in COUNTED_CVS:
+        count_query, _ = COUNTED_CVS[cv_name]
+        counts = count_query(db, cv_no if terms else None)
+    tree = build_cv_tree(cv_name, terms, relationships, counts, version)
+    logger.info(
+        "Loaded CV tree %s: %d terms, %d roots", cv_name, len(tree.terms), len(tree.roots)
+    )
+    return tree
+
+
+class CvTreeCache:
+    """The process's current ``CvTree`` per cv_name, re-validated periodically."""
+
+    def __init__(self, check_interval: float, clock: Callable[[], float] = time.monotonic):
+        self.check_interval = check_interval
+        self._clock = clock
+        # cv_name -> (tree, checked_at)
+        self._trees: dict[str, tuple[CvTree, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, cv_name: str) -> CvTree:
+        cv_name = cv_name.lower()
+        now = self._clock()
+        with self._lock:
+            current, checked_at = self._trees.get(cv_name, (None, 0.0))
+        if current is not None and now - checked_at < self.check_interval:
+            record_cache_lookup("cv_tree", hit=True)
+            return current
+
+        version = _tree_version(db, cv_name)
+        record_cache_lookup("cv_tree", hit=current is not None and current.version == version)
+        if version[0] is None and cv_name not in COUNTED_CVS:
+            # Not a CV: nothing to load, and names from URLs are not kept
+            with self._lock:
+                self._trees.pop(cv_name, None)
+            return CvTree(cv_name=cv_name, version=version)
+        if current is None or current.version != version:
+            current = load_cv_tree(db, cv_name, version)
+        with self._lock:
+            self._trees[cv_name] = (current, now)
+        return current
+
+    def invalidate(self, cv_name: Optional[str] = None) -> None:
+        with self._lock:
+            if cv_name is None:
+                self._trees.clear()
+            else:
+                self._trees.pop(cv_name.lower(), None)
+
+
+_cv_trees: Optional[CvTreeCache] = None
+_cv_trees_lock = threading.Lock()
+
+
+def _get_cache() -> CvTreeCache:
+    global _cv_trees
+    with _cv_trees_lock:
+        if _cv_trees is None:
+            _cv_trees = CvTreeCache(settings.cv_tree_check_interval)
+        return _cv_trees
+
+
+def get_cv_tree(db: Session, cv_name: str) -> CvTree:
+    """
+    The current tree for a CV (case-insensitive name), loading it if needed.
+
+    An unknown CV gets an empty tree, which is not cached (except for the
+    counted CVs, whose trees still carry their counts).
+    """
+    return _get_cache().get(db, cv_name)
+
+
+def invalidate_cv_tree(cv_name: Optional[str] = None) -> None:
+    """Force a reload of one CV's tree (all by default); call after committing."""
+    _get_cache().invalidate(cv_name)
+
+
+def cv_tree_response(
+    request: Request,
+    tree: CvTree,
+    view: str,
+    build: Callable[[CvTree], BaseModel],
+) -> Response:
+    """
+    Serve a view of ``tree`` as JSON, serializing it on first use.
+
+    ``build`` renders the tree to the response model; its bytes (in every
+    available content coding) are kept on the tree until it is replaced.
+    """
+    entry = tree.views.get(view)
+    if entry is None:
+        body = build(tree).model_dump_json(by_alias=True).encode()
+        entry = tree.views.setdefault(view, PrecompressedEntry.build(body))
+    return entry.response(request.headers.get("accept-encoding", ""))
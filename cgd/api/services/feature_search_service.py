@@ -12,7 +12,7 @@ Handles complex feature searching with multiple filter criteria including:
 from __future__ import annotations
 
 import logging
-from typing import Optional, List, Dict, Set, Tuple
+from typing import Optional, List, Dict, NamedTuple, Set, Tuple, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import func, text
 
@@ -20,13 +20,16 @@ logger = logging.getLogger(__name__)
 
 from cgd.models.models import (
     Feature, Organism, FeatProperty, FeatLocation, Seq,
-    Go, GoSet, GoPath, GoAnnotation, FeatRelationship,
+    Go, GoSet, GoAnnotation, FeatRelationship,
     GenomeVersion,
 )
 from cgd.api.services.genome_snapshot_service import (
     get_current_feature_nos,
     get_features_with_qualifier,
 )
+from cgd.api.services.go_dag_service import get_go_dag
+from cgd.api.services.region_service import feature_nos_on_roots
+from cgd.core.columnar import encode_columns
 from cgd.schemas.feature_search_schema import (
     FeatureSearchRequest,
     FeatureSearchResponse,
@@ -47,6 +50,15 @@ APPLICATION_NAME = "Chromosomal Feature Search"
 # Oracle IN clause limit
 ORACLE_IN_LIMIT = 999
 
+# Result fields, in the order of the row tuples built by _get_feature_rows
+FEATURE_COLUMNS = (
+    "feature_id", "orf", "gene", "feature_type", "qualifier", "description",
+    "chromosome", "strand", "start_coord", "stop_coord",
+    "go_process_terms", "go_function_terms", "go_component_terms",
+)
+# Low-cardinality fields dictionary-encoded in the columnar format
+FEATURE_DICTIONARY_COLUMNS = ("feature_type", "qualifier", "chromosome", "strand")
+
 
 def _chunked_in_query(db: Session, query_func, items: List, chunk_size: int = ORACLE_IN_LIMIT):
     """
@@ -112,6 +124,15 @@ def get_feature_search_config(
     )
 
 
+class _FeatureMatches(NamedTuple):
+    """Features matching a search, sorted, with what to show for them."""
+    query_summary: QuerySummary
+    feature_nos: List[int]
+    show_position: bool
+    show_go_terms: bool
+    go_annotations: Dict[int, Dict[str, List[GoTermBrief]]]
+
+
 def search_features(
     db: Session,
     request: FeatureSearchRequest,
@@ -126,6 +147,71 @@ def search_features(
     Returns:
         Search results with pagination
     """
+    matches = _find_features(db, request)
+    if isinstance(matches, FeatureSearchResponse):
+        return matches
+
+    rows = _feature_rows_or_raise(db, matches)
+    return FeatureSearchResponse(
+        success=True,
+        query_summary=matches.query_summary,
+        features=[FeatureSearchResult(**dict(zip(FEATURE_COLUMNS, row))) for row in rows],
+        total_count=matches.query_summary.total_results,
+        show_position=matches.show_position,
+        show_go_terms=matches.show_go_terms,
+    )
+
+
+def search_features_columnar(
+    db: Session,
+    request: FeatureSearchRequest,
+) -> dict:
+    """
+    Execute feature search, returning the features as a columnar table.
+
+    Same search as ``search_features``, but rows are plain tuples encoded
+    with ``encode_columns`` (feature type, qualifier, chromosome and
+    strand dictionary-encoded) rather than validated result models.
+    """
+    matches = _find_features(db, request)
+    if isinstance(matches, FeatureSearchResponse):
+        return matches.model_dump()
+
+    rows = _feature_rows_or_raise(db, matches)
+    return {
+        "success": True,
+        "query_summary": matches.query_summary.model_dump(),
+        "features": encode_columns(rows, FEATURE_COLUMNS, FEATURE_DICTIONARY_COLUMNS),
+        "total_count": matches.query_summary.total_results,
+        "show_position": matches.show_position,
+        "show_go_terms": matches.show_go_terms,
+        "filter_counts": None,
+        "error": None,
+    }
+
+
+def _feature_rows_or_raise(db: Session, matches: _FeatureMatches) -> List[tuple]:
+    # Get feature details for all results (no pagination - AgGrid handles display)
+    try:
+        return _get_feature_rows(
+            db, matches.feature_nos, matches.show_position,
+            matches.show_go_terms, matches.go_annotations,
+        )
+    except Exception as e:
+        logger.error(f"Get feature details error: {e}")
+        raise Exception(f"Get feature details failed: {e}")
+
+
+def _find_features(
+    db: Session,
+    request: FeatureSearchRequest,
+) -> Union[FeatureSearchResponse, _FeatureMatches]:
+    """
+    Apply all search filters.
+
+    Returns an unsuccessful FeatureSearchResponse for an invalid request,
+    otherwise the sorted matching feature_nos.
+    """
     # Validate required fields
     if not request.organism:
         return FeatureSearchResponse(
@@ -243,20 +329,14 @@ def search_features(
     # Get total count
     total_results = len(feature_nos)
 
+    query_summary = QuerySummary(
+        organism_name=organism_obj.organism_name,
+        feature_types=request.feature_types if not request.include_all_types else ["All"],
+        filter_counts=filter_counts,
+        total_results=total_results,
+    )
     if total_results == 0:
-        return FeatureSearchResponse(
-            success=True,
-            query_summary=QuerySummary(
-                organism_name=organism_obj.organism_name,
-                feature_types=request.feature_types if not request.include_all_types else ["All"],
-                filter_counts=filter_counts,
-                total_results=0,
-            ),
-            features=[],
-            total_count=0,
-            show_position=show_position,
-            show_go_terms=do_go_search,
-        )
+        return _FeatureMatches(query_summary, [], show_position, do_go_search, go_annotations)
 
     # Build final query with sorting
     try:
@@ -265,27 +345,8 @@ def search_features(
         logger.error(f"Sort features error: {e}")
         raise Exception(f"Sort features failed: {e}")
 
-    # Get feature details for all results (no pagination - AgGrid handles display)
-    try:
-        results = _get_feature_details(
-            db, sorted_feature_nos, show_position, do_go_search, go_annotations
-        )
-    except Exception as e:
-        logger.error(f"Get feature details error: {e}")
-        raise Exception(f"Get feature details failed: {e}")
-
-    return FeatureSearchResponse(
-        success=True,
-        query_summary=QuerySummary(
-            organism_name=organism_obj.organism_name,
-            feature_types=request.feature_types if not request.include_all_types else ["All"],
-            filter_counts=filter_counts,
-            total_results=total_results,
-        ),
-        features=results,
-        total_count=total_results,
-        show_position=show_position,
-        show_go_terms=do_go_search,
+    return _FeatureMatches(
+        query_summary, sorted_feature_nos, show_position, do_go_search, go_annotations
     )
 
 
@@ -524,52 +585,9 @@ def _filter_by_chromosomes(
     if not feature_nos:
         return set(), 0
 
-    # Get chromosome feature numbers
-    chr_feature_nos = (
-        db.query(Feature.feature_no)
-        .filter(Feature.feature_name.in_(chromosomes))
-        .all()
-    )
-    chr_feature_no_list = [f[0] for f in chr_feature_nos]
-
-    if not chr_feature_no_list:
-        return set(), 0
-
-    # Get seq_no for chromosomes with current sequence and genome version
-    chr_seq_nos = (
-        db.query(Seq.seq_no)
-        .join(GenomeVersion, Seq.genome_version_no == GenomeVersion.genome_version_no)
-        .filter(
-            Seq.feature_no.in_(chr_feature_no_list),
-            Seq.is_seq_current == "Y",
-            GenomeVersion.is_ver_current == "Y",
-        )
-        .all()
-    )
-    chr_seq_no_list = [s[0] for s in chr_seq_nos]
-
-    if not chr_seq_no_list:
-        return set(), 0
-
-    # Get features located on these chromosomes using chunked query
-    # Note: The features are already filtered for current location in the base query,
-    # so we just need to filter by the chromosome seq_nos here
-    feature_nos_list = list(feature_nos)
-
-    def query_locations(db, chunk):
-        return (
-            db.query(FeatLocation.feature_no)
-            .filter(
-                FeatLocation.feature_no.in_(chunk),
-                FeatLocation.root_seq_no.in_(chr_seq_no_list),
-                FeatLocation.is_loc_current == "Y"
-            )
-            .distinct()
-            .all()
-        )
-
-    matching = _chunked_in_query(db, query_locations, feature_nos_list)
-    result = set(f[0] for f in matching)
+    # Features on the chromosomes' current sequences come from the
+    # per-root interval index rather than a chunked FEAT_LOCATION query
+    result = feature_nos & feature_nos_on_roots(db, chromosomes)
     return result, len(result)
 
 
@@ -661,17 +679,12 @@ def _filter_by_go_terms(
     if not feature_nos or not goids:
         return feature_nos, len(feature_nos), {}
 
-    # Get all descendant GOIDs for the selected GO Slim terms
-    descendant_goids = _get_descendant_goids(db, goids)
-    all_goids_to_search = set(goids) | descendant_goids
-
-    # Get go_no for these GOIDs
-    go_no_mapping = dict(
-        db.query(Go.goid, Go.go_no)
-        .filter(Go.goid.in_(all_goids_to_search))
-        .all()
-    )
-    go_nos_to_search = set(go_no_mapping.values())
+    # Get all descendant GOIDs for the selected GO Slim terms, and their
+    # go_no, from the GO DAG
+    dag = get_go_dag(db)
+    all_goids_to_search = set(goids) | dag.descendant_goids(goids)
+    indexes = [dag.index_of(goid) for goid in all_goids_to_search]
+    go_nos_to_search = {int(dag.go_no[i]) for i in indexes if i is not None}
 
     # Build annotation query using chunked queries
     feature_nos_list = list(feature_nos)
@@ -720,42 +733,6 @@ def _filter_by_go_terms(
     return result, len(result), feature_go_terms
 
 
-def _get_descendant_goids(db: Session, ancestor_goids: List[int]) -> Set[int]:
-    """Get all descendant GOIDs for given ancestor GOIDs."""
-    # Query go_path for descendants
-    descendants = (
-        db.query(Go.goid)
-        .join(GoPath, Go.go_no == GoPath.child_go_no)
-        .join(Go, GoPath.ancestor_go_no == Go.go_no, isouter=True)
-        .filter(
-            db.query(Go.go_no)
-            .filter(Go.goid.in_(ancestor_goids))
-            .filter(GoPath.ancestor_go_no == Go.go_no)
-            .exists()
-        )
-        .distinct()
-        .all()
-    )
-
-    # Simpler approach: query directly
-    ancestor_go_nos = (
-        db.query(Go.go_no)
-        .filter(Go.goid.in_(ancestor_goids))
-        .all()
-    )
-    ancestor_go_no_set = set(g[0] for g in ancestor_go_nos)
-
-    descendant_query = (
-        db.query(Go.goid)
-        .join(GoPath, Go.go_no == GoPath.child_go_no)
-        .filter(GoPath.ancestor_go_no.in_(ancestor_go_no_set))
-        .distinct()
-        .all()
-    )
-
-    return set(d[0] for d in descendant_query)
-
-
 def _sort_features(
     db: Session,
     feature_nos: Set[int],
@@ -801,25 +778,35 @@ def _sort_features(
     return [f[0] for f in sorted_info]
 
 
-def _get_feature_details(
+def _get_feature_rows(
     db: Session,
     feature_nos: List[int],
     show_position: bool,
     show_go_terms: bool,
     go_annotations: Dict[int, Dict[str, List[GoTermBrief]]],
-) -> List[FeatureSearchResult]:
-    """Get detailed feature information for results."""
+) -> List[tuple]:
+    """Get detailed feature information for results, as FEATURE_COLUMNS tuples."""
     if not feature_nos:
         return []
 
     # Get basic feature info using chunked query
     def query_features(db, chunk):
-        return db.query(Feature).filter(Feature.feature_no.in_(chunk)).all()
+        return (
+            db.query(
+                Feature.feature_no,
+                Feature.feature_name,
+                Feature.gene_name,
+                Feature.feature_type,
+                Feature.headline,
+            )
+            .filter(Feature.feature_no.in_(chunk))
+            .all()
+        )
 
     features = _chunked_in_query(db, query_features, feature_nos)
 
     # Create lookup by feature_no
-    feature_lookup = {f.feature_no: f for f in features}
+    feature_lookup = {f[0]: f for f in features}
 
     # Get qualifiers using chunked query
     def query_qualifiers(db, chunk):
@@ -883,6 +870,7 @@ def _get_feature_details(
             }
 
     # Build results in the order of feature_nos
+    no_terms = {"P": [], "F": [], "C": []}
     results = []
     for fno in feature_nos:
         feature = feature_lookup.get(fno)
@@ -893,22 +881,23 @@ def _get_feature_details(
         qualifier_str = "|".join(quals) if quals else None
 
         pos = position_lookup.get(fno, {}) if show_position else {}
-        go_terms = go_annotations.get(fno, {"P": [], "F": [], "C": []}) if show_go_terms else {"P": [], "F": [], "C": []}
-
-        results.append(FeatureSearchResult(
-            feature_id=feature.feature_no,
-            orf=feature.feature_name,
-            gene=feature.gene_name,
-            feature_type=feature.feature_type,
-            qualifier=qualifier_str,
-            description=feature.headline,
-            chromosome=pos.get("chromosome"),
-            strand=pos.get("strand"),
-            start_coord=pos.get("start"),
-            stop_coord=pos.get("stop"),
-            go_process_terms=go_terms.get("P", []),
-            go_function_terms=go_terms.get("F", []),
-            go_component_terms=go_terms.get("C", []),
+        go_terms = go_annotations.get(fno, no_terms) if show_go_terms else no_terms
+
+        _, feature_name, gene_name, feature_type, headline = feature
+        results.append((
+            fno,
+            feature_name,
+            gene_name,
+            feature_type,
+            qualifier_str,
+            headline,
+            pos.get("chromosome"),
+            pos.get("strand"),
+            pos.get("start"),
+            pos.get("stop"),
+            go_terms.get("P", []),
+            go_terms.get("F", []),
+            go_terms.get("C", []),
         ))
 
     return results
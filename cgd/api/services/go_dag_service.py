@@ -0,0 +1,457 @@
+"""
+GO DAG Service.
+
+Holds the Gene Ontology term graph in memory, so GO hierarchy diagrams,
+GO term pages and GO term filters can walk it without querying GO_PATH:
+
+- Node attributes (go_no, goid, term, aspect) in go_no order
+- Direct is_a/part_of edges (GO_PATH generation 1) as compressed
+  adjacency arrays, both parent and child directions
+- Per-term gene counts: genes annotated directly to the term, and genes
+  annotated to the term or any of its descendants
+
+Gene counts leave out Assembly 21 features that have an Assembly 22
+equivalent, as the GO pages do.
+
+The DAG is built once per process and replaced as a whole, so a request
+always sees one consistent graph. Its version is the row count and
+highest key of GO, GO_PATH and GO_ANNOTATION, a content fingerprint of
+the GO terms and direct GO_PATH edges (so the in-place updates of a
+``load_go.py`` run count as changes) and the relationship map version.
+It is re-checked at most every ``GO_DAG_CHECK_INTERVAL`` seconds and the
+DAG rebuilt when changed, or after ``GO_DAG_MAX_AGE`` seconds regardless.
+A rebuild runs in one thread while the others keep answering from the
+old DAG; ``invalidate_go_dag`` (called after GO curation commits) forces
+one on the next request.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import String, cast, func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from cgd.api.services.relationship_map_service import get_relationship_map
+from cgd.core.settings import settings
+from cgd.models.models import Go, GoAnnotation, GoPath
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELATIONSHIP = "is_a"
+
+
+def _empty_index() -> np.ndarray:
+    return np.zeros(0, dtype=np.int32)
+
+
+def _empty_pointers() -> np.ndarray:
+    return np.zeros(1, dtype=np.int32)
+
+
+class GoTerm(NamedTuple):
+    """One node of the DAG."""
+
+    go_no: int
+    goid: int
+    go_term: str
+    go_aspect: str
+    direct_gene_count: int
+    inherited_gene_count: int
+
+
+class GoSubgraph(NamedTuple):
+    """Nodes around a focus term and the direct edges between them."""
+
+    # Node index -> level (0 focus, negative ancestors, positive descendants),
+    # focus first, then by distance from the focus
+    levels: dict[int, int]
+    # (parent index, child index, relationship type)
+    edges: list[tuple[int, int, str]]
+
+
+@dataclass
+class GoDag:
+    """GO terms, their direct relationships and per-term gene counts."""
+
+    version: tuple = ()
+    go_no: np.ndarray = field(default_factory=_empty_index)
+    goid: np.ndarray = field(default_factory=_empty_index)
+    go_term: list[str] = field(default_factory=list)
+    go_aspect: list[str] = field(default_factory=list)
+    # Parents of node i: parent_index[parent_ptr[i]:parent_ptr[i + 1]], with
+    # the relationship type of each edge in parent_relationship (an index
+    # into relationship_types); child_* likewise for children
+    parent_ptr: np.ndarray = field(default_factory=_empty_pointers)
+    parent_index: np.ndarray = field(default_factory=_empty_index)
+    parent_relationship: np.ndarray = field(default_factory=_empty_index)
+    child_ptr: np.ndarray = field(default_factory=_empty_pointers)
+    child_index: np.ndarray = field(default_factory=_empty_index)
+    child_relationship: np.ndarray = field(default_factory=_empty_index)
+    relationship_types: tuple[str, ...] = ()
+    direct_gene_count: np.ndarray = field(default_factory=_empty_index)
+    inherited_gene_count: np.ndarray = field(default_factory=_empty_index)
+    by_goid: dict[int, int] = field(default_factory=dict)
+    by_go_no: dict[int, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.go_term)
+
+    def index_of(self, goid: int) -> Optional[int]:
+        """Node index of a GOID, if the term exists."""
+        return self.by_goid.get(goid)
+
+    def term(self, index: int) -> GoTerm:
+        return GoTerm(
+            go_no=int(self.go_no[index]),
+            goid=int(self.goid[index]),
+            go_term=self.go_term[index],
+            go_aspect=self.go_aspect[index],
+            direct_gene_count=int(self.direct_gene_count[index]),
+            inherited_gene_count=int(self.inherited_gene_count[index]),
+        )
+
+    def parents(self, index: int) -> list[tuple[int, str]]:
+        """Direct parents of a node as (index, relationship type)."""
+        start, stop = self.parent_ptr[index], self.parent_ptr[index + 1]
+        return [
+            (parent, self.relationship_types[rel])
+            for parent, rel in zip(
+                self.parent_index[start:stop].tolist(),
+                self.parent_relationship[start:stop].tolist(),
+            )
+        ]
+
+    def children(self, index: int) -> list[tuple[int, str]]:
+        """Direct children of a node as (index, relationship type)."""
+        start, stop = self.child_ptr[index], self.child_ptr[index + 1]
+        return [
+            (child, self.relationship_types[rel])
+            for child, rel in zip(
+                self.child_index[start:stop].tolist(),
+                self.child_relationship[start:stop].tolist(),
+            )
+        ]
+
+    def ancestors(self, index: int, max_levels: Optional[int] = None) -> dict[int, int]:
+        """Ancestor index -> generations up (shortest path), nearest first."""
+        return _walk(self.parent_ptr, self.parent_index, index, max_levels)
+
+    def descendants(self, index: int, max_levels: Optional[int] = None) -> dict[int, int]:
+        """Descendant index -> generations down (shortest path), nearest first."""
+        return _walk(self.child_ptr, self.child_index, index, max_levels)
+
+    def descendant_goids(self, goids: Iterable[int]) -> set[int]:
+        """GOIDs of every descendant of the given terms (unknown GOIDs ignored)."""
+        found: set[int] = set()
+        for goid in goids:
+            index = self.by_goid.get(goid)
+            if index is not None:
+                found.update(self.descendants(index))
+        return {int(self.goid[i]) for i in found}
+
+    def subgraph(
+        self,
+        index: int,
+        ancestor_levels: int,
+        descendant_levels: int,
+        max_nodes: Optional[int] = None,
+    ) -> GoSubgraph:
+        """
+        The focus term, its ancestors and descendants up to the given
+        number of generations, and the direct edges among them. With
+        ``max_nodes``, only the nodes closest to the focus are kept.
+        """
+        levels = {index: 0}
+        for ancestor, generation in self.ancestors(index, ancestor_levels).items():
+            levels[ancestor] = -generation
+        for descendant, generation in self.descendants(index, descendant_levels).items():
+            levels.setdefault(descendant, generation)
+        if max_nodes is not None and len(levels) > max_nodes:
+            nearest = sorted(levels.items(), key=lambda item: abs(item[1]))[:max_nodes]
+            levels = dict(nearest)
+
+        edges = [
+            (parent, child, relationship)
+            for child in levels
+            for parent, relationship in self.parents(child)
+            if parent in levels
+        ]
+        return GoSubgraph(levels=levels, edges=edges)
+
+
+def _walk(
+    ptr: np.ndarray, neighbours: np.ndarray, start: int, max_levels: Optional[int]
+) -> dict[int, int]:
+    """Breadth-first walk over one adjacency direction."""
+    levels: dict[int, int] = {}
+    seen = {start}
+    frontier = [start]
+    level = 0
+    while frontier and (max_levels is None or level < max_levels):
+        level += 1
+        next_frontier = []
+        for node in frontier:
+            for neighbour in neighbours[ptr[node]:ptr[node + 1]].tolist():
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    levels[neighbour] = level
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return levels
+
+
+def _adjacency(
+    keys: np.ndarray, values: np.ndarray, relationships: np.ndarray, size: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pointer, neighbour and relationship arrays grouping ``values`` by ``keys``."""
+    order = np.lexsort((values, keys))
+    ptr = np.zeros(size + 1, dtype=np.int32)
+    np.cumsum(np.bincount(keys, minlength=size), out=ptr[1:])
+    return (
+        ptr,
+        values[order].astype(np.int32),
+        relationships[order].astype(np.int32),
+    )
+
+
+def _inherited_counts(
+    parent_ptr: np.ndarray, parent_index: np.ndarray, pairs: np.ndarray, size: int
+) -> np.ndarray:
+    """
+    Genes per term counting annotations to the term or any descendant.
+
+    ``pairs`` are unique (feature, node) rows sorted by feature. Each
+    annotated term's ancestor set (itself included) is computed once.
+    """
+    counts = np.zeros(size, dtype=np.int32)
+    if not len(pairs):
+        return counts
+
+    closures: dict[int, np.ndarray] = {}
+    expanding: set[int] = set()
+
+    def closure(node: int) -> np.ndarray:
+        if node in closures:
+            return closures[node]
+        expanding.add(node)
+        parts = [np.array([node], dtype=np.int32)]
+        for parent in parent_index[parent_ptr[node]:parent_ptr[node + 1]].tolist():
+            if parent not in expanding:
+                parts.append(closure(parent))
+        expanding.discard(node)
+        closures[node] = np.unique(np.concatenate(parts))
+        return closures[node]
+
+    boundaries = np.flatnonzero(np.diff(pairs[:, 0])) + 1
+    for nodes in np.split(pairs[:, 1], boundaries):
+        if len(nodes) == 1:
+            counts[closure(int(nodes[0]))] += 1
+        else:
+            counts[np.unique(np.concatenate([closure(n) for n in nodes.tolist()]))] += 1
+    return counts
+
+
+def build_go_dag(
+    terms: Iterable[tuple],
+    edges: Iterable[tuple],
+    annotations: Iterable[tuple],
+    excluded_features: frozenset[int] = frozenset(),
+    version: tuple = (),
+) -> GoDag:
+    """
+    Index GO terms, edges and annotations.
+
+    Terms are (go_no, goid, go_term, go_aspect) rows, edges (parent go_no,
+    child go_no, relationship_type) rows for direct relationships, and
+    annotations (go_no, feature_no) rows. Edges and annotations referring
+    to unknown terms, and annotations to ``excluded_features``, are skipped.
+    """
+    terms = list(terms)
+    size = len(terms)
+    dag = GoDag(
+        version=version,
+        go_no=np.array([t[0] for t in terms], dtype=np.int64),
+        goid=np.array([t[1] for t in terms], dtype=np.int64),
+        go_term=[t[2] for t in terms],
+        go_aspect=[t[3] for t in terms],
+    )
+    dag.by_go_no = {go_no: i for i, go_no in enumerate(dag.go_no.tolist())}
+    dag.by_goid = {goid: i for i, goid in enumerate(dag.goid.tolist())}
+
+    relationship_codes: dict[str, int] = {}
+    edge_relationship: dict[tuple[int, int], int] = {}
+    for parent_no, child_no, relationship_type in edges:
+        parent = dag.by_go_no.get(parent_no)
+        child = dag.by_go_no.get(child_no)
+        if parent is None or child is None or parent == child:
+            continue
+        name = (relationship_type or DEFAULT_RELATIONSHIP).replace(" ", "_")
+        code = relationship_codes.setdefault(name, len(relationship_codes))
+        edge_relationship.setdefault((parent, child), code)
+    dag.relationship_types = tuple(relationship_codes)
+
+    parents = np.array([p for p, _ in edge_relationship], dtype=np.int32)
+    children = np.array([c for _, c in edge_relationship], dtype=np.int32)
+    codes = np.array(list(edge_relationship.values()), dtype=np.int32)
+    dag.parent_ptr, dag.parent_index, dag.parent_relationship = _adjacency(
+        children, parents, codes, size
+    )
+    dag.child_ptr, dag.child_index, dag.child_relationship = _adjacency(
+        parents, children, codes, size
+    )
+
+    annotated = [
+        (feature_no, dag.by_go_no[go_no])
+        for go_no, feature_no in annotations
+        if go_no in dag.by_go_no and feature_no not in excluded_features
+    ]
+    pairs = np.unique(np.array(annotated, dtype=np.int64).reshape(-1, 2), axis=0)
+    dag.direct_gene_count = np.bincount(pairs[:, 1], minlength=size).astype(np.int32)
+    dag.inherited_gene_count = _inherited_counts(
+        dag.parent_ptr, dag.parent_index, pairs, size
+    )
+    return dag
+
+
+def _row_hash(db: Session, *columns) -> ColumnElement:
+    """
+    Per-row hash of ``columns``, summed into content fingerprints.
+
+    ORA_HASH on Oracle. Other databases (SQLite in tests) have no hash
+    function, so there it is the length of the joined values.
+    """
+    joined = None
+    for column in columns:
+        value = func.coalesce(cast(column, String(240)), "")
+        joined = value if joined is None else joined + "|" + value
+    if db.get_bind().dialect.name == "oracle":
+        return func.ora_hash(joined)
+    return func.length(joined)
+
+
+def _dag_version(db: Session) -> tuple:
+    version = []
+    for key in (Go.go_no, GoPath.go_path_no, GoAnnotation.go_annotation_no):
+        version.extend(db.query(func.count(key), func.max(key)).one())
+    # load_go.py updates term names, aspects and GO_PATH rows in place,
+    # which leaves the counts and keys above unchanged
+    version.append(
+        db.query(func.sum(_row_hash(db, Go.go_no, Go.goid, Go.go_term, Go.go_aspect))).scalar()
+    )
+    version.append(
+        db.query(func.sum(_row_hash(
+            db, GoPath.go_path_no, GoPath.ancestor_go_no, GoPath.child_go_no,
+            GoPath.relationship_type,
+        )))
+        .filter(GoPath.generation == 1)
+        .scalar()
+    )
+    return (*version, get_relationship_map(db).version)
+
+
+def load_go_dag(db: Session, version: tuple = ()) -> GoDag:
+    """Read GO terms, direct relationships and annotations into a new DAG."""
+    terms = (
+        db.query(Go.go_no, Go.goid, Go.go_term, Go.go_aspect)
+        .order_by(Go.go_no)
+        .all()
+    )
+    edges = (
+        db.query(GoPath.ancestor_go_no, GoPath.child_go_no, GoPath.relationship_type)
+        .filter(GoPath.generation == 1)
+        .all()
+    )
+    annotations = db.query(GoAnnotation.go_no, GoAnnotation.feature_no).distinct().all()
+    dag = build_go_dag(
+        terms, edges, annotations,
+        excluded_features=get_relationship_map(db).a21_with_a22,
+        version=version,
+    )
+    logger.info(
+        "Loaded GO DAG: %d terms, %d edges, %d annotated terms",
+        len(dag), len(dag.parent_index), int(np.count_nonzero(dag.direct_gene_count)),
+    )
+    return dag
+
+
+class GoDagCache:
+    """The process's current ``GoDag``, re-validated periodically."""
+
+    def __init__(
+        self,
+        check_interval: float,
+        max_age: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._clock = clock
+        self._dag: Optional[GoDag] = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _current(self) -> tuple[Optional[GoDag], float, float]:
+        with self._lock:
+            return self._dag, self._checked_at, self._loaded_at
+
+    def get(self, db: Session) -> GoDag:
+        now = self._clock()
+        current, checked_at, _ = self._current()
+        if current is not None and now - checked_at < self.check_interval:
+            return current
+
+        # One thread checks and rebuilds; the others keep the current DAG
+        # (or, before the first build, wait for it)
+        if not self._build_lock.acquire(blocking=current is None):
+            return current
+        try:
+            current, checked_at, loaded_at = self._current()
+            if current is not None and now - checked_at < self.check_interval:
+                return current
+
+            version = _dag_version(db)
+            if current is None or current.version != version or now - loaded_at >= self.max_age:
+                current = load_go_dag(db, version)
+                loaded_at = now
+            with self._lock:
+                self._dag = current
+                self._checked_at = now
+                self._loaded_at = loaded_at
+            return current
+        finally:
+            self._build_lock.release()
+
+    def invalidate(self) -> None:
+        """Rebuild on next use; until then, other threads keep the current DAG."""
+        with self._lock:
+            self._checked_at = self._loaded_at = float("-inf")
+
+
+_go_dags: Optional[GoDagCache] = None
+_go_dags_lock = threading.Lock()
+
+
+def _get_cache() -> GoDagCache:
+    global _go_dags
+    with _go_dags_lock:
+        if _go_dags is None:
+            _go_dags = GoDagCache(settings.go_dag_check_interval, settings.go_dag_max_age)
+        return _go_dags
+
+
+def get_go_dag(db: Session) -> GoDag:
+    """The current GO DAG, loading or refreshing it if needed."""
+    return _get_cache().get(db)
+
+
+def invalidate_go_dag() -> None:
+    """Force a reload on next use; call after committing GO or annotation changes."""
+    _get_cache().invalidate()
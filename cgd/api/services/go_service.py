@@ -7,7 +7,7 @@ from collections import defaultdict
 from typing import Optional
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from sqlalchemy import and_
 from fastapi import HTTPException
 
 from cgd.schemas.go_schema import (
@@ -31,13 +31,13 @@ from cgd.models.models import (
     GoGosyn,
     GoRef,
     GoQualifier,
-    GoPath,
     Feature,
-    FeatRelationship,
     RefUrl,
     Code,
     Seq,
 )
+from cgd.api.services.go_dag_service import get_go_dag
+from cgd.api.services.relationship_map_service import get_relationship_map
 
 
 # Map GO aspect codes to full names
@@ -98,38 +98,6 @@ def _get_organism_name(feature: Feature) -> str:
     return str(feature.organism_no)
 
 
-def _get_assembly21_feature_nos_to_exclude(db: Session, feature_nos: set[int]) -> set[int]:
-    """
-    Identify Assembly 21 features that have Assembly 22 equivalents.
-
-    In CGD, the same gene may have both Assembly 21 (orf19.XXXX) and
-    Assembly 22 (C7_XXXXX_A) feature records. We prefer Assembly 22.
-
-    Args:
-        db: Database session
-        feature_nos: Set of feature_no values to check
-
-    Returns:
-        Set of feature_no values that are Assembly 21 versions with
-        Assembly 22 equivalents (these should be excluded from results)
-    """
-    if not feature_nos:
-        return set()
-
-    # Find Assembly 21 features that have Assembly 22 parents
-    a21_relationships = (
-        db.query(FeatRelationship.child_feature_no)
-        .filter(
-            FeatRelationship.child_feature_no.in_(feature_nos),
-            FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            FeatRelationship.rank == 3,
-        )
-        .all()
-    )
-
-    return {rel[0] for rel in a21_relationships}
-
-
 def _normalize_annotation_type(db_type: str) -> str:
     """Normalize database annotation type to API format."""
     if not db_type:
@@ -286,9 +254,9 @@ def get_go_term_info(
 
     # Filter out Assembly 21 features that have Assembly 22 equivalents
     # to only show genes on Assembly 22 for C. albicans SC5314
-    all_feature_nos = {ann.feature_no for ann in annotations if ann.feature}
-    a21_to_exclude = _get_assembly21_feature_nos_to_exclude(db, all_feature_nos)
-    annotations = [ann for ann in annotations if ann.feature_no not in a21_to_exclude]
+    if annotations:
+        a21_to_exclude = get_relationship_map(db).a21_with_a22
+        annotations = [ann for ann in annotations if ann.feature_no not in a21_to_exclude]
 
     # Collect all unique reference_no values to query RefUrl
     ref_nos = set()
@@ -558,6 +526,8 @@ def get_go_hierarchy(
     """
     Get GO term hierarchy (ancestors and descendants) for diagram visualization.
 
+    Nodes, edges and gene counts come from the in-memory GO DAG.
+
     Args:
         db: Database session
         goid_str: GO identifier (e.g., "GO:0005634" or "5634")
@@ -577,177 +547,51 @@ def get_go_hierarchy(
             detail=f"Invalid GO identifier format: {goid_str}"
         )
 
-    # Query focus GO term
-    focus_go = db.query(Go).filter(Go.goid == goid_int).first()
-    if not focus_go:
+    dag = get_go_dag(db)
+    focus_index = dag.index_of(goid_int)
+    if focus_index is None:
         raise HTTPException(
             status_code=404,
             detail=f"GO term not found: {_format_goid(goid_int)}"
         )
 
-    # Collect all go_no values we need to include (focus + ancestors + descendants)
-    # Map go_no -> level (0 = focus, negative = ancestor, positive = descendant)
-    go_no_to_level: dict[int, int] = {focus_go.go_no: 0}
+    # Focus term plus ancestors (negative levels) and descendants (positive
+    # levels), keeping the nodes closest to the focus
+    subgraph = dag.subgraph(focus_index, ancestor_levels, descendant_levels, max_nodes)
 
-    # Query ancestors via GoPath table (where child_go_no = focus term's go_no)
-    ancestor_paths = (
-        db.query(GoPath)
-        .filter(GoPath.child_go_no == focus_go.go_no)
-        .filter(GoPath.generation <= ancestor_levels)
-        .order_by(GoPath.generation)
-        .all()
-    )
-
-    # Build set of ancestor go_no values with their levels
-    for path in ancestor_paths:
-        ancestor_go_no = path.ancestor_go_no
-        level = -path.generation  # Negative for ancestors
-        # Keep the closest level (smallest absolute value) if seen multiple times
-        if ancestor_go_no not in go_no_to_level:
-            go_no_to_level[ancestor_go_no] = level
-        elif abs(level) < abs(go_no_to_level[ancestor_go_no]):
-            go_no_to_level[ancestor_go_no] = level
-
-    # Query descendants via GoPath table (where ancestor_go_no = focus term's go_no)
-    descendant_paths = (
-        db.query(GoPath)
-        .filter(GoPath.ancestor_go_no == focus_go.go_no)
-        .filter(GoPath.generation <= descendant_levels)
-        .order_by(GoPath.generation)
-        .all()
-    )
-
-    # Build set of descendant go_no values with their levels
-    for path in descendant_paths:
-        descendant_go_no = path.child_go_no
-        level = path.generation  # Positive for descendants
-        # Keep the closest level (smallest absolute value) if seen multiple times
-        if descendant_go_no not in go_no_to_level:
-            go_no_to_level[descendant_go_no] = level
-        elif abs(level) < abs(go_no_to_level[descendant_go_no]):
-            go_no_to_level[descendant_go_no] = level
-
-    # Limit to max_nodes if we have too many
-    all_go_nos = list(go_no_to_level.keys())
-    if len(all_go_nos) > max_nodes:
-        # Keep focus term and closest nodes (both ancestors and descendants)
-        sorted_items = sorted(go_no_to_level.items(), key=lambda x: abs(x[1]))
-        all_go_nos = [item[0] for item in sorted_items[:max_nodes]]
-        go_no_to_level = {k: v for k, v in go_no_to_level.items() if k in all_go_nos}
-
-    # Query Go records for all nodes
-    go_records = db.query(Go).filter(Go.go_no.in_(all_go_nos)).all()
-    go_no_to_go: dict[int, Go] = {go.go_no: go for go in go_records}
-
-    # Query annotation counts for all nodes (direct annotations)
-    # Count distinct feature_no for each go_no
-    # Exclude Assembly 21 features that have Assembly 22 equivalents
-    # Use a subquery to find feature_nos to exclude
-    a21_subquery = (
-        db.query(FeatRelationship.child_feature_no)
-        .filter(
-            FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            FeatRelationship.rank == 3,
-        )
-        .subquery()
-    )
-
-    annotation_counts = (
-        db.query(
-            GoAnnotation.go_no,
-            func.count(func.distinct(GoAnnotation.feature_no)).label('gene_count')
-        )
-        .filter(GoAnnotation.go_no.in_(all_go_nos))
-        .filter(~GoAnnotation.feature_no.in_(a21_subquery))
-        .group_by(GoAnnotation.go_no)
-        .all()
-    )
-    go_no_to_gene_count: dict[int, int] = {row.go_no: row.gene_count for row in annotation_counts}
-
-    # Build nodes list
     nodes = []
     focus_node = None
-    for go_no in all_go_nos:
-        go = go_no_to_go.get(go_no)
-        if not go:
-            continue
-
-        level = go_no_to_level[go_no]
-        direct_count = go_no_to_gene_count.get(go_no, 0)
-        aspect_code = go.go_aspect[0].upper() if go.go_aspect else "P"
+    for index, level in subgraph.levels.items():
+        term = dag.term(index)
+        aspect_code = term.go_aspect[0].upper() if term.go_aspect else "P"
 
         node = GoHierarchyNode(
-            goid=_format_goid(go.goid),
-            go_term=go.go_term,
+            goid=_format_goid(term.goid),
+            go_term=term.go_term,
             go_aspect=aspect_code,
-            direct_gene_count=direct_count,
-            inherited_gene_count=0,  # Could be computed but expensive
-            has_annotations=direct_count > 0,
-            is_focus=(go_no == focus_go.go_no),
+            direct_gene_count=term.direct_gene_count,
+            inherited_gene_count=term.inherited_gene_count,
+            has_annotations=term.direct_gene_count > 0,
+            is_focus=(index == focus_index),
             level=level,
         )
         nodes.append(node)
 
-        if go_no == focus_go.go_no:
+        if index == focus_index:
             focus_node = node
 
-    # Build edges - query GoPath for direct parent-child relationships (generation=1)
-    # between nodes we're displaying
-    edges = []
-    edge_set = set()  # Track unique edges
-
-    # Helper function to add edge if not already present
-    def add_edge(parent_go, child_go, relationship_type):
-        edge_key = (parent_go.goid, child_go.goid)
-        if edge_key not in edge_set:
-            edge_set.add(edge_key)
-            rel_type = "is_a"
-            if relationship_type:
-                rel_type = relationship_type.replace(" ", "_")
-            edges.append(GoHierarchyEdge(
-                source=_format_goid(parent_go.goid),
-                target=_format_goid(child_go.goid),
-                relationship_type=rel_type,
-            ))
-
-    # Add edges from ancestor paths (parent -> focus and between ancestors)
-    for path in ancestor_paths:
-        if path.generation == 1:  # Direct parent-child relationship
-            if path.ancestor_go_no in all_go_nos and path.child_go_no in all_go_nos:
-                parent_go = go_no_to_go.get(path.ancestor_go_no)
-                child_go = go_no_to_go.get(path.child_go_no)
-                if parent_go and child_go:
-                    add_edge(parent_go, child_go, path.relationship_type)
-
-    # Add edges from descendant paths (focus -> children and between descendants)
-    for path in descendant_paths:
-        if path.generation == 1:  # Direct parent-child relationship
-            if path.ancestor_go_no in all_go_nos and path.child_go_no in all_go_nos:
-                parent_go = go_no_to_go.get(path.ancestor_go_no)
-                child_go = go_no_to_go.get(path.child_go_no)
-                if parent_go and child_go:
-                    add_edge(parent_go, child_go, path.relationship_type)
-
-    # Query additional edges between non-focus nodes (ancestors and descendants)
-    if len(all_go_nos) > 1:
-        non_focus_go_nos = [gn for gn in all_go_nos if gn != focus_go.go_no]
-        if non_focus_go_nos:
-            inter_node_paths = (
-                db.query(GoPath)
-                .filter(GoPath.generation == 1)
-                .filter(GoPath.child_go_no.in_(non_focus_go_nos))
-                .filter(GoPath.ancestor_go_no.in_(all_go_nos))
-                .all()
-            )
-            for path in inter_node_paths:
-                parent_go = go_no_to_go.get(path.ancestor_go_no)
-                child_go = go_no_to_go.get(path.child_go_no)
-                if parent_go and child_go:
-                    add_edge(parent_go, child_go, path.relationship_type)
+    edges = [
+        GoHierarchyEdge(
+            source=_format_goid(int(dag.goid[parent])),
+            target=_format_goid(int(dag.goid[child])),
+            relationship_type=relationship_type,
+        )
+        for parent, child, relationship_type in subgraph.edges
+    ]
 
     # Determine navigation flags
-    can_go_up = any(path.generation == 1 for path in ancestor_paths)
-    can_go_down = any(path.generation == 1 for path in descendant_paths)
+    can_go_up = ancestor_levels > 0 and bool(dag.parents(focus_index))
+    can_go_down = descendant_levels > 0 and bool(dag.children(focus_index))
 
     return GoHierarchyResponse(
         focus_term=focus_node,
@@ -9,10 +9,10 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Optional
 
-from scipy.stats import hypergeom
 from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session, joinedload
 
+from cgd.core.columnar import encode_columns, encode_objects
 from cgd.models.models import (
     Alias,
     Code,
@@ -51,6 +51,14 @@ ASPECT_NAMES = {
     "P": "Biological Process",
 }
 
+# EnrichedGoTerm and GeneHit fields in the columnar format
+TERM_COLUMNS = (
+    "go_no", "goid", "go_term", "go_aspect", "aspect_name",
+    "query_count", "query_total", "background_count", "background_total",
+    "query_frequency", "background_frequency", "fold_enrichment", "p_value", "fdr",
+)
+GENE_HIT_COLUMNS = ("term", "feature_no", "systematic_name", "gene_name", "evidence_codes")
+
 # Map database annotation_type values to API format
 ANNOTATION_TYPE_MAP = {
     "manually curated": "manually_curated",
@@ -401,6 +409,9 @@ def _calculate_enrichment(
 
     Returns list of (go_no, k, n, K, N, p_value) tuples for significant terms.
     """
+    # scipy.stats takes ~1s to import; defer it until an analysis is run
+    from scipy.stats import hypergeom
+
     # Calculate N and n
     N = len(background_annotations)  # Total background genes
     n = len(query_annotations)  # Total query genes
@@ -695,7 +706,8 @@ def run_go_term_finder(
                 feature = feature_no_to_feature.get(feature_no)
                 if feature:
                     evidence_codes = list(go_to_gene_evidence.get(go_no, {}).get(feature_no, []))
-                    gene_hits.append(GeneHit(
+                    # Values come straight from the database: skip validation
+                    gene_hits.append(GeneHit.model_construct(
                         feature_no=feature_no,
                         systematic_name=feature.feature_name,
                         gene_name=feature.gene_name,
@@ -762,6 +774,34 @@ def run_go_term_finder(
     )
 
 
+def columnar_go_term_finder_response(response: GoTermFinderResponse) -> dict:
+    """
+    GO Term Finder response with the enriched terms as columnar tables.
+
+    ``result.terms`` holds the process, function and component terms in
+    that order (aspect dictionary-encoded); ``result.gene_hits`` holds
+    every term's genes, its ``term`` column indexing rows of ``terms``.
+    """
+    payload = response.model_dump(exclude={"result"})
+    result = response.result
+    if result is None:
+        payload["result"] = None
+        return payload
+
+    terms = result.process_terms + result.function_terms + result.component_terms
+    hits = [
+        (i, hit.feature_no, hit.systematic_name, hit.gene_name, hit.evidence_codes)
+        for i, term in enumerate(terms)
+        for hit in term.genes
+    ]
+    payload["result"] = {
+        **result.model_dump(exclude={"process_terms", "function_terms", "component_terms"}),
+        "terms": encode_objects(terms, TERM_COLUMNS, dictionary=("go_aspect", "aspect_name")),
+        "gene_hits": encode_columns(hits, GENE_HIT_COLUMNS),
+    }
+    return payload
+
+
 def build_enrichment_graph(
     db: Session,
     enriched_terms: list[EnrichedGoTerm],
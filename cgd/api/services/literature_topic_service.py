@@ -8,8 +8,8 @@ from collections import defaultdict
 from typing import List
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, distinct
 
+from cgd.api.services.cv_tree_service import CvTree, get_cv_tree
 from cgd.schemas.literature_topic_schema import (
     LiteratureTopicTerm,
     LiteratureTopicTreeResponse,
@@ -21,9 +21,7 @@ from cgd.schemas.literature_topic_schema import (
     CitationLinkForLitTopic,
 )
 from cgd.models.models import (
-    Cv,
     CvTerm,
-    CvtermRelationship,
     RefProperty,
     RefpropFeat,
     Reference,
@@ -58,109 +56,46 @@ def _build_citation_links(ref, ref_urls=None) -> list[CitationLinkForLitTopic]:
     return links
 
 
-def get_literature_topic_tree(db: Session) -> LiteratureTopicTreeResponse:
-    """
-    Get hierarchical tree of literature topics.
-
-    Returns literature topics with reference counts, organized hierarchically
-    using the CV term relationships.
-    """
-    # Get the literature_topic CV
-    lit_topic_cv = (
-        db.query(Cv)
-        .filter(func.lower(Cv.cv_name) == 'literature_topic')
-        .first()
-    )
-
-    if not lit_topic_cv:
-        return LiteratureTopicTreeResponse(tree=[])
-
-    # Get all CV terms for literature_topic
-    cv_terms = (
-        db.query(CvTerm)
-        .filter(CvTerm.cv_no == lit_topic_cv.cv_no)
-        .all()
-    )
-
-    if not cv_terms:
-        return LiteratureTopicTreeResponse(tree=[])
-
-    # Build maps
-    term_map = {t.term_name: t for t in cv_terms}
-    term_no_map = {t.cv_term_no: t for t in cv_terms}
-
-    # Get reference counts per topic from ref_property
-    topic_counts = (
-        db.query(
-            RefProperty.property_value,
-            func.count(distinct(RefProperty.reference_no)).label('count')
-        )
-        .filter(RefProperty.property_value.in_([t.term_name for t in cv_terms]))
-        .group_by(RefProperty.property_value)
-        .all()
-    )
-    count_map = {topic: cnt for topic, cnt in topic_counts}
-
-    # Get all relationships for these terms
-    relationships = (
-        db.query(CvtermRelationship)
-        .filter(
-            CvtermRelationship.parent_cv_term_no.in_([t.cv_term_no for t in cv_terms])
-            | CvtermRelationship.child_cv_term_no.in_([t.cv_term_no for t in cv_terms])
-        )
-        .all()
-    )
-
-    # Build parent -> children map
-    children_map: dict[int, list[int]] = defaultdict(list)
-    has_parent: set[int] = set()
-
-    for rel in relationships:
-        if rel.parent_cv_term_no in term_no_map and rel.child_cv_term_no in term_no_map:
-            children_map[rel.parent_cv_term_no].append(rel.child_cv_term_no)
-            has_parent.add(rel.child_cv_term_no)
-
-    # Find root terms (terms that have no parent)
-    root_term_nos = [t.cv_term_no for t in cv_terms if t.cv_term_no not in has_parent]
-
-    # Recursively build tree
+def literature_topic_tree(cv_tree: CvTree) -> LiteratureTopicTreeResponse:
+    """Render the literature_topic CV tree with reference counts, sorted by name."""
     def build_tree_node(term_no: int) -> LiteratureTopicTerm:
-        term = term_no_map[term_no]
-        term_name = term.term_name
-        count = count_map.get(term_name, 0)
-
-        children = []
-        for child_no in sorted(children_map.get(term_no, []),
-                               key=lambda x: term_no_map[x].term_name):
-            children.append(build_tree_node(child_no))
-
         return LiteratureTopicTerm(
             cv_term_no=term_no,
-            term=term_name,
-            count=count,
-            children=children,
+            term=cv_tree.terms[term_no],
+            count=cv_tree.count(term_no),
+            children=[
+                build_tree_node(child_no)
+                for child_no in cv_tree.sorted_terms(cv_tree.children.get(term_no, []))
+            ],
         )
 
-    # Build tree from roots
-    tree = []
-    for root_no in sorted(root_term_nos, key=lambda x: term_no_map[x].term_name):
-        tree.append(build_tree_node(root_no))
+    tree = [build_tree_node(root_no) for root_no in cv_tree.sorted_terms(cv_tree.roots)]
 
     # If tree is empty but we have terms, fall back to flat list
-    if not tree and cv_terms:
+    if not tree and cv_tree.terms:
         tree = [
             LiteratureTopicTerm(
-                cv_term_no=t.cv_term_no,
-                term=t.term_name,
-                count=count_map.get(t.term_name, 0),
-                children=[]
+                cv_term_no=term_no,
+                term=cv_tree.terms[term_no],
+                count=cv_tree.count(term_no),
+                children=[],
             )
-            for t in sorted(cv_terms, key=lambda x: x.term_name)
+            for term_no in cv_tree.sorted_terms(cv_tree.terms)
         ]
 
     return LiteratureTopicTreeResponse(tree=tree)
 
 
+def get_literature_topic_tree(db: Session) -> LiteratureTopicTreeResponse:
+    """
+    Get hierarchical tree of literature topics.
+
+    Returns literature topics with reference counts, organized hierarchically
+    using the CV term relationships. Built from the shared CV tree cache.
+    """
+    return literature_topic_tree(get_cv_tree(db, "literature_topic"))
+
+
 def search_by_topics(
     db: Session,
     topic_cv_term_nos: List[int],
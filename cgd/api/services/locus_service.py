@@ -5,7 +5,7 @@ import urllib.request
 import urllib.error
 from typing import Optional
 from pathlib import Path
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import func, or_
 from collections import defaultdict
 
@@ -124,7 +124,12 @@ from cgd.schemas.homology_schema import (
     SequenceAlignmentOut,
     AlignmentSequenceOut,
 )
+from cgd.api.services.relationship_map_service import (
+    PRIMARY_RANK,
+    get_relationship_map,
+)
 from cgd.core.settings import settings
+from cgd.utils.seqkernels import count_cug_codons, has_ambiguous_bases, translate
 from cgd.models.locus_model import Feature
 from cgd.models.go_model import GoAnnotation, GoRef
 from cgd.models.phenotype_model import PhenoAnnotation
@@ -603,19 +608,7 @@ def _count_cug_codons(cds_sequence: str) -> int:
     Returns:
         Number of CTG codons found
     """
-    if not cds_sequence:
-        return 0
-
-    cds_upper = cds_sequence.upper()
-    count = 0
-
-    # Count CTG codons at codon positions (every 3rd position)
-    for i in range(0, len(cds_upper) - 2, 3):
-        codon = cds_upper[i:i + 3]
-        if codon == 'CTG':
-            count += 1
-
-    return count
+    return count_cug_codons(cds_sequence)
 
 
 def _get_cds_sequence(db: Session, feature_no: int) -> Optional[str]:
@@ -652,30 +645,9 @@ def _translate_codon(codon: str, use_table_12: bool = True) -> str:
     Returns:
         Single letter amino acid code, or 'X' for unknown
     """
-    codon = codon.upper()
-
-    # Standard genetic code with table 12 modification
-    codon_table = {
-        'TTT': 'F', 'TTC': 'F', 'TTA': 'L', 'TTG': 'L',
-        'TCT': 'S', 'TCC': 'S', 'TCA': 'S', 'TCG': 'S',
-        'TAT': 'Y', 'TAC': 'Y', 'TAA': '*', 'TAG': '*',
-        'TGT': 'C', 'TGC': 'C', 'TGA': '*', 'TGG': 'W',
-        'CTT': 'L', 'CTC': 'L', 'CTA': 'L',
-        'CTG': 'S' if use_table_12 else 'L',  # Key difference for table 12
-        'CCT': 'P', 'CCC': 'P', 'CCA': 'P', 'CCG': 'P',
-        'CAT': 'H', 'CAC': 'H', 'CAA': 'Q', 'CAG': 'Q',
-        'CGT': 'R', 'CGC': 'R', 'CGA': 'R', 'CGG': 'R',
-        'ATT': 'I', 'ATC': 'I', 'ATA': 'I', 'ATG': 'M',
-        'ACT': 'T', 'ACC': 'T', 'ACA': 'T', 'ACG': 'T',
-        'AAT': 'N', 'AAC': 'N', 'AAA': 'K', 'AAG': 'K',
-        'AGT': 'S', 'AGC': 'S', 'AGA': 'R', 'AGG': 'R',
-        'GTT': 'V', 'GTC': 'V', 'GTA': 'V', 'GTG': 'V',
-        'GCT': 'A', 'GCC': 'A', 'GCA': 'A', 'GCG': 'A',
-        'GAT': 'D', 'GAC': 'D', 'GAA': 'E', 'GAG': 'E',
-        'GGT': 'G', 'GGC': 'G', 'GGA': 'G', 'GGG': 'G',
-    }
-
-    return codon_table.get(codon, 'X')
+    if len(codon) != 3:
+        return 'X'
+    return translate(codon, table=12 if use_table_12 else 1)
 
 
 def _translate_sequence(cds: str, use_table_12: bool = True) -> str:
@@ -691,19 +663,7 @@ def _translate_sequence(cds: str, use_table_12: bool = True) -> str:
     """
     if not cds:
         return ''
-
-    protein = []
-    cds_upper = cds.upper()
-
-    for i in range(0, len(cds_upper) - 2, 3):
-        codon = cds_upper[i:i + 3]
-        # Skip codons with ambiguous bases
-        if any(base not in 'ACGT' for base in codon):
-            protein.append('X')
-        else:
-            protein.append(_translate_codon(codon, use_table_12))
-
-    return ''.join(protein)
+    return translate(cds, table=12 if use_table_12 else 1)
 
 
 def _check_allelic_variation(
@@ -736,8 +696,8 @@ def _check_allelic_variation(
     allele_upper = allele_cds.upper()
 
     # Check for ambiguous sequences
-    has_ambiguous_primary = any(base not in 'ACGT' for base in primary_upper)
-    has_ambiguous_allele = any(base not in 'ACGT' for base in allele_upper)
+    has_ambiguous_primary = has_ambiguous_bases(primary_upper)
+    has_ambiguous_allele = has_ambiguous_bases(allele_upper)
     has_ambiguous = has_ambiguous_primary or has_ambiguous_allele
 
     descriptions = []
@@ -872,23 +832,14 @@ def _filter_features_by_preference(
         # If a feature is an Assembly 21 version with an Assembly 22 equivalent,
         # prefer the Assembly 22 version
         a22_replacements = {}
+        relationship_map = get_relationship_map(db)
         for f in org_features:
-            # Query for Assembly 21 Primary Allele relationship where this
-            # feature is the child (Assembly 21) and parent is Assembly 22
-            a22_rel = (
-                db.query(FeatRelationship)
-                .filter(
-                    FeatRelationship.child_feature_no == f.feature_no,
-                    FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-                    FeatRelationship.rank == 3,
-                )
-                .first()
-            )
-            if a22_rel:
-                # Check if the parent (A22) is in our feature list
-                parent_no = a22_rel.parent_feature_no
-                if parent_no in feat_map:
-                    a22_replacements[f.feature_no] = parent_no
+            # Assembly 21 Primary Allele relationship where this feature is
+            # the child (Assembly 21) and the parent is Assembly 22
+            parent_no = relationship_map.a22_for_a21(f.feature_no)
+            # Check if the parent (A22) is in our feature list
+            if parent_no is not None and parent_no in feat_map:
+                a22_replacements[f.feature_no] = parent_no
 
         # Remove Assembly 21 features that have Assembly 22 equivalents in the list
         if a22_replacements:
@@ -965,6 +916,41 @@ def _filter_features_by_preference(
     return result
 
 
+def _locus_summary_options() -> tuple:
+    """
+    Loader options for the locus summary page.
+
+    Each collection is loaded with its own SELECT ... IN query, so the rows
+    fetched are the sum, not the product, of aliases, URLs and homology
+    groups.
+    """
+    return (
+        joinedload(Feature.organism),
+        selectinload(Feature.feat_alias).joinedload(FeatAlias.alias),
+        selectinload(Feature.feat_url).joinedload(FeatUrl.url).selectinload(Url.web_display),
+        selectinload(Feature.feat_homology).joinedload(FeatHomology.homology_group),
+    )
+
+
+def _feature_qualifiers(db: Session, feature_nos) -> dict[int, Optional[str]]:
+    """First 'feature_qualifier' property value of each feature, in one query."""
+    qualifiers: dict[int, Optional[str]] = {}
+    feature_nos = list(feature_nos)
+    if not feature_nos:
+        return qualifiers
+    rows = (
+        db.query(FeatProperty.feature_no, FeatProperty.property_value)
+        .filter(
+            FeatProperty.feature_no.in_(feature_nos),
+            FeatProperty.property_type == 'feature_qualifier',
+        )
+        .all()
+    )
+    for feature_no, value in rows:
+        qualifiers.setdefault(feature_no, value)
+    return qualifiers
+
+
 def get_locus_by_organism(db: Session, name: str) -> LocusByOrganismResponse:
     n = name.strip()
     upper_n = func.upper(n)
@@ -972,12 +958,7 @@ def get_locus_by_organism(db: Session, name: str) -> LocusByOrganismResponse:
     # Query for direct matches (gene_name, feature_name, dbxref_id)
     direct_features = (
         db.query(Feature)
-        .options(
-            joinedload(Feature.organism),
-            joinedload(Feature.feat_alias).joinedload(FeatAlias.alias),
-            joinedload(Feature.feat_url).joinedload(FeatUrl.url),
-            joinedload(Feature.feat_homology).joinedload(FeatHomology.homology_group),
-        )
+        .options(*_locus_summary_options())
         .filter(
             or_(
                 func.upper(Feature.gene_name) == upper_n,
@@ -997,12 +978,7 @@ def get_locus_by_organism(db: Session, name: str) -> LocusByOrganismResponse:
     # Also query for features with matching aliases (e.g., HOG1 alias for Cd36_18080)
     alias_features = (
         db.query(Feature)
-        .options(
-            joinedload(Feature.organism),
-            joinedload(Feature.feat_alias).joinedload(FeatAlias.alias),
-            joinedload(Feature.feat_url).joinedload(FeatUrl.url),
-            joinedload(Feature.feat_homology).joinedload(FeatHomology.homology_group),
-        )
+        .options(*_locus_summary_options())
         .join(FeatAlias, Feature.feature_no == FeatAlias.feature_no)
         .join(Alias, FeatAlias.alias_no == Alias.alias_no)
         .filter(func.upper(Alias.alias_name) == upper_n)
@@ -1318,22 +1294,9 @@ def get_locus_by_organism(db: Session, name: str) -> LocusByOrganismResponse:
 
         # Get Assembly 21 identifier (if this is Assembly 22, find the Assembly 21 child)
         assembly_21_identifier = None
-        a21_rel = (
-            db.query(FeatRelationship)
-            .filter(
-                FeatRelationship.parent_feature_no == f.feature_no,
-                FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            )
-            .first()
-        )
-        if a21_rel:
-            a21_feature = (
-                db.query(Feature)
-                .filter(Feature.feature_no == a21_rel.child_feature_no)
-                .first()
-            )
-            if a21_feature and a21_feature.feature_name != f.feature_name:
-                assembly_21_identifier = a21_feature.feature_name
+        a21_feature = get_relationship_map(db).a21_for_a22(f.feature_no)
+        if a21_feature and a21_feature[1] != f.feature_name:
+            assembly_21_identifier = a21_feature[1]
 
         # Get feature qualifier from FEAT_PROPERTY
         feature_qualifier = None
@@ -1350,30 +1313,13 @@ def get_locus_by_organism(db: Session, name: str) -> LocusByOrganismResponse:
 
         # Get alleles for this locus
         alleles = []
-        allele_relationships = (
-            db.query(FeatRelationship)
-            .filter(
-                FeatRelationship.parent_feature_no == f.feature_no,
-                FeatRelationship.relationship_type == 'allele',
-            )
-            .all()
-        )
-        for ar in allele_relationships:
-            allele_feature = (
-                db.query(Feature)
-                .filter(
-                    Feature.feature_no == ar.child_feature_no,
-                    func.lower(Feature.feature_type) == 'allele',
-                )
-                .first()
-            )
-            if allele_feature:
-                alleles.append(AlleleOut(
-                    feature_no=allele_feature.feature_no,
-                    feature_name=allele_feature.feature_name,
-                    gene_name=allele_feature.gene_name,
-                    dbxref_id=allele_feature.dbxref_id,
-                ))
+        for allele_feature in _get_allele_features(db, f.feature_no):
+            alleles.append(AlleleOut(
+                feature_no=allele_feature.feature_no,
+                feature_name=allele_feature.feature_name,
+                gene_name=allele_feature.gene_name,
+                dbxref_id=allele_feature.dbxref_id,
+            ))
 
         # Get Candida orthologs (internal CGD species via CGOB method)
         candida_orthologs = []
@@ -1381,21 +1327,17 @@ def get_locus_by_organism(db: Session, name: str) -> LocusByOrganismResponse:
             hg = fh.homology_group
             if hg and hg.homology_group_type == 'ortholog' and hg.method == 'CGOB':
                 # Get other features in same homology group
-                other_members = (
-                    db.query(FeatHomology)
+                other_features = (
+                    db.query(Feature)
+                    .options(joinedload(Feature.organism))
+                    .join(FeatHomology, FeatHomology.feature_no == Feature.feature_no)
                     .filter(
                         FeatHomology.homology_group_no == hg.homology_group_no,
                         FeatHomology.feature_no != f.feature_no,
                     )
                     .all()
                 )
-                for om in other_members:
-                    other_feat = (
-                        db.query(Feature)
-                        .options(joinedload(Feature.organism))
-                        .filter(Feature.feature_no == om.feature_no)
-                        .first()
-                    )
+                for other_feat in other_features:
                     if other_feat:
                         other_org_name, _ = _get_organism_info(other_feat)
                         candida_orthologs.append(CandidaOrthologOut(
@@ -2034,11 +1976,15 @@ def get_locus_protein_details(db: Session, name: str) -> ProteinDetailsResponse:
         db.query(Feature)
         .options(
             joinedload(Feature.organism),
-            joinedload(Feature.protein_info).joinedload(ProteinInfo.protein_detail),
-            joinedload(Feature.feat_alias).joinedload(FeatAlias.alias),
-            joinedload(Feature.feat_url).joinedload(FeatUrl.url).joinedload(Url.web_display),
-            joinedload(Feature.feat_homology).joinedload(FeatHomology.homology_group),
-            joinedload(Feature.seq),
+            selectinload(Feature.protein_info).selectinload(ProteinInfo.protein_detail),
+            selectinload(Feature.feat_alias).joinedload(FeatAlias.alias),
+            selectinload(Feature.feat_url).joinedload(FeatUrl.url).selectinload(Url.web_display),
+            selectinload(Feature.feat_homology)
+                .joinedload(FeatHomology.homology_group)
+                .selectinload(HomologyGroup.feat_homology)
+                .joinedload(FeatHomology.feature)
+                .joinedload(Feature.organism),
+            selectinload(Feature.seq),
         )
         .filter(
             or_(
@@ -2114,41 +2060,24 @@ def get_locus_protein_details(db: Session, name: str) -> ProteinDetailsResponse:
 
         # Section 3: Allele Names - get from FeatRelationship (like Summary tab)
         allele_names = []
-        allele_relationships = (
-            db.query(FeatRelationship)
-            .filter(
-                FeatRelationship.parent_feature_no == f.feature_no,
-                FeatRelationship.relationship_type == 'allele',
-            )
-            .all()
-        )
-        for ar in allele_relationships:
-            allele_feature = (
-                db.query(Feature)
-                .filter(
-                    Feature.feature_no == ar.child_feature_no,
-                    func.lower(Feature.feature_type) == 'allele',
-                )
-                .first()
-            )
-            if allele_feature:
-                # Convert to protein format (e.g., C1_13700W_B -> C1_13700wp_b)
-                allele_name = allele_feature.feature_name
-                protein_allele = _systematic_name_to_protein_name(allele_name)
-
-                # Get references for this allele (from FEATURE table, GENE_NAME column)
-                allele_refs = add_refs_from_ref_link('FEATURE', 'GENE_NAME', allele_feature.feature_no)
-                if allele_refs:
-                    ref_sup = format_ref_superscript(allele_refs)
-                    allele_with_refs = f'{protein_allele}{ref_sup}'
-                else:
-                    allele_with_refs = protein_allele
+        for allele_feature in _get_allele_features(db, f.feature_no):
+            # Convert to protein format (e.g., C1_13700W_B -> C1_13700wp_b)
+            allele_name = allele_feature.feature_name
+            protein_allele = _systematic_name_to_protein_name(allele_name)
+
+            # Get references for this allele (from FEATURE table, GENE_NAME column)
+            allele_refs = add_refs_from_ref_link('FEATURE', 'GENE_NAME', allele_feature.feature_no)
+            if allele_refs:
+                ref_sup = format_ref_superscript(allele_refs)
+                allele_with_refs = f'{protein_allele}{ref_sup}'
+            else:
+                allele_with_refs = protein_allele
 
-                allele_names.append(ProteinAlleleNameOut(
-                    allele_name=allele_name,
-                    protein_allele_name=protein_allele,
-                    allele_name_with_refs=allele_with_refs,
-                ))
+            allele_names.append(ProteinAlleleNameOut(
+                allele_name=allele_name,
+                protein_allele_name=protein_allele,
+                allele_name_with_refs=allele_with_refs,
+            ))
 
         # Section 4: Description
         description = f.headline
@@ -2890,14 +2819,16 @@ def get_locus_homology_details(db: Session, name: str) -> HomologyDetailsRespons
     features = (
         db.query(Feature)
         .options(
+            # One query per collection: rows grow with the cluster size
+            # instead of members x external members
             joinedload(Feature.organism),
-            joinedload(Feature.feat_homology)
+            selectinload(Feature.feat_homology)
                 .joinedload(FeatHomology.homology_group)
-                .joinedload(HomologyGroup.dbxref_homology)
+                .selectinload(HomologyGroup.dbxref_homology)
                 .joinedload(DbxrefHomology.dbxref),
-            joinedload(Feature.feat_homology)
+            selectinload(Feature.feat_homology)
                 .joinedload(FeatHomology.homology_group)
-                .joinedload(HomologyGroup.feat_homology)
+                .selectinload(HomologyGroup.feat_homology)
                 .joinedload(FeatHomology.feature)
                 .joinedload(Feature.organism),
         )
@@ -2984,34 +2915,23 @@ def get_locus_homology_details(db: Session, name: str) -> HomologyDetailsRespons
                 # Get orf19 identifier for CGOB link (Assembly 19/21 identifier)
                 # For Assembly 22 features, look up via feat_relationship
                 orf19_id = f.feature_name  # Default to current feature name
-                orf19_row = (
-                    db.query(Feature.feature_name)
-                    .join(
-                        FeatRelationship,
-                        Feature.feature_no == FeatRelationship.child_feature_no
-                    )
-                    .filter(
-                        FeatRelationship.parent_feature_no == f.feature_no,
-                        FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-                        FeatRelationship.rank == 3,
-                    )
-                    .first()
+                orf19_row = get_relationship_map(db).a21_for_a22(
+                    f.feature_no, rank=PRIMARY_RANK
                 )
                 if orf19_row:
-                    orf19_id = orf19_row[0]
+                    orf19_id = orf19_row[1]
+
+                # Qualifiers of the query gene and all CGD members at once
+                qualifiers = _feature_qualifiers(
+                    db,
+                    {f.feature_no} | {
+                        other_fh.feature_no for other_fh in hg.feat_homology
+                    },
+                )
 
                 # Add query gene first
-                query_status = None
-                qualifier_row = (
-                    db.query(FeatProperty.property_value)
-                    .filter(
-                        FeatProperty.feature_no == f.feature_no,
-                        FeatProperty.property_type == 'feature_qualifier',
-                    )
-                    .first()
-                )
-                if qualifier_row:
-                    query_status = qualifier_row[0].upper() if qualifier_row[0] else None
+                query_qualifier = qualifiers.get(f.feature_no)
+                query_status = query_qualifier.upper() if query_qualifier else None
 
                 orthologs.append(OrthologOut(
                     sequence_id=format_seq_id(f.gene_name, f.feature_name),
@@ -3028,17 +2948,8 @@ def get_locus_homology_details(db: Session, name: str) -> HomologyDetailsRespons
                     if other_feat and other_feat.feature_no != f.feature_no:
                         other_org_name, _ = _get_organism_info(other_feat)
                         # Get status for this ortholog
-                        other_status = None
-                        other_qualifier = (
-                            db.query(FeatProperty.property_value)
-                            .filter(
-                                FeatProperty.feature_no == other_feat.feature_no,
-                                FeatProperty.property_type == 'feature_qualifier',
-                            )
-                            .first()
-                        )
-                        if other_qualifier:
-                            other_status = other_qualifier[0].upper() if other_qualifier[0] else None
+                        other_qualifier = qualifiers.get(other_feat.feature_no)
+                        other_status = other_qualifier.upper() if other_qualifier else None
 
                         orthologs.append(OrthologOut(
                             sequence_id=format_seq_id(other_feat.gene_name, other_feat.feature_name),
@@ -3500,6 +3411,27 @@ def _get_jbrowse_info(
     )
 
 
+def _get_allele_features(db: Session, feature_no: int, *options) -> list:
+    """
+    Get the allele features of a locus.
+
+    Allele feature_nos come from the in-memory relationship map; the
+    features themselves are fetched in one query, in relationship order.
+    """
+    allele_nos = get_relationship_map(db).alleles_of(feature_no)
+    if not allele_nos:
+        return []
+
+    query = db.query(Feature)
+    if options:
+        query = query.options(*options)
+    by_no = {
+        allele.feature_no: allele
+        for allele in query.filter(Feature.feature_no.in_(allele_nos)).all()
+    }
+    return [by_no[no] for no in allele_nos if no in by_no]
+
+
 def _get_allele_locations(
     db: Session,
     feature_no: int,
@@ -3522,34 +3454,12 @@ def _get_allele_locations(
     """
     allele_locations = []
 
-    # Get allele relationships for this feature
-    allele_relationships = (
-        db.query(FeatRelationship)
-        .filter(
-            FeatRelationship.parent_feature_no == feature_no,
-            FeatRelationship.relationship_type == 'allele',
-        )
-        .all()
+    # Get allele features (with locations) for this feature
+    alleles = _get_allele_features(
+        db, feature_no, joinedload(Feature.feat_location), joinedload(Feature.seq)
     )
 
-    for ar in allele_relationships:
-        # Get the allele feature with its location
-        allele = (
-            db.query(Feature)
-            .options(
-                joinedload(Feature.feat_location),
-                joinedload(Feature.seq),
-            )
-            .filter(
-                Feature.feature_no == ar.child_feature_no,
-                func.lower(Feature.feature_type) == 'allele',
-            )
-            .first()
-        )
-
-        if not allele:
-            continue
-
+    for allele in alleles:
         # Skip the primary allele (same name as main feature)
         if allele.feature_name == feature_name:
             continue
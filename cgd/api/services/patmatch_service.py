@@ -13,6 +13,7 @@ import tempfile
 import logging
 from typing import Optional, List, Dict, Tuple
 
+from cgd.core.metrics import track_subprocess
 from cgd.core.patmatch_config import (
     NRGREP_BINARY,
     PATMATCH_DATASETS,
@@ -187,12 +188,13 @@ def _run_nrgrep_search(
     logger.debug(f"Running nrgrep: {' '.join(cmd)}")
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minute timeout
-        )
+        with track_subprocess("nrgrep"):
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=300,  # 5 minute timeout
+            )
 
         if result.returncode != 0 and result.stderr:
             logger.warning(f"nrgrep stderr: {result.stderr}")
@@ -10,6 +10,7 @@ from collections import defaultdict
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, or_, distinct
 
+from cgd.api.services.cv_tree_service import CvTree, get_cv_tree
 from cgd.schemas.phenotype_schema import (
     PhenotypeSearchResponse,
     PhenotypeSearchResult,
@@ -33,9 +34,6 @@ from cgd.models.models import (
     RefUrl,
     Reference,
     Organism,
-    Cv,
-    CvTerm,
-    CvtermRelationship,
 )
 
 logger = logging.getLogger(__name__)
@@ -465,106 +463,41 @@ def search_phenotypes_summary(
     )
 
 
-def get_observable_tree(db: Session) -> ObservableTreeResponse:
+def observable_tree(cv_tree: CvTree) -> ObservableTreeResponse:
     """
-    Get hierarchical tree of observable terms.
+    Render the observable CV tree with annotation counts.
 
-    Returns observable terms with annotation counts, organized hierarchically
-    using the CV term relationships if available, or as a flat list otherwise.
+    Terms are nested by CV relationship and sorted by name; without
+    observable CV terms, every annotated observable is listed flat.
     """
-    # First, get all distinct observables from the Phenotype table with counts
-    observable_counts = (
-        db.query(
-            Phenotype.observable,
-            func.count(PhenoAnnotation.pheno_annotation_no).label('count')
+    def build_tree_node(term_no: int) -> ObservableTerm:
+        return ObservableTerm(
+            term=cv_tree.terms[term_no],
+            count=cv_tree.count(term_no),
+            children=[
+                build_tree_node(child_no)
+                for child_no in cv_tree.sorted_terms(cv_tree.children.get(term_no, []))
+            ],
         )
-        .join(PhenoAnnotation, PhenoAnnotation.phenotype_no == Phenotype.phenotype_no)
-        .group_by(Phenotype.observable)
-        .order_by(Phenotype.observable)
-        .all()
-    )
 
-    # Build a map of observable -> count
-    count_map = {obs: cnt for obs, cnt in observable_counts}
+    tree = [build_tree_node(root_no) for root_no in cv_tree.sorted_terms(cv_tree.roots)]
 
-    # Try to get the observable CV and its term hierarchy
-    observable_cv = (
-        db.query(Cv)
-        .filter(func.lower(Cv.cv_name) == 'observable')
-        .first()
-    )
-
-    if observable_cv:
-        # Get all CV terms for the observable CV
-        cv_terms = (
-            db.query(CvTerm)
-            .filter(CvTerm.cv_no == observable_cv.cv_no)
-            .all()
-        )
-
-        # Build a map of term_name -> CvTerm
-        term_map = {t.term_name: t for t in cv_terms}
-        term_no_map = {t.cv_term_no: t for t in cv_terms}
-
-        # Get all relationships for these terms
-        relationships = (
-            db.query(CvtermRelationship)
-            .filter(
-                or_(
-                    CvtermRelationship.parent_cv_term_no.in_([t.cv_term_no for t in cv_terms]),
-                    CvtermRelationship.child_cv_term_no.in_([t.cv_term_no for t in cv_terms]),
-                )
-            )
-            .all()
-        )
-
-        # Build parent -> children map
-        children_map: dict[int, list[int]] = defaultdict(list)
-        has_parent: set[int] = set()
-
-        for rel in relationships:
-            if rel.parent_cv_term_no in term_no_map and rel.child_cv_term_no in term_no_map:
-                children_map[rel.parent_cv_term_no].append(rel.child_cv_term_no)
-                has_parent.add(rel.child_cv_term_no)
-
-        # Find root terms (terms that have no parent)
-        root_term_nos = [t.cv_term_no for t in cv_terms if t.cv_term_no not in has_parent]
-
-        # Recursively build tree
-        def build_tree_node(term_no: int) -> ObservableTerm:
-            term = term_no_map[term_no]
-            term_name = term.term_name
-            count = count_map.get(term_name, 0)
-
-            children = []
-            for child_no in sorted(children_map.get(term_no, []), key=lambda x: term_no_map[x].term_name):
-                children.append(build_tree_node(child_no))
-
-            return ObservableTerm(
-                term=term_name,
-                count=count,
-                children=children,
-            )
-
-        # Build tree from roots
-        tree = []
-        for root_no in sorted(root_term_nos, key=lambda x: term_no_map[x].term_name):
-            tree.append(build_tree_node(root_no))
-
-        # If tree is empty but we have observables, fall back to flat list
-        if not tree and observable_counts:
-            tree = [
-                ObservableTerm(term=obs, count=cnt, children=[])
-                for obs, cnt in observable_counts
-            ]
-
-        return ObservableTreeResponse(tree=tree)
-
-    else:
-        # No observable CV found, return flat list of observables
+    # No CV (or an empty one): fall back to a flat list of observables
+    if not tree:
         tree = [
             ObservableTerm(term=obs, count=cnt, children=[])
-            for obs, cnt in observable_counts
+            for obs, cnt in cv_tree.counts.items()
         ]
 
-        return ObservableTreeResponse(tree=tree)
+    return ObservableTreeResponse(tree=tree)
+
+
+def get_observable_tree(db: Session) -> ObservableTreeResponse:
+    """
+    Get hierarchical tree of observable terms.
+
+    Returns observable terms with annotation counts, organized hierarchically
+    using the CV term relationships if available, or as a flat list otherwise.
+    Built from the shared CV tree cache.
+    """
+    return observable_tree(get_cv_tree(db, "observable"))
@@ -0,0 +1,290 @@
+"""
+Region Service.
+
+Answers "which features are at or near these coordinates" from an
+in-memory interval index per root sequence (chromosome or contig) rather
+than start/stop range predicates on FEAT_LOCATION.
+
+The current feature locations of a root are loaded once per process into
+a ``RootFeatures`` entry holding an ``IntervalIndex``. Entries are
+versioned by genome version: every lookup resolves the root name against
+the current SEQ and GENOME_VERSION rows, so a new assembly or a version
+switch loads a fresh index. Location edits within a version are picked up
+after ``REGION_INDEX_MAX_AGE`` seconds, or at once in the process that
+made them via ``invalidate_region_index``.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from cgd.core.settings import settings
+from cgd.models.models import Feature, FeatLocation, GenomeVersion, Seq
+from cgd.schemas.chromosome_schema import RegionFeatureOut, RegionFeaturesResponse
+from cgd.utils.intervals import IntervalIndex
+
+logger = logging.getLogger(__name__)
+
+REGION_MODES = ("overlap", "upstream", "downstream", "nearest")
+
+
+@dataclass(frozen=True)
+class RootSeq:
+    """A current root sequence and the genome version it belongs to."""
+
+    seq_no: int
+    feature_name: str
+    seq_length: int
+    genome_version_no: int
+    genome_version: str
+
+
+@dataclass
+class RootFeatures:
+    """Current feature locations on one root sequence, with their index."""
+
+    root: RootSeq
+    feature_no: np.ndarray
+    feature_name: list[str]
+    gene_name: list[Optional[str]]
+    feature_type: list[str]
+    start_coord: np.ndarray
+    stop_coord: np.ndarray
+    strand: list[Optional[str]]
+    index: IntervalIndex
+    loaded_at: float
+
+    @cached_property
+    def feature_nos(self) -> frozenset[int]:
+        return frozenset(self.feature_no.tolist())
+
+    def rows(self, ids: np.ndarray, distances: Optional[np.ndarray] = None) -> list[dict]:
+        """Feature dicts for index query results, in result order."""
+        rows = [
+            {
+                "feature_no": int(self.feature_no[i]),
+                "feature_name": self.feature_name[i],
+                "gene_name": self.gene_name[i],
+                "feature_type": self.feature_type[i],
+                "start_coord": int(self.start_coord[i]),
+                "stop_coord": int(self.stop_coord[i]),
+                "strand": self.strand[i],
+            }
+            for i in ids.tolist()
+        ]
+        if distances is not None:
+            for row, distance in zip(rows, distances.tolist()):
+                row["distance"] = distance
+        return rows
+
+
+def resolve_roots(db: Session, names: Iterable[str]) -> list[RootSeq]:
+    """Current genomic root sequences (current genome version) for the given names."""
+    upper_names = sorted({n.strip().upper() for n in names if n and n.strip()})
+    if not upper_names:
+        return []
+
+    rows = (
+        db.query(
+            Seq.seq_no,
+            Feature.feature_name,
+            Seq.seq_length,
+            GenomeVersion.genome_version_no,
+            GenomeVersion.genome_version,
+        )
+        .join(Feature, Feature.feature_no == Seq.feature_no)
+        .join(GenomeVersion, Seq.genome_version_no == GenomeVersion.genome_version_no)
+        .filter(
+            func.upper(Feature.feature_name).in_(upper_names),
+            func.upper(Seq.seq_type) == "GENOMIC",
+            Seq.is_seq_current == "Y",
+            GenomeVersion.is_ver_current == "Y",
+        )
+        .all()
+    )
+    return [RootSeq(*row) for row in rows]
+
+
+def load_root_features(db: Session, root: RootSeq, loaded_at: float) -> RootFeatures:
+    """Read a root's current feature locations and build their index."""
+    rows = (
+        db.query(
+            FeatLocation.feature_no,
+            Feature.feature_name,
+            Feature.gene_name,
+            Feature.feature_type,
+            FeatLocation.start_coord,
+            FeatLocation.stop_coord,
+            FeatLocation.strand,
+        )
+        .join(Feature, Feature.feature_no == FeatLocation.feature_no)
+        .filter(
+            FeatLocation.root_seq_no == root.seq_no,
+            FeatLocation.is_loc_current == "Y",
+        )
+        .all()
+    )
+    columns = list(zip(*rows)) if rows else [()] * 7
+    feature_no, names, gene_names, types, starts, stops, strands = columns
+    start_coord = np.asarray(starts, dtype=np.int64)
+    stop_coord = np.asarray(stops, dtype=np.int64)
+
+    logger.debug(
+        "Indexed %d feature locations on %s (%s)",
+        len(rows), root.feature_name, root.genome_version,
+    )
+    return RootFeatures(
+        root=root,
+        feature_no=np.asarray(feature_no, dtype=np.int64),
+        feature_name=list(names),
+        gene_name=list(gene_names),
+        feature_type=list(types),
+        start_coord=start_coord,
+        stop_coord=stop_coord,
+        strand=list(strands),
+        index=IntervalIndex(start_coord, stop_coord),
+        loaded_at=loaded_at,
+    )
+
+
+class RegionIndexCache:
+    """Per-process ``RootFeatures`` entries keyed by root seq_no."""
+
+    def __init__(self, max_age: float, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self._clock = clock
+        self._entries: dict[int, RootFeatures] = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, entry: RootFeatures, now: float) -> bool:
+        return now - entry.loaded_at <= self.max_age
+
+    def get(self, db: Session, root: RootSeq) -> RootFeatures:
+        with self._lock:
+            entry = self._entries.get(root.seq_no)
+        now = self._clock()
+        if entry is not None and entry.root == root and self._fresh(entry, now):
+            return entry
+
+        # Built outside the lock; concurrent misses on one root may both
+        # load it, and the last one wins
+        entry = load_root_features(db, root, now)
+        with self._lock:
+            self._entries = {
+                seq_no: cached
+                for seq_no, cached in self._entries.items()
+                if self._fresh(cached, now)
+            }
+            self._entries[root.seq_no] = entry
+        return entry
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries = {}
+
+
+_region_index: Optional[RegionIndexCache] = None
+_region_index_lock = threading.Lock()
+
+
+def get_region_index() -> RegionIndexCache:
+    """Process-wide cache, shared by all request handlers."""
+    global _region_index
+    with _region_index_lock:
+        if _region_index is None:
+            _region_index = RegionIndexCache(settings.region_index_max_age)
+        return _region_index
+
+
+def invalidate_region_index() -> None:
+    """Drop every cached index; call after committing feature location changes."""
+    get_region_index().invalidate()
+
+
+def get_root_features(db: Session, name: str) -> Optional[RootFeatures]:
+    """Indexed features of the named root sequence, or None if it is not current."""
+    roots = resolve_roots(db, [name])
+    if not roots:
+        return None
+    return get_region_index().get(db, roots[0])
+
+
+def feature_nos_on_roots(db: Session, names: Iterable[str]) -> set[int]:
+    """Features with a current location on any of the named root sequences."""
+    cache = get_region_index()
+    found: set[int] = set()
+    for root in resolve_roots(db, names):
+        found |= cache.get(db, root).feature_nos
+    return found
+
+
+def query_region(
+    features: RootFeatures,
+    start: int,
+    end: int,
+    mode: str = "overlap",
+    k: int = 10,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run one index query; upstream/downstream are relative to [start, end]."""
+    index = features.index
+    if mode == "overlap":
+        return index.overlap(start, end)
+    if mode == "upstream":
+        return index.upstream(min(start, end), k)
+    if mode == "downstream":
+        return index.downstream(max(start, end), k)
+    if mode == "nearest":
+        return index.nearest(start, end, k)
+    raise ValueError(f"Unknown region mode: {mode}")
+
+
+def get_region_features(
+    db: Session,
+    name: str,
+    start: int,
+    end: Optional[int] = None,
+    mode: str = "overlap",
+    k: int = 10,
+) -> RegionFeaturesResponse:
+    """
+    Features overlapping or nearest to a region of a chromosome/contig.
+
+    ``overlap`` returns every feature sharing a base with [start, end];
+    ``upstream``/``downstream`` return the k features wholly below/above it;
+    ``nearest`` returns the k closest, overlapping ones first.
+    """
+    if end is None:
+        end = start
+    if mode not in REGION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid mode '{mode}'; expected one of: {', '.join(REGION_MODES)}",
+        )
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be less than start")
+
+    features = get_root_features(db, name)
+    if features is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No current sequence for chromosome/contig '{name}'",
+        )
+
+    ids, distances = query_region(features, start, end, mode, k)
+    return RegionFeaturesResponse(
+        chromosome=features.root.feature_name,
+        genome_version=features.root.genome_version,
+        start=start,
+        end=end,
+        mode=mode,
+        features=[RegionFeatureOut(**row) for row in features.rows(ids, distances)],
+    )
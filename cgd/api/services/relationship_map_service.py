@@ -0,0 +1,239 @@
+"""
+Relationship Map Service.
+
+Holds the cross-assembly and allele relationships from FEAT_RELATIONSHIP
+in memory, so BLAST annotation, searches, GO pages and the locus page can
+look them up per feature without a query:
+
+- Assembly 21 Primary Allele: parent is the Assembly 22 feature
+  (C1_XXXXX_A), child its Assembly 21 (orf19.XXXX) counterpart
+- allele: parent is a locus, child one of its allele features
+
+The map is loaded once per process. Its version is the row count and
+highest feat_relationship_no of those two relationship types; it is
+re-checked at most every ``RELATIONSHIP_MAP_CHECK_INTERVAL`` seconds and
+the map reloaded when a data load has changed it. Curation that adds or
+removes relationships calls ``invalidate_relationship_map``.
+
+For filters that must stay inside a paginated or counting SQL statement,
+``a21_exclusion_subquery`` builds the equivalent anti-join subquery.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+
+from cgd.core.settings import settings
+from cgd.models.models import Feature, FeatRelationship
+
+logger = logging.getLogger(__name__)
+
+A21_RELATIONSHIP = "Assembly 21 Primary Allele"
+ALLELE_RELATIONSHIP = "allele"
+RELATIONSHIP_TYPES = (A21_RELATIONSHIP, ALLELE_RELATIONSHIP)
+
+# Rank of the curated one-to-one Assembly 21 <-> 22 and allele links
+PRIMARY_RANK = 3
+
+
+@dataclass
+class RelationshipMap:
+    """Assembly 21/22 and allele relationships, indexed both ways."""
+
+    version: tuple = ()
+    # A22 parent -> [(A21 child feature_no, child name, rank)], load order
+    a21_children: dict[int, list[tuple[int, str, Optional[int]]]] = field(default_factory=dict)
+    # A21 child -> A22 parent, rank 3 only
+    a22_parents: dict[int, int] = field(default_factory=dict)
+    # Upper-cased A22 name -> first A21 child name
+    orf19_by_name: dict[str, str] = field(default_factory=dict)
+    # Locus -> its children of feature type 'allele', load order
+    allele_children: dict[int, list[int]] = field(default_factory=dict)
+    # Assembly 21 features with an Assembly 22 equivalent (rank 3)
+    a21_with_a22: frozenset[int] = frozenset()
+    # a21_with_a22 plus their rank 3 alleles: hidden from search results
+    a21_exclusions: frozenset[int] = frozenset()
+
+    def a21_for_a22(self, feature_no: int, rank: Optional[int] = None) -> Optional[tuple[int, str]]:
+        """First Assembly 21 (feature_no, name) for an Assembly 22 feature."""
+        for child_no, child_name, child_rank in self.a21_children.get(feature_no, ()):
+            if rank is None or child_rank == rank:
+                return child_no, child_name
+        return None
+
+    def a22_for_a21(self, feature_no: int) -> Optional[int]:
+        """Assembly 22 feature_no for an Assembly 21 feature, if any."""
+        return self.a22_parents.get(feature_no)
+
+    def orf19_for_name(self, feature_name: str) -> Optional[str]:
+        """Assembly 21 (orf19) name for an Assembly 22 feature name."""
+        return self.orf19_by_name.get(feature_name.upper())
+
+    def alleles_of(self, feature_no: int) -> list[int]:
+        """Allele feature_nos of a locus."""
+        return self.allele_children.get(feature_no, [])
+
+
+def build_relationship_map(rows: Iterable[tuple], version: tuple = ()) -> RelationshipMap:
+    """
+    Index relationship rows.
+
+    Rows are (parent_no, parent_name, child_no, child_name, child_type,
+    relationship_type, rank) in feat_relationship_no order.
+    """
+    result = RelationshipMap(version=version)
+    allele_rank3: list[tuple[int, int]] = []
+
+    for parent_no, parent_name, child_no, child_name, child_type, rel_type, rank in rows:
+        if rel_type == A21_RELATIONSHIP:
+            result.a21_children.setdefault(parent_no, []).append((child_no, child_name, rank))
+            result.orf19_by_name.setdefault(parent_name.upper(), child_name)
+            if rank == PRIMARY_RANK:
+                result.a22_parents.setdefault(child_no, parent_no)
+        elif rel_type == ALLELE_RELATIONSHIP:
+            if (child_type or "").lower() == "allele":
+                result.allele_children.setdefault(parent_no, []).append(child_no)
+            if rank == PRIMARY_RANK:
+                allele_rank3.append((parent_no, child_no))
+
+    result.a21_with_a22 = frozenset(result.a22_parents)
+    result.a21_exclusions = result.a21_with_a22 | frozenset(
+        child_no for parent_no, child_no in allele_rank3
+        if parent_no in result.a21_with_a22
+    )
+    return result
+
+
+def _map_version(db: Session) -> tuple:
+    row = (
+        db.query(
+            func.count(FeatRelationship.feat_relationship_no),
+            func.max(FeatRelationship.feat_relationship_no),
+        )
+        .filter(FeatRelationship.relationship_type.in_(RELATIONSHIP_TYPES))
+        .one()
+    )
+    return tuple(row)
+
+
+def load_relationship_map(db: Session, version: tuple = ()) -> RelationshipMap:
+    """Read every Assembly 21 and allele relationship into a new map."""
+    parent = aliased(Feature)
+    child = aliased(Feature)
+    rows = (
+        db.query(
+            FeatRelationship.parent_feature_no,
+            parent.feature_name,
+            FeatRelationship.child_feature_no,
+            child.feature_name,
+            child.feature_type,
+            FeatRelationship.relationship_type,
+            FeatRelationship.rank,
+        )
+        .join(parent, parent.feature_no == FeatRelationship.parent_feature_no)
+        .join(child, child.feature_no == FeatRelationship.child_feature_no)
+        .filter(FeatRelationship.relationship_type.in_(RELATIONSHIP_TYPES))
+        .order_by(FeatRelationship.feat_relationship_no)
+        .all()
+    )
+    result = build_relationship_map(rows, version)
+    logger.info(
+        "Loaded relationship map: %d Assembly 21 links, %d loci with alleles",
+        len(result.a22_parents), len(result.allele_children),
+    )
+    return result
+
+
+class RelationshipMapCache:
+    """The process's current ``RelationshipMap``, re-validated periodically."""
+
+    def __init__(self, check_interval: float, clock: Callable[[], float] = time.monotonic):
+        self.check_interval = check_interval
+        self._clock = clock
+        self._map: Optional[RelationshipMap] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> RelationshipMap:
+        now = self._clock()
+        with self._lock:
+            current, checked_at = self._map, self._checked_at
+        if current is not None and now - checked_at < self.check_interval:
+            return current
+
+        version = _map_version(db)
+        if current is None or current.version != version:
+            current = load_relationship_map(db, version)
+        with self._lock:
+            self._map = current
+            self._checked_at = now
+        return current
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._map = None
+
+
+_relationship_maps: Optional[RelationshipMapCache] = None
+_relationship_maps_lock = threading.Lock()
+
+
+def _get_cache() -> RelationshipMapCache:
+    global _relationship_maps
+    with _relationship_maps_lock:
+        if _relationship_maps is None:
+            _relationship_maps = RelationshipMapCache(
+                settings.relationship_map_check_interval
+            )
+        return _relationship_maps
+
+
+def get_relationship_map(db: Session) -> RelationshipMap:
+    """The current relationship map, loading or refreshing it if needed."""
+    return _get_cache().get(db)
+
+
+def invalidate_relationship_map() -> None:
+    """Force a reload on next use; call after committing relationship changes."""
+    _get_cache().invalidate()
+
+
+def a21_exclusion_subquery(db: Session, include_alleles: bool = True):
+    """
+    Subquery of feature_nos hidden in favour of their Assembly 22 equivalent.
+
+    Covers Assembly 21 features with a rank 3 Assembly 22 parent and, with
+    ``include_alleles``, the rank 3 alleles of those features. Use as
+    ``~Feature.feature_no.in_(db.query(subq.c.feature_no))``.
+    """
+    direct_a21 = (
+        db.query(FeatRelationship.child_feature_no.label("feature_no"))
+        .filter(
+            FeatRelationship.relationship_type == A21_RELATIONSHIP,
+            FeatRelationship.rank == PRIMARY_RANK,
+        )
+    )
+    if not include_alleles:
+        return direct_a21.subquery()
+
+    alleles_of_a21 = (
+        db.query(FeatRelationship.child_feature_no.label("feature_no"))
+        .filter(
+            FeatRelationship.relationship_type == ALLELE_RELATIONSHIP,
+            FeatRelationship.rank == PRIMARY_RANK,
+            FeatRelationship.parent_feature_no.in_(
+                db.query(FeatRelationship.child_feature_no)
+                .filter(
+                    FeatRelationship.relationship_type == A21_RELATIONSHIP,
+                    FeatRelationship.rank == PRIMARY_RANK,
+                )
+            ),
+        )
+    )
+    return direct_a21.union(alleles_of_a21).subquery()
@@ -24,24 +24,20 @@ from cgd.schemas.restriction_mapper_schema import (
     EnzymeFilterInfo,
     RestrictionMapperConfigResponse,
 )
+from cgd.core.metrics import track_subprocess
 from cgd.core.restriction_config import (
     SCAN_FOR_MATCHES_BINARY,
     EnzymeFilterType as ConfigEnzymeFilterType,
     EnzymeInfo,
     load_enzymes,
     get_enzyme_file,
-    IUPAC_TO_REGEX,
-    get_reverse_complement,
 )
+from cgd.utils.seqkernels import iupac_to_regex, reverse_complement
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Complement mapping for Python fallback
-COMPLEMENT = {"A": "T", "T": "A", "C": "G", "G": "C"}
-
-
 def _check_binary_available() -> bool:
     """Check if the scan_for_matches binary is available and enabled."""
     # Allow disabling binary via environment variable
@@ -53,21 +49,13 @@ def _check_binary_available() -> bool:
 
 def _iupac_to_regex(pattern: str) -> str:
     """Convert IUPAC DNA pattern to regex."""
-    regex_parts = []
-    for char in pattern.upper():
-        if char in IUPAC_TO_REGEX:
-            regex_parts.append(IUPAC_TO_REGEX[char])
-        else:
-            # Unknown character, escape it
-            regex_parts.append(re.escape(char))
-    return "".join(regex_parts)
+    # Unknown characters are escaped
+    return iupac_to_regex(pattern)
 
 
 def _reverse_complement(seq: str) -> str:
     """Return the reverse complement of a DNA sequence."""
-    complement_map = str.maketrans("ACGTacgtRYSWKMBDHVNryswkmbdhvn",
-                                    "TGCAtgcaYRSWMKVHDBNyrswmkvhdbn")
-    return seq.translate(complement_map)[::-1]
+    return reverse_complement(seq)
 
 
 def _get_sequence_for_locus(
@@ -212,7 +200,7 @@ def _run_scan_for_matches(
                 # Run scan_for_matches with -c flag for complement search
                 cmd = [SCAN_FOR_MATCHES_BINARY, "-c", pat_file]
 
-                with open(seq_file, "r") as seq_input:
+                with open(seq_file, "r") as seq_input, track_subprocess("scan_for_matches"):
                     result = subprocess.run(
                         cmd,
                         stdin=seq_input,
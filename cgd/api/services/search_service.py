@@ -20,7 +20,6 @@ from cgd.schemas.search_schema import (
 )
 from cgd.models.models import (
     Feature,
-    FeatRelationship,
     Go,
     Phenotype,
     Reference,
@@ -30,6 +29,7 @@ from cgd.models.models import (
     RefUrl,
     Url,
 )
+from cgd.api.services.relationship_map_service import a21_exclusion_subquery, get_relationship_map
 
 
 def _normalize_query(query: str) -> str:
@@ -238,118 +238,6 @@ def resolve_identifier(db: Session, query: str) -> ResolveResponse:
     )
 
 
-def _get_a21_exclusion_subquery(db: Session):
-    """
-    Build a subquery that returns all feature_nos to exclude:
-    - Direct Assembly 21 features (have 'Assembly 21 Primary Allele' relationship)
-    - Alleles of Assembly 21 features (parent has 'Assembly 21 Primary Allele' relationship)
-
-    Returns a subquery that can be used with ~Feature.feature_no.in_(subquery)
-    """
-    # Direct Assembly 21 features
-    direct_a21 = (
-        db.query(FeatRelationship.child_feature_no.label('feature_no'))
-        .filter(
-            FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            FeatRelationship.rank == 3,
-        )
-    )
-
-    # Alleles of Assembly 21 features
-    # Join allele relationships with A21 relationships to find alleles whose parents are A21
-    alleles_of_a21 = (
-        db.query(FeatRelationship.child_feature_no.label('feature_no'))
-        .filter(
-            FeatRelationship.relationship_type == 'allele',
-            FeatRelationship.rank == 3,
-            FeatRelationship.parent_feature_no.in_(
-                db.query(FeatRelationship.child_feature_no)
-                .filter(
-                    FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-                    FeatRelationship.rank == 3,
-                )
-            )
-        )
-    )
-
-    # Union both
-    return direct_a21.union(alleles_of_a21).subquery()
-
-
-def _get_assembly21_feature_nos_to_exclude(db: Session, feature_nos: set[int]) -> set[int]:
-    """
-    Identify Assembly 21 features that have Assembly 22 equivalents.
-
-    In CGD, the same gene may have both Assembly 21 (orf19.XXXX) and
-    Assembly 22 (C7_XXXXX_A) feature records. We prefer Assembly 22.
-
-    This also excludes alleles of Assembly 21 features (e.g., orf19.8514 is an
-    allele of orf19.895, and should also be excluded when orf19.895 has an
-    Assembly 22 equivalent).
-
-    Args:
-        db: Database session
-        feature_nos: Set of feature_no values to check
-
-    Returns:
-        Set of feature_no values that are Assembly 21 versions with
-        Assembly 22 equivalents (these should be excluded from results)
-    """
-    if not feature_nos:
-        return set()
-
-    to_exclude = set()
-
-    # Find Assembly 21 features that have Assembly 22 parents
-    a21_relationships = (
-        db.query(FeatRelationship.child_feature_no)
-        .filter(
-            FeatRelationship.child_feature_no.in_(feature_nos),
-            FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            FeatRelationship.rank == 3,
-        )
-        .all()
-    )
-    direct_a21_features = {rel[0] for rel in a21_relationships}
-    to_exclude.update(direct_a21_features)
-
-    # Also find alleles of Assembly 21 features that have Assembly 22 equivalents
-    # These are features where parent has 'Assembly 21 Primary Allele' relationship
-    # and the child is an allele (relationship_type='allele')
-    if feature_nos:
-        # Find features in our set that are alleles of any feature
-        allele_relationships = (
-            db.query(FeatRelationship.child_feature_no, FeatRelationship.parent_feature_no)
-            .filter(
-                FeatRelationship.child_feature_no.in_(feature_nos),
-                FeatRelationship.relationship_type == 'allele',
-                FeatRelationship.rank == 3,
-            )
-            .all()
-        )
-
-        # Check if parent features have Assembly 22 equivalents
-        parent_feature_nos = {rel[1] for rel in allele_relationships}
-        if parent_feature_nos:
-            parents_with_a22 = (
-                db.query(FeatRelationship.child_feature_no)
-                .filter(
-                    FeatRelationship.child_feature_no.in_(parent_feature_nos),
-                    FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-                    FeatRelationship.rank == 3,
-                )
-                .all()
-            )
-            parents_to_exclude = {rel[0] for rel in parents_with_a22}
-
-            # Exclude alleles whose parents have Assembly 22 equivalents
-            for child_no, parent_no in allele_relationships:
-                if parent_no in parents_to_exclude:
-                    to_exclude.add(child_no)
-
-    return to_exclude
-
-
 def search_genes(db: Session, query: str, limit: int = 20) -> list[SearchResult]:
     """
     Search genes/loci by gene_name, feature_name, or aliases.
@@ -404,7 +292,7 @@ def search_genes(db: Session, query: str, limit: int = 20) -> list[SearchResult]
             found_feature_nos.add(feat.feature_no)
 
     # Filter out Assembly 21 features that have Assembly 22 equivalents
-    a21_to_exclude = _get_assembly21_feature_nos_to_exclude(db, found_feature_nos)
+    a21_to_exclude = get_relationship_map(db).a21_exclusions
 
     # Build results from direct matches (excluding Assembly 21 duplicates)
     for feat in direct_features:
@@ -877,7 +765,7 @@ def _count_genes(db: Session, query: str) -> int:
     upper_pattern = like_pattern.upper()
 
     # Subquery to identify Assembly 21 features to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Subquery for features matching directly (gene_name, feature_name, or dbxref_id)
     # Use label() to ensure column name is consistent in UNION
@@ -930,7 +818,7 @@ def _count_genes_by_organism(db: Session, query: str) -> dict[str, int]:
     upper_pattern = like_pattern.upper()
 
     # Subquery to identify Assembly 21 features to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Subquery for features matching directly (gene_name, feature_name, or dbxref_id)
     direct_subq = (
@@ -1132,7 +1020,7 @@ def _search_genes_all(db: Session, query: str) -> list[SearchResult]:
     upper_pattern = like_pattern.upper()
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Get all features matching directly (excluding Assembly 21)
     feature_query = (
@@ -8,7 +8,8 @@ from urllib.parse import quote, urlencode
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from cgd.models.models import Feature, Seq, FeatLocation, Organism, GenomeVersion, FeatRelationship
+from cgd.api.services.relationship_map_service import get_relationship_map
+from cgd.models.models import Feature, Seq, FeatLocation, Organism, GenomeVersion
 from cgd.schemas.seq_tools_schema import (
     InputType,
     SeqType,
@@ -103,23 +104,14 @@ def _get_assembly22_equivalent(db: Session, feature: Feature) -> Optional[Featur
     Returns:
         Assembly 22 feature if found, None otherwise
     """
-    relationship = (
-        db.query(FeatRelationship)
-        .filter(
-            FeatRelationship.child_feature_no == feature.feature_no,
-            FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            FeatRelationship.rank == 3,
-        )
-        .first()
-    )
-
-    if not relationship:
+    a22_feature_no = get_relationship_map(db).a22_for_a21(feature.feature_no)
+    if a22_feature_no is None:
         return None
 
     # Get the Assembly 22 parent feature
     a22_feature = (
         db.query(Feature)
-        .filter(Feature.feature_no == relationship.parent_feature_no)
+        .filter(Feature.feature_no == a22_feature_no)
         .first()
     )
 
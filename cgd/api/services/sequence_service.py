@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from cgd.models.models import Feature, Seq, FeatLocation, Organism
+from cgd.utils.seqkernels import reverse_complement
 from cgd.schemas.sequence_schema import (
     SeqType,
     SeqFormat,
@@ -17,13 +18,9 @@ from cgd.schemas.sequence_schema import (
 )
 
 
-# Complement mapping for reverse complement
-COMPLEMENT_MAP = str.maketrans("ACGTacgt", "TGCAtgca")
-
-
 def _reverse_complement(seq: str) -> str:
     """Return the reverse complement of a DNA sequence."""
-    return seq.translate(COMPLEMENT_MAP)[::-1]
+    return reverse_complement(seq)
 
 
 def _format_fasta_header(
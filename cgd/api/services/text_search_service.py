@@ -21,7 +21,6 @@ from cgd.schemas.search_schema import (
 )
 from cgd.models.models import (
     Feature,
-    FeatRelationship,
     Go,
     GoSynonym,
     GoGosyn,
@@ -46,6 +45,8 @@ from cgd.models.models import (
     RefProperty,
     RefUrl,
 )
+from cgd.api.services.relationship_map_service import a21_exclusion_subquery
+from cgd.core.columnar import encode_objects
 
 
 # Category display names for the frontend
@@ -77,6 +78,12 @@ CATEGORY_ORDER = [
 # Ortholog sources (from other MODs)
 ORTHOLOG_SOURCES = ["SGD", "POMBASE", "AspGD", "CGD"]
 
+# TextSearchResult fields in the columnar format
+TEXT_RESULT_COLUMNS = (
+    "category", "id", "name", "description", "link", "organism",
+    "match_context", "links", "highlighted_name", "highlighted_description",
+)
+
 
 def _normalize_query(query: str) -> str:
     """
@@ -312,132 +319,6 @@ def _build_citation_links_for_search(ref, ref_urls=None) -> list[SearchResultLin
     return links
 
 
-# =============================================================================
-# Assembly 21/22 Deduplication Helper
-# =============================================================================
-
-def _get_assembly21_feature_nos_to_exclude(db: Session, feature_nos: set[int]) -> set[int]:
-    """
-    Identify Assembly 21 features that have Assembly 22 equivalents.
-
-    In CGD, the same gene may have both Assembly 21 (orf19.XXXX) and
-    Assembly 22 (C7_XXXXX_A) feature records. We prefer Assembly 22.
-
-    The relationship is stored in FeatRelationship where:
-    - child_feature_no = Assembly 21 feature
-    - parent_feature_no = Assembly 22 feature
-    - relationship_type = 'Assembly 21 Primary Allele'
-    - rank = 3
-
-    This also excludes alleles of Assembly 21 features (e.g., orf19.8514 is an
-    allele of orf19.895, and should also be excluded when orf19.895 has an
-    Assembly 22 equivalent).
-
-    Args:
-        db: Database session
-        feature_nos: Set of feature_no values to check
-
-    Returns:
-        Set of feature_no values that are Assembly 21 versions with
-        Assembly 22 equivalents (these should be excluded from results)
-    """
-    if not feature_nos:
-        return set()
-
-    to_exclude = set()
-
-    # Find Assembly 21 features that have Assembly 22 parents
-    a21_relationships = (
-        db.query(FeatRelationship.child_feature_no)
-        .filter(
-            FeatRelationship.child_feature_no.in_(feature_nos),
-            FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            FeatRelationship.rank == 3,
-        )
-        .all()
-    )
-    direct_a21_features = {rel[0] for rel in a21_relationships}
-    to_exclude.update(direct_a21_features)
-
-    # Also find alleles of Assembly 21 features that have Assembly 22 equivalents
-    # These are features where parent has 'Assembly 21 Primary Allele' relationship
-    # and the child is an allele (relationship_type='allele')
-    if feature_nos:
-        # Find features in our set that are alleles of any feature
-        allele_relationships = (
-            db.query(FeatRelationship.child_feature_no, FeatRelationship.parent_feature_no)
-            .filter(
-                FeatRelationship.child_feature_no.in_(feature_nos),
-                FeatRelationship.relationship_type == 'allele',
-                FeatRelationship.rank == 3,
-            )
-            .all()
-        )
-
-        # Check if parent features have Assembly 22 equivalents
-        parent_feature_nos = {rel[1] for rel in allele_relationships}
-        if parent_feature_nos:
-            parents_with_a22 = (
-                db.query(FeatRelationship.child_feature_no)
-                .filter(
-                    FeatRelationship.child_feature_no.in_(parent_feature_nos),
-                    FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-                    FeatRelationship.rank == 3,
-                )
-                .all()
-            )
-            parents_to_exclude = {rel[0] for rel in parents_with_a22}
-
-            # Exclude alleles whose parents have Assembly 22 equivalents
-            for child_no, parent_no in allele_relationships:
-                if parent_no in parents_to_exclude:
-                    to_exclude.add(child_no)
-
-    return to_exclude
-
-
-# =============================================================================
-# Individual Category Search Functions
-# =============================================================================
-
-def _get_a21_exclusion_subquery(db: Session):
-    """
-    Build a subquery that returns all feature_nos to exclude:
-    - Direct Assembly 21 features (have 'Assembly 21 Primary Allele' relationship)
-    - Alleles of Assembly 21 features (parent has 'Assembly 21 Primary Allele' relationship)
-
-    Returns a subquery that can be used with ~Feature.feature_no.in_(subquery)
-    """
-    # Direct Assembly 21 features
-    direct_a21 = (
-        db.query(FeatRelationship.child_feature_no.label('feature_no'))
-        .filter(
-            FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-            FeatRelationship.rank == 3,
-        )
-    )
-
-    # Alleles of Assembly 21 features
-    # Join allele relationships with A21 relationships to find alleles whose parents are A21
-    alleles_of_a21 = (
-        db.query(FeatRelationship.child_feature_no.label('feature_no'))
-        .filter(
-            FeatRelationship.relationship_type == 'allele',
-            FeatRelationship.rank == 3,
-            FeatRelationship.parent_feature_no.in_(
-                db.query(FeatRelationship.child_feature_no)
-                .filter(
-                    FeatRelationship.relationship_type == 'Assembly 21 Primary Allele',
-                    FeatRelationship.rank == 3,
-                )
-            )
-        )
-    )
-
-    # Union both
-    return direct_a21.union(alleles_of_a21).subquery()
-
-
 def search_genes(db: Session, query: str, limit: int = 20) -> list[TextSearchResult]:
     """
     Search genes/loci by gene_name, feature_name, dbxref_id, or aliases.
@@ -451,7 +332,7 @@ def search_genes(db: Session, query: str, limit: int = 20) -> list[TextSearchRes
     upper_pattern = like_pattern.upper()
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Search in Feature table: gene_name, feature_name, dbxref_id
     # Exclude Assembly 21 features directly in SQL
@@ -550,7 +431,7 @@ def search_descriptions(
         return results
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Query with Assembly 21 exclusion built into the SQL
     # Order by exact phrase match first
@@ -1109,7 +990,7 @@ def search_notes(
         return results
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Search notes linked to features (with verified feature existence)
     # Exclude Assembly 21 features that have Assembly 22 equivalents
@@ -1304,7 +1185,7 @@ def _count_genes(db: Session, query: str) -> int:
     all_matches = direct_subq.union(alias_subq).subquery()
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Count distinct feature_nos, excluding Assembly 21 duplicates
     # Use labeled column name 'fno' from the UNION subquery
@@ -1358,7 +1239,7 @@ def _count_genes_by_organism(db: Session, query: str) -> dict[str, int]:
     all_matches = direct_subq.union(alias_subq).subquery()
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Join with Organism to get organism names and count by organism
     # Exclude Assembly 21 duplicates
@@ -1394,7 +1275,7 @@ def _count_descriptions(db: Session, query: str, match_mode: str = "all") -> int
         return 0
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     return (
         db.query(func.count(Feature.feature_no))
@@ -1620,7 +1501,7 @@ def _count_notes(db: Session, query: str, match_mode: str = "all") -> int:
         return 0
 
     # Subquery to get Assembly 21 feature_nos to exclude (includes alleles)
-    a21_subq = _get_a21_exclusion_subquery(db)
+    a21_subq = a21_exclusion_subquery(db)
 
     # Count notes linked to features that exist and have a displayable name
     # (gene_name or feature_name must be non-null)
@@ -1909,13 +1790,56 @@ def text_search_category(
     Returns:
         TextSearchCategoryPagedResponse with all results
     """
+    all_results, total_count, organism_counts = _search_category(
+        db, query, category, search_field, match_mode
+    )
+    return TextSearchCategoryPagedResponse(
+        query=query,
+        category=category,
+        results=all_results,
+        total_count=total_count,
+        organism_counts=organism_counts,
+    )
+
+
+def text_search_category_columnar(
+    db: Session,
+    query: str,
+    category: str,
+    search_field: str = "both",
+    match_mode: str = "all",
+) -> dict:
+    """
+    Search within a specific category, returning the results as a columnar table.
+
+    Same search as ``text_search_category``; results are read into columns
+    (category and organism dictionary-encoded) instead of being validated
+    again into the response model.
+    """
+    all_results, total_count, organism_counts = _search_category(
+        db, query, category, search_field, match_mode
+    )
+    return {
+        "query": query,
+        "category": category,
+        "results": encode_objects(
+            all_results, TEXT_RESULT_COLUMNS, dictionary=("category", "organism")
+        ),
+        "total_count": total_count,
+        "organism_counts": organism_counts,
+    }
+
+
+def _search_category(
+    db: Session,
+    query: str,
+    category: str,
+    search_field: str,
+    match_mode: str,
+) -> tuple[list[TextSearchResult], int, Optional[dict[str, int]]]:
+    """All results of one category, their total count and per-organism gene counts."""
     if category not in CATEGORY_SEARCH_FUNCTIONS:
-        return TextSearchCategoryPagedResponse(
-            query=query,
-            category=category,
-            results=[],
-            total_count=0,
-        )
+        return [], 0, None
 
     count_func = CATEGORY_COUNT_FUNCTIONS[category]
     search_func = CATEGORY_SEARCH_FUNCTIONS[category]
@@ -1943,10 +1867,4 @@ def text_search_category(
     if category == "genes":
         organism_counts = _count_genes_by_organism(db, query)
 
-    return TextSearchCategoryPagedResponse(
-        query=query,
-        category=category,
-        results=all_results,
-        total_count=total_count,
-        organism_counts=organism_counts,
-    )
+    return all_results, total_count, organism_counts
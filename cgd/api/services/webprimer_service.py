@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from cgd.models.models import Feature, Seq, FeatLocation, Organism
+from cgd.utils.seqkernels import gc_content, reverse_complement
 from cgd.schemas.webprimer_schema import (
     WebPrimerRequest,
     WebPrimerResponse,
@@ -136,25 +137,17 @@ def get_sequence_for_locus(
 
 def _complement_base(base: str) -> str:
     """Get complement of a single base."""
-    complements = {"A": "T", "T": "A", "G": "C", "C": "G",
-                   "a": "t", "t": "a", "g": "c", "c": "g",
-                   "N": "N", "n": "n"}
-    return complements.get(base, "N")
+    return reverse_complement(base, unknown="N")
 
 
 def _reverse_complement(seq: str) -> str:
     """Get reverse complement of a DNA sequence."""
-    return "".join(_complement_base(b) for b in reversed(seq))
+    return reverse_complement(seq, unknown="N")
 
 
 def _calculate_gc_percent(seq: str) -> float:
     """Calculate GC percentage of a sequence."""
-    seq = seq.upper()
-    gc_count = seq.count("G") + seq.count("C")
-    total = len(seq)
-    if total == 0:
-        return 0.0
-    return (gc_count / total) * 100
+    return gc_content(seq) * 100
 
 
 def _has_gc_clamp(seq: str) -> bool:
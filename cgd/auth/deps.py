@@ -4,19 +4,15 @@ from typing import Annotated, Optional
 
 from fastapi import Cookie, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
-
-from cgd.db.deps import get_db
 
 from .schemas import UserInfo
-from .service import AuthService, AuthenticationError
+from .service import AuthenticationError, verify_access_token
 
 # Security scheme for Swagger UI
 security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
-    db: Session = Depends(get_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     access_token: Optional[str] = Cookie(default=None),
 ) -> UserInfo:
@@ -27,8 +23,10 @@ async def get_current_user(
     1. Authorization header (Bearer token)
     2. access_token cookie
 
+    Verification needs no database session (see ``verify_access_token``),
+    so authenticating does not check out a pooled connection.
+
     Args:
-        db: Database session
         credentials: Bearer token from Authorization header
         access_token: Token from HttpOnly cookie
 
@@ -54,18 +52,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    auth_service = AuthService(db)
-
     try:
-        payload = auth_service.verify_token(token, token_type="access")
-        return UserInfo(
-            dbuser_no=payload["dbuser_no"],
-            userid=payload["sub"],
-            first_name=payload["first_name"],
-            last_name=payload["last_name"],
-            email=payload["email"],
-            status="Current",  # Only current users can have valid tokens
-        )
+        return verify_access_token(token)
     except AuthenticationError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,7 +63,6 @@ async def get_current_user(
 
 
 async def get_current_user_optional(
-    db: Session = Depends(get_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     access_token: Optional[str] = Cookie(default=None),
 ) -> Optional[UserInfo]:
@@ -86,7 +73,6 @@ async def get_current_user_optional(
     Useful for endpoints that behave differently for authenticated users.
 
     Args:
-        db: Database session
         credentials: Bearer token from Authorization header
         access_token: Token from HttpOnly cookie
 
@@ -103,18 +89,8 @@ async def get_current_user_optional(
     if not token:
         return None
 
-    auth_service = AuthService(db)
-
     try:
-        payload = auth_service.verify_token(token, token_type="access")
-        return UserInfo(
-            dbuser_no=payload["dbuser_no"],
-            userid=payload["sub"],
-            first_name=payload["first_name"],
-            last_name=payload["last_name"],
-            email=payload["email"],
-            status="Current",
-        )
+        return verify_access_token(token)
     except AuthenticationError:
         return None
 
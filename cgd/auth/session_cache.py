@@ -0,0 +1,157 @@
+"""
+Per-process caches for access-token verification.
+
+``get_current_user`` runs on every curator request. Checking a token's
+signature and expiry needs no database; checking that its session has not
+been revoked (logout) used to query CURATOR_SESSION on the request's
+session, which checked a pooled connection out before the route ran and
+held it until the request ended. Instead each process keeps:
+
+- the ids of revoked, unexpired sessions, re-read on a short-lived
+  primary session at most every ``AUTH_REVOCATION_CHECK_INTERVAL``
+  seconds (``revoke_session`` adds to it at once, so a logout takes
+  effect immediately in the worker that served it)
+- an LRU of verified tokens and the user info in their claims, so
+  repeat requests skip decoding the token
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from cgd.core.metrics import record_cache_lookup
+from cgd.core.settings import settings
+from cgd.db import engine as db_engine
+from cgd.db.engine import PRIMARY
+
+from .models import CuratorSession
+from .schemas import UserInfo
+
+logger = logging.getLogger(__name__)
+
+
+def load_revoked_sessions() -> list[str]:
+    """Ids of revoked sessions that have not yet expired."""
+    # expires_at is stored as naive UTC (see AuthService.create_access_token)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db = db_engine.session_factories[PRIMARY]()
+    try:
+        rows = (
+            db.query(CuratorSession.session_id)
+            .filter(
+                CuratorSession.revoked,
+                CuratorSession.expires_at > now,
+            )
+            .all()
+        )
+        return [session_id for session_id, in rows]
+    finally:
+        db.close()
+
+
+class RevokedSessions:
+    """Revoked session ids, re-read from the database every ``check_interval`` seconds."""
+
+    def __init__(
+        self,
+        check_interval: float,
+        load: Callable[[], Iterable[str]] = load_revoked_sessions,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.check_interval = check_interval
+        self._load = load
+        self._clock = clock
+        self._revoked: set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def contains(self, session_id: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            if self._loaded_at is None or now - self._loaded_at >= self.check_interval:
+                # Held while loading, so concurrent requests share one query
+                self._revoked = set(self._load())
+                self._loaded_at = now
+                logger.debug("Loaded %d revoked curator sessions", len(self._revoked))
+            return session_id in self._revoked
+
+    def add(self, session_id: str) -> None:
+        with self._lock:
+            self._revoked.add(session_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._revoked = set()
+            self._loaded_at = None
+
+
+class CachedToken(NamedTuple):
+    user: UserInfo
+    session_id: Optional[str]
+    # "exp" claim, seconds since the epoch
+    expires_at: float
+
+
+class TokenCache:
+    """LRU of verified access tokens."""
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        """The cached token, or None if it was never verified or has since expired."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[token]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(token)
+        record_cache_lookup("auth_token", hit=entry is not None)
+        return entry
+
+    def put(self, token: str, entry: CachedToken) -> None:
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_revoked_sessions: Optional[RevokedSessions] = None
+_token_cache: Optional[TokenCache] = None
+_caches_lock = threading.Lock()
+
+
+def get_revoked_sessions() -> RevokedSessions:
+    global _revoked_sessions
+    with _caches_lock:
+        if _revoked_sessions is None:
+            _revoked_sessions = RevokedSessions(settings.auth_revocation_check_interval)
+        return _revoked_sessions
+
+
+def get_token_cache() -> TokenCache:
+    global _token_cache
+    with _caches_lock:
+        if _token_cache is None:
+            _token_cache = TokenCache(settings.auth_token_cache_size)
+        return _token_cache
+
+
+def invalidate_auth_caches() -> None:
+    """Forget verified tokens and re-read revoked sessions on next use."""
+    get_token_cache().invalidate()
+    get_revoked_sessions().invalidate()
@@ -3,6 +3,8 @@ CLI management commands for CGD.
 
 Usage:
     python -m cgd.cli.commands reindex
+    python -m cgd.cli.commands migrate status
+    python -m cgd.cli.commands migrate upgrade [--to VERSION]
 """
 from __future__ import annotations
 
@@ -11,7 +13,8 @@ import logging
 import sys
 
 from cgd.core.elasticsearch import get_es_client
-from cgd.db.engine import SessionLocal
+from cgd.db import migrations
+from cgd.db.engine import SessionLocal, engine
 from cgd.api.services.es_indexer import rebuild_index
 
 logging.basicConfig(
@@ -47,6 +50,23 @@ def cmd_reindex() -> None:
         es.close()
 
 
+def cmd_migrate(action: str, target: int | None = None) -> None:
+    """Show or apply pending DDL migrations on the primary database."""
+    if action == "status":
+        pending_versions = {m.version for m in migrations.pending(engine)}
+        for migration in migrations.discover():
+            state = "pending" if migration.version in pending_versions else "applied"
+            logger.info(f"{migration.name:<30s} {state:<8s} {migration.description}")
+        return
+
+    try:
+        applied = migrations.upgrade(engine, target=target)
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        sys.exit(1)
+    logger.info(f"Applied {len(applied)} migration(s)")
+
+
 def main() -> None:
     """Main CLI entrypoint."""
     parser = argparse.ArgumentParser(
@@ -62,10 +82,23 @@ def main() -> None:
         help="Rebuild Elasticsearch index from database"
     )
 
+    # migrate command
+    migrate_parser = subparsers.add_parser(
+        "migrate",
+        help="Show or apply versioned DDL migrations (cgd/db/migrations)"
+    )
+    migrate_parser.add_argument("action", choices=["status", "upgrade"])
+    migrate_parser.add_argument(
+        "--to", type=int, dest="target",
+        help="Apply migrations up to and including this version"
+    )
+
     args = parser.parse_args()
 
     if args.command == "reindex":
         cmd_reindex()
+    elif args.command == "migrate":
+        cmd_migrate(args.action, args.target)
     else:
         parser.print_help()
         sys.exit(1)
@@ -0,0 +1,323 @@
+"""
+Cost-based admission control.
+
+BLAST, PatMatch and the bulk search/export endpoints can each hold a
+worker thread and a DB connection for tens of seconds. Routes declare a
+cost class with a dependency:
+
+    @router.post("/search", dependencies=[Depends(admission(ANALYSIS))])
+
+and requests of that class are admitted through:
+
+- a per-client share: at most ``ADMISSION_CLIENT_SHARE`` admitted or
+  queued requests per client and class; more get 429
+- per-class slots (``ADMISSION_ANALYSIS_SLOTS``, ``ADMISSION_BULK_SLOTS``)
+  bounding how many run at once
+- a per-class queue of ``ADMISSION_QUEUE_SIZE`` waiting requests; when it
+  is full, or a request waits longer than ``ADMISSION_QUEUE_TIMEOUT``, the
+  client gets 429 with a ``Retry-After`` estimated from recent run times
+
+Undeclared routes (locus pages, autocomplete, ...) are never admitted or
+queued: that is the reserved lane. Waiting happens on the event loop
+before the endpoint runs, so queued requests hold neither a thread-pool
+thread nor a DB connection.
+
+With ``ADMISSION_DIR`` set, slots, queue places and client shares are
+``flock`` files in that directory and apply across all gunicorn workers
+(a dead worker's locks are released by the kernel). Without it they are
+per process. Waiters poll, so admission is not strictly FIFO.
+
+Metrics: ``cgd_admission_queue_depth``, ``cgd_admission_in_flight``,
+``cgd_admission_wait_seconds`` and ``cgd_admission_rejections_total``.
+"""
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import hashlib
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional
+
+from fastapi import HTTPException, Request
+
+from cgd.core.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTIONS,
+    ADMISSION_WAIT,
+)
+from cgd.core.settings import settings
+
+# Cost classes
+ANALYSIS = "analysis"  # external tools: BLAST, PatMatch
+BULK = "bulk"  # whole-result searches, exports and enrichment analyses
+
+# Seconds between slot checks while queued
+POLL_INTERVAL = 0.05
+
+# Assumed run time (seconds) of a class before any request has finished
+INITIAL_RUN_TIME = 5.0
+
+# Client share files untouched for this long are removed
+CLIENT_FILE_MAX_AGE = 3600.0
+
+
+class LocalSlots:
+    """Counting slots shared by the threads of one process."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._used: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, name: str) -> Optional[Any]:
+        with self._lock:
+            used = self._used.get(name, 0)
+            if used >= self.size:
+                return None
+            self._used[name] = used + 1
+            return name
+
+    def release(self, token: Any) -> None:
+        with self._lock:
+            used = self._used.get(token, 0) - 1
+            if used > 0:
+                self._used[token] = used
+            else:
+                self._used.pop(token, None)
+
+
+class FileSlots:
+    """Slots held as ``flock`` locks on ``<dir>/<name>.<i>.lock`` files."""
+
+    def __init__(self, directory: str, size: int):
+        self.directory = Path(directory)
+        self.size = size
+
+    def try_acquire(self, name: str) -> Optional[Any]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for i in range(self.size):
+            path = self.directory / f"{name}.{i}.lock"
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            os.utime(fd)
+            return fd
+        return None
+
+    def release(self, token: Any) -> None:
+        fcntl.flock(token, fcntl.LOCK_UN)
+        os.close(token)
+
+    def sweep(self, prefix: str, max_age: float) -> None:
+        """Remove unlocked slot files named ``prefix*`` not used for ``max_age`` seconds."""
+        cutoff = time.time() - max_age
+        for path in self.directory.glob(f"{prefix}*.lock"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                fd = os.open(path, os.O_RDWR)
+            except OSError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                path.unlink()
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+
+@dataclass
+class CostClass:
+    """Limits and recent run time of one cost class."""
+
+    name: str
+    slots: int
+    queue_size: int
+    client_share: int
+    queue_timeout: float
+    run_time: float = INITIAL_RUN_TIME
+
+    def record_run_time(self, seconds: float) -> None:
+        # Exponentially weighted, so Retry-After follows the current load
+        self.run_time = 0.8 * self.run_time + 0.2 * seconds
+
+    def retry_after(self) -> int:
+        """Seconds until a queued request could expect a slot."""
+        return max(1, math.ceil(self.run_time * (self.queue_size + 1) / self.slots))
+
+
+class AdmissionController:
+    """Admits requests of each cost class through client, slot and queue limits."""
+
+    def __init__(
+        self,
+        classes: dict[str, CostClass],
+        directory: Optional[str] = None,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.classes = classes
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._pools: dict[tuple[str, str], Any] = {}
+        self._swept_at = time.monotonic()
+
+    def _pool(self, cost: CostClass, kind: str):
+        pool = self._pools.get((cost.name, kind))
+        if pool is None:
+            size = {"run": cost.slots, "queue": cost.queue_size, "client": cost.client_share}[kind]
+            pool = FileSlots(self.directory, size) if self.directory else LocalSlots(size)
+            self._pools[(cost.name, kind)] = pool
+        return pool
+
+    def _reject(self, cost: CostClass, reason: str, detail: str) -> HTTPException:
+        ADMISSION_REJECTIONS.labels(cost_class=cost.name, reason=reason).inc()
+        return HTTPException(
+            status_code=429,
+            detail=detail,
+            headers={"Retry-After": str(cost.retry_after())},
+        )
+
+    async def acquire(self, class_name: str, client: str) -> tuple:
+        """Wait for a slot; returns a token for ``release``. Raises 429."""
+        cost = self.classes[class_name]
+        client_pool = self._pool(cost, "client")
+        client_key = hashlib.sha1(client.encode()).hexdigest()[:16]
+        client_token = client_pool.try_acquire(f"{cost.name}.client.{client_key}")
+        if client_token is None:
+            raise self._reject(
+                cost, "client_share",
+                f"Too many concurrent {cost.name} requests from this client",
+            )
+
+        try:
+            run_token = await self._wait_for_slot(cost)
+        except BaseException:
+            client_pool.release(client_token)
+            raise
+        ADMISSION_IN_FLIGHT.labels(cost_class=cost.name).inc()
+        self._sweep()
+        return cost, run_token, client_token, time.monotonic()
+
+    async def _wait_for_slot(self, cost: CostClass) -> Any:
+        run_pool = self._pool(cost, "run")
+        started = time.monotonic()
+        run_token = run_pool.try_acquire(f"{cost.name}.run")
+        if run_token is not None:
+            ADMISSION_WAIT.labels(cost_class=cost.name).observe(0.0)
+            return run_token
+
+        queue_pool = self._pool(cost, "queue")
+        ticket = queue_pool.try_acquire(f"{cost.name}.queue")
+        if ticket is None:
+            raise self._reject(cost, "queue_full", f"The {cost.name} queue is full")
+
+        depth = ADMISSION_QUEUE_DEPTH.labels(cost_class=cost.name)
+        depth.inc()
+        try:
+            deadline = started + cost.queue_timeout
+            while run_token is None:
+                if time.monotonic() >= deadline:
+                    raise self._reject(
+                        cost, "timeout", f"Timed out waiting for a {cost.name} slot"
+                    )
+                await asyncio.sleep(self.poll_interval)
+                run_token = run_pool.try_acquire(f"{cost.name}.run")
+        finally:
+            depth.dec()
+            queue_pool.release(ticket)
+        ADMISSION_WAIT.labels(cost_class=cost.name).observe(time.monotonic() - started)
+        return run_token
+
+    def release(self, token: tuple) -> None:
+        cost, run_token, client_token, admitted_at = token
+        cost.record_run_time(time.monotonic() - admitted_at)
+        ADMISSION_IN_FLIGHT.labels(cost_class=cost.name).dec()
+        self._pool(cost, "run").release(run_token)
+        self._pool(cost, "client").release(client_token)
+
+    def _sweep(self) -> None:
+        if not self.directory or time.monotonic() - self._swept_at < CLIENT_FILE_MAX_AGE:
+            return
+        self._swept_at = time.monotonic()
+        for cost in self.classes.values():
+            self._pool(cost, "client").sweep(f"{cost.name}.client.", CLIENT_FILE_MAX_AGE)
+
+
+_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Process-wide controller configured from settings."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            def cost_class(name: str, slots: int) -> CostClass:
+                return CostClass(
+                    name=name,
+                    slots=slots,
+                    queue_size=settings.admission_queue_size,
+                    client_share=settings.admission_client_share,
+                    queue_timeout=settings.admission_queue_timeout,
+                )
+
+            _controller = AdmissionController(
+                {
+                    ANALYSIS: cost_class(ANALYSIS, settings.admission_analysis_slots),
+                    BULK: cost_class(BULK, settings.admission_bulk_slots),
+                },
+                directory=settings.admission_dir or None,
+            )
+        return _controller
+
+
+def client_id(request: Request) -> str:
+    """Client address, as forwarded by nginx (X-Real-IP) or seen directly."""
+    forwarded = request.headers.get("x-real-ip")
+    if forwarded:
+        return forwarded.strip()
+    return request.client.host if request.client else "unknown"
+
+
+def admission(
+    class_name: str,
+    applies: Optional[Callable[[Any], bool]] = None,
+) -> Callable[..., AsyncIterator[None]]:
+    """
+    Route dependency admitting requests of a cost class.
+
+    ``applies``, if given, receives the parsed JSON body; requests for
+    which it returns False are not admission-controlled (e.g. GO Term
+    Finder without a custom background).
+    """
+    async def dependency(request: Request) -> AsyncIterator[None]:
+        if not settings.admission_enabled:
+            yield
+            return
+        if applies is not None:
+            try:
+                body = await request.json()
+            except ValueError:
+                body = None
+            if not applies(body):
+                yield
+                return
+
+        controller = get_admission_controller()
+        token = await controller.acquire(class_name, client_id(request))
+        try:
+            yield
+        finally:
+            controller.release(token)
+
+    return dependency
@@ -0,0 +1,144 @@
+"""
+Columnar response format for large result sets.
+
+Endpoints that can return tens of thousands of rows (advanced feature
+search, text search by category, GO Term Finder) offer an opt-in format
+with one array per field instead of one object per row:
+
+    {
+      "success": true,
+      "total_count": 3,
+      "features": {
+        "fields": ["feature_id", "orf", "feature_type", ...],
+        "row_count": 3,
+        "columns": {"feature_id": [1, 2, 3], "feature_type": [0, 0, 1], ...},
+        "dictionaries": {"feature_type": ["ORF", "tRNA"]}
+      }
+    }
+
+Low-cardinality fields (organism, feature type, chromosome, ...) are
+dictionary-encoded: their column holds indexes into ``dictionaries``
+(null stays null). Tables are built from plain tuples or attribute reads,
+without per-row model validation, and serialized with orjson.
+
+Clients opt in with ``Accept: application/vnd.cgd.columnar+json`` or
+``?format=columnar``; endpoints take ``columnar: bool =
+Depends(columnar_requested)`` and return a ``ColumnarResponse``. Both
+formats are served from the same URL, so both send ``Vary: Accept``.
+"""
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Any, Iterable, Optional, Sequence
+
+import orjson
+from fastapi import Query, Request
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from cgd.core.http_compression import add_vary
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.cgd.columnar+json"
+COLUMNAR_FORMAT = "columnar"
+
+
+def columnar_requested(
+    request: Request,
+    response: Response,
+    format: Optional[str] = Query(
+        None,
+        description="Response format: 'json' (default) or 'columnar'",
+        pattern="^(json|columnar)$",
+    ),
+) -> bool:
+    """Dependency: whether the client asked for the columnar format."""
+    # Applies to the JSON path, where the endpoint returns a model
+    add_vary(response.headers, "Accept")
+    if format is not None:
+        return format == COLUMNAR_FORMAT
+    return COLUMNAR_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def encode_columns(
+    rows: Sequence[Sequence[Any]],
+    fields: Sequence[str],
+    dictionary: Iterable[str] = (),
+) -> dict:
+    """
+    Transpose row tuples (ordered as ``fields``) into a columnar table.
+
+    Fields named in ``dictionary`` are dictionary-encoded in order of
+    first appearance.
+    """
+    fields = list(fields)
+    if rows:
+        columns = dict(zip(fields, map(list, zip(*rows))))
+    else:
+        columns = {field: [] for field in fields}
+
+    dictionaries = {}
+    for field in dictionary:
+        codes: dict[Any, int] = {}
+        encoded = []
+        for value in columns[field]:
+            if value is None:
+                encoded.append(None)
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+            encoded.append(code)
+        columns[field] = encoded
+        dictionaries[field] = list(codes)
+
+    return {
+        "fields": fields,
+        "row_count": len(rows),
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
+
+
+def encode_objects(
+    objects: Sequence[Any],
+    fields: Sequence[str],
+    dictionary: Iterable[str] = (),
+) -> dict:
+    """Columnar table of attribute values read from objects (e.g. models)."""
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        rows = [(getter(obj),) for obj in objects]
+    else:
+        rows = [getter(obj) for obj in objects]
+    return encode_columns(rows, fields, dictionary)
+
+
+def decode_columns(table: dict) -> list[dict]:
+    """Rebuild row dicts from a columnar table (for clients and tests)."""
+    columns = dict(table["columns"])
+    for field, values in table["dictionaries"].items():
+        columns[field] = [None if code is None else values[code] for code in columns[field]]
+    fields = table["fields"]
+    return [dict(zip(fields, row)) for row in zip(*(columns[f] for f in fields))]
+
+
+def _default(value: Any) -> Any:
+    # Nested models (GO terms, citation links) inside a column
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ColumnarResponse(Response):
+    """Response serialized with orjson in the columnar media type."""
+
+    media_type = COLUMNAR_MEDIA_TYPE
+
+    def __init__(self, content: Any, status_code: int = 200, **kwargs: Any):
+        super().__init__(content, status_code, **kwargs)
+        add_vary(self.headers, "Accept")
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,355 @@
+"""
+HTTP response compression.
+
+``CompressionMiddleware`` negotiates a content coding from the request's
+``Accept-Encoding`` and compresses compressible responses (JSON, text,
+XML) above ``COMPRESSION_MIN_SIZE`` bytes. Server preference is zstd,
+then br, then gzip; zstd and br need the optional ``zstandard`` and
+``brotli`` packages, gzip is always available. Streamed responses are
+compressed chunk by chunk and flushed after each one, so downloads keep
+streaming.
+
+Responses that rarely change (genome snapshots, GO slim distributions,
+homology alignments) are built once and kept in a ``PrecompressedCache``
+with every available coding, so repeated hits cost neither the query nor
+the compression:
+
+    return precompressed_response(request, f"genome_snapshot:{abbrev}", build)
+
+Entries are rebuilt after ``PRECOMPRESSED_CACHE_MAX_AGE`` seconds. Curation
+services call ``invalidate_precompressed`` with the key prefixes their
+commits affect, so the worker that served the edit shows it at once;
+other workers, and changes made by loader scripts (orthologs, GO
+annotation loads), can lag by up to that age.
+
+Responses that already carry a ``Content-Encoding`` pass through the
+middleware untouched.
+"""
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cgd.core.metrics import record_cache_lookup
+from cgd.core.settings import settings
+from cgd.core.singleflight import get_single_flight
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_LEVEL = 6
+BROTLI_LEVEL = 5
+ZSTD_LEVEL = 6
+
+# Levels for precompressed responses: compressed once, served many times
+PRECOMPRESS_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Content codings this process can produce, in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def negotiate_encoding(
+    accept_encoding: str,
+    available: tuple[str, ...] = None,
+) -> Optional[str]:
+    """
+    Pick a content coding for an ``Accept-Encoding`` header value.
+
+    Returns the most preferred available coding with the highest q-value
+    the client accepts, or None for identity.
+    """
+    if available is None:
+        available = available_encodings()
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a complete body."""
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level or GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=level or BROTLI_LEVEL)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level or ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+class StreamEncoder:
+    """Incremental encoder; ``write`` returns output flushed so far."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=BROTLI_LEVEL)
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            raise ValueError(f"Unsupported content coding: {encoding}")
+
+    def write(self, data: bytes) -> bytes:
+        if self.encoding == "gzip":
+            return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def _compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith("text/") or any(
+        kind in content_type for kind in ("json", "xml", "javascript")
+    )
+
+
+def add_vary(headers: MutableHeaders, field: str = "Accept-Encoding") -> None:
+    """Add ``field`` to the Vary header, keeping any fields already listed."""
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = field
+    elif field.lower() not in [name.strip().lower() for name in vary.split(",")]:
+        headers["Vary"] = f"{vary}, {field}"
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with the negotiated coding."""
+
+    def __init__(self, app: ASGIApp, min_size: Optional[int] = None):
+        self.app = app
+        self.min_size = settings.compression_min_size if min_size is None else min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        encoder: Optional[StreamEncoder] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows the size
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                headers = MutableHeaders(scope=start)
+                if (
+                    "content-encoding" in headers
+                    or not _compressible(headers)
+                    or (not more_body and len(body) < self.min_size)
+                ):
+                    passthrough = True
+                    if _compressible(headers) and "content-encoding" not in headers:
+                        add_vary(headers)
+                    await send(start)
+                    await send(message)
+                    return
+                headers["Content-Encoding"] = encoding
+                add_vary(headers)
+                if "content-length" in headers:
+                    del headers["content-length"]
+                if not more_body:
+                    compressed = compress(body, encoding)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                encoder = StreamEncoder(encoding)
+                await send(start)
+
+            chunk = encoder.write(body) if body else b""
+            if not more_body:
+                chunk += encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+@dataclass
+class PrecompressedEntry:
+    """A response body in identity and every available content coding."""
+
+    media_type: str
+    bodies: dict[str, bytes]
+    created: float
+
+    @classmethod
+    def build(cls, body: bytes, media_type: str = "application/json", created: float = 0.0):
+        bodies = {"identity": body}
+        if len(body) >= settings.compression_min_size:
+            for encoding in available_encodings():
+                bodies[encoding] = compress(body, encoding, PRECOMPRESS_LEVELS[encoding])
+        return cls(media_type, bodies, created)
+
+    def response(self, accept_encoding: str) -> Response:
+        encoding = negotiate_encoding(accept_encoding, tuple(self.bodies))
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding is None or encoding == "identity":
+            body = self.bodies["identity"]
+        else:
+            body = self.bodies[encoding]
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class PrecompressedCache:
+    """LRU of precompressed response bodies, each kept for ``max_age`` seconds."""
+
+    def __init__(
+        self,
+        max_age: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, PrecompressedEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[PrecompressedEntry]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now - entry.created >= self.max_age:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: PrecompressedEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key: str, build: Callable[[], bytes]) -> PrecompressedEntry:
+        """Cached entry for ``key``, building (once per concurrent miss) if needed."""
+        entry = self.get(key)
+        record_cache_lookup("precompressed", hit=entry is not None)
+        if entry is not None:
+            return entry
+
+        def build_entry() -> PrecompressedEntry:
+            return PrecompressedEntry.build(build(), created=self._clock())
+
+        entry = get_single_flight().do(
+            f"precompressed:{key}", build_entry, name="precompressed"
+        )
+        self.put(key, entry)
+        return entry
+
+    def invalidate(self, prefix: str = "") -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+_cache: Optional[PrecompressedCache] = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> PrecompressedCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PrecompressedCache(
+                settings.precompressed_cache_max_age,
+                settings.precompressed_cache_max_entries,
+            )
+        return _cache
+
+
+def invalidate_precompressed(prefix: str = "") -> None:
+    """Drop cached responses whose key starts with ``prefix`` (all by default)."""
+    _get_cache().invalidate(prefix)
+
+
+def precompressed_response(
+    request: Request,
+    key: str,
+    build: Callable[[], BaseModel],
+) -> Response:
+    """
+    Serve a cacheable JSON response from the precompressed cache.
+
+    ``build`` returns the response model and runs only on a cache miss;
+    exceptions it raises (e.g. HTTPException) propagate and nothing is
+    cached.
+    """
+    entry = _get_cache().get_or_build(
+        key, lambda: build().model_dump_json(by_alias=True).encode()
+    )
+    return entry.response(request.headers.get("accept-encoding", ""))
@@ -0,0 +1,292 @@
+"""
+Prometheus metrics.
+
+Defines the application metrics and the helpers that record them:
+
+- HTTP: per-route latency histogram (``MetricsMiddleware``) and in-flight
+  gauge (``track_in_flight`` app dependency)
+- DB pool: checked-out and overflow gauges plus a checkout wait histogram
+  (``instrument_pool``)
+- External tools: BLAST, nrgrep and scan_for_matches durations and
+  timeouts (``track_subprocess``)
+- Service caches: hit/miss counters (``record_cache_lookup``)
+- Request coalescing: single-flight leader/follower counters
+  (``record_single_flight``)
+- Admission control: queue depth and in-flight gauges, queue wait
+  histogram and rejection counter per cost class (``cgd/core/admission.py``)
+
+Gunicorn runs several worker processes, so metrics are collected in
+prometheus_client's multiprocess mode whenever ``PROMETHEUS_MULTIPROC_DIR``
+is set (see ``deploy/gunicorn.conf.py``); ``/metrics`` then aggregates the
+per-process files. Without it (uvicorn --reload, tests) the default
+in-process registry is used.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Latency buckets spanning cheap lookups to long analysis requests
+REQUEST_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120,
+)
+TOOL_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 15, 30, 60)
+ADMISSION_WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 15, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "cgd_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "cgd_http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "cgd_db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "cgd_db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is filling)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "cgd_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+TOOL_DURATION = Histogram(
+    "cgd_tool_duration_seconds",
+    "External tool (subprocess) run time",
+    ["tool", "outcome"],
+    buckets=TOOL_BUCKETS,
+)
+TOOL_TIMEOUTS = Counter(
+    "cgd_tool_timeouts_total",
+    "External tool runs killed by their timeout",
+    ["tool"],
+)
+
+CACHE_LOOKUPS = Counter(
+    "cgd_cache_lookups_total",
+    "Service-level cache lookups",
+    ["cache", "result"],
+)
+
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "cgd_single_flight_requests_total",
+    "Requests to coalesced endpoints by single-flight role",
+    ["name", "role"],
+)
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "cgd_admission_queue_depth",
+    "Requests waiting for an admission slot",
+    ["cost_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "cgd_admission_in_flight",
+    "Admitted requests currently running",
+    ["cost_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "cgd_admission_wait_seconds",
+    "Time admitted requests waited for a slot",
+    ["cost_class"],
+    buckets=ADMISSION_WAIT_BUCKETS,
+)
+ADMISSION_REJECTIONS = Counter(
+    "cgd_admission_rejections_total",
+    "Requests rejected with 429 by admission control",
+    ["cost_class", "reason"],
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss (hit ratio = hit / (hit + miss))."""
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_single_flight(name: str, role: str) -> None:
+    """
+    Count a coalesced request by role: ``leader`` computed the result,
+    ``follower`` shared it within the process, ``worker_follower`` across
+    workers (coalescing ratio = non-leaders / total).
+    """
+    SINGLE_FLIGHT_REQUESTS.labels(name=name, role=role).inc()
+
+
+@contextmanager
+def track_subprocess(tool: str) -> Iterator[None]:
+    """
+    Time an external tool invocation.
+
+    Usage:
+        with track_subprocess("blast"):
+            subprocess.run(cmd, timeout=...)
+
+    ``subprocess.TimeoutExpired`` is counted and re-raised.
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except subprocess.TimeoutExpired:
+        outcome = "timeout"
+        TOOL_TIMEOUTS.labels(tool=tool).inc()
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        TOOL_DURATION.labels(tool=tool, outcome=outcome).observe(
+            time.perf_counter() - start
+        )
+
+
+def instrument_pool(engine: Engine, name: str = "default") -> None:
+    """Export pool occupancy and checkout wait time for an engine."""
+    pool = engine.pool
+    if getattr(pool, "_cgd_instrumented", False):
+        return
+
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool=name)
+    overflow_gauge = DB_POOL_OVERFLOW.labels(pool=name)
+
+    def _on_checkout(*_args) -> None:
+        checked_out.inc()
+
+    def _on_checkin(*_args) -> None:
+        checked_out.dec()
+
+    event.listen(pool, "checkout", _on_checkout)
+    event.listen(pool, "checkin", _on_checkin)
+
+    # Pool.connect() blocks while the pool is exhausted, so timing it
+    # measures the wait for a free connection.
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(pool=name).observe(
+                time.perf_counter() - start
+            )
+            # Overflow is sampled here, right after a checkout settles
+            if hasattr(pool, "overflow"):
+                overflow_gauge.set(pool.overflow())
+
+    pool.connect = timed_connect
+    pool._cgd_instrumented = True
+
+
+def resolve_route(scope: Scope) -> str:
+    """
+    Return the route template that served a request.
+
+    Read from ``scope["route"]`` once routing has run: FastAPI matches
+    routes of included routers inside the router itself, so they cannot
+    be resolved up front from ``app.router.routes``.
+    """
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+async def track_in_flight(request: Request) -> AsyncIterator[None]:
+    """
+    App-level dependency counting in-flight requests per route.
+
+    Dependencies run after routing, when the matched route is known.
+    Usage: ``FastAPI(dependencies=[Depends(track_in_flight)])``
+    """
+    if request.url.path == "/metrics":
+        yield
+        return
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(
+        method=request.method, route=resolve_route(request.scope)
+    )
+    in_progress.inc()
+    try:
+        yield
+    finally:
+        in_progress.dec()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request latency."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("path") == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                method=scope.get("method", "GET"),
+                route=resolve_route(scope),
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format (all workers)."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (gunicorn child_exit hook)."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(pid)
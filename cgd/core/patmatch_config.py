@@ -6,6 +6,8 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+from cgd.utils.seqkernels import reverse_complement
+
 
 # Binary tool paths
 NRGREP_BINARY = os.environ.get("NRGREP_BINARY", "/data/bin/nrgrep_coords")
@@ -284,5 +286,4 @@ def convert_pattern_for_nrgrep(
 
 def get_reverse_complement(seq: str) -> str:
     """Return the reverse complement of a DNA sequence."""
-    complement = str.maketrans('ACGTacgt', 'TGCAtgca')
-    return seq.translate(complement)[::-1]
+    return reverse_complement(seq)
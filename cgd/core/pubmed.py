@@ -0,0 +1,507 @@
+"""
+Shared PubMed E-utilities client.
+
+Used by the reference curation service and the PubMed loader cron so that
+every NCBI call in a process goes through one rate limiter and one cache:
+
+- efetch is batched (up to ``EFETCH_BATCH_SIZE`` PMIDs per POST) and the
+  batches run concurrently, each waiting on a token bucket sized to
+  NCBI's limits (3 requests/s, or 10/s with an API key).
+- Parsed MEDLINE records are kept in a SQLite file keyed by PMID and
+  revision date (the MEDLINE LR field), shared by all workers on a host.
+  Finalised MEDLINE citations are reused for ``pubmed_cache_max_age_days``;
+  in-process and publisher-supplied citations change as NCBI indexes
+  them, so they are refetched after a day.
+
+Records are the MEDLINE text format as dicts, with the same keys and value
+types as ``Bio.Medline`` (text fields are strings, repeated fields lists).
+
+Usage:
+    client = get_pubmed_client()
+    records = client.fetch_sync([12345, 67890])
+    metadata = medline_to_metadata(records[12345])
+
+    # from async code
+    records = await client.fetch(pmids)
+    id_lists = await client.search_many(queries)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+import httpx
+
+from cgd.core.metrics import record_cache_lookup
+from cgd.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EFETCH_BATCH_SIZE = 200
+DEFAULT_RATE = 3.0      # requests/s without an API key
+API_KEY_RATE = 10.0     # requests/s with an API key
+MAX_CONCURRENCY = 4
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 30.0
+IN_PROCESS_MAX_AGE = 24 * 3600
+
+# MEDLINE fields that hold a single (possibly wrapped) string; every other
+# field is a list of values, one per line starting with the tag
+MEDLINE_TEXT_KEYS = frozenset((
+    "ID", "PMID", "SO", "RF", "NI", "JC", "TA", "IS", "CY", "TT", "CA", "IP",
+    "VI", "DP", "YR", "PG", "LID", "DA", "LR", "OWN", "STAT", "DCOM", "PUBM",
+    "DEP", "PL", "JID", "SB", "PMC", "EDAT", "MHDA", "PST", "AB", "EA", "TI",
+    "JT",
+))
+# Continuation lines of these fields extend the last value, not add one
+MEDLINE_JOINED_KEYS = frozenset(("MH", "AD"))
+
+
+class PubMedError(Exception):
+    """Raised when E-utilities requests fail after retries."""
+
+    def __init__(
+        self,
+        message: str,
+        partial: Optional[dict[int, dict]] = None,
+        failed: Optional[list[int]] = None,
+    ):
+        super().__init__(message)
+        # Records from the batches that did succeed, and the PMIDs that did not
+        self.partial = partial or {}
+        self.failed = failed or []
+
+
+def _chunk_list(lst: list, chunk_size: int) -> list[list]:
+    """Split list into chunks."""
+    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+
+
+def parse_medline(text: str) -> Iterator[dict]:
+    """Parse MEDLINE text (efetch rettype=medline) into record dicts."""
+    record: dict = {}
+    key = ""
+    for line in text.splitlines():
+        if line.startswith("      ") and key:
+            if key in MEDLINE_JOINED_KEYS:
+                record[key][-1] += line[5:].rstrip()
+            else:
+                record[key].append(line[6:].rstrip())
+        elif line.strip():
+            key = line[:4].rstrip()
+            record.setdefault(key, []).append(line[6:].rstrip())
+        elif record:
+            yield _finish_record(record)
+            record = {}
+            key = ""
+    if record:
+        yield _finish_record(record)
+
+
+def _finish_record(record: dict) -> dict:
+    for key, values in record.items():
+        if key in MEDLINE_TEXT_KEYS:
+            record[key] = " ".join(values)
+    return record
+
+
+def record_pmid(record: dict) -> Optional[int]:
+    pmid = record.get("PMID", "")
+    return int(pmid) if pmid.isdigit() else None
+
+
+def record_revision(record: dict) -> str:
+    """Revision date of a record: last revised, else completed, else created."""
+    return record.get("LR") or record.get("DCOM") or record.get("DA") or ""
+
+
+def medline_to_metadata(record: dict) -> dict:
+    """Reference metadata (title, journal, authors, ...) from a MEDLINE record."""
+    authors = []
+    initials_by_name = {}
+    for short_name in record.get("AU", []):
+        last_name, _, initials = short_name.rpartition(" ")
+        initials_by_name.setdefault(last_name or short_name, initials)
+    if record.get("FAU"):
+        for full_name in record["FAU"]:
+            last_name, _, first_name = full_name.partition(", ")
+            authors.append({
+                "last_name": last_name,
+                "first_name": first_name,
+                "initials": initials_by_name.get(last_name, ""),
+            })
+    else:
+        for short_name in record.get("AU", []):
+            last_name, _, initials = short_name.rpartition(" ")
+            authors.append({
+                "last_name": last_name or short_name,
+                "first_name": "",
+                "initials": initials if last_name else "",
+            })
+
+    doi = None
+    for article_id in record.get("AID", []):
+        if article_id.endswith(" [doi]"):
+            doi = article_id[:-len(" [doi]")]
+            break
+
+    date_published = record.get("DP", "")
+    return {
+        "title": record.get("TI", ""),
+        "journal_name": record.get("JT", ""),
+        "journal_abbrev": record.get("TA", ""),
+        "year": int(date_published[:4]) if date_published[:4].isdigit() else None,
+        "volume": record.get("VI", ""),
+        "issue": record.get("IP", ""),
+        "pages": record.get("PG", ""),
+        "authors": authors,
+        "abstract": record.get("AB", ""),
+        "doi": doi,
+    }
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared by threads and event loops.
+
+    ``reserve`` takes a token under a thread lock and returns how long the
+    caller must wait for it; waiting happens outside the lock, so it works
+    the same from any thread or event loop (the sync wrappers run a new
+    loop per call).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        # A capacity of 1 spaces requests evenly, so no one-second window
+        # ever sees more than ``rate`` of them
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # Tokens go negative while callers are queued for future ones
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class MedlineCache:
+    """Parsed MEDLINE records in a SQLite file, keyed by (pmid, revised)."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_age: float,
+        in_process_max_age: float = IN_PROCESS_MAX_AGE,
+    ):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.in_process_max_age = min(in_process_max_age, max_age)
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS medline ("
+                " pmid INTEGER NOT NULL,"
+                " revised TEXT NOT NULL,"
+                " final INTEGER NOT NULL,"
+                " fetched REAL NOT NULL,"
+                " record TEXT NOT NULL,"
+                " PRIMARY KEY (pmid, revised))"
+            )
+            self._ready = True
+        return conn
+
+    def get_many(self, pmids: Iterable[int]) -> dict[int, dict]:
+        """Newest cached revision of each PMID that has not expired."""
+        now = time.time()
+        found: dict[int, dict] = {}
+        try:
+            conn = self._connect()
+            try:
+                for chunk in _chunk_list(list(pmids), 900):
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        "SELECT pmid, final, fetched, record FROM medline"
+                        f" WHERE pmid IN ({placeholders}) ORDER BY revised",
+                        chunk,
+                    )
+                    for pmid, final, fetched, record in rows:
+                        max_age = self.max_age if final else self.in_process_max_age
+                        if now - fetched <= max_age:
+                            found[pmid] = json.loads(record)
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"PubMed cache read failed ({self.path}): {e}")
+        return found
+
+    def put_many(self, records: Iterable[dict]) -> None:
+        """Store records, replacing older revisions of the same PMIDs."""
+        now = time.time()
+        rows = []
+        for record in records:
+            pmid = record_pmid(record)
+            if pmid is not None:
+                rows.append((
+                    pmid,
+                    record_revision(record),
+                    int(record.get("STAT") == "MEDLINE"),
+                    now,
+                    json.dumps(record),
+                ))
+        if not rows:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "DELETE FROM medline WHERE pmid = ? AND revised <> ?",
+                        [(pmid, revised) for pmid, revised, *_ in rows],
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO medline VALUES (?, ?, ?, ?, ?)", rows
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"PubMed cache write failed ({self.path}): {e}")
+
+
+class PubMedClient:
+    """Batched, rate-limited and cached E-utilities client."""
+
+    def __init__(
+        self,
+        base_url: str,
+        bucket: TokenBucket,
+        cache: Optional[MedlineCache] = None,
+        email: Optional[str] = None,
+        api_key: Optional[str] = None,
+        tool: str = "cgd-backend",
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        timeout: float = REQUEST_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.bucket = bucket
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._common_params = {"tool": tool}
+        if email:
+            self._common_params["email"] = email
+        if api_key:
+            self._common_params["api_key"] = api_key
+
+    async def _request(
+        self,
+        http: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        endpoint: str,
+        data: dict,
+    ) -> httpx.Response:
+        """POST to an E-utility, retrying rate limit, server and network errors."""
+        url = f"{self.base_url}/{endpoint}"
+        data = {**self._common_params, **data}
+        error = ""
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                retry_after = 2.0 ** attempt
+                try:
+                    response = await http.post(url, data=data)
+                except httpx.RequestError as e:
+                    error = f"{type(e).__name__}: {e}"
+                else:
+                    if response.status_code == 200:
+                        return response
+                    error = f"HTTP {response.status_code}"
+                    if response.status_code != 429 and response.status_code < 500:
+                        break
+                    header = response.headers.get("Retry-After", "")
+                    if header.isdigit():
+                        retry_after = float(header)
+                if attempt < self.max_retries:
+                    logger.info(f"{endpoint} failed ({error}); retrying in {retry_after}s")
+                    await asyncio.sleep(retry_after)
+        raise PubMedError(f"{endpoint} failed: {error}")
+
+    def _http_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self.timeout)
+
+    async def fetch(self, pmids: Iterable[int], refresh: bool = False) -> dict[int, dict]:
+        """
+        MEDLINE records for ``pmids``, from the cache where possible.
+
+        PMIDs PubMed does not know are left out of the result. If any
+        batch fails, raises PubMedError carrying the records that were
+        retrieved (``partial``) and the PMIDs that were not (``failed``).
+        """
+        wanted = list(dict.fromkeys(int(pmid) for pmid in pmids))
+        records = {} if refresh or self.cache is None else self.cache.get_many(wanted)
+        for pmid in wanted:
+            record_cache_lookup("pubmed", hit=pmid in records)
+        missing = [pmid for pmid in wanted if pmid not in records]
+        if not missing:
+            return records
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batches = _chunk_list(missing, EFETCH_BATCH_SIZE)
+        async with self._http_client() as http:
+            results = await asyncio.gather(
+                *(self._fetch_batch(http, semaphore, batch) for batch in batches),
+                return_exceptions=True,
+            )
+
+        fetched: list[dict] = []
+        failed: list[int] = []
+        errors = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                failed.extend(batch)
+                errors.append(str(result))
+            else:
+                fetched.extend(result)
+        if self.cache is not None:
+            self.cache.put_many(fetched)
+        for record in fetched:
+            records[record_pmid(record)] = record
+
+        if failed:
+            raise PubMedError(
+                f"Failed to fetch {len(failed)} PubMed record(s): {errors[0]}",
+                partial=records,
+                failed=failed,
+            )
+        return records
+
+    async def _fetch_batch(
+        self,
+        http: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        pmids: list[int],
+    ) -> list[dict]:
+        response = await self._request(http, semaphore, "efetch.fcgi", {
+            "db": "pubmed",
+            "id": ",".join(str(pmid) for pmid in pmids),
+            "rettype": "medline",
+            "retmode": "text",
+        })
+        return [
+            record for record in parse_medline(response.text)
+            if record_pmid(record) is not None
+        ]
+
+    async def search(self, term: str, retmax: int = 9000) -> list[int]:
+        """PMIDs matching a PubMed query."""
+        return (await self.search_many([term], retmax=retmax))[0]
+
+    async def search_many(
+        self, terms: list[str], retmax: int = 9000
+    ) -> list[Union[list[int], PubMedError]]:
+        """
+        Run PubMed queries concurrently.
+
+        Returns one entry per term, in order: the PMID list, or the
+        PubMedError for a query that failed.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._http_client() as http:
+            results = await asyncio.gather(
+                *(self._search(http, semaphore, term, retmax) for term in terms),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, PubMedError):
+                raise result
+        return results
+
+    async def _search(
+        self,
+        http: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        term: str,
+        retmax: int,
+    ) -> list[int]:
+        response = await self._request(http, semaphore, "esearch.fcgi", {
+            "db": "pubmed",
+            "term": term,
+            "retmax": str(retmax),
+            "retmode": "json",
+        })
+        try:
+            result = response.json()["esearchresult"]
+        except (ValueError, KeyError) as e:
+            raise PubMedError(f"esearch returned an unexpected response: {e}")
+        if "ERROR" in result:
+            raise PubMedError(f"esearch error: {result['ERROR']}")
+        return [int(pmid) for pmid in result.get("idlist", [])]
+
+    # Sync wrappers for request handlers and scripts. Each runs its own
+    # event loop, so they must not be called from a coroutine.
+
+    def fetch_sync(self, pmids: Iterable[int], refresh: bool = False) -> dict[int, dict]:
+        return asyncio.run(self.fetch(pmids, refresh=refresh))
+
+    def search_many_sync(
+        self, terms: list[str], retmax: int = 9000
+    ) -> list[Union[list[int], PubMedError]]:
+        return asyncio.run(self.search_many(terms, retmax=retmax))
+
+
+_client: Optional[PubMedClient] = None
+_client_lock = threading.Lock()
+
+
+def get_pubmed_client() -> PubMedClient:
+    """Process-wide client, so all callers share one rate limit and cache."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            rate = API_KEY_RATE if settings.ncbi_api_key else DEFAULT_RATE
+            cache = None
+            if settings.pubmed_cache_path:
+                cache = MedlineCache(
+                    settings.pubmed_cache_path,
+                    max_age=settings.pubmed_cache_max_age_days * 86400,
+                )
+            _client = PubMedClient(
+                settings.ncbi_eutils_url,
+                TokenBucket(rate),
+                cache=cache,
+                email=settings.ncbi_email,
+                api_key=settings.ncbi_api_key,
+            )
+        return _client
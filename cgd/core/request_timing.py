@@ -0,0 +1,158 @@
+"""
+Request timing middleware.
+
+Wraps every HTTP request in a ``QueryStats`` collection (see
+``cgd.db.query_stats``) and reports it three ways:
+
+- a ``Server-Timing`` response header (``db`` and ``app`` metrics), visible
+  in the browser dev tools network panel
+- one structured ``key=value`` log line per request on the ``cgd.request``
+  logger
+- warnings for slow statements and N+1 statement shapes on ``cgd.sql``
+
+Outside production (``CGD_ENV != production``) a request can also be
+profiled by sending ``X-CGD-Profile: 1`` (or ``?_profile=1``). A stack
+sampler then records every thread for the duration of the request and
+writes collapsed stacks (flamegraph.pl / speedscope format) to
+``REQUEST_PROFILE_DIR``.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cgd.core.settings import settings
+from cgd.db.query_stats import log_query_stats, start_query_stats, stop_query_stats
+
+logger = logging.getLogger("cgd.request")
+
+PROFILE_HEADER = b"x-cgd-profile"
+PROFILE_QUERY_PARAM = b"_profile=1"
+
+
+def route_name(scope: Scope) -> str:
+    """Return the matched route template (e.g. /api/locus/{name}) or the raw path."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path or scope.get("path", "-")
+
+
+class StackSampler:
+    """
+    Minimal sampling profiler.
+
+    A daemon thread snapshots ``sys._current_frames()`` every ``interval``
+    seconds and counts collapsed stacks. Sampling all threads (rather than
+    only the caller) is what makes it useful for sync endpoints, which
+    FastAPI runs in a worker thread pool.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _profiling_requested(scope: Scope) -> bool:
+    if settings.environment == "production":
+        return False
+    if PROFILE_QUERY_PARAM in scope.get("query_string", b"").split(b"&"):
+        return True
+    return any(
+        name == PROFILE_HEADER and value not in (b"", b"0")
+        for name, value in scope.get("headers", [])
+    )
+
+
+class RequestTimingMiddleware:
+    """ASGI middleware reporting per-request SQL statistics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = start_query_stats()
+        sampler = StackSampler() if _profiling_requested(scope) else None
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                stats.route = route_name(scope)
+                app_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.db_time_ms:.1f};desc="{stats.statements} queries", '
+                    f"app;dur={app_ms:.1f}",
+                )
+            await send(message)
+
+        if sampler is not None:
+            sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_query_stats()
+            if stats.route is None:
+                stats.route = route_name(scope)
+            duration_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                f"request method={scope.get('method')} route={stats.route} "
+                f"status={status_code} duration_ms={duration_ms:.1f} "
+                f"db_queries={stats.statements} db_ms={stats.db_time_ms:.1f} "
+                f"db_rows={stats.rows}"
+            )
+            log_query_stats(stats)
+            if sampler is not None:
+                sampler.stop()
+                safe_route = stats.route.strip("/").replace("/", "_") or "root"
+                path = Path(settings.request_profile_dir) / (
+                    f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_route}.folded"
+                )
+                sampler.write(path)
+                logger.info(f"profile route={stats.route} file={path}")
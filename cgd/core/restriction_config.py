@@ -6,6 +6,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from cgd.utils.seqkernels import iupac_to_regex, reverse_complement
+
 
 # Binary tool path
 SCAN_FOR_MATCHES_BINARY = os.environ.get("SCAN_FOR_MATCHES_BINARY", "/data/bin/scan_for_matches")
@@ -227,19 +229,9 @@ IUPAC_TO_REGEX = {
 
 def pattern_to_regex(pattern: str) -> str:
     """Convert IUPAC DNA pattern to regex."""
-    regex_parts = []
-    for char in pattern.upper():
-        if char in IUPAC_TO_REGEX:
-            regex_parts.append(IUPAC_TO_REGEX[char])
-        else:
-            regex_parts.append(char)
-    return "".join(regex_parts)
+    return iupac_to_regex(pattern, escape_unknown=False)
 
 
 def get_reverse_complement(seq: str) -> str:
     """Return the reverse complement of a DNA sequence."""
-    complement_map = str.maketrans(
-        "ACGTacgtRYSWKMBDHVNryswkmbdhvn",
-        "TGCAtgcaYRSWMKVHDBNyrswmkvhdbn"
-    )
-    return seq.translate(complement_map)[::-1]
+    return reverse_complement(seq)
@@ -14,6 +14,7 @@ class Settings(BaseSettings):
 
     Optional:
       - DB_SCHEMA: used for prefixing table names in raw SQL: "{schema}.{table}"
+      - DATABASE_READ_URL: read replica for public read-only and analysis routes
       - CGD_DATA_DIR: path to CGD data files (homology alignments, trees, etc.)
     """
 
@@ -22,6 +23,26 @@ class Settings(BaseSettings):
     database_url: str
     db_schema: Optional[str] = None
 
+    # Connection pools, one per workload (see cgd.db.engine)
+    database_read_url: Optional[str] = Field(
+        default=None,
+        validation_alias="DATABASE_READ_URL",
+        description="Read replica URL; public reads and analyses use the primary if unset",
+    )
+    db_pool_timeout: int = Field(
+        default=30,
+        validation_alias="DB_POOL_TIMEOUT",
+        description="Seconds to wait for a pooled connection before failing",
+    )
+    db_primary_pool_size: int = Field(default=5, validation_alias="DB_PRIMARY_POOL_SIZE")
+    db_primary_max_overflow: int = Field(default=5, validation_alias="DB_PRIMARY_MAX_OVERFLOW")
+    db_read_pool_size: int = Field(default=10, validation_alias="DB_READ_POOL_SIZE")
+    db_read_max_overflow: int = Field(default=10, validation_alias="DB_READ_MAX_OVERFLOW")
+    db_curation_pool_size: int = Field(default=5, validation_alias="DB_CURATION_POOL_SIZE")
+    db_curation_max_overflow: int = Field(default=5, validation_alias="DB_CURATION_MAX_OVERFLOW")
+    db_analysis_pool_size: int = Field(default=3, validation_alias="DB_ANALYSIS_POOL_SIZE")
+    db_analysis_max_overflow: int = Field(default=2, validation_alias="DB_ANALYSIS_MAX_OVERFLOW")
+
     # JWT Authentication settings
     jwt_secret_key: str = Field(
         default_factory=lambda: secrets.token_urlsafe(32),
@@ -43,6 +64,16 @@ class Settings(BaseSettings):
         validation_alias="COOKIE_DOMAIN",
         description="Domain for auth cookies (e.g., '.dev.candidagenome.org' for cross-subdomain)",
     )
+    auth_revocation_check_interval: float = Field(
+        default=30,
+        validation_alias="AUTH_REVOCATION_CHECK_INTERVAL",
+        description="Seconds between re-reads of revoked curator sessions (other workers' logouts)",
+    )
+    auth_token_cache_size: int = Field(
+        default=1024,
+        validation_alias="AUTH_TOKEN_CACHE_SIZE",
+        description="Verified access tokens kept per process",
+    )
 
     # Path to CGD data files (default matches typical production setup)
     cgd_data_dir: str = "/data"
@@ -80,6 +111,177 @@ class Settings(BaseSettings):
         description="Path to external blast_clade.conf file"
     )
 
+    # Deployment environment ("production", "staging", "development", ...)
+    environment: str = Field(
+        default="production",
+        validation_alias="CGD_ENV",
+        description="Deployment environment; debugging hooks are disabled in production",
+    )
+
+    # SQL instrumentation
+    sql_instrumentation: bool = Field(
+        default=True,
+        validation_alias="SQL_INSTRUMENTATION",
+        description="Collect per-request SQL statistics and emit Server-Timing headers",
+    )
+    sql_slow_query_ms: float = Field(
+        default=500.0,
+        validation_alias="SQL_SLOW_QUERY_MS",
+        description="Statements slower than this (ms) are logged",
+    )
+    sql_n_plus_one_threshold: int = Field(
+        default=20,
+        validation_alias="SQL_N_PLUS_ONE_THRESHOLD",
+        description="Log a statement shape repeated more than this many times in one request",
+    )
+    request_profile_dir: str = Field(
+        default="/tmp/cgd_profiles",
+        validation_alias="REQUEST_PROFILE_DIR",
+        description="Where per-request profiles are written (non-production only)",
+    )
+
+    # Include router groups on first request instead of at startup
+    lazy_routers: bool = Field(
+        default=False,
+        validation_alias="CGD_LAZY_ROUTERS",
+        description="Import router groups on first use (faster worker start-up)",
+    )
+
+    # NCBI E-utilities (see cgd.core.pubmed)
+    ncbi_email: Optional[str] = Field(
+        default="admin@candidagenome.org",
+        validation_alias="NCBI_EMAIL",
+        description="Contact email sent with E-utilities requests (required by NCBI)",
+    )
+    ncbi_api_key: Optional[str] = Field(
+        default=None,
+        validation_alias="NCBI_API_KEY",
+        description="E-utilities API key; raises the rate limit from 3 to 10 requests/s",
+    )
+    ncbi_eutils_url: str = Field(
+        default="https://eutils.ncbi.nlm.nih.gov/entrez/eutils",
+        validation_alias="NCBI_EUTILS_URL",
+    )
+    pubmed_cache_path: Optional[str] = Field(
+        default="/tmp/cgd_pubmed_cache.sqlite",
+        validation_alias="PUBMED_CACHE_PATH",
+        description="SQLite file caching parsed MEDLINE records; empty disables the cache",
+    )
+    pubmed_cache_max_age_days: float = Field(
+        default=30,
+        validation_alias="PUBMED_CACHE_MAX_AGE_DAYS",
+        description="Days a finalised MEDLINE record is reused before refetching",
+    )
+
+    # Region feature index
+    region_index_max_age: float = Field(
+        default=300,
+        validation_alias="REGION_INDEX_MAX_AGE",
+        description="Seconds a root sequence's feature interval index is reused before reloading",
+    )
+
+    # Assembly 21/22 and allele relationship map
+    relationship_map_check_interval: float = Field(
+        default=60,
+        validation_alias="RELATIONSHIP_MAP_CHECK_INTERVAL",
+        description="Seconds between checks of FEAT_RELATIONSHIP for changes to reload",
+    )
+
+    # In-memory GO DAG
+    go_dag_check_interval: float = Field(
+        default=60,
+        validation_alias="GO_DAG_CHECK_INTERVAL",
+        description="Seconds between checks of GO, GO_PATH and GO_ANNOTATION for changes to reload",
+    )
+    go_dag_max_age: float = Field(
+        default=86400,
+        validation_alias="GO_DAG_MAX_AGE",
+        description="Seconds the GO DAG is reused before rebuilding even if unchanged",
+    )
+
+    # Controlled-vocabulary trees
+    cv_tree_check_interval: float = Field(
+        default=60,
+        validation_alias="CV_TREE_CHECK_INTERVAL",
+        description="Seconds between checks of a CV's terms and annotation counts for changes",
+    )
+
+    # Single-flight request coalescing
+    single_flight_enabled: bool = Field(
+        default=True,
+        validation_alias="SINGLE_FLIGHT_ENABLED",
+        description="Share one computation among concurrent identical requests",
+    )
+    single_flight_dir: Optional[str] = Field(
+        default=None,
+        validation_alias="SINGLE_FLIGHT_DIR",
+        description="Directory for lock/result files coalescing requests across workers",
+    )
+    single_flight_wait_timeout: float = Field(
+        default=30,
+        validation_alias="SINGLE_FLIGHT_WAIT_TIMEOUT",
+        description="Seconds to wait for another worker's result before computing it",
+    )
+
+    # Response compression
+    compression_enabled: bool = Field(
+        default=True,
+        validation_alias="COMPRESSION_ENABLED",
+        description="Compress responses with the negotiated content coding (zstd, br, gzip)",
+    )
+    compression_min_size: int = Field(
+        default=1024,
+        validation_alias="COMPRESSION_MIN_SIZE",
+        description="Smallest response body (bytes) worth compressing",
+    )
+    precompressed_cache_max_age: float = Field(
+        default=600,
+        validation_alias="PRECOMPRESSED_CACHE_MAX_AGE",
+        description="Seconds a precompressed cacheable response is served before rebuilding",
+    )
+    precompressed_cache_max_entries: int = Field(
+        default=512,
+        validation_alias="PRECOMPRESSED_CACHE_MAX_ENTRIES",
+        description="Precompressed responses kept per worker (least recently used evicted)",
+    )
+
+    # Admission control for heavy endpoints
+    admission_enabled: bool = Field(
+        default=True,
+        validation_alias="ADMISSION_ENABLED",
+        description="Queue and limit analysis/bulk requests by cost class",
+    )
+    admission_dir: Optional[str] = Field(
+        default=None,
+        validation_alias="ADMISSION_DIR",
+        description="Directory for slot lock files shared by all workers (unset: per worker)",
+    )
+    admission_analysis_slots: int = Field(
+        default=2,
+        validation_alias="ADMISSION_ANALYSIS_SLOTS",
+        description="Concurrent BLAST/PatMatch requests",
+    )
+    admission_bulk_slots: int = Field(
+        default=4,
+        validation_alias="ADMISSION_BULK_SLOTS",
+        description="Concurrent bulk search, export and enrichment requests",
+    )
+    admission_queue_size: int = Field(
+        default=16,
+        validation_alias="ADMISSION_QUEUE_SIZE",
+        description="Requests per cost class allowed to wait for a slot",
+    )
+    admission_queue_timeout: float = Field(
+        default=15,
+        validation_alias="ADMISSION_QUEUE_TIMEOUT",
+        description="Seconds a request waits for a slot before getting 429",
+    )
+    admission_client_share: int = Field(
+        default=2,
+        validation_alias="ADMISSION_CLIENT_SHARE",
+        description="Running or queued requests per client and cost class",
+    )
+
     # JBrowse configuration
     jbrowse_base_url: str = Field(
         default="/jbrowse/index.html",
@@ -0,0 +1,305 @@
+"""
+Single-flight request coalescing.
+
+Identical concurrent requests for an expensive, idempotent endpoint (a
+popular locus page, a GO term, a text search) share one computation
+instead of each running the full query set:
+
+    @router.get("/{name}")
+    @single_flight("locus")
+    def locus(name: str, db: Session = Depends(get_db)):
+        ...
+
+Within a worker process the first request for a key becomes the leader
+and runs the endpoint; requests arriving while it runs wait for it and
+return the same result (or raise the same exception). Nothing is cached:
+once the leader finishes, the next request computes afresh.
+
+With ``SINGLE_FLIGHT_DIR`` set, leaders in different gunicorn workers
+also coordinate through a ``flock`` on a per-key file in that directory.
+The worker holding the lock computes and writes the pickled result next
+to it. Leaders in other workers wait for the lock and reuse that result
+if it was written after they started waiting; otherwise they compute it
+themselves.
+
+Coalescing is counted in ``cgd_single_flight_requests_total`` by role
+(leader / follower / worker_follower); the coalescing ratio is
+(follower + worker_follower) / total.
+
+Only sync endpoints are supported: FastAPI runs them in its thread pool,
+which is where followers block.
+"""
+from __future__ import annotations
+
+import fcntl
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from cgd.core.metrics import record_single_flight
+from cgd.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Endpoint parameters that never distinguish requests
+DEFAULT_EXCLUDE = ("db", "current_user", "request")
+
+# How often each process sweeps stale files out of SINGLE_FLIGHT_DIR
+SWEEP_INTERVAL = 60.0
+
+
+class _Call:
+    """One in-flight computation and the requests waiting on it."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key (per process, optionally per host)."""
+
+    def __init__(
+        self,
+        lock_dir: Optional[str] = None,
+        wait_timeout: float = 30.0,
+        poll_interval: float = 0.01,
+    ):
+        self.lock_dir = Path(lock_dir) if lock_dir else None
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._swept_at = 0.0
+
+    def do(self, key: str, fn: Callable[[], Any], name: str = "default") -> Any:
+        """Run ``fn`` once for all concurrent callers with ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            record_single_flight(name, "follower")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._lead(key, fn, name)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _lead(self, key: str, fn: Callable[[], Any], name: str) -> Any:
+        if self.lock_dir is None:
+            record_single_flight(name, "leader")
+            return fn()
+
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        lock_path = self.lock_dir / f"{digest}.lock"
+        result_path = self.lock_dir / f"{digest}.result"
+        try:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.warning("single-flight lock unavailable for %s: %s", name, e)
+            record_single_flight(name, "leader")
+            return fn()
+
+        try:
+            waited_from = time.time()
+            if not self._acquire(fd):
+                # Another worker is computing this key; reuse its result
+                # if it finished while we waited
+                shared = self._read_result(result_path, waited_from)
+                if shared is not None:
+                    record_single_flight(name, "worker_follower")
+                    return shared[0]
+                if not self._acquire(fd, block=False):
+                    record_single_flight(name, "leader")
+                    return fn()
+
+            try:
+                record_single_flight(name, "leader")
+                result = fn()
+                self._write_result(result_path, result)
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+            self._sweep()
+
+    def _acquire(self, fd: int, block: bool = True) -> bool:
+        """Take the lock at once (True) or, if ``block``, wait for it to be released (False)."""
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            # Neither flock nor opening the file touches its mtime; mark
+            # it in use so the sweep keeps it
+            os.utime(fd)
+            return True
+        except BlockingIOError:
+            if not block:
+                return False
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            break
+        return False
+
+    @staticmethod
+    def _read_result(path: Path, newer_than: float) -> Optional[tuple[Any]]:
+        try:
+            if path.stat().st_mtime < newer_than:
+                return None
+            with open(path, "rb") as f:
+                return (pickle.load(f),)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Unreadable single-flight result %s: %s", path.name, e)
+            return None
+
+    @staticmethod
+    def _write_result(path: Path, result: Any) -> None:
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning("Could not share single-flight result %s: %s", path.name, e)
+            tmp.unlink(missing_ok=True)
+
+    def _sweep(self) -> None:
+        """Remove files of keys not requested for a while."""
+        now = time.time()
+        if now - self._swept_at < SWEEP_INTERVAL:
+            return
+        self._swept_at = now
+        cutoff = now - SWEEP_INTERVAL
+        for path in self.lock_dir.iterdir():
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                if path.suffix == ".lock":
+                    self._unlink_unlocked(path)
+                elif path.suffix == ".tmp":
+                    # <digest>.<pid>.tmp: keep results still being written
+                    if not _process_alive(int(path.suffixes[-2][1:])):
+                        path.unlink()
+                else:
+                    path.unlink()
+            except (OSError, ValueError, IndexError):
+                pass
+
+    @staticmethod
+    def _unlink_unlocked(path: Path) -> None:
+        """Remove a lock file unless a leader holds it."""
+        fd = os.open(path, os.O_RDWR)
+        try:
+            # Unlinking a held lock would let the next worker lock a new
+            # file and lead alongside the current leader
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            path.unlink()
+        finally:
+            os.close(fd)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def request_key(name: str, params: dict, exclude: Iterable[str] = DEFAULT_EXCLUDE) -> str:
+    """
+    Normalized key for a request: endpoint name plus its parameters.
+
+    Parameters are sorted by name, strings are stripped, and parameters
+    in ``exclude`` (the DB session, the current user) are left out.
+    """
+    skip = set(exclude)
+    normalized = {}
+    for key in sorted(params):
+        if key in skip:
+            continue
+        value = params[key]
+        if isinstance(value, str):
+            value = value.strip()
+        normalized[key] = value
+    return f"{name}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+_group: Optional[SingleFlight] = None
+_group_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide group shared by every coalesced endpoint."""
+    global _group
+    with _group_lock:
+        if _group is None:
+            _group = SingleFlight(
+                lock_dir=settings.single_flight_dir or None,
+                wait_timeout=settings.single_flight_wait_timeout,
+            )
+        return _group
+
+
+def single_flight(name: str, exclude: Iterable[str] = DEFAULT_EXCLUDE) -> Callable:
+    """
+    Decorator coalescing concurrent identical calls of a sync endpoint.
+
+    ``name`` labels the endpoint in keys and metrics. Apply it below the
+    route decorator so FastAPI still sees the endpoint's signature.
+    """
+    exclude = tuple(exclude)
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            raise TypeError("single_flight only supports sync endpoints")
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.single_flight_enabled:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = request_key(name, bound.arguments, exclude)
+            return get_single_flight().do(
+                key, functools.partial(fn, *args, **kwargs), name=name
+            )
+
+        return wrapper
+
+    return decorator
@@ -5,8 +5,12 @@ This package provides database connection and session management
 using SQLAlchemy.
 
 Modules:
-- engine: Database engine configuration and SessionLocal factory
-- deps: Database session dependency for FastAPI
+- engine: Per-workload engines (primary, read replica, curation, analysis)
+  and the SessionLocal factory
+- deps: Database session dependency for FastAPI, routed by route tag
+- query_stats: Per-request SQL statistics
+- migrations: Versioned DDL migrations (indexes), applied with
+  ``python -m cgd.cli.commands migrate upgrade``
 
 Usage:
     from cgd.db.engine import SessionLocal
@@ -17,5 +21,6 @@ Usage:
 
 Environment Variables:
     DATABASE_URL: SQLAlchemy database connection URL
+    DATABASE_READ_URL: Read replica connection URL (optional)
     DB_SCHEMA: Database schema name (default: MULTI)
 """
@@ -1,11 +1,39 @@
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
+
+from fastapi import Request
 from sqlalchemy.orm import Session
 
-from cgd.db.engine import SessionLocal
+from cgd.db import engine as db_engine
+from cgd.db.engine import ANALYSIS, CURATION, PRIMARY, READ
+
+# Route tags whose requests get their own workload pool; see cgd.db.engine.
+# Routes with other tags (the public pages) use the read pool.
+PRIMARY_TAGS = frozenset({"auth"})
+ANALYSIS_TAGS = frozenset({
+    "batch-download",
+    "feature-search",
+    "go-slim-mapper",
+    "go-term-finder",
+})
+
+
+def workload_for_tags(tags: Iterable[str]) -> str:
+    """Pick the connection pool for a route from its tags."""
+    for tag in tags:
+        if tag in PRIMARY_TAGS:
+            return PRIMARY
+        # curation-* routers, and "Literature Review Curation"
+        if "curation" in tag.lower():
+            return CURATION
+        if tag in ANALYSIS_TAGS:
+            return ANALYSIS
+    return READ
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+def get_db(request: Request) -> Generator[Session, None, None]:
+    route = request.scope.get("route")
+    workload = workload_for_tags(getattr(route, "tags", None) or ())
+    db = db_engine.session_factories[workload]()
     try:
         yield db
     finally:
@@ -1,14 +1,84 @@
+"""
+Database engines, one per workload.
+
+Each workload gets its own bounded connection pool, so a burst of long
+analysis requests cannot starve curators (or public pages) of connections:
+
+- primary: the primary database; scripts, the CLI and authentication
+  (``engine`` / ``SessionLocal``)
+- read: public read-only routers, on the read replica
+- curation: curator routers (writes), on the primary
+- analysis: long read-only requests (feature search, GO Term Finder,
+  GO Slim Mapper, batch download), on the read replica
+
+The replica is ``DATABASE_READ_URL``; without it the read and analysis
+pools connect to the primary. ``cgd.db.deps.get_db`` picks the workload
+from the tags of the route being served.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
+from cgd.core.metrics import instrument_pool
 from cgd.core.settings import settings
+from cgd.db.query_stats import install_query_listeners
+
+PRIMARY = "primary"
+READ = "read"
+CURATION = "curation"
+ANALYSIS = "analysis"
+
+WORKLOADS = (PRIMARY, READ, CURATION, ANALYSIS)
+
+
+def _pool_config(workload: str) -> tuple[int, int]:
+    """(pool_size, max_overflow) for a workload from settings."""
+    return (
+        getattr(settings, f"db_{workload}_pool_size"),
+        getattr(settings, f"db_{workload}_max_overflow"),
+    )
+
+
+def create_workload_engines(
+    primary_url: str, read_url: Optional[str] = None
+) -> dict[str, Engine]:
+    """Create one pooled, instrumented engine per workload."""
+    urls = {
+        PRIMARY: primary_url,
+        READ: read_url or primary_url,
+        CURATION: primary_url,
+        ANALYSIS: read_url or primary_url,
+    }
+    engines = {}
+    for workload, url in urls.items():
+        pool_size, max_overflow = _pool_config(workload)
+        eng = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+        if settings.sql_instrumentation:
+            install_query_listeners(eng)
+        instrument_pool(eng, name=workload)
+        engines[workload] = eng
+    return engines
+
+
+def create_session_factories(engines: dict[str, Engine]) -> dict[str, sessionmaker]:
+    return {
+        workload: sessionmaker(bind=eng, autoflush=False, autocommit=False)
+        for workload, eng in engines.items()
+    }
+
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    pool_timeout=60,
-)
+engines = create_workload_engines(settings.database_url, settings.database_read_url)
+session_factories = create_session_factories(engines)
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+engine = engines[PRIMARY]
+SessionLocal = session_factories[PRIMARY]
@@ -0,0 +1,154 @@
+"""
+Versioned DDL migrations.
+
+Each ``vNNNN_<name>.py`` module in this package is one migration: a
+``DESCRIPTION`` and an ``upgrade(connection)`` that issues its DDL. The
+applied versions are recorded in ``MULTI.schema_migration``; ``upgrade``
+runs the pending ones in version order, each in its own transaction, so a
+database can be brought up to date from any point:
+
+    python -m cgd.cli.commands migrate status
+    python -m cgd.cli.commands migrate upgrade
+
+Migrations must be safe to run against a database that already has some
+of their objects (``create_index`` skips existing indexes): the production
+Oracle schema predates this package, and replicas or test databases may
+not.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import pkgutil
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "MULTI"
+
+_MODULE_NAME = re.compile(r"^v(\d{4})_\w+$")
+
+metadata = MetaData()
+
+schema_migration = Table(
+    "schema_migration",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    schema=SCHEMA,
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+# Index lookups by name; SQLAlchemy's reflection skips expression
+# (function-based) indexes on some dialects
+_INDEX_EXISTS = {
+    "sqlite": "SELECT count(*) FROM sqlite_master WHERE type = 'index' AND name = :name",
+    "postgresql": (
+        "SELECT count(*) FROM pg_indexes WHERE indexname = :name"
+        " AND schemaname = coalesce(:schema, current_schema())"
+    ),
+    "oracle": (
+        "SELECT count(*) FROM all_indexes WHERE index_name = upper(:name)"
+        " AND owner = coalesce(upper(:schema), sys_context('USERENV', 'CURRENT_SCHEMA'))"
+    ),
+}
+
+
+def index_exists(connection: Connection, index: Index) -> bool:
+    """Whether an index with ``index``'s name exists in its table's schema."""
+    schema = connection.schema_for_object(index.table)
+    sql = _INDEX_EXISTS.get(connection.dialect.name)
+    if sql is None:
+        return inspect(connection).has_index(index.table.name, index.name, schema=schema)
+    return connection.scalar(text(sql), {"name": index.name, "schema": schema}) > 0
+
+
+def create_index(connection: Connection, index: Index) -> bool:
+    """Create ``index`` unless it already exists; returns whether it was created."""
+    if index_exists(connection, index):
+        logger.info(f"Index {index.name} already exists")
+        return False
+    index.create(connection)
+    return True
+
+
+def discover() -> list[Migration]:
+    """All migrations in this package, in version order."""
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=module_info.name,
+            description=module.DESCRIPTION,
+            upgrade=module.upgrade,
+        ))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return migrations
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    """Versions recorded in ``schema_migration`` (empty if it doesn't exist yet)."""
+    with engine.begin() as conn:
+        schema_migration.create(conn, checkfirst=True)
+        return set(conn.scalars(select(schema_migration.c.version)))
+
+
+def pending(engine: Engine) -> list[Migration]:
+    """Migrations not yet applied to the database behind ``engine``."""
+    applied = applied_versions(engine)
+    return [m for m in discover() if m.version not in applied]
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> list[Migration]:
+    """
+    Apply pending migrations up to ``target`` (all by default).
+
+    Returns the migrations applied.
+    """
+    applied = []
+    for migration in pending(engine):
+        if target is not None and migration.version > target:
+            break
+        logger.info(f"Applying migration {migration.name}: {migration.description}")
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(schema_migration.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.now(),
+            ))
+        applied.append(migration)
+    return applied
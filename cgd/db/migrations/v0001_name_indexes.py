@@ -0,0 +1,81 @@
+"""
+Function-based name indexes and current-row composite indexes.
+
+Name lookups compare ``UPPER(column)`` with the upper-cased query (locus,
+sequence, batch download, search and BLAST services, and the curation
+services); only an index on the same expression avoids a full scan. The
+``upper_*`` indexes are part of the original Oracle schema and are created
+here only where missing (rebuilt replicas, PostgreSQL, test databases).
+On PostgreSQL they use ``text_pattern_ops`` so prefix ``LIKE 'ABC%'``
+searches can use them as well as equality.
+
+Sequence and location lookups for a feature filter on the current row
+(``is_seq_current``/``is_loc_current = 'Y'``); the composite indexes let
+them resolve from the index instead of visiting every version of the row.
+"""
+from __future__ import annotations
+
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, func
+from sqlalchemy.engine import Connection
+
+from cgd.db.migrations import SCHEMA, create_index
+
+DESCRIPTION = "Function-based name indexes and current-row composite indexes"
+
+# Only the columns indexed here; the tables themselves already exist
+metadata = MetaData()
+
+feature = Table(
+    "feature", metadata,
+    Column("feature_name", String(40)),
+    Column("gene_name", String(40)),
+    Column("dbxref_id", String(40)),
+    schema=SCHEMA,
+)
+alias = Table("alias", metadata, Column("alias_name", String(40)), schema=SCHEMA)
+go = Table("go", metadata, Column("go_term", String(240)), schema=SCHEMA)
+dbxref = Table("dbxref", metadata, Column("dbxref_id", String(40)), schema=SCHEMA)
+reference = Table("reference", metadata, Column("dbxref_id", String(40)), schema=SCHEMA)
+feat_location = Table(
+    "feat_location", metadata,
+    Column("feature_no", Integer),
+    Column("is_loc_current", String(1)),
+    schema=SCHEMA,
+)
+seq = Table(
+    "seq", metadata,
+    Column("feature_no", Integer),
+    Column("seq_type", String(40)),
+    Column("is_seq_current", String(1)),
+    schema=SCHEMA,
+)
+
+
+def _upper_index(name: str, column: Column) -> Index:
+    label = f"upper_{column.name}"
+    return Index(
+        name,
+        func.upper(column).label(label),
+        postgresql_ops={label: "text_pattern_ops"},
+    )
+
+
+INDEXES = [
+    _upper_index("upper_feature_name_i", feature.c.feature_name),
+    _upper_index("upper_gene_name_i", feature.c.gene_name),
+    _upper_index("upper_feat_dbxref_id_i", feature.c.dbxref_id),
+    _upper_index("upper_alias_name_i", alias.c.alias_name),
+    _upper_index("upper_go_term_i", go.c.go_term),
+    _upper_index("upper_dbxref_id_i", dbxref.c.dbxref_id),
+    _upper_index("upper_ref_dbxref_id_i", reference.c.dbxref_id),
+    Index("fl_feat_current_i", feat_location.c.feature_no, feat_location.c.is_loc_current),
+    Index(
+        "seq_feat_type_current_i",
+        seq.c.feature_no, seq.c.seq_type, seq.c.is_seq_current,
+    ),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for index in INDEXES:
+        create_index(connection, index)
@@ -0,0 +1,156 @@
+"""
+Per-request SQL statistics.
+
+SQLAlchemy cursor-execute listeners accumulate statement count, DB time and
+driver-reported row counts into a ``QueryStats`` object held in a
+contextvar. The request middleware (``cgd.core.request_timing``) opens a
+fresh ``QueryStats`` per request and reports it; outside a request (cron
+scripts, shell) the listeners only log slow statements.
+
+Statements are also grouped by *shape* (whitespace collapsed, literals and
+IN-lists folded) so that N+1 patterns - the same query issued once per row
+of an earlier result - can be flagged at the end of the request.
+
+Usage:
+    from cgd.db.query_stats import install_query_listeners
+
+    install_query_listeners(engine)
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from cgd.core.settings import settings
+
+logger = logging.getLogger("cgd.sql")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*[^()]*?\)", re.IGNORECASE)
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+_START_KEY = "cgd_query_start"
+
+
+@dataclass
+class QueryStats:
+    """SQL statistics accumulated for one request (or one unit of work)."""
+
+    route: Optional[str] = None
+    statements: int = 0
+    db_time: float = 0.0
+    rows: int = 0
+    shapes: Counter = field(default_factory=Counter)
+    slow: list[tuple[float, str]] = field(default_factory=list)
+
+    @property
+    def db_time_ms(self) -> float:
+        return self.db_time * 1000
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Return statement shapes issued more than ``threshold`` times."""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "cgd_query_stats", default=None
+)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape.
+
+    Collapses whitespace, folds IN-lists to ``IN (...)`` and replaces string
+    and numeric literals with ``?`` so that statements differing only in
+    their parameters compare equal.
+    """
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _IN_LIST_RE.sub("IN (...)", shape)
+    shape = _STRING_LITERAL_RE.sub("?", shape)
+    shape = _NUMBER_LITERAL_RE.sub("?", shape)
+    return shape
+
+
+def start_query_stats(route: Optional[str] = None) -> QueryStats:
+    """Begin collecting statistics in the current context."""
+    stats = QueryStats(route=route)
+    _current_stats.set(stats)
+    return stats
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """Return the statistics being collected in the current context, if any."""
+    return _current_stats.get()
+
+
+def stop_query_stats() -> Optional[QueryStats]:
+    """Stop collecting and return the statistics for the current context."""
+    stats = _current_stats.get()
+    _current_stats.set(None)
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    slow = elapsed * 1000 >= settings.sql_slow_query_ms
+
+    stats = _current_stats.get()
+    if stats is None:
+        if slow:
+            logger.warning(
+                f"slow_query duration_ms={elapsed * 1000:.1f} "
+                f"sql={normalize_statement(statement)[:500]}"
+            )
+        return
+
+    stats.statements += 1
+    stats.db_time += elapsed
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount > 0:
+        stats.rows += rowcount
+    stats.shapes[normalize_statement(statement)] += 1
+    if slow:
+        stats.slow.append((elapsed, statement))
+
+
+def install_query_listeners(engine: Engine) -> None:
+    """Attach the statistics listeners to an engine (idempotent)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def log_query_stats(stats: QueryStats) -> None:
+    """Log slow statements and N+1 patterns collected for a request."""
+    route = stats.route or "-"
+    for elapsed, statement in stats.slow:
+        logger.warning(
+            f"slow_query route={route} duration_ms={elapsed * 1000:.1f} "
+            f"sql={normalize_statement(statement)[:500]}"
+        )
+    for shape, count in stats.repeated_shapes(settings.sql_n_plus_one_threshold):
+        logger.warning(
+            f"n_plus_one route={route} count={count} sql={shape[:500]}"
+        )
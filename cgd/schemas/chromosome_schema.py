@@ -128,3 +128,25 @@ class OrganismChromosomes(BaseModel):
 
 class ChromosomeListResponse(BaseModel):
     organisms: list[OrganismChromosomes] = []
+
+
+# --- Region Features ---
+
+class RegionFeatureOut(BaseModel):
+    feature_no: int
+    feature_name: str
+    gene_name: typing.Optional[str] = None
+    feature_type: str
+    start_coord: int
+    stop_coord: int
+    strand: typing.Optional[str] = None
+    distance: int  # bases between the feature and the query region; 0 if overlapping
+
+
+class RegionFeaturesResponse(BaseModel):
+    chromosome: str
+    genome_version: str
+    start: int
+    end: int
+    mode: str  # overlap, upstream, downstream, nearest
+    features: list[RegionFeatureOut]
@@ -15,10 +15,18 @@ compression
     File compression and archiving utilities.
 sequence
     DNA/protein sequence manipulation.
+seqkernels
+    Vectorized sequence kernels (reverse complement, translation, codon usage).
+seqedit
+    Batch sequence edits (piece table) and coordinate remapping.
+intervals
+    Interval index (nested containment list) for overlap and nearest-feature queries.
 ids
     ID formatting utilities (GO IDs, chromosome names, etc.).
 database
     Common database query utilities.
+annotation_export
+    Bulk queries and row generators for the GPI and GAF exports.
 notifications
     Email and notification utilities.
 file_io
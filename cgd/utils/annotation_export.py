@@ -0,0 +1,414 @@
+"""
+Bulk data for the GO annotation exports (GPI and GAF files).
+
+Everything an export needs is read in a fixed number of streamed queries,
+whatever the number of features: the features themselves, their aliases
+and UniProt cross-references, and the GO annotations with their
+references, qualifiers and with/from support. The pieces are joined in
+memory by feature_no and go_ref_no, and the GPI/GAF rows are produced by
+generators so the writers never hold a whole file.
+
+Usage:
+    features = iter_export_features(session, seq_source, GPI_FEATURE_TYPES, taxon_id=5476)
+    for row in iter_gpi_rows(features):
+        out.write("\\t".join(row) + "\\n")
+
+    features = {f.feature_no: f for f in iter_export_features(session, seq_source, types)}
+    for row in iter_gaf_rows(session, features, db_code_map, [seq_source], types):
+        out.write("\\t".join(row) + "\\n")
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+# Get schema from environment
+DB_SCHEMA = os.getenv("DB_SCHEMA", "MULTI")
+PROJECT_ACRONYM = os.getenv("PROJECT_ACRONYM", "CGD")
+
+# Rows fetched per round trip from the server-side cursors
+FETCH_SIZE = 5000
+
+# Feature types written to GPI files, with their SO codes
+SO_CODE_FOR_TYPE = {
+    "ORF": "SO:0001217",
+    "ncRNA": "SO:0001263",
+    "rRNA": "SO:0001263",
+    "snRNA": "SO:0001263",
+    "snoRNA": "SO:0001263",
+    "tRNA": "SO:0001263",
+    "pseudogene": "SO:0000336",
+}
+GPI_FEATURE_TYPES = tuple(SO_CODE_FOR_TYPE)
+
+UNIPROT_DBXREF_TYPES = ("SwissProt", "UniProtKB")
+
+# GAF 2.2 relation for annotations without one, by aspect. Cellular
+# component terms under "protein-containing complex" take part_of.
+DEFAULT_RELATION = {"F": "enables", "P": "involved_in", "C": "located_in"}
+PROTEIN_COMPLEX_GOID = 32991
+
+
+@dataclass
+class ExportFeature:
+    """A feature with the names and cross-references the exports write."""
+    feature_no: int
+    feature_name: str
+    dbxref_id: Optional[str]
+    feature_type: str
+    gene_name: Optional[str]
+    headline: Optional[str]
+    taxon_id: Optional[int] = None
+    aliases: list[str] = field(default_factory=list)
+    uniprot_ids: list[str] = field(default_factory=list)
+
+
+def stream_rows(session: Session, query, params: Optional[dict] = None):
+    """Execute ``query`` on a server-side cursor, FETCH_SIZE rows at a time."""
+    return session.execute(
+        query.execution_options(stream_results=True, yield_per=FETCH_SIZE), params or {}
+    )
+
+
+def get_search_feature_types(session: Session) -> list[str]:
+    """Feature types offered by the Chromosomal Feature Search (the GAF feature set)."""
+    query = text(f"""
+        SELECT col_value
+        FROM {DB_SCHEMA}.web_metadata
+        WHERE tab_name = 'FEATURE'
+        AND col_name = 'FEATURE_TYPE'
+        AND application_name = 'Chromosomal Feature Search'
+    """)
+    return [row[0] for row in session.execute(query)]
+
+
+def _feature_scope(exclude_deleted_and_dubious: bool) -> str:
+    """FROM/WHERE selecting the current features of the assemblies in :seq_sources."""
+    scope = f"""
+        FROM {DB_SCHEMA}.feature f
+        JOIN {DB_SCHEMA}.feat_location fl
+             ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
+        JOIN {DB_SCHEMA}.seq s
+             ON (fl.root_seq_no = s.seq_no AND s.is_seq_current = 'Y'
+                 AND s.source IN :seq_sources)
+        JOIN {DB_SCHEMA}.genome_version gv
+             ON (s.genome_version_no = gv.genome_version_no AND gv.is_ver_current = 'Y')
+        WHERE f.feature_type IN :feature_types
+    """
+    if exclude_deleted_and_dubious:
+        scope += f"""
+        AND f.feature_no NOT IN (
+            SELECT fp.feature_no
+            FROM {DB_SCHEMA}.feat_property fp
+            WHERE fp.property_type = 'feature_qualifier'
+            AND (fp.property_value LIKE 'Deleted%' OR fp.property_value = 'Dubious')
+        )
+        """
+    return scope
+
+
+def _scoped(sql: str):
+    """Statement over the feature scope, with its IN lists expanded."""
+    return text(sql).bindparams(
+        bindparam("seq_sources", expanding=True),
+        bindparam("feature_types", expanding=True),
+    )
+
+
+def _scope_params(seq_sources: Sequence[str], feature_types: Sequence[str]) -> dict:
+    return {"seq_sources": list(seq_sources), "feature_types": list(feature_types)}
+
+
+def iter_export_features(
+    session: Session,
+    seq_source: str,
+    feature_types: Sequence[str],
+    taxon_id: Optional[int] = None,
+    exclude_deleted_and_dubious: bool = False,
+    with_uniprot: bool = True,
+) -> Iterator[ExportFeature]:
+    """
+    Yield the current features of an assembly, ordered by feature name.
+
+    Aliases and UniProt IDs are read for the whole feature set up front
+    (one query each) and attached to each feature as it streams past.
+
+    Args:
+        session: Database session
+        seq_source: Sequence source of the assembly
+        feature_types: Feature types to export
+        taxon_id: NCBI taxon ID stamped on the features
+        exclude_deleted_and_dubious: Skip Deleted and Dubious features
+        with_uniprot: Read the UniProt cross-references
+
+    Returns:
+        Iterator of ExportFeature
+    """
+    scope = _feature_scope(exclude_deleted_and_dubious)
+    params = _scope_params([seq_source], feature_types)
+
+    aliases: dict[int, list[str]] = defaultdict(list)
+    for feature_no, alias_name in stream_rows(session, _scoped(f"""
+        SELECT fa.feature_no, a.alias_name
+        FROM {DB_SCHEMA}.alias a
+        JOIN {DB_SCHEMA}.feat_alias fa ON fa.alias_no = a.alias_no
+        WHERE fa.feature_no IN (SELECT f.feature_no {scope})
+        ORDER BY fa.feature_no, a.alias_name
+    """), params):
+        if alias_name:
+            aliases[feature_no].append(alias_name)
+
+    uniprot: dict[int, list[str]] = defaultdict(list)
+    if with_uniprot:
+        for feature_no, dbxref_id in stream_rows(session, _scoped(f"""
+            SELECT df.feature_no, d.dbxref_id
+            FROM {DB_SCHEMA}.dbxref d
+            JOIN {DB_SCHEMA}.dbxref_feat df ON d.dbxref_no = df.dbxref_no
+            WHERE d.dbxref_type IN ({", ".join(f"'{t}'" for t in UNIPROT_DBXREF_TYPES)})
+            AND df.feature_no IN (SELECT f.feature_no {scope})
+            ORDER BY df.feature_no, d.dbxref_id
+        """), params):
+            if dbxref_id:
+                uniprot[feature_no].append(dbxref_id)
+
+    for row in stream_rows(session, _scoped(f"""
+        SELECT f.feature_no, f.feature_name, f.dbxref_id, f.feature_type,
+               f.gene_name, f.headline
+        {scope}
+        ORDER BY f.feature_name, f.feature_no
+    """), params):
+        yield ExportFeature(
+            feature_no=row[0],
+            feature_name=row[1],
+            dbxref_id=row[2],
+            feature_type=row[3],
+            gene_name=row[4],
+            headline=row[5],
+            taxon_id=taxon_id,
+            aliases=aliases.get(row[0], []),
+            uniprot_ids=uniprot.get(row[0], []),
+        )
+
+
+def clean_description(headline: Optional[str]) -> str:
+    """GPI DB_Object_Name: the first clause of the headline, without HTML tags."""
+    if not headline:
+        return ""
+    return re.sub(r"<[^>]+>", "", headline.split(";")[0].strip())
+
+
+def iter_gpi_rows(features: Iterable[ExportFeature]) -> Iterator[list[str]]:
+    """
+    Yield GPI 2.0 rows (11 columns) for ``features``.
+
+    Args:
+        features: Features to write
+
+    Returns:
+        Iterator of column lists
+    """
+    for feature in features:
+        dbid = f"{PROJECT_ACRONYM}:{feature.dbxref_id}"
+        names = ([feature.gene_name] if feature.gene_name else []) + feature.aliases
+        uniprot_ids = feature.uniprot_ids if feature.feature_type == "ORF" else []
+        yield [
+            dbid,                                               # DB_Object_ID
+            feature.feature_name,                               # DB_Object_Symbol
+            clean_description(feature.headline),                # DB_Object_Name
+            " | ".join(names),                                  # DB_Object_Synonym(s)
+            SO_CODE_FOR_TYPE.get(feature.feature_type, ""),     # DB_Object_Type
+            f"NCBITaxon:{feature.taxon_id}",                    # DB_Object_Taxon
+            "",                                                 # Encoded_by
+            dbid,                                               # Parent_Protein
+            "",                                                 # Protein_Containing_Complex_Members
+            " | ".join(f"UniProtKB:{up}" for up in uniprot_ids),  # DB_Xref(s)
+            "",                                                 # Gene_Product_Properties
+        ]
+
+
+def get_go_ref_qualifiers(
+    session: Session,
+    seq_sources: Sequence[str],
+    feature_types: Sequence[str],
+    exclude_deleted_and_dubious: bool = False,
+) -> dict[int, list[str]]:
+    """Qualifiers of the exported features' GO references flagged as having them."""
+    query = _scoped(f"""
+        SELECT gq.go_ref_no, gq.qualifier
+        FROM {DB_SCHEMA}.go_qualifier gq
+        JOIN {DB_SCHEMA}.go_ref gr ON gr.go_ref_no = gq.go_ref_no
+        JOIN {DB_SCHEMA}.go_annotation ga ON ga.go_annotation_no = gr.go_annotation_no
+        WHERE gr.has_qualifier = 'Y'
+        AND ga.feature_no IN (SELECT f.feature_no {_feature_scope(exclude_deleted_and_dubious)})
+        ORDER BY gq.go_ref_no, gq.qualifier
+    """)
+    qualifiers: dict[int, list[str]] = defaultdict(list)
+    params = _scope_params(seq_sources, feature_types)
+    for go_ref_no, qualifier in stream_rows(session, query, params):
+        qualifiers[go_ref_no].append(qualifier)
+    return qualifiers
+
+
+def get_go_ref_support(
+    session: Session,
+    db_code_map: dict[str, str],
+    seq_sources: Sequence[str],
+    feature_types: Sequence[str],
+    exclude_deleted_and_dubious: bool = False,
+) -> dict[int, str]:
+    """
+    With/from column of the exported features' GO references with supporting dbxrefs.
+
+    Args:
+        session: Database session
+        db_code_map: "SOURCE:DBXREF_TYPE" (upper case) to GO database code
+        seq_sources: Sequence sources of the exported assemblies
+        feature_types: Exported feature types
+        exclude_deleted_and_dubious: Skip Deleted and Dubious features
+
+    Returns:
+        Dictionary mapping go_ref_no to pipe-separated "DB:ID" entries
+    """
+    query = _scoped(f"""
+        SELECT gd.go_ref_no, d.source, d.dbxref_type, d.dbxref_id
+        FROM {DB_SCHEMA}.goref_dbxref gd
+        JOIN {DB_SCHEMA}.dbxref d ON gd.dbxref_no = d.dbxref_no
+        JOIN {DB_SCHEMA}.go_ref gr ON gr.go_ref_no = gd.go_ref_no
+        JOIN {DB_SCHEMA}.go_annotation ga ON ga.go_annotation_no = gr.go_annotation_no
+        WHERE ga.feature_no IN (SELECT f.feature_no {_feature_scope(exclude_deleted_and_dubious)})
+        ORDER BY gd.go_ref_no, d.source
+    """)
+    supports: dict[int, list[str]] = defaultdict(list)
+    params = _scope_params(seq_sources, feature_types)
+    for go_ref_no, source, dbxref_type, dbxref_id in stream_rows(session, query, params):
+        go_code = db_code_map.get(f"{source.upper()}:{dbxref_type.upper()}", source)
+        if go_code == "GO":
+            dbxref_id = str(dbxref_id).zfill(7)
+        supports[go_ref_no].append(f"{go_code}:{dbxref_id}")
+    return {go_ref_no: "|".join(entries) for go_ref_no, entries in supports.items()}
+
+
+def get_protein_complex_goids(session: Session) -> set[int]:
+    """GOIDs of "protein-containing complex" and its descendants."""
+    query = text(f"""
+        SELECT child.goid
+        FROM {DB_SCHEMA}.go_path gp
+        JOIN {DB_SCHEMA}.go ancestor ON gp.ancestor_go_no = ancestor.go_no
+        JOIN {DB_SCHEMA}.go child ON gp.child_go_no = child.go_no
+        WHERE ancestor.goid = :goid
+    """)
+    goids = {int(row[0]) for row in session.execute(query, {"goid": PROTEIN_COMPLEX_GOID})}
+    goids.add(PROTEIN_COMPLEX_GOID)
+    return goids
+
+
+def gaf_qualifier(qualifiers: Sequence[str], aspect: str, in_complex: bool) -> str:
+    """
+    GAF 2.2 qualifier column: the relation, prefixed by NOT when negated.
+
+    Args:
+        qualifiers: Qualifiers curated on the GO reference
+        aspect: GO aspect (F, P or C) of the term
+        in_complex: Whether the term is a protein-containing complex
+
+    Returns:
+        Qualifier column value, e.g. "enables" or "NOT|colocalizes_with"
+    """
+    relations = [q.replace(" ", "_") for q in qualifiers if q.upper() != "NOT"]
+    if relations:
+        relation = relations[0]
+    elif aspect == "C" and in_complex:
+        relation = "part_of"
+    else:
+        relation = DEFAULT_RELATION.get(aspect, "")
+    if len(relations) < len(qualifiers):
+        return f"NOT|{relation}"
+    return relation
+
+
+def iter_gaf_rows(
+    session: Session,
+    features: dict[int, ExportFeature],
+    db_code_map: dict[str, str],
+    seq_sources: Sequence[str],
+    feature_types: Sequence[str],
+    exclude_deleted_and_dubious: bool = False,
+    default_taxon_id: int = 4932,
+) -> Iterator[list[str]]:
+    """
+    Yield GAF 2.2 rows (17 columns) for the GO annotations of ``features``.
+
+    Rows come out ordered by feature name, then GO reference. Qualifiers,
+    with/from support and the protein complex terms are read first (one
+    query each); the annotations are then streamed with their GO term and
+    reference and joined to them in memory. Annotation, qualifier and
+    support queries are restricted to the features selected by the same
+    scope ``iter_export_features`` used to read ``features``.
+
+    Args:
+        session: Database session
+        features: Features to export, by feature_no
+        db_code_map: "SOURCE:DBXREF_TYPE" (upper case) to GO database code
+        seq_sources: Sequence sources the features were read from
+        feature_types: Feature types the features were read with
+        exclude_deleted_and_dubious: Whether Deleted and Dubious features were skipped
+        default_taxon_id: Taxon for features without one
+
+    Returns:
+        Iterator of column lists
+    """
+    scope = (seq_sources, feature_types, exclude_deleted_and_dubious)
+    qualifiers = get_go_ref_qualifiers(session, *scope)
+    supports = get_go_ref_support(session, db_code_map, *scope)
+    complex_goids = get_protein_complex_goids(session)
+
+    query = _scoped(f"""
+        SELECT ga.feature_no, gr.go_ref_no, g.goid, g.go_aspect, ga.go_evidence,
+               ga.source, r.dbxref_id, r.pubmed, gr.date_created
+        FROM {DB_SCHEMA}.go_annotation ga
+        JOIN {DB_SCHEMA}.go_ref gr ON gr.go_annotation_no = ga.go_annotation_no
+        JOIN {DB_SCHEMA}.reference r ON gr.reference_no = r.reference_no
+        JOIN {DB_SCHEMA}.go g ON ga.go_no = g.go_no
+        JOIN {DB_SCHEMA}.feature f ON ga.feature_no = f.feature_no
+        WHERE ga.feature_no IN (SELECT f.feature_no {_feature_scope(exclude_deleted_and_dubious)})
+        ORDER BY f.feature_name, ga.feature_no, gr.go_ref_no
+    """)
+
+    for (feature_no, go_ref_no, goid, aspect, evidence, source,
+         ref_dbxref_id, pubmed, date_created) in stream_rows(
+            session, query, _scope_params(seq_sources, feature_types)):
+        feature = features.get(feature_no)
+        if feature is None or not feature.dbxref_id:
+            continue
+
+        ref_str = f"{PROJECT_ACRONYM}_REF:{ref_dbxref_id}"
+        if pubmed:
+            ref_str += f"|PMID:{pubmed}"
+
+        yield [
+            PROJECT_ACRONYM,                                    # 1. DB
+            feature.dbxref_id,                                  # 2. DB Object ID
+            feature.gene_name or feature.feature_name,          # 3. DB Object Symbol
+            gaf_qualifier(
+                qualifiers.get(go_ref_no, []), aspect, int(goid) in complex_goids
+            ),                                                  # 4. Qualifier
+            "GO:" + str(goid).zfill(7),                         # 5. GO ID
+            ref_str,                                            # 6. DB:Reference
+            evidence,                                           # 7. Evidence Code
+            supports.get(go_ref_no, ""),                        # 8. With/From
+            aspect,                                             # 9. Aspect
+            "",                                                 # 10. DB Object Name
+            "|".join([feature.feature_name] + feature.aliases),  # 11. DB Object Synonym
+            "gene_product",                                     # 12. DB Object Type
+            f"taxon:{feature.taxon_id or default_taxon_id}",    # 13. Taxon
+            date_created.strftime("%Y%m%d") if date_created else "",  # 14. Date
+            source,                                             # 15. Assigned By
+            "",                                                 # 16. Annotation Extension
+            "",                                                 # 17. Gene Product Form ID
+        ]
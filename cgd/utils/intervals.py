@@ -0,0 +1,148 @@
+"""
+Interval index for feature coordinates.
+
+``IntervalIndex`` is a nested containment list (NCList) over a fixed set
+of intervals. Intervals are sorted by start and every interval contained
+in another is moved into its container's sublist, so within any sublist
+both starts and ends increase. An overlap query then binary-searches each
+sublist it visits for the first end at or after the query start and scans
+forward until the starts pass the query end: O(log n + k) for k hits.
+
+Nearest-upstream and nearest-downstream lookups use the intervals sorted
+by end and by start respectively, and k-nearest merges the two, so they
+also cost O(log n + k).
+
+Coordinates are 1-based and inclusive. Either coordinate may be the
+larger one (Crick-strand features have start > stop); intervals and
+queries are normalized to (min, max). "Upstream" and "downstream" are
+genomic directions (lower and higher coordinates), not strand-relative.
+
+Every query returns ``(ids, distances)``: positions into the arrays the
+index was built from, and the gap in bases between each interval and the
+query (0 for overlapping intervals).
+
+Usage:
+    index = IntervalIndex(starts, stops)
+    ids, _ = index.overlap(1000, 2000)
+    ids, distances = index.nearest(1500, 1500, k=5)
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Sequence
+
+import numpy as np
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+class IntervalIndex:
+    """Static NCList over intervals given as parallel start/stop arrays."""
+
+    def __init__(self, starts: Sequence[int], stops: Sequence[int]):
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = np.asarray(stops, dtype=np.int64)
+        if starts.shape != stops.shape or starts.ndim != 1:
+            raise ValueError("starts and stops must be 1-d arrays of the same length")
+
+        lo = np.minimum(starts, stops)
+        hi = np.maximum(starts, stops)
+        # Rank order: start ascending, longest first, so containers precede
+        # everything they contain
+        self._order = np.lexsort((-hi, lo))
+        lo = lo[self._order]
+        hi = hi[self._order]
+        n = len(lo)
+        self._n = n
+
+        # Parent of each rank is the innermost earlier interval containing
+        # it; n stands for the top-level list
+        his = hi.tolist()
+        parent = np.full(n, n, dtype=np.int64)
+        stack: list[int] = []
+        for rank, end in enumerate(his):
+            while stack and his[stack[-1]] < end:
+                stack.pop()
+            if stack:
+                parent[rank] = stack[-1]
+            stack.append(rank)
+
+        # Store each sublist contiguously, in rank (start) order
+        layout = np.argsort(parent, kind="stable")
+        keys = parent[layout]
+        bounds = np.arange(n + 1)
+        self._sub_begin = np.searchsorted(keys, bounds, side="left").tolist()
+        self._sub_end = np.searchsorted(keys, bounds, side="right").tolist()
+        self._sub_lo = lo[layout].tolist()
+        self._sub_hi = hi[layout].tolist()
+        self._sub_rank = layout.tolist()
+
+        # Flat views for the directional lookups
+        self._lo = lo
+        self._hi = hi
+        self._lo_list = lo.tolist()
+        self._by_hi = np.argsort(hi, kind="stable")
+        self._hi_sorted = hi[self._by_hi].tolist()
+
+    def __len__(self) -> int:
+        return self._n
+
+    def overlap(self, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+        """Intervals sharing at least one base with [start, end], by start."""
+        start, end = min(start, end), max(start, end)
+        ranks = np.sort(np.asarray(self._overlapping_ranks(start, end), dtype=np.int64))
+        return self._order[ranks], np.zeros(len(ranks), dtype=np.int64)
+
+    def upstream(self, position: int, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """The ``k`` intervals ending closest below ``position``, nearest first."""
+        cut = bisect_left(self._hi_sorted, position)
+        ranks = self._by_hi[max(0, cut - k):cut][::-1]
+        return self._order[ranks], position - self._hi[ranks]
+
+    def downstream(self, position: int, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """The ``k`` intervals starting closest above ``position``, nearest first."""
+        cut = bisect_right(self._lo_list, position)
+        ranks = np.arange(cut, min(self._n, cut + k))
+        return self._order[ranks], self._lo[ranks] - position
+
+    def nearest(self, start: int, end: int, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The ``k`` intervals closest to [start, end].
+
+        Overlapping intervals come first (by start), then the rest by
+        distance, upstream before downstream on ties.
+        """
+        start, end = min(start, end), max(start, end)
+        if k <= 0:
+            return _EMPTY, _EMPTY
+        ids, distances = self.overlap(start, end)
+        if len(ids) >= k:
+            return ids[:k], distances[:k]
+
+        need = k - len(ids)
+        up_ids, up_dist = self.upstream(start, need)
+        down_ids, down_dist = self.downstream(end, need)
+        merged = np.concatenate([up_dist, down_dist])
+        # Stable sort keeps upstream first among equal distances
+        take = np.argsort(merged, kind="stable")[:need]
+        return (
+            np.concatenate([ids, np.concatenate([up_ids, down_ids])[take]]),
+            np.concatenate([distances, merged[take]]),
+        )
+
+    def _overlapping_ranks(self, start: int, end: int) -> list[int]:
+        found: list[int] = []
+        pending = [self._n]
+        sub_hi, sub_lo, sub_rank = self._sub_hi, self._sub_lo, self._sub_rank
+        while pending:
+            node = pending.pop()
+            stop = self._sub_end[node]
+            # Ends increase within a sublist, so skip everything ending
+            # before the query in one bisection
+            i = bisect_left(sub_hi, start, self._sub_begin[node], stop)
+            while i < stop and sub_lo[i] <= end:
+                rank = sub_rank[i]
+                found.append(rank)
+                pending.append(rank)
+                i += 1
+        return found
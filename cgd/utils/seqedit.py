@@ -0,0 +1,225 @@
+"""
+Batch sequence edits on large sequences.
+
+``PieceTable`` applies a batch of insertions, deletions and substitutions
+to a sequence without copying it: the edited sequence is a list of pieces
+pointing into the original string or the inserted text, so applying k
+edits costs O(k log k) regardless of the sequence length, and reading a
+slice (e.g. the context around an edit) only touches the pieces it spans.
+
+``OffsetMap`` is the matching coordinate map. It remaps the coordinates of
+any number of features from the old to the new sequence in one vectorized
+pass, and classifies each feature against the edits.
+
+All edit coordinates refer to the *original* sequence, as curators enter
+them. Edits in a batch must not overlap.
+
+Usage:
+    edits = [SequenceEdit.insertion(100, "ATG"), SequenceEdit.deletion(500, 510)]
+    table = PieceTable(residues, edits)
+    len(table), table[90:120]
+    result = table.offset_map.remap(starts, stops)
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Sequence, Union
+
+import numpy as np
+
+# Feature classification codes returned by OffsetMap.remap
+UNAFFECTED = 0    # upstream of every edit
+DOWNSTREAM = 1    # no edit inside the feature; shifted by upstream edits
+ENCOMPASSING = 2  # contains an edit; its length changes with the edit
+OVERLAP = 3       # an edit covers a feature end; coordinates not remapped
+
+STATUS_NAMES = {
+    UNAFFECTED: "unaffected",
+    DOWNSTREAM: "downstream",
+    ENCOMPASSING: "encompassing",
+    OVERLAP: "overlap",
+}
+
+
+@dataclass(frozen=True)
+class SequenceEdit:
+    """
+    Replace original[start:end] (0-based, half-open) with ``replacement``.
+
+    Use the constructors for the 1-based curator conventions.
+    """
+
+    start: int
+    end: int
+    replacement: str = ""
+
+    @classmethod
+    def insertion(cls, position: int, sequence: str) -> "SequenceEdit":
+        """Insert after 1-based ``position`` (0 inserts at the beginning)."""
+        return cls(position, position, sequence)
+
+    @classmethod
+    def deletion(cls, start: int, end: int) -> "SequenceEdit":
+        """Delete 1-based ``start``..``end`` inclusive."""
+        return cls(start - 1, end)
+
+    @classmethod
+    def substitution(cls, start: int, end: int, sequence: str) -> "SequenceEdit":
+        """Replace 1-based ``start``..``end`` inclusive with ``sequence``."""
+        return cls(start - 1, end, sequence)
+
+    @property
+    def delta(self) -> int:
+        return len(self.replacement) - (self.end - self.start)
+
+
+def sort_edits(edits: Iterable[SequenceEdit], length: int) -> list[SequenceEdit]:
+    """Sort edits by position, checking bounds and overlaps."""
+    ordered = sorted(edits, key=lambda e: (e.start, e.end))
+    previous = None
+    for edit in ordered:
+        if edit.start < 0 or edit.end > length or edit.start > edit.end:
+            raise ValueError(
+                f"Edit {edit.start + 1}-{edit.end} is outside the sequence (1-{length})"
+            )
+        if previous is not None and (
+            edit.start < previous.end
+            # Two insertions at one point have no defined order
+            or (edit.start == previous.start and edit.end == previous.end == edit.start)
+        ):
+            raise ValueError(f"Edits overlap at position {edit.start + 1}")
+        previous = edit
+    return ordered
+
+
+class OffsetMap:
+    """Cumulative coordinate offsets for a sorted batch of edits."""
+
+    def __init__(self, edits: Sequence[SequenceEdit]):
+        self.starts = np.array([e.start for e in edits], dtype=np.int64)
+        self.ends = np.array([e.end for e in edits], dtype=np.int64)
+        # cumulative[i] = total length change from edits[0..i-1]
+        self.cumulative = np.concatenate(
+            ([0], np.cumsum([e.delta for e in edits], dtype=np.int64))
+        )
+
+    @property
+    def net_change(self) -> int:
+        return int(self.cumulative[-1])
+
+    def shift(self, positions: np.ndarray) -> np.ndarray:
+        """Offset to add to 1-based positions of bases kept by the edits."""
+        # Edits ending at or before a base (0-based index position - 1)
+        # shift it, including insertions immediately before it
+        passed = np.searchsorted(self.ends, positions - 1, side="right")
+        return self.cumulative[passed]
+
+    def _inside_edit(self, positions: np.ndarray) -> np.ndarray:
+        """Whether each 1-based base is deleted or replaced by an edit."""
+        if len(self.starts) == 0:
+            return np.zeros(len(positions), dtype=bool)
+        index = positions - 1
+        candidate = np.searchsorted(self.starts, index, side="right") - 1
+        valid = candidate >= 0
+        candidate = np.where(valid, candidate, 0)
+        return valid & (self.starts[candidate] <= index) & (index < self.ends[candidate])
+
+    def remap(self, starts, stops) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Remap 1-based inclusive feature coordinates.
+
+        Coordinates may be in either orientation (start > stop on the Crick
+        strand). Returns (new_starts, new_stops, status) arrays; features
+        with status OVERLAP keep their old coordinates.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = np.asarray(stops, dtype=np.int64)
+        low = np.minimum(starts, stops)
+        high = np.maximum(starts, stops)
+
+        low_shift = self.shift(low)
+        high_shift = self.shift(high)
+        overlap = self._inside_edit(low) | self._inside_edit(high)
+        # An edit ending between the first and last base lies inside the feature
+        encompassing = np.searchsorted(self.ends, high - 1, side="right") > np.searchsorted(
+            self.ends, low - 1, side="right"
+        )
+
+        status = np.full(len(starts), UNAFFECTED, dtype=np.int8)
+        status[low_shift != 0] = DOWNSTREAM
+        status[encompassing] = ENCOMPASSING
+        status[overlap] = OVERLAP
+
+        new_low = np.where(overlap, low, low + low_shift)
+        new_high = np.where(overlap, high, high + high_shift)
+        forward = starts <= stops
+        return (
+            np.where(forward, new_low, new_high),
+            np.where(forward, new_high, new_low),
+            status,
+        )
+
+
+class PieceTable:
+    """A sequence with a batch of edits applied, stored as pieces."""
+
+    def __init__(self, original: str, edits: Iterable[SequenceEdit] = ()):
+        self.original = original
+        self.edits = sort_edits(edits, len(original))
+        self.offset_map = OffsetMap(self.edits)
+
+        # Pieces are (source, source_start, length); source is the original
+        # string or an edit's replacement text
+        self._pieces: list[tuple[str, int, int]] = []
+        cursor = 0
+        for edit in self.edits:
+            if edit.start > cursor:
+                self._pieces.append((original, cursor, edit.start - cursor))
+            if edit.replacement:
+                self._pieces.append((edit.replacement, 0, len(edit.replacement)))
+            cursor = edit.end
+        if cursor < len(original):
+            self._pieces.append((original, cursor, len(original) - cursor))
+
+        # Start offset of each piece in the edited sequence
+        self._offsets: list[int] = []
+        total = 0
+        for _, _, length in self._pieces:
+            self._offsets.append(total)
+            total += length
+        self._length = total
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: Union[slice, int]) -> str:
+        if isinstance(key, int):
+            if key < 0:
+                key += self._length
+            if not 0 <= key < self._length:
+                raise IndexError("PieceTable index out of range")
+            return self[key:key + 1]
+        start, stop, step = key.indices(self._length)
+        if step != 1:
+            raise ValueError("PieceTable slices do not support steps")
+        if start >= stop:
+            return ""
+
+        parts = []
+        i = bisect_right(self._offsets, start) - 1
+        while i < len(self._pieces) and self._offsets[i] < stop:
+            source, source_start, length = self._pieces[i]
+            piece_start = self._offsets[i]
+            lo = max(start, piece_start) - piece_start
+            hi = min(stop, piece_start + length) - piece_start
+            parts.append(source[source_start + lo:source_start + hi])
+            i += 1
+        return "".join(parts)
+
+    def __str__(self) -> str:
+        return self[:]
+
+    def new_start(self, index: int) -> int:
+        """0-based start of ``edits[index]``'s replacement in the edited sequence."""
+        return self.edits[index].start + int(self.offset_map.cumulative[index])
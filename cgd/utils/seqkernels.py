@@ -0,0 +1,409 @@
+"""
+Fast sequence kernels.
+
+Vectorized implementations of the sequence primitives used throughout the
+API services and the cron/dump scripts. Everything here works on whole
+sequences at once: complementing goes through ``bytes.translate`` and
+translation/codon counting through NumPy codon indexing, so the cost per
+base is a handful of C-level operations instead of a Python loop iteration.
+
+Codons are indexed in NCBI order (T=0, C=1, A=2, G=3 at each position), so
+a translation table is simply the 64-character ``ncbieaa`` string from the
+NCBI genetic code definitions.
+
+Example:
+    >>> reverse_complement("ATGC")
+    'GCAT'
+    >>> translate("ATGCTGTAA", table=12)
+    'MS*'
+    >>> count_cug_codons("ATGCTGTAA")
+    1
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+import numpy as np
+
+# NCBI nucleotide ordering used for codon indexing
+CODON_BASES = "TCAG"
+
+# All 64 codons in NCBI index order
+CODONS: tuple[str, ...] = tuple(
+    a + b + c for a in CODON_BASES for b in CODON_BASES for c in CODON_BASES
+)
+
+# Index assigned to codons containing anything other than A/C/G/T
+AMBIGUOUS_CODON = 64
+
+# NCBI translation tables (ncbieaa strings, codons in TCAG order)
+TRANSLATION_TABLES: dict[int, str] = {
+    # Standard code
+    1: "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    # Alternative yeast nuclear code (CTG -> Ser), used by most Candida species
+    12: "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+}
+
+# IUPAC nucleotide codes and the bases they stand for
+IUPAC_DNA: dict[str, str] = {
+    "A": "A", "C": "C", "G": "G", "T": "T", "U": "T",
+    "R": "AG",      # Purine
+    "Y": "CT",      # Pyrimidine
+    "S": "GC",      # Strong
+    "W": "AT",      # Weak
+    "K": "GT",      # Keto
+    "M": "AC",      # Amino
+    "B": "CGT",     # Not A
+    "D": "AGT",     # Not C
+    "H": "ACT",     # Not G
+    "V": "ACG",     # Not T
+    "N": "ACGT",    # Any
+}
+
+_COMPLEMENT_FROM = b"ACGTRYSWKMBDHVNacgtryswkmbdhvn"
+_COMPLEMENT_TO = b"TGCAYRSWMKVHDBNtgcayrswmkvhdbn"
+
+# 256-byte table for bytes.translate
+_COMPLEMENT_TABLE = bytes.maketrans(_COMPLEMENT_FROM, _COMPLEMENT_TO)
+
+# Base -> codon position value (0-3). Anything else maps to
+# AMBIGUOUS_CODON, which pushes the combined codon index to >= 64.
+_BASE_INDEX = np.full(256, AMBIGUOUS_CODON, dtype=np.int16)
+for _i, _base in enumerate(CODON_BASES):
+    _BASE_INDEX[ord(_base)] = _i
+    _BASE_INDEX[ord(_base.lower())] = _i
+
+CODON_INDEX: dict[str, int] = {codon: i for i, codon in enumerate(CODONS)}
+
+# Translation tables as uint8 lookup arrays, with a trailing slot for
+# ambiguous codons
+_TABLE_ARRAYS: dict[tuple[int, str], np.ndarray] = {}
+
+
+def _complement_table(unknown: Optional[str]) -> bytes:
+    """Return the complement table, optionally mapping unknown bytes."""
+    if unknown is None:
+        return _COMPLEMENT_TABLE
+    fill = unknown.encode("ascii")
+    table = bytearray(fill * 256)
+    for src, dst in zip(_COMPLEMENT_FROM, _COMPLEMENT_TO):
+        table[src] = dst
+    return bytes(table)
+
+
+def _table_array(table: int, unknown_symbol: str) -> np.ndarray:
+    """Return (and memoize) the uint8 lookup array for a translation table."""
+    key = (table, unknown_symbol)
+    arr = _TABLE_ARRAYS.get(key)
+    if arr is None:
+        try:
+            residues = TRANSLATION_TABLES[table]
+        except KeyError:
+            raise ValueError(f"Unsupported translation table: {table}")
+        arr = np.frombuffer(
+            (residues + unknown_symbol).encode("ascii"), dtype=np.uint8
+        )
+        _TABLE_ARRAYS[key] = arr
+    return arr
+
+
+def _as_bytes(seq: str | bytes) -> bytes:
+    if isinstance(seq, bytes):
+        return seq
+    return seq.encode("ascii", "replace")
+
+
+def _byte_counts(seq: str | bytes) -> np.ndarray:
+    """Histogram of byte values in a sequence."""
+    raw = np.frombuffer(_as_bytes(seq), dtype=np.uint8)
+    return np.bincount(raw, minlength=256)
+
+
+def codon_indices(seq: str | bytes) -> np.ndarray:
+    """
+    Map an in-frame DNA sequence to NCBI codon indices.
+
+    Trailing bases that do not make a full codon are ignored. Codons
+    containing anything other than A/C/G/T (case-insensitive) get
+    ``AMBIGUOUS_CODON``.
+
+    Args:
+        seq: DNA sequence (str or ASCII bytes)
+
+    Returns:
+        int16 array with one entry per codon (values 0-64)
+    """
+    raw = np.frombuffer(_as_bytes(seq), dtype=np.uint8)
+    n_codons = len(raw) // 3
+    if n_codons == 0:
+        return np.empty(0, dtype=np.int16)
+
+    codes = _BASE_INDEX[raw[: n_codons * 3]].reshape(n_codons, 3)
+    idx = codes[:, 0] * 16
+    idx += codes[:, 1] * 4
+    idx += codes[:, 2]
+    return np.minimum(idx, AMBIGUOUS_CODON, out=idx)
+
+
+def reverse_complement(seq: str, unknown: Optional[str] = None) -> str:
+    """
+    Return the reverse complement of a DNA sequence.
+
+    IUPAC ambiguity codes are complemented and case is preserved.
+
+    Args:
+        seq: DNA sequence string
+        unknown: If given, characters outside the IUPAC alphabet are
+            replaced by this character; otherwise they pass through
+
+    Returns:
+        Reverse complement sequence
+
+    Example:
+        >>> reverse_complement("ATGC")
+        'GCAT'
+    """
+    try:
+        raw = seq.encode("ascii")
+    except UnicodeEncodeError:
+        # Non-ASCII input: complement the ASCII part, keep the rest as-is
+        table = {a: b for a, b in zip(_COMPLEMENT_FROM, _COMPLEMENT_TO)}
+        return seq.translate(table)[::-1]
+    return raw.translate(_complement_table(unknown))[::-1].decode("ascii")
+
+
+def complement(seq: str) -> str:
+    """
+    Return the complement of a DNA sequence (without reversing).
+
+    Args:
+        seq: DNA sequence string
+
+    Returns:
+        Complement sequence
+    """
+    return reverse_complement(seq)[::-1]
+
+
+def translate(
+    seq: str,
+    table: int = 1,
+    unknown_symbol: str = "X",
+    to_stop: bool = False,
+) -> str:
+    """
+    Translate an in-frame DNA sequence to protein.
+
+    Input is case-insensitive; codons containing ambiguous bases translate
+    to ``unknown_symbol`` and a trailing partial codon is ignored.
+
+    Args:
+        seq: CDS DNA sequence
+        table: NCBI translation table number (1 or 12)
+        unknown_symbol: Residue used for ambiguous codons
+        to_stop: Stop translating at the first stop codon (not included)
+
+    Returns:
+        Protein sequence string
+
+    Example:
+        >>> translate("ATGCTG", table=12)
+        'MS'
+    """
+    if not seq:
+        return ""
+    lookup = _table_array(table, unknown_symbol)
+    protein = lookup[codon_indices(seq)].tobytes().decode("ascii")
+    if to_stop:
+        stop = protein.find("*")
+        if stop != -1:
+            protein = protein[:stop]
+    return protein
+
+
+def translate_many(
+    seqs: Iterable[str],
+    table: int = 1,
+    unknown_symbol: str = "X",
+) -> list[str]:
+    """
+    Translate a batch of in-frame sequences (e.g. a whole proteome).
+
+    The sequences are joined into one buffer (each padded to a whole number
+    of codons) and translated with a single vectorized lookup.
+
+    Args:
+        seqs: CDS DNA sequences
+        table: NCBI translation table number (1 or 12)
+        unknown_symbol: Residue used for ambiguous codons
+
+    Returns:
+        Protein sequences in input order
+    """
+    seqs = list(seqs)
+    if not seqs:
+        return []
+
+    # Drop trailing partial codons so every sequence starts in frame
+    lengths = [len(s) // 3 for s in seqs]
+    buffer = "".join(s[: n * 3] for s, n in zip(seqs, lengths))
+    lookup = _table_array(table, unknown_symbol)
+    protein = lookup[codon_indices(buffer)].tobytes().decode("ascii")
+
+    results = []
+    pos = 0
+    for n in lengths:
+        results.append(protein[pos:pos + n])
+        pos += n
+    return results
+
+
+def codon_counts(seq: str, include_ambiguous: bool = False) -> dict[str, int]:
+    """
+    Count in-frame codon usage.
+
+    Args:
+        seq: CDS DNA sequence (case-insensitive)
+        include_ambiguous: Also report codons with ambiguous bases under "NNN"
+
+    Returns:
+        Dictionary of codon -> count for all 64 codons
+    """
+    counts = np.bincount(codon_indices(seq or ""), minlength=AMBIGUOUS_CODON + 1)
+    usage = dict(zip(CODONS, counts[:AMBIGUOUS_CODON].tolist()))
+    if include_ambiguous:
+        usage["NNN"] = int(counts[AMBIGUOUS_CODON])
+    return usage
+
+
+def count_codon(seq: str, codon: str) -> int:
+    """
+    Count in-frame occurrences of a single codon.
+
+    Args:
+        seq: CDS DNA sequence (case-insensitive)
+        codon: Codon to count (e.g. "CTG")
+
+    Returns:
+        Number of in-frame occurrences
+    """
+    target = CODON_INDEX.get(codon.upper())
+    if target is None:
+        raise ValueError(f"Invalid codon: {codon}")
+    if not seq:
+        return 0
+    return int(np.count_nonzero(codon_indices(seq) == target))
+
+
+def count_cug_codons(seq: Optional[str]) -> int:
+    """
+    Count CUG (CTG in DNA) codons in an in-frame CDS.
+
+    Under translation table 12 these encode serine instead of leucine.
+
+    Args:
+        seq: CDS DNA sequence (case-insensitive)
+
+    Returns:
+        Number of in-frame CTG codons
+    """
+    return count_codon(seq, "CTG") if seq else 0
+
+
+def gc_content(seq: str) -> float:
+    """
+    Calculate GC content of a DNA sequence.
+
+    Args:
+        seq: DNA sequence (case-insensitive)
+
+    Returns:
+        GC content as a fraction (0.0 to 1.0)
+    """
+    if not seq:
+        return 0.0
+    counts = _byte_counts(seq)
+    gc = counts[ord("G")] + counts[ord("C")] + counts[ord("g")] + counts[ord("c")]
+    return int(gc) / len(seq)
+
+
+def base_counts(seq: str, bases: str = "ACGTN") -> dict[str, int]:
+    """
+    Count occurrences of each base (case-insensitive).
+
+    Args:
+        seq: DNA sequence
+        bases: Bases to count
+
+    Returns:
+        Dictionary of base -> count
+    """
+    counts = _byte_counts(seq or "")
+    return {
+        base: int(counts[ord(base.upper())] + counts[ord(base.lower())])
+        for base in bases
+    }
+
+
+def has_ambiguous_bases(seq: str) -> bool:
+    """Return True if the sequence contains anything other than A/C/G/T."""
+    raw = _as_bytes(seq or "")
+    return bool(raw) and bool((_BASE_INDEX[np.frombuffer(raw, dtype=np.uint8)] > 3).any())
+
+
+_IUPAC_REGEX_TABLE = {
+    ord(code): bases if len(bases) == 1 else f"[{bases}]"
+    for code, bases in IUPAC_DNA.items()
+}
+
+
+def iupac_to_regex(pattern: str, escape_unknown: bool = True) -> str:
+    """
+    Expand an IUPAC DNA pattern into a regular expression.
+
+    Args:
+        pattern: DNA pattern, possibly containing ambiguity codes
+        escape_unknown: Regex-escape characters that are not IUPAC codes
+            (otherwise they are copied verbatim)
+
+    Returns:
+        Regular expression string (upper case)
+
+    Example:
+        >>> iupac_to_regex("GANTC")
+        'GA[ACGT]TC'
+    """
+    pattern = pattern.upper()
+    if escape_unknown:
+        pattern = "".join(
+            c if ord(c) in _IUPAC_REGEX_TABLE else re.escape(c) for c in pattern
+        )
+    return pattern.translate(_IUPAC_REGEX_TABLE)
+
+
+def expand_iupac(pattern: str) -> list[str]:
+    """
+    Enumerate every concrete DNA sequence matched by an IUPAC pattern.
+
+    Args:
+        pattern: DNA pattern, possibly containing ambiguity codes
+
+    Returns:
+        List of A/C/G/T sequences, in lexical order of the code expansions
+
+    Raises:
+        ValueError: If the pattern contains non-IUPAC characters
+    """
+    choices = []
+    for char in pattern.upper():
+        bases = IUPAC_DNA.get(char)
+        if bases is None:
+            raise ValueError(f"Invalid IUPAC code: {char}")
+        choices.append(bases)
+
+    results = [""]
+    for bases in choices:
+        results = [prefix + base for prefix in results for base in bases]
+    return results
@@ -7,6 +7,8 @@ like reverse complement, translation, and subsequence extraction.
 
 from typing import Optional
 
+from cgd.utils import seqkernels
+
 # Standard genetic code
 CODON_TABLE = {
     "TTT": "F", "TTC": "F", "TTA": "L", "TTG": "L",
@@ -27,7 +29,7 @@ CODON_TABLE = {
     "GGT": "G", "GGC": "G", "GGA": "G", "GGG": "G",
 }
 
-# DNA complement mapping
+# DNA complement mapping (reference; the kernels in seqkernels do the work)
 COMPLEMENT_MAP = {
     "A": "T", "T": "A", "G": "C", "C": "G",
     "a": "t", "t": "a", "g": "c", "c": "g",
@@ -54,7 +56,7 @@ def reverse_complement(seq: str) -> str:
         >>> reverse_complement("ATGC")
         "GCAT"
     """
-    return "".join(COMPLEMENT_MAP.get(base, base) for base in reversed(seq))
+    return seqkernels.reverse_complement(seq)
 
 
 def complement(seq: str) -> str:
@@ -67,7 +69,7 @@ def complement(seq: str) -> str:
     Returns:
         Complement sequence
     """
-    return "".join(COMPLEMENT_MAP.get(base, base) for base in seq)
+    return seqkernels.complement(seq)
 
 
 def translate_dna(
@@ -93,7 +95,10 @@ def translate_dna(
         "MA"
     """
     if codon_table is None:
-        codon_table = CODON_TABLE
+        protein = seqkernels.translate(dna_seq, table=1, unknown_symbol=unknown_symbol)
+        if stop_symbol != "*":
+            protein = protein.replace("*", stop_symbol)
+        return protein
 
     dna_seq = dna_seq.upper()
     protein = []
@@ -191,10 +196,7 @@ def gc_content(seq: str) -> float:
     Returns:
         GC content as a fraction (0.0 to 1.0)
     """
-    seq = seq.upper()
-    gc_count = seq.count("G") + seq.count("C")
-    total = len(seq)
-    return gc_count / total if total > 0 else 0.0
+    return seqkernels.gc_content(seq)
 
 
 def count_bases(seq: str) -> dict[str, int]:
@@ -207,14 +209,7 @@ def count_bases(seq: str) -> dict[str, int]:
     Returns:
         Dictionary with base counts
     """
-    seq = seq.upper()
-    return {
-        "A": seq.count("A"),
-        "T": seq.count("T"),
-        "G": seq.count("G"),
-        "C": seq.count("C"),
-        "N": seq.count("N"),
-    }
+    return seqkernels.base_counts(seq, "ATGCN")
 
 
 def split_into_codons(seq: str) -> list[str]:
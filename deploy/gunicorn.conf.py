@@ -0,0 +1,27 @@
+# Gunicorn configuration for the CGD API
+# Used by deploy/systemd/cgd-api.service:  gunicorn -c deploy/gunicorn.conf.py cgd.main:app
+#
+# Prometheus multiprocess mode: every worker writes its metrics to
+# PROMETHEUS_MULTIPROC_DIR and /metrics aggregates them. The directory is
+# wiped when the master starts so stale files from a previous run are not
+# reported.
+
+import os
+import shutil
+
+bind = "127.0.0.1:8000"
+workers = 2
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from cgd.core.metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
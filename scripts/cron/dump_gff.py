@@ -18,6 +18,7 @@ Usage:
     python dump_gff.py <strain_abbrev> [seq_source]
     python dump_gff.py C_albicans_SC5314 > genes.gff
     python dump_gff.py C_albicans_SC5314 --output genes.gff
+    python dump_gff.py C_albicans_SC5314 --output genes.gff --workers 4
 
 Environment Variables:
     DATABASE_URL: Database connection URL
@@ -30,9 +31,13 @@ Environment Variables:
 import argparse
 import gzip
 import logging
+import multiprocessing
 import os
 import re
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import quote
@@ -124,108 +129,148 @@ def get_root_sequences(session, seq_source: str) -> list[dict]:
     return roots
 
 
-def get_features(session, organism_no: int, seq_source: str) -> list[dict]:
-    """Get features for a strain that have current locations.
+# Rows fetched per round trip from the server-side cursors
+FETCH_SIZE = 5000
 
-    Excludes:
-    - chromosomes/contigs (these are root sequences)
-    - subfeature types (CDS, intron, exon, UTR, etc.) - these are output as subfeatures of parent features
+SUBFEATURE_TYPES = (
+    "CDS", "intron", "noncoding_exon", "adjustment", "gap",
+    "three_prime_UTR", "five_prime_UTR",
+    "three_prime_UTR_intron", "five_prime_UTR_intron",
+)
+
+# Features of an organism with a current location on the assembly, and
+# the root sequence they are on. Chromosomes/contigs are the root
+# sequences and subfeature types (CDS, intron, UTR, ...) are written under
+# their parent feature.
+FEATURE_JOINS = f"""
+    FROM {DB_SCHEMA}.feature f
+    JOIN {DB_SCHEMA}.feat_location fl ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
+    JOIN {DB_SCHEMA}.seq s ON (fl.root_seq_no = s.seq_no AND s.is_seq_current = 'Y' AND s.source = :seq_source)
+    JOIN {DB_SCHEMA}.feature root_feat ON s.feature_no = root_feat.feature_no
+"""
+FEATURE_FILTER = f"""
+    WHERE f.organism_no = :organism_no
+    AND f.feature_type NOT IN ('chromosome', 'contig', {", ".join(f"'{t}'" for t in SUBFEATURE_TYPES)})
+"""
+
+
+class GroupStream:
     """
-    query = text(f"""
-        SELECT f.feature_no, f.feature_name, f.gene_name, f.feature_type,
-               fp.property_value as feature_qualifier, f.dbxref_id, f.headline,
-               fl.start_coord, fl.stop_coord, fl.strand,
-               root_feat.feature_name as root_name
-        FROM {DB_SCHEMA}.feature f
-        JOIN {DB_SCHEMA}.feat_location fl ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
-        JOIN {DB_SCHEMA}.seq s ON (fl.root_seq_no = s.seq_no AND s.is_seq_current = 'Y' AND s.source = :seq_source)
-        JOIN {DB_SCHEMA}.feature root_feat ON s.feature_no = root_feat.feature_no
-        LEFT JOIN {DB_SCHEMA}.feat_property fp ON (f.feature_no = fp.feature_no AND fp.property_type = 'feature_qualifier')
-        WHERE f.organism_no = :organism_no
-        AND f.feature_type NOT IN ('chromosome', 'contig',
-            'CDS', 'intron', 'noncoding_exon', 'adjustment', 'gap',
-            'three_prime_UTR', 'five_prime_UTR',
-            'three_prime_UTR_intron', 'five_prime_UTR_intron')
-        ORDER BY root_feat.feature_name, fl.start_coord
-    """)
+    One side of a merge join over an ordered row stream.
 
-    features = []
-    for row in session.execute(
-        query, {"organism_no": organism_no, "seq_source": seq_source}
-    ).fetchall():
-        feature_qualifier = row[4] or ""
+    Rows must arrive sorted by ``key``; ``take`` is called with
+    non-decreasing keys and returns the rows with that key, skipping the
+    ones before it. Asking for the same key again returns the same group.
+    """
 
-        # Skip deleted features (unless it's a specific assembly exception)
-        if "Deleted" in feature_qualifier:
-            continue
+    _END = object()
+
+    def __init__(self, rows, key):
+        self._rows = iter(rows)
+        self._key = key
+        self._next = next(self._rows, self._END)
+        self._group_key = None
+        self._group: list = []
+
+    def take(self, key) -> list:
+        if key == self._group_key:
+            return self._group
+        while self._next is not self._END and self._key(self._next) < key:
+            self._next = next(self._rows, self._END)
+        group = []
+        while self._next is not self._END and self._key(self._next) == key:
+            group.append(self._next)
+            self._next = next(self._rows, self._END)
+        self._group_key, self._group = key, group
+        return group
+
+
+def stream_rows(session, query, params: dict):
+    """Execute ``query`` on a server-side cursor, FETCH_SIZE rows at a time."""
+    return session.execute(
+        query.execution_options(stream_results=True, yield_per=FETCH_SIZE), params
+    )
 
-        features.append({
-            "feature_no": row[0],
-            "feature_name": row[1],
-            "gene_name": row[2],
-            "feature_type": row[3],
-            "feature_qualifier": feature_qualifier,
-            "dbxref_id": row[5],
-            "headline": row[6],
-            "start_coord": row[7],
-            "stop_coord": row[8],
-            "strand": row[9],
-            "root_name": row[10],
-        })
 
-    return features
+def get_section_roots(session, organism_no: int, seq_source: str) -> list[str]:
+    """Names of the root sequences carrying features, in output order."""
+    query = text(f"""
+        SELECT DISTINCT root_feat.feature_name
+        {FEATURE_JOINS}
+        {FEATURE_FILTER}
+        ORDER BY root_feat.feature_name
+    """)
+    return [
+        row[0] for row in session.execute(
+            query, {"organism_no": organism_no, "seq_source": seq_source}
+        )
+    ]
 
 
-def get_all_feature_aliases(session, organism_no: int) -> dict[int, list[str]]:
-    """Get all aliases for features of an organism (batched for performance)."""
-    from collections import defaultdict
+def stream_features(session, organism_no: int, seq_source: str, root_name: str):
+    """Features on one root sequence, ordered by (start_coord, feature_no)."""
+    query = text(f"""
+        SELECT f.feature_no, f.feature_name, f.gene_name, f.feature_type,
+               fp.property_value as feature_qualifier, f.headline,
+               fl.start_coord, fl.stop_coord, fl.strand
+        {FEATURE_JOINS}
+        LEFT JOIN {DB_SCHEMA}.feat_property fp ON (f.feature_no = fp.feature_no AND fp.property_type = 'feature_qualifier')
+        {FEATURE_FILTER}
+        AND root_feat.feature_name = :root_name
+        ORDER BY fl.start_coord, f.feature_no, fp.property_value
+    """)
+    return stream_rows(session, query, {
+        "organism_no": organism_no, "seq_source": seq_source, "root_name": root_name,
+    })
 
+
+def stream_aliases(session, organism_no: int, seq_source: str, root_name: str):
+    """Aliases of the features on one root sequence, in feature stream order."""
     query = text(f"""
-        SELECT fa.feature_no, a.alias_name
+        SELECT fl.start_coord, fa.feature_no, a.alias_name
         FROM {DB_SCHEMA}.alias a
         JOIN {DB_SCHEMA}.feat_alias fa ON a.alias_no = fa.alias_no
         JOIN {DB_SCHEMA}.feature f ON fa.feature_no = f.feature_no
+        JOIN {DB_SCHEMA}.feat_location fl ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
+        JOIN {DB_SCHEMA}.seq s ON (fl.root_seq_no = s.seq_no AND s.is_seq_current = 'Y' AND s.source = :seq_source)
+        JOIN {DB_SCHEMA}.feature root_feat ON s.feature_no = root_feat.feature_no
         WHERE f.organism_no = :organism_no
-        ORDER BY fa.feature_no, a.alias_name
+        AND root_feat.feature_name = :root_name
+        ORDER BY fl.start_coord, fa.feature_no, a.alias_name
     """)
+    return stream_rows(session, query, {
+        "organism_no": organism_no, "seq_source": seq_source, "root_name": root_name,
+    })
 
-    alias_map: dict[int, list[str]] = defaultdict(list)
-    for row in session.execute(query, {"organism_no": organism_no}).fetchall():
-        alias_map[row[0]].append(row[1])
 
-    return alias_map
-
-
-def get_all_subfeatures(session, organism_no: int, seq_source: str) -> dict[int, list[dict]]:
-    """Get all subfeatures for features of an organism (batched for performance)."""
-    from collections import defaultdict
+def stream_subfeatures(session, organism_no: int, seq_source: str, root_name: str):
+    """
+    Subfeatures of the features on one root sequence, in feature stream order.
 
+    Keyed by the parent's location so the stream lines up with the
+    features; within a parent, ordered by type and start.
+    """
     query = text(f"""
-        SELECT fr.parent_feature_no, f.feature_type, fl.start_coord, fl.stop_coord,
-               f.feature_no, f.feature_name
+        SELECT pfl.start_coord, fr.parent_feature_no, f.feature_type,
+               fl.start_coord, fl.stop_coord
         FROM {DB_SCHEMA}.feature f
         JOIN {DB_SCHEMA}.feat_relationship fr ON fr.child_feature_no = f.feature_no
         JOIN {DB_SCHEMA}.feat_location fl ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
         JOIN {DB_SCHEMA}.seq s ON (fl.seq_no = s.seq_no AND s.is_seq_current = 'Y')
         JOIN {DB_SCHEMA}.genome_version gv ON (s.genome_version_no = gv.genome_version_no AND gv.is_ver_current = 'Y')
         JOIN {DB_SCHEMA}.feature parent_f ON fr.parent_feature_no = parent_f.feature_no
+        JOIN {DB_SCHEMA}.feat_location pfl ON (parent_f.feature_no = pfl.feature_no AND pfl.is_loc_current = 'Y')
+        JOIN {DB_SCHEMA}.seq ps ON (pfl.root_seq_no = ps.seq_no AND ps.is_seq_current = 'Y' AND ps.source = :seq_source)
+        JOIN {DB_SCHEMA}.feature root_feat ON ps.feature_no = root_feat.feature_no
         WHERE parent_f.organism_no = :organism_no
         AND fr.rank = 2
         AND s.source = :seq_source
-        ORDER BY fr.parent_feature_no, f.feature_type, fl.start_coord
+        AND root_feat.feature_name = :root_name
+        ORDER BY pfl.start_coord, fr.parent_feature_no, f.feature_type, fl.start_coord, f.feature_no
     """)
-
-    subfeature_map: dict[int, list[dict]] = defaultdict(list)
-    for row in session.execute(query, {"organism_no": organism_no, "seq_source": seq_source}).fetchall():
-        subfeature_map[row[0]].append({
-            "type": row[1],
-            "start": row[2],
-            "end": row[3],
-            "feature_no": row[4],
-            "feature_name": row[5],
-        })
-
-    return subfeature_map
+    return stream_rows(session, query, {
+        "organism_no": organism_no, "seq_source": seq_source, "root_name": root_name,
+    })
 
 
 def get_all_allele_parent_types(session, organism_no: int) -> dict[int, str]:
@@ -267,12 +312,173 @@ def format_gff_attributes(attrs: dict) -> str:
     return ";".join(parts)
 
 
+def write_section(
+    session,
+    organism_no: int,
+    seq_source: str,
+    root_name: str,
+    allele_parent_map: dict[int, str],
+    output_file,
+) -> int:
+    """
+    Write the features of one root sequence, each followed by its subfeatures.
+
+    The feature, alias and subfeature rows are streamed in the same order
+    and merged by feature, so memory does not grow with the section.
+
+    Returns:
+        Number of features written
+    """
+    source = PROJECT_ACRONYM
+    aliases = GroupStream(
+        stream_aliases(session, organism_no, seq_source, root_name), key=lambda row: row[:2]
+    )
+    subfeatures = GroupStream(
+        stream_subfeatures(session, organism_no, seq_source, root_name), key=lambda row: row[:2]
+    )
+
+    count = 0
+
+    for feat in stream_features(session, organism_no, seq_source, root_name):
+        feature_qualifier = feat.feature_qualifier or ""
+
+        # Skip deleted features (unless it's a specific assembly exception)
+        if "Deleted" in feature_qualifier:
+            continue
+
+        key = (feat.start_coord, feat.feature_no)
+        feature_name = feat.feature_name
+        feature_type = feat.feature_type.replace(" ", "_")
+
+        # Handle allele features - look up parent feature type
+        if feature_type == "allele":
+            parent_type = allele_parent_map.get(feat.feature_no)
+            feature_type = parent_type if parent_type else "ORF"
+
+        # Get coordinates
+        start = feat.start_coord
+        end = feat.stop_coord
+        if start > end:
+            start, end = end, start
+
+        strand = "-" if feat.strand == "C" else "+"
+
+        # Build attributes
+        attrs = {"ID": feature_name, "Name": feature_name}
+
+        if feat.gene_name:
+            attrs["Gene"] = feat.gene_name
+
+        if feat.headline:
+            # Strip HTML tags from headline
+            attrs["Note"] = re.sub(r"<[^<>]+>", "", feat.headline)
+
+        # Get ORF classification from qualifier
+        orf_classification = None
+        if feature_qualifier:
+            match = re.search(r"(Verified|Uncharacterized|Dubious)", feature_qualifier)
+            if match:
+                orf_classification = match.group(1)
+                attrs["orf_classification"] = orf_classification
+
+        alias_names = [row[2] for row in aliases.take(key)]
+        if alias_names:
+            attrs["Alias"] = alias_names
+
+        attr_str = format_gff_attributes(attrs)
+        output_file.write(
+            f"{root_name}\t{source}\t{feature_type}\t{start}\t{end}\t.\t{strand}\t.\t{attr_str}\n"
+        )
+
+        for _, _, sf_type, sf_start, sf_end in subfeatures.take(key):
+            sf_attrs = {"Parent": feature_name}
+
+            # Add orf_classification to CDS subfeatures
+            if feature_type == "ORF" and sf_type == "CDS":
+                if orf_classification:
+                    sf_attrs["orf_classification"] = orf_classification
+
+            sf_attrs["parent_feature_type"] = feature_type
+
+            # Swap subfeature coordinates for minus strand (per Perl script)
+            if strand == "-":
+                sf_start, sf_end = sf_end, sf_start
+
+            sf_attr_str = format_gff_attributes(sf_attrs)
+            output_file.write(
+                f"{root_name}\t{source}\t{sf_type}\t{sf_start}\t{sf_end}\t.\t{strand}\t.\t{sf_attr_str}\n"
+            )
+
+        count += 1
+
+    return count
+
+
+# Per-process state of the section workers, set by _init_section_worker
+_worker_session_factory = None
+_worker_allele_parent_map: dict[int, str] = {}
+
+
+def _init_section_worker(session_factory, allele_parent_map: dict[int, str]) -> None:
+    global _worker_session_factory, _worker_allele_parent_map
+    # Pooled connections inherited over fork belong to the parent process
+    session_factory.kw["bind"].dispose(close=False)
+    _worker_session_factory = session_factory
+    _worker_allele_parent_map = allele_parent_map
+
+
+def _write_section_file(task: tuple) -> tuple[str, int]:
+    organism_no, seq_source, root_name, path = task
+    with _worker_session_factory() as session, open(path, "w", newline="") as section_file:
+        count = write_section(
+            session, organism_no, seq_source, root_name, _worker_allele_parent_map, section_file
+        )
+    return path, count
+
+
+def write_sections_parallel(
+    session_factory,
+    organism_no: int,
+    seq_source: str,
+    section_roots: list[str],
+    allele_parent_map: dict[int, str],
+    output_file,
+    workers: int,
+) -> int:
+    """
+    Write each root sequence's section in a worker process.
+
+    Sections go to temporary files that are appended to ``output_file``
+    in root order as they complete, so the output matches a serial run.
+    """
+    count = 0
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory(prefix="dump_gff_") as tmp_dir, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_section_worker,
+        initargs=(session_factory, allele_parent_map),
+    ) as executor:
+        tasks = [
+            (organism_no, seq_source, root_name, os.path.join(tmp_dir, f"{n:05d}.gff"))
+            for n, root_name in enumerate(section_roots)
+        ]
+        for path, section_count in executor.map(_write_section_file, tasks):
+            with open(path, newline="") as section_file:
+                shutil.copyfileobj(section_file, output_file)
+            os.remove(path)
+            count += section_count
+    return count
+
+
 def dump_gff(
     session,
     organism_no: int,
     strain_abbrev: str,
     seq_source: str | None = None,
     output_file=None,
+    workers: int = 1,
+    session_factory=None,
 ) -> int:
     """
     Dump GFF3 format gene annotations.
@@ -283,6 +489,9 @@ def dump_gff(
         strain_abbrev: Strain abbreviation
         seq_source: Sequence source (optional, auto-detected if not provided)
         output_file: Output file handle (defaults to stdout)
+        workers: Number of processes writing root sequence sections
+        session_factory: Session factory for the worker processes
+            (defaults to SessionLocal)
 
     Returns:
         Number of features written
@@ -336,93 +545,27 @@ def dump_gff(
             f"{root['name']}\t{source}\t{root['type']}\t1\t{root['length']}\t.\t.\t.\t{attrs}\n"
         )
 
-    # Get features
-    features = get_features(session, organism_no, seq_source)
-    logger.info(f"Found {len(features)} features")
-
-    # Batch fetch all aliases, subfeatures, and allele parent types for performance
-    logger.info("Fetching aliases...")
-    alias_map = get_all_feature_aliases(session, organism_no)
-    logger.info("Fetching subfeatures...")
-    subfeature_map = get_all_subfeatures(session, organism_no, seq_source)
-    logger.info("Fetching allele parent types...")
+    section_roots = get_section_roots(session, organism_no, seq_source)
+    logger.info(f"Found features on {len(section_roots)} root sequences")
     allele_parent_map = get_all_allele_parent_types(session, organism_no)
 
-    count = 0
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Process pool needs the fork start method; writing sections serially")
+        workers = 1
 
-    for feat in features:
-        feature_name = feat["feature_name"]
-        root_name = feat["root_name"]
-        feature_type = feat["feature_type"].replace(" ", "_")
-
-        # Handle allele features - look up parent feature type
-        if feature_type == "allele":
-            parent_type = allele_parent_map.get(feat["feature_no"])
-            feature_type = parent_type if parent_type else "ORF"
-
-        # Get coordinates
-        start = feat["start_coord"]
-        end = feat["stop_coord"]
-        if start > end:
-            start, end = end, start
-
-        strand = "-" if feat["strand"] == "C" else "+"
-
-        # Build attributes
-        attrs = {"ID": feature_name, "Name": feature_name}
-
-        if feat["gene_name"]:
-            attrs["Gene"] = feat["gene_name"]
-
-        if feat["headline"]:
-            # Strip HTML tags from headline
-            headline = feat["headline"]
-            headline = re.sub(r"<[^<>]+>", "", headline)
-            attrs["Note"] = headline
-
-        # Get ORF classification from qualifier
-        orf_classification = None
-        if feat["feature_qualifier"]:
-            match = re.search(r"(Verified|Uncharacterized|Dubious)", feat["feature_qualifier"])
-            if match:
-                orf_classification = match.group(1)
-                attrs["orf_classification"] = orf_classification
-
-        # Get aliases from pre-fetched map
-        aliases = alias_map.get(feat["feature_no"], [])
-        if aliases:
-            attrs["Alias"] = aliases
-
-        attr_str = format_gff_attributes(attrs)
-        output_file.write(
-            f"{root_name}\t{source}\t{feature_type}\t{start}\t{end}\t.\t{strand}\t.\t{attr_str}\n"
+    if workers > 1 and len(section_roots) > 1:
+        output_file.flush()
+        count = write_sections_parallel(
+            session_factory or SessionLocal, organism_no, seq_source, section_roots,
+            allele_parent_map, output_file, min(workers, len(section_roots)),
         )
-
-        # Get and write subfeatures from pre-fetched map
-        subfeatures = subfeature_map.get(feat["feature_no"], [])
-        for sf in subfeatures:
-            sf_attrs = {"Parent": feature_name}
-
-            # Add orf_classification to CDS subfeatures
-            if feature_type == "ORF" and sf["type"] == "CDS":
-                if orf_classification:
-                    sf_attrs["orf_classification"] = orf_classification
-
-            sf_attrs["parent_feature_type"] = feature_type
-
-            # Get subfeature coordinates - swap for minus strand (per Perl script)
-            sf_start = sf["start"]
-            sf_end = sf["end"]
-            if strand == "-":
-                sf_start, sf_end = sf_end, sf_start
-
-            sf_attr_str = format_gff_attributes(sf_attrs)
-            output_file.write(
-                f"{root_name}\t{source}\t{sf['type']}\t{sf_start}\t{sf_end}\t.\t{strand}\t.\t{sf_attr_str}\n"
+    else:
+        count = 0
+        for root_name in section_roots:
+            count += write_section(
+                session, organism_no, seq_source, root_name, allele_parent_map, output_file
             )
 
-        count += 1
-
     logger.info(f"Wrote {count} features to GFF")
     return count
 
@@ -453,6 +596,12 @@ def main() -> int:
         action="store_true",
         help="Gzip the output file",
     )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=1,
+        help="Processes writing chromosome sections in parallel (default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -467,13 +616,16 @@ def main() -> int:
             if args.output:
                 if args.gzip:
                     with gzip.open(args.output, "wt") as f:
-                        count = dump_gff(session, config["organism_no"], args.strain_abbrev, args.seq_source, f)
+                        count = dump_gff(session, config["organism_no"], args.strain_abbrev, args.seq_source, f, args.workers)
                 else:
                     with open(args.output, "w") as f:
-                        count = dump_gff(session, config["organism_no"], args.strain_abbrev, args.seq_source, f)
+                        count = dump_gff(session, config["organism_no"], args.strain_abbrev, args.seq_source, f, args.workers)
                 logger.info(f"Output written to {args.output}")
             else:
-                count = dump_gff(session, config["organism_no"], args.strain_abbrev, args.seq_source)
+                count = dump_gff(
+                    session, config["organism_no"], args.strain_abbrev, args.seq_source,
+                    workers=args.workers,
+                )
 
             if count == 0:
                 return 1
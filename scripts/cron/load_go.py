@@ -11,6 +11,16 @@ and updates the GO table in the database. It handles:
 - Obsolete GO entries (deletions with validation)
 - Secondary (alt_id) GO entries (merging with primary)
 - GO synonyms (go_synonym and go_gosyn tables)
+- GO_PATH, the transitive closure of is_a and part_of relationships
+
+The OBO file is parsed into columnar tables and diffed against one
+snapshot of the GO, GO_SYNONYM, GO_GOSYN and GO_PATH tables; the
+resulting insert, update and delete sets are written with batched
+executemany statements, one transaction per table group. API workers
+swap in a rebuilt GO DAG (cgd/api/services/go_dag_service.py) within
+GO_DAG_CHECK_INTERVAL seconds of the last commit: the DAG version includes
+a fingerprint of GO terms and direct GO_PATH edges, so in-place term and
+path updates are noticed as well as inserts and deletes.
 
 Based on loadGo.pl/updateGo by Gavin Sherlock (June 2000)
 Rewritten by Shuai Weng (April 2004)
@@ -18,6 +28,7 @@ Rewritten by Shuai Weng (April 2004)
 Usage:
     python load_go.py
     python load_go.py --obo /path/to/gene_ontology.obo
+    python load_go.py --no-download --dry-run
 
 Environment Variables:
     DATABASE_URL: Database connection URL
@@ -33,8 +44,12 @@ import logging
 import os
 import re
 import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 
 import requests
 from dotenv import load_dotenv
@@ -79,696 +94,678 @@ def delete_unwanted_char(text_value: str | None) -> str | None:
     return text_value
 
 
-class GOLoader:
-    """Load/update GO information from OBO file."""
-
-    def __init__(self, session):
-        self.session = session
-
-        # Data caches from database
-        self.go_info_db: dict[str, dict] = {}  # goid -> {go_no, term, aspect, definition}
-        self.goid_for_term: dict[str, str] = {}  # term -> goid
-
-        # Counters
-        self.go_insert_count = 0
-        self.go_update_count = 0
-        self.go_delete_count = 0
-        self.synonym_insert_count = 0
-        self.synonym_delete_count = 0
-        self.go_gosyn_insert_count = 0
-        self.go_gosyn_delete_count = 0
-
-        # Error tracking
-        self.oracle_err = 0
-        self.obsolete_err = 0
-        self.secondary_err = 0
-        self.check_term_err = 0
-
-        # Error messages
-        self.error_messages: list[str] = []
-
-    def populate_hashes(self) -> None:
-        """
-        Retrieve data from GO and go_synonym tables.
-
-        Populates go_info_db and goid_for_term dictionaries.
-        """
-        query = text(f"""
-            SELECT go_no, goid, go_term, go_aspect, go_definition
-            FROM {DB_SCHEMA}.go
-        """)
+def _chunk_list(lst: list, chunk_size: int = 900) -> list[list]:
+    """Split list into chunks (Oracle IN lists are limited to 1000 items)."""
+    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
 
-        result = self.session.execute(query)
 
-        for row in result:
-            go_no, goid, go_term, go_aspect, go_def = row
-            goid_str = str(goid)
+def _goid_number(value: str) -> str | None:
+    """'GO:0008150 ! name' -> '8150' (GOIDs are stored without zero padding)."""
+    value = value.split("!", 1)[0].strip()
+    if value[:3].upper() != "GO:" or not value[3:].isdigit():
+        return None
+    return str(int(value[3:]))
 
-            self.go_info_db[goid_str] = {
-                "go_no": go_no,
-                "term": go_term,
-                "aspect": go_aspect,
-                "definition": go_def,
-            }
 
-            if go_term:
-                self.goid_for_term[go_term] = goid_str
+# namespace value -> go_aspect
+ASPECTS = {
+    "biological_process": "P",
+    "molecular_function": "F",
+    "cellular_component": "C",
+}
+# relationship tags that are part of the GO_PATH closure
+PATH_RELATIONSHIPS = {"is_a": "is a", "part_of": "part of"}
+# def: and synonym: values start with a quoted string (with \" escapes),
+# then the synonym scope/type and dbxrefs
+QUOTED_VALUE = re.compile(r'^"((?:[^"\\]|\\.)+)"')
+DML_BATCH_SIZE = 5000
 
-        logger.info(f"Loaded {len(self.go_info_db)} GO entries from database")
 
-    def process_obo_file(self, obo_file: Path) -> None:
-        """
-        Process the OBO ontology file.
-
-        Args:
-            obo_file: Path to gene_ontology.obo file
-        """
-        logger.info(f"Processing OBO file: {obo_file}")
-
-        with open(obo_file, "r", encoding="utf-8") as f:
-            entry = ""
-            term_start = False
-
-            for line in f:
-                if line.strip() == "[Term]":
-                    term_start = True
-                    if entry:
-                        self._process_entry(entry)
-                    entry = ""
-                    continue
-
-                if line.strip() == "[Typedef]":
-                    # End of terms section
-                    if entry:
-                        self._process_entry(entry)
-                    break
-
-                if term_start:
-                    entry += line
-
-            # Process last entry
-            if entry:
-                self._process_entry(entry)
-
-    def _process_entry(self, entry: str) -> None:
-        """Process a single OBO term entry."""
-        goid = None
-        term = None
-        aspect = None
-        definition = None
-        synonyms: list[str] = []
-        secondary_goids: list[str] = []
-        is_obsolete = False
-
-        for line in entry.split("\n"):
-            line = line.strip()
-
-            # Get GO ID
-            match = re.match(r"^id:\s*GO:0*(\d+)$", line, re.IGNORECASE)
-            if match:
-                goid = match.group(1)
-                continue
-
-            # Get name/term
-            match = re.match(r"^name:\s*(.+)$", line)
-            if match and not term:
-                term = match.group(1)
-                term = term.replace("\\n", " ")
-                term = term.replace("\\", "")
-                continue
-
-            # Get alt_id (secondary GOID)
-            match = re.match(r"^alt_id:\s*GO:0*(\d+)$", line, re.IGNORECASE)
-            if match:
-                secondary_goids.append(match.group(1))
-                continue
-
-            # Get namespace/aspect
-            match = re.match(
-                r"^namespace:\s*(biological|molecular|cellular)[_ ]([pfc]).*$",
-                line, re.IGNORECASE
-            )
-            if match:
-                aspect = match.group(2).upper()
-                continue
-
-            # Get definition
-            match = re.match(r'^def:\s*"(.+)"\s*\[.*\]$', line)
-            if match:
-                definition = match.group(1)
-                definition = definition.replace("\\n", " ")
-                definition = definition.replace("\\", "")
-                continue
-
-            # Get synonyms (various types)
-            match = re.match(r'^[\w_]*synonym:\s*"(.+)"\s*\[.*\]$', line)
-            if match:
-                synonym = match.group(1)
-                synonym = synonym.replace("\\n", " ")
-                synonym = synonym.replace("\\", "")
-                synonyms.append(synonym)
-                continue
-
-            # Check if obsolete
-            if line.startswith("is_obsolete:") and "true" in line.lower():
-                is_obsolete = True
-                continue
-
-        # Skip Gene_ontology root term
-        if term and term.lower().startswith("gene_ontology"):
-            return
-
-        if not goid:
-            return
+@dataclass
+class OboTables:
+    """
+    [Term] stanzas of an OBO file as columns.
 
-        if not aspect:
-            self.error_messages.append(
-                f"There is no namespace (aspect) associated with goid = {goid}"
-            )
-            self.oracle_err += 1
-            return
+    One row per term in the term columns; synonyms, alt_ids and parent
+    edges are separate tables keyed by the term's goid.
+    """
 
-        if is_obsolete:
-            self._check_and_delete_obsolete_goid(goid)
-            return
+    goid: list[str] = field(default_factory=list)
+    term: list[str | None] = field(default_factory=list)
+    aspect: list[str | None] = field(default_factory=list)
+    definition: list[str | None] = field(default_factory=list)
+    obsolete: list[bool] = field(default_factory=list)
 
-        # Clean up text fields
-        term = delete_unwanted_char(term)
-        definition = delete_unwanted_char(definition)
+    synonym_goid: list[str] = field(default_factory=list)
+    synonym: list[str] = field(default_factory=list)
 
-        # Check if new entry
-        if goid not in self.go_info_db or not self.go_info_db[goid].get("term"):
-            go_no = self._insert_new_go_entry(goid, term, aspect, definition)
+    alt_goid: list[str] = field(default_factory=list)
+    alt_id: list[str] = field(default_factory=list)
 
-            if go_no:
-                for synonym in synonyms:
-                    self._insert_go_synonym(go_no, synonym)
+    parent_child: list[str] = field(default_factory=list)
+    parent_goid: list[str] = field(default_factory=list)
+    parent_relationship: list[str] = field(default_factory=list)
 
-            # Handle secondary GOIDs
-            self._check_and_delete_secondary_goid(goid, secondary_goids)
-            return
+    def __len__(self) -> int:
+        return len(self.goid)
 
-        # Check for updates
-        db_entry = self.go_info_db[goid]
-        if (db_entry.get("term") != term or
-                db_entry.get("aspect") != aspect or
-                db_entry.get("definition") != definition):
-            self._update_go_entry(goid, term, aspect, definition)
 
-        # Update synonyms
-        self._update_synonyms(goid, synonyms)
+def parse_obo(lines: Iterable[str]) -> OboTables:
+    """
+    Parse the [Term] stanzas of an OBO file into columnar tables.
 
-        # Handle secondary GOIDs
-        self._check_and_delete_secondary_goid(goid, secondary_goids)
+    Each line is split once on its tag and dispatched on the tag; the
+    Gene_ontology root term and stanzas without a GO id are skipped.
+    """
+    tables = OboTables()
+    stanza: dict | None = None
 
-    def _check_and_delete_obsolete_goid(self, goid: str) -> None:
-        """Check and delete an obsolete GOID."""
-        if goid not in self.go_info_db:
+    def flush() -> None:
+        if stanza is None or not stanza["goid"]:
             return
-
-        type_str = "Obsolete"
-        before_err = self.obsolete_err
-
-        # Check if obsolete goid is still used
-        self._check_go_annotation(goid, type_str)
-        self._check_go_set(goid, type_str)
-        self._check_go_ref_support(goid, type_str)
-
-        if self.obsolete_err > before_err:
+        term = stanza["term"]
+        if term and term.lower().startswith("gene_ontology"):
             return
-
-        # Delete the GO entry and associated data
-        self._delete_go_entry(goid, type_str)
-
-    def _check_and_delete_secondary_goid(
-        self, primary_goid: str, secondary_goids: list[str]
-    ) -> None:
-        """Check and delete secondary GOIDs, transferring terms to synonyms."""
-        type_str = "Synonymous"
-        before_err = self.secondary_err
-
-        for secondary_goid in secondary_goids:
-            if secondary_goid not in self.go_info_db:
+        goid = stanza["goid"]
+        tables.goid.append(goid)
+        tables.term.append(delete_unwanted_char(term))
+        tables.aspect.append(stanza["aspect"])
+        tables.definition.append(delete_unwanted_char(stanza["definition"]))
+        tables.obsolete.append(stanza["obsolete"])
+        for synonym in stanza["synonyms"]:
+            tables.synonym_goid.append(goid)
+            tables.synonym.append(synonym)
+        for alt_id in stanza["alt_ids"]:
+            tables.alt_goid.append(goid)
+            tables.alt_id.append(alt_id)
+        for parent, relationship in stanza["parents"]:
+            tables.parent_child.append(goid)
+            tables.parent_goid.append(parent)
+            tables.parent_relationship.append(relationship)
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("["):
+            flush()
+            if line == "[Typedef]":
+                # End of terms section
+                stanza = None
+                break
+            stanza = None
+            if line == "[Term]":
+                stanza = {
+                    "goid": None, "term": None, "aspect": None, "definition": None,
+                    "obsolete": False, "synonyms": [], "alt_ids": [], "parents": [],
+                }
+            continue
+        if stanza is None:
+            continue
+
+        tag, _, value = line.partition(":")
+        value = value.strip()
+        if tag == "id":
+            stanza["goid"] = _goid_number(value)
+        elif tag == "name":
+            if not stanza["term"]:
+                stanza["term"] = value
+        elif tag == "alt_id":
+            alt_id = _goid_number(value)
+            if alt_id:
+                stanza["alt_ids"].append(alt_id)
+        elif tag == "namespace":
+            stanza["aspect"] = ASPECTS.get(value.lower().replace(" ", "_"))
+        elif tag == "def" or tag.endswith("synonym"):
+            match = QUOTED_VALUE.match(value)
+            if not match:
                 continue
+            if tag == "def":
+                stanza["definition"] = match.group(1)
+            else:
+                stanza["synonyms"].append(delete_unwanted_char(match.group(1)))
+        elif tag == "is_obsolete":
+            stanza["obsolete"] = "true" in value.lower()
+        elif tag == "is_a":
+            parent = _goid_number(value)
+            if parent:
+                stanza["parents"].append((parent, PATH_RELATIONSHIPS["is_a"]))
+        elif tag == "relationship":
+            relationship, _, target = value.partition(" ")
+            parent = _goid_number(target)
+            if parent and relationship in PATH_RELATIONSHIPS:
+                stanza["parents"].append((parent, PATH_RELATIONSHIPS[relationship]))
+    else:
+        flush()
+
+    return tables
+
+
+def compute_go_paths(
+    parent_child: list[str],
+    parent_goid: list[str],
+    parent_relationship: list[str],
+) -> dict[str, list[tuple[str, int, str, str | None]]]:
+    """
+    Transitive closure of the parent edges, one row per path.
+
+    Returns {child goid: [(ancestor goid, generation, ancestor_path,
+    relationship)]}, where ancestor_path lists the goids from the parent
+    up to the ancestor separated by "::" and relationship is only set
+    for direct parents. Every distinct path is a row, as in GO_PATH.
+    Paths are memoized per term, so each term's ancestors are expanded
+    once however many descendants it has.
+    """
+    parents: dict[str, dict[str, str]] = {}
+    for child, parent, relationship in zip(parent_child, parent_goid, parent_relationship):
+        if child != parent:
+            parents.setdefault(child, {})[parent] = relationship
+
+    paths: dict[str, list[tuple[str, int, str, str | None]]] = {}
+    expanding: set[str] = set()
+
+    def expand(goid: str) -> list[tuple[str, int, str, str | None]]:
+        if goid in paths:
+            return paths[goid]
+        if goid in expanding:
+            raise ValueError(f"Cycle in GO parent relationships at GOID {goid}")
+        expanding.add(goid)
+        rows = []
+        for parent, relationship in parents.get(goid, {}).items():
+            rows.append((parent, 1, parent, relationship))
+            for ancestor, generation, path, _ in expand(parent):
+                rows.append((ancestor, generation + 1, f"{parent}::{path}", None))
+        expanding.discard(goid)
+        paths[goid] = rows
+        return rows
+
+    for child in parents:
+        expand(child)
+    return {child: paths[child] for child in parents}
+
+
+@dataclass
+class GOSnapshot:
+    """GO, GO_SYNONYM, GO_GOSYN and GO_PATH rows, read once before planning."""
+
+    go: dict[str, dict] = field(default_factory=dict)          # goid -> row
+    synonym_no: dict[str, int] = field(default_factory=dict)   # synonym -> go_synonym_no
+    gosyn: set[tuple[int, int]] = field(default_factory=set)   # (go_no, go_synonym_no)
+    # (ancestor_path, child_go_no, generation) -> (go_path_no, ancestor_go_no, relationship)
+    paths: dict[tuple[str, int, int], tuple[int, int, str | None]] = field(
+        default_factory=dict
+    )
 
-            # Check if secondary goid is still used
-            self._check_go_annotation(secondary_goid, type_str)
-            self._check_go_set(secondary_goid, type_str)
-            self._check_go_ref_support(secondary_goid, type_str)
 
-            if self.secondary_err > before_err:
-                continue
+@dataclass
+class GOPlan:
+    """Row sets to write, computed in memory from the OBO and the snapshot."""
 
-            # Transfer term to synonym for primary GOID
-            primary_go_no = self.go_info_db.get(primary_goid, {}).get("go_no")
-            secondary_term = self.go_info_db.get(secondary_goid, {}).get("term")
+    go_inserts: list[dict] = field(default_factory=list)
+    go_updates: list[dict] = field(default_factory=list)
+    # goid -> "Obsolete" or "Synonymous", until checked for remaining uses
+    go_deletes: dict[str, str] = field(default_factory=dict)
+    # (go_no, synonym) links each live term should have
+    synonyms: dict[int, set[str]] = field(default_factory=dict)
+    synonym_inserts: list[dict] = field(default_factory=list)
+    synonym_deletes: list[dict] = field(default_factory=list)
+    gosyn_inserts: list[dict] = field(default_factory=list)
+    gosyn_deletes: list[dict] = field(default_factory=list)
+    path_inserts: list[dict] = field(default_factory=list)
+    path_updates: list[dict] = field(default_factory=list)
+    path_deletes: list[dict] = field(default_factory=list)
 
-            if primary_go_no and secondary_term:
-                self._insert_go_synonym(primary_go_no, secondary_term)
 
-            # Delete the secondary GO entry
-            self._delete_go_entry(secondary_goid, type_str)
+class GOLoader:
+    """
+    Load/update GO information from an OBO file.
+
+    The load runs in phases: parse the OBO into columns, read the GO
+    tables once, plan every insert, update and delete in memory, check
+    that terms to delete are unused, then write each table with batched
+    executemany statements. Each write phase commits on its own; a failed
+    run leaves the tables consistent, and the next run's diff picks up
+    what is left.
+    """
 
-    def _delete_go_entry(self, goid: str, type_str: str) -> None:
-        """Delete a GO entry and associated data."""
-        go_no = self.go_info_db.get(goid, {}).get("go_no")
-        if not go_no:
-            return
+    def __init__(self, session):
+        self.session = session
 
-        # Delete from go_path
-        try:
-            delete_path = text(f"""
-                DELETE FROM {DB_SCHEMA}.go_path
-                WHERE child_go_no = :go_no OR ancestor_go_no = :go_no
-            """)
-            self.session.execute(delete_path, {"go_no": go_no})
-        except Exception as e:
-            self.error_messages.append(
-                f"Error deleting go_path for goid={goid} (go_no={go_no}): {e}"
-            )
-            self.oracle_err += 1
-            return
+        self.snapshot = GOSnapshot()
+        self.plan = GOPlan()
+        self._new_go: dict[str, dict] = {}  # goid -> planned go row
+        self.timings: dict[str, float] = {}
 
-        # Delete from go table
-        try:
-            delete_go = text(f"""
-                DELETE FROM {DB_SCHEMA}.go WHERE go_no = :go_no
-            """)
-            self.session.execute(delete_go, {"go_no": go_no})
-            self.go_delete_count += 1
-            logger.info(f"Deletion: GOID {goid} from go table")
-        except Exception as e:
-            self.error_messages.append(
-                f"Error deleting {type_str.lower()} GOID {goid} from go table: {e}"
-            )
-            self.oracle_err += 1
-            return
+        # Counters
+        self.go_insert_count = 0
+        self.go_update_count = 0
+        self.go_delete_count = 0
+        self.synonym_insert_count = 0
+        self.synonym_delete_count = 0
+        self.go_gosyn_insert_count = 0
+        self.go_gosyn_delete_count = 0
+        self.go_path_insert_count = 0
+        self.go_path_update_count = 0
+        self.go_path_delete_count = 0
 
-        # Delete associated synonyms
-        get_synonyms = text(f"""
-            SELECT gs.go_synonym
-            FROM {DB_SCHEMA}.go g
-            JOIN {DB_SCHEMA}.go_gosyn gg ON g.go_no = gg.go_no
-            JOIN {DB_SCHEMA}.go_synonym gs ON gg.go_synonym_no = gs.go_synonym_no
-            WHERE g.goid = :goid
-        """)
-
-        result = self.session.execute(get_synonyms, {"goid": goid})
-        for row in result:
-            synonym = row[0]
-            if synonym:
-                self._delete_go_synonym(synonym)
-
-        # Delete from dbxref table
-        self._delete_goid_from_dbxref(goid, type_str)
-
-    def _delete_goid_from_dbxref(self, goid: str, type_str: str) -> None:
-        """Delete GOID from dbxref table."""
-        try:
-            delete_dbxref = text(f"""
-                DELETE FROM {DB_SCHEMA}.dbxref
-                WHERE source = 'GO Consortium'
-                AND dbxref_type = 'GOID'
-                AND dbxref_id = :goid
-            """)
-            self.session.execute(delete_dbxref, {"goid": goid})
-            logger.info(f"Deletion: GOID {goid} from dbxref table")
-        except Exception as e:
-            self.error_messages.append(
-                f"Error deleting {type_str} GOID {goid} from dbxref table: {e}"
-            )
-            self.oracle_err += 1
+        # Error tracking
+        self.oracle_err = 0
+        self.obsolete_err = 0
+        self.secondary_err = 0
+        self.check_term_err = 0
 
-    def _insert_new_go_entry(
-        self, goid: str, term: str, aspect: str, definition: str | None
-    ) -> int | None:
-        """Insert a new GO entry."""
-        if self._is_term_in_use(goid, term, aspect):
-            return None
+        # Error messages
+        self.error_messages: list[str] = []
 
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a load phase."""
+        start = time.perf_counter()
         try:
-            # Get next go_no
-            get_max = text(f"SELECT MAX(go_no) FROM {DB_SCHEMA}.go")
-            result = self.session.execute(get_max).scalar()
-            new_go_no = (result or 0) + 1
-
-            insert_go = text(f"""
-                INSERT INTO {DB_SCHEMA}.go
-                (go_no, goid, go_term, go_aspect, go_definition, created_by)
-                VALUES (:go_no, :goid, :term, :aspect, :definition, :user)
-            """)
-
-            self.session.execute(insert_go, {
-                "go_no": new_go_no,
-                "goid": goid,
-                "term": term,
-                "aspect": aspect,
-                "definition": definition,
-                "user": ADMIN_USER,
-            })
-
-            self.go_insert_count += 1
-            logger.info(
-                f"Insertion: GOID {goid}, TERM: {term}, ASPECT: {aspect}"
-            )
-
-            # Update cache
-            self.go_info_db[goid] = {
-                "go_no": new_go_no,
-                "term": term,
-                "aspect": aspect,
-                "definition": definition,
-            }
-            self.goid_for_term[term] = goid
-
-            return new_go_no
-
-        except Exception as e:
-            self.error_messages.append(
-                f"Error inserting GOID {goid}: {e}"
-            )
-            self.oracle_err += 1
-            return None
-
-    def _update_go_entry(
-        self, goid: str, term: str, aspect: str, definition: str | None
-    ) -> None:
-        """Update an existing GO entry."""
-        if self._is_term_in_use(goid, term, aspect):
-            return
-
-        db_entry = self.go_info_db[goid]
-        updates = []
-        params = {"goid": goid}
-        messages = []
-
-        if term != db_entry.get("term"):
-            updates.append("go_term = :term")
-            params["term"] = term
-            messages.append(f'TERM: "{db_entry.get("term")}" to "{term}"')
-
-        if aspect != db_entry.get("aspect"):
-            updates.append("go_aspect = :aspect")
-            params["aspect"] = aspect
-            messages.append(f'ASPECT: "{db_entry.get("aspect")}" to "{aspect}"')
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+            logger.info(f"Phase {name}: {self.timings[name]:.2f}s")
+
+    def run(self, obo_file: Path, dry_run: bool = False) -> bool:
+        """Run all phases; returns False if the load stopped on an error."""
+        with self.phase("parse"):
+            with open(obo_file, "r", encoding="utf-8") as f:
+                tables = parse_obo(f)
+            logger.info(f"Parsed {len(tables)} terms from {obo_file}")
+        with self.phase("snapshot"):
+            self.read_snapshot()
+        with self.phase("plan"):
+            self.plan_terms(tables)
+        if self.oracle_err:
+            return False
+        with self.phase("check_deletes"):
+            self.check_deletes()
+        with self.phase("plan_synonyms_and_paths"):
+            self.plan_synonyms(tables)
+            self.plan_paths(tables)
+        if dry_run:
+            return True
 
-        if definition != db_entry.get("definition"):
-            updates.append("go_definition = :definition")
-            params["definition"] = definition
-            messages.append(f'DEFINITION updated')
+        for name, apply in (
+            ("write_go", self.apply_go),
+            ("write_synonyms", self.apply_synonyms),
+            ("write_paths", self.apply_paths),
+            ("write_deletes", self.apply_deletes),
+        ):
+            with self.phase(name):
+                try:
+                    apply()
+                    self.session.commit()
+                except Exception as e:
+                    self.session.rollback()
+                    self.error_messages.append(f"Error in {name}: {e}")
+                    self.oracle_err += 1
+                    return False
+        return True
 
-        if not updates:
-            return
+    def read_snapshot(self) -> None:
+        """Read the GO, GO_SYNONYM, GO_GOSYN and GO_PATH tables once."""
+        snapshot = self.snapshot
+        result = self.session.execute(text(f"""
+            SELECT go_no, goid, go_term, go_aspect, go_definition
+            FROM {DB_SCHEMA}.go
+        """))
+        for go_no, goid, go_term, go_aspect, go_def in result:
+            snapshot.go[str(goid)] = {
+                "go_no": go_no,
+                "term": go_term,
+                "aspect": go_aspect,
+                "definition": go_def,
+            }
 
-        try:
-            update_sql = text(f"""
-                UPDATE {DB_SCHEMA}.go
-                SET {', '.join(updates)}
-                WHERE goid = :goid
-            """)
-
-            self.session.execute(update_sql, params)
-            self.go_update_count += 1
-
-            message = f"Update GOID {goid}: " + ", ".join(messages)
-            logger.info(message)
-
-            # Update cache
-            if "term" in params:
-                self.go_info_db[goid]["term"] = params["term"]
-                self.goid_for_term[params["term"]] = goid
-            if "aspect" in params:
-                self.go_info_db[goid]["aspect"] = params["aspect"]
-            if "definition" in params:
-                self.go_info_db[goid]["definition"] = params["definition"]
-
-        except Exception as e:
-            self.error_messages.append(
-                f"Error updating GOID {goid}: {e}"
+        result = self.session.execute(text(f"""
+            SELECT go_synonym_no, go_synonym FROM {DB_SCHEMA}.go_synonym
+        """))
+        snapshot.synonym_no = {synonym: synonym_no for synonym_no, synonym in result}
+
+        result = self.session.execute(text(f"""
+            SELECT go_no, go_synonym_no FROM {DB_SCHEMA}.go_gosyn
+        """))
+        snapshot.gosyn = {(go_no, synonym_no) for go_no, synonym_no in result}
+
+        result = self.session.execute(text(f"""
+            SELECT go_path_no, ancestor_go_no, child_go_no, generation,
+                   ancestor_path, relationship_type
+            FROM {DB_SCHEMA}.go_path
+        """))
+        for go_path_no, ancestor_no, child_no, generation, path, relationship in result:
+            snapshot.paths[(path, child_no, generation)] = (
+                go_path_no, ancestor_no, relationship
             )
-            self.oracle_err += 1
 
-    def _update_synonyms(self, goid: str, new_synonyms: list[str]) -> None:
-        """Update synonyms for a GO entry."""
-        go_no = self.go_info_db.get(goid, {}).get("go_no")
-        if not go_no:
-            return
+        logger.info(
+            f"Loaded {len(snapshot.go)} GO entries, {len(snapshot.synonym_no)} synonyms, "
+            f"{len(snapshot.gosyn)} go_gosyn and {len(snapshot.paths)} go_path rows"
+        )
 
-        # Get existing synonyms from database
-        get_synonyms = text(f"""
-            SELECT gs.go_synonym
-            FROM {DB_SCHEMA}.go g
-            JOIN {DB_SCHEMA}.go_gosyn gg ON g.go_no = gg.go_no
-            JOIN {DB_SCHEMA}.go_synonym gs ON gg.go_synonym_no = gs.go_synonym_no
-            WHERE g.goid = :goid
-        """)
-
-        result = self.session.execute(get_synonyms, {"goid": goid})
-        db_synonyms = {row[0] for row in result if row[0]}
-
-        new_synonym_set = {s for s in new_synonyms if s}
-
-        # Insert new synonyms
-        for synonym in new_synonym_set:
-            if synonym not in db_synonyms:
-                self._insert_go_synonym(go_no, synonym)
-
-        # Delete old synonyms
-        for synonym in db_synonyms:
-            if synonym not in new_synonym_set:
-                self._delete_go_synonym(synonym, go_no)
-
-    def _insert_go_synonym(self, go_no: int, synonym: str) -> None:
-        """Insert a GO synonym."""
-        if not synonym:
-            return
+    def plan_terms(self, tables: OboTables) -> None:
+        """
+        Plan GO inserts, updates and candidate deletes.
 
-        synonym_no = self._get_go_synonym_no(synonym)
-
-        if not synonym_no:
-            # Insert new synonym
-            try:
-                get_max = text(f"SELECT MAX(go_synonym_no) FROM {DB_SCHEMA}.go_synonym")
-                result = self.session.execute(get_max).scalar()
-                synonym_no = (result or 0) + 1
-
-                insert_syn = text(f"""
-                    INSERT INTO {DB_SCHEMA}.go_synonym
-                    (go_synonym_no, go_synonym, created_by)
-                    VALUES (:syn_no, :synonym, :user)
-                """)
-
-                self.session.execute(insert_syn, {
-                    "syn_no": synonym_no,
-                    "synonym": synonym,
-                    "user": ADMIN_USER,
-                })
+        Terms are visited in file order, so a term moving from one GOID to
+        another is handled as the per-entry load did.
+        """
+        go = self.snapshot.go
+        goid_for_term = {row["term"]: goid for goid, row in go.items() if row["term"]}
+        next_go_no = max((row["go_no"] for row in go.values()), default=0) + 1
+        new_go: dict[str, dict] = {}
+
+        def is_term_in_use(goid: str, term: str, aspect: str) -> bool:
+            existing_goid = goid_for_term.get(term)
+            if existing_goid and existing_goid != goid:
+                existing = new_go.get(existing_goid) or go.get(existing_goid, {})
+                if existing.get("aspect") == aspect:
+                    self.error_messages.append(
+                        f"Another GOID ({existing_goid}) exists for TERM: {term}, "
+                        f"ASPECT: {aspect}, for which you are trying to assign GOID {goid}"
+                    )
+                    self.check_term_err += 1
+                    return True
+            return False
 
-                self.synonym_insert_count += 1
-                logger.info(f'Insertion: "{synonym}" into go_synonym table')
+        alt_ids: dict[str, list[str]] = {}
+        for goid, alt_id in zip(tables.alt_goid, tables.alt_id):
+            alt_ids.setdefault(goid, []).append(alt_id)
 
-            except Exception as e:
+        for goid, term, aspect, definition, obsolete in zip(
+            tables.goid, tables.term, tables.aspect, tables.definition, tables.obsolete
+        ):
+            if not aspect:
                 self.error_messages.append(
-                    f"Error inserting synonym ({synonym}): {e}"
+                    f"There is no namespace (aspect) associated with goid = {goid}"
                 )
                 self.oracle_err += 1
-                return
-
-        # Insert into go_gosyn table
-        self._insert_go_gosyn(go_no, synonym_no)
-
-    def _delete_go_synonym(self, synonym: str, go_no: int | None = None) -> None:
-        """Delete a GO synonym."""
-        synonym_no = self._get_go_synonym_no(synonym)
-        if not synonym_no:
-            return
-
-        if go_no:
-            self._delete_go_gosyn(go_no, synonym_no)
-
-        # Check if synonym is still in use
-        if self._is_synonym_in_use(synonym_no):
-            return
-
-        try:
-            delete_syn = text(f"""
-                DELETE FROM {DB_SCHEMA}.go_synonym
-                WHERE go_synonym = :synonym
-            """)
-            self.session.execute(delete_syn, {"synonym": synonym})
-            self.synonym_delete_count += 1
-            logger.info(f'Deletion: go_synonym ({synonym}) from go_synonym table')
-
-        except Exception as e:
-            self.error_messages.append(
-                f"Error deleting go_synonym ({synonym}): {e}"
-            )
-            self.oracle_err += 1
-
-    def _insert_go_gosyn(self, go_no: int, synonym_no: int) -> None:
-        """Insert an entry into go_gosyn table."""
-        if go_no <= 0 or synonym_no <= 0:
-            return
-
-        # Check if already exists
-        check_sql = text(f"""
-            SELECT go_no FROM {DB_SCHEMA}.go_gosyn
-            WHERE go_no = :go_no AND go_synonym_no = :syn_no
-        """)
-        result = self.session.execute(
-            check_sql, {"go_no": go_no, "syn_no": synonym_no}
-        ).first()
-
-        if result:
-            return
-
-        try:
-            insert_sql = text(f"""
-                INSERT INTO {DB_SCHEMA}.go_gosyn (go_no, go_synonym_no)
-                VALUES (:go_no, :syn_no)
-            """)
-            self.session.execute(insert_sql, {"go_no": go_no, "syn_no": synonym_no})
-            self.go_gosyn_insert_count += 1
-            logger.info(
-                f"Insertion: go_no={go_no}, go_synonym_no={synonym_no} into go_gosyn"
-            )
-
-        except Exception as e:
-            self.error_messages.append(
-                f"Error inserting go_gosyn (go_no={go_no}, syn_no={synonym_no}): {e}"
-            )
-            self.oracle_err += 1
-
-    def _delete_go_gosyn(self, go_no: int, synonym_no: int) -> None:
-        """Delete an entry from go_gosyn table."""
-        try:
-            delete_sql = text(f"""
-                DELETE FROM {DB_SCHEMA}.go_gosyn
-                WHERE go_no = :go_no AND go_synonym_no = :syn_no
-            """)
-            self.session.execute(delete_sql, {"go_no": go_no, "syn_no": synonym_no})
-            self.go_gosyn_delete_count += 1
-            logger.info(
-                f"Deletion: go_no={go_no}, go_synonym_no={synonym_no} from go_gosyn"
-            )
+                continue
 
-        except Exception as e:
-            self.error_messages.append(
-                f"Error deleting go_gosyn (go_no={go_no}, syn_no={synonym_no}): {e}"
-            )
-            self.oracle_err += 1
-
-    def _get_go_synonym_no(self, synonym: str) -> int | None:
-        """Get go_synonym_no for a synonym."""
-        query = text(f"""
-            SELECT go_synonym_no FROM {DB_SCHEMA}.go_synonym
-            WHERE go_synonym = :synonym
-        """)
-        result = self.session.execute(query, {"synonym": synonym}).first()
-        return result[0] if result else None
-
-    def _check_go_annotation(self, goid: str, type_str: str) -> None:
-        """Check if GOID is still used in go_annotation."""
-        go_no = self.go_info_db.get(goid, {}).get("go_no")
-        if not go_no:
-            return
+            if obsolete:
+                if goid in go:
+                    self.plan.go_deletes[goid] = "Obsolete"
+                continue
 
-        query = text(f"""
-            SELECT f.feature_no, f.feature_name, f.gene_name
-            FROM {DB_SCHEMA}.feature f
-            JOIN {DB_SCHEMA}.go_annotation ga ON ga.feature_no = f.feature_no
-            WHERE ga.go_no = :go_no
-        """)
-
-        result = self.session.execute(query, {"go_no": go_no})
-
-        for row in result:
-            feat_no, feat_name, gene_name = row
-            self.error_messages.append(
-                f"{type_str} GOID ({goid}) is still associated with "
-                f"feature_no={feat_no} (feature_name='{feat_name}', "
-                f"gene_name='{gene_name}') in go_annotation table."
-            )
-            if type_str == "Obsolete":
-                self.obsolete_err += 1
-            else:
-                self.secondary_err += 1
+            db_entry = go.get(goid)
+            if db_entry is None:
+                if not is_term_in_use(goid, term, aspect):
+                    row = {
+                        "go_no": next_go_no,
+                        "goid": goid,
+                        "term": term,
+                        "aspect": aspect,
+                        "definition": definition,
+                        "user": ADMIN_USER,
+                    }
+                    next_go_no += 1
+                    self.plan.go_inserts.append(row)
+                    new_go[goid] = row
+                    goid_for_term[term] = goid
+                    logger.info(f"Insertion: GOID {goid}, TERM: {term}, ASPECT: {aspect}")
+            elif (db_entry["term"], db_entry["aspect"], db_entry["definition"]) != (
+                term, aspect, definition
+            ) and not is_term_in_use(goid, term, aspect):
+                messages = []
+                if term != db_entry["term"]:
+                    messages.append(f'TERM: "{db_entry["term"]}" to "{term}"')
+                if aspect != db_entry["aspect"]:
+                    messages.append(f'ASPECT: "{db_entry["aspect"]}" to "{aspect}"')
+                if definition != db_entry["definition"]:
+                    messages.append("DEFINITION updated")
+                self.plan.go_updates.append({
+                    "go_no": db_entry["go_no"],
+                    "term": term,
+                    "aspect": aspect,
+                    "definition": definition,
+                })
+                goid_for_term[term] = goid
+                logger.info(f"Update GOID {goid}: " + ", ".join(messages))
 
-    def _check_go_set(self, goid: str, type_str: str) -> None:
-        """Check if GOID is still used in go_set."""
-        go_no = self.go_info_db.get(goid, {}).get("go_no")
-        if not go_no:
-            return
+            for secondary_goid in alt_ids.get(goid, []):
+                if secondary_goid in go:
+                    self.plan.go_deletes.setdefault(secondary_goid, "Synonymous")
 
-        query = text(f"""
-            SELECT go_set_name FROM {DB_SCHEMA}.go_set
-            WHERE go_no = :go_no
-        """)
+        self._new_go = new_go
 
-        result = self.session.execute(query, {"go_no": go_no})
+    def check_deletes(self) -> None:
+        """Drop planned deletes of GOIDs still used by annotations, sets or evidence."""
+        go = self.snapshot.go
+        goid_by_go_no = {go[goid]["go_no"]: goid for goid in self.plan.go_deletes}
+        blocked: set[str] = set()
 
-        for row in result:
-            go_set_name = row[0]
-            self.error_messages.append(
-                f"{type_str} GOID ({goid}) is still associated with "
-                f"go_set_name='{go_set_name}' in go_set table."
-            )
+        def report(goid: str, message: str) -> None:
+            type_str = self.plan.go_deletes[goid]
+            self.error_messages.append(f"{type_str} GOID ({goid}) is still associated with {message}")
             if type_str == "Obsolete":
                 self.obsolete_err += 1
             else:
                 self.secondary_err += 1
-
-    def _check_go_ref_support(self, goid: str, type_str: str) -> None:
-        """Check if GOID is still used in go_ref support evidence."""
-        query = text(f"""
-            SELECT DISTINCT f.feature_no, f.feature_name, f.gene_name
-            FROM {DB_SCHEMA}.feature f
-            JOIN {DB_SCHEMA}.go_annotation ga ON ga.feature_no = f.feature_no
-            JOIN {DB_SCHEMA}.go_ref gr ON gr.go_annotation_no = ga.go_annotation_no
-            JOIN {DB_SCHEMA}.goref_dbxref gd ON gd.go_ref_no = gr.go_ref_no
-            JOIN {DB_SCHEMA}.dbxref d ON d.dbxref_no = gd.dbxref_no
-            WHERE d.dbxref_id = :goid
-            AND d.dbxref_type = 'GOID'
-        """)
-
-        result = self.session.execute(query, {"goid": goid})
-
-        for row in result:
-            feat_no, feat_name, gene_name = row
-            self.error_messages.append(
-                f"{type_str} GOID ({goid}) is still associated with go_ref "
-                f"support evidence for feature_no={feat_no} "
-                f"(feature_name='{feat_name}', gene_name='{gene_name}')."
-            )
-            if type_str == "Obsolete":
-                self.obsolete_err += 1
-            else:
-                self.secondary_err += 1
-
-    def _is_term_in_use(self, goid: str, term: str, aspect: str) -> bool:
-        """Check if term is used by another GOID in the same aspect."""
-        existing_goid = self.goid_for_term.get(term)
-
-        if existing_goid and existing_goid != goid:
-            existing_aspect = self.go_info_db.get(existing_goid, {}).get("aspect")
-            if existing_aspect == aspect:
-                self.error_messages.append(
-                    f"Another GOID ({existing_goid}) exists for TERM: {term}, "
-                    f"ASPECT: {aspect}, for which you are trying to assign GOID {goid}"
+            blocked.add(goid)
+
+        for chunk in _chunk_list(sorted(goid_by_go_no)):
+            params = {f"g{i}": go_no for i, go_no in enumerate(chunk)}
+            in_list = ", ".join(f":{name}" for name in params)
+
+            result = self.session.execute(text(f"""
+                SELECT ga.go_no, f.feature_no, f.feature_name, f.gene_name
+                FROM {DB_SCHEMA}.feature f
+                JOIN {DB_SCHEMA}.go_annotation ga ON ga.feature_no = f.feature_no
+                WHERE ga.go_no IN ({in_list})
+            """), params)
+            for go_no, feat_no, feat_name, gene_name in result:
+                report(goid_by_go_no[go_no], (
+                    f"feature_no={feat_no} (feature_name='{feat_name}', "
+                    f"gene_name='{gene_name}') in go_annotation table."
+                ))
+
+            result = self.session.execute(text(f"""
+                SELECT go_no, go_set_name FROM {DB_SCHEMA}.go_set
+                WHERE go_no IN ({in_list})
+            """), params)
+            for go_no, go_set_name in result:
+                report(goid_by_go_no[go_no], f"go_set_name='{go_set_name}' in go_set table.")
+
+        for chunk in _chunk_list(sorted(self.plan.go_deletes)):
+            params = {f"g{i}": goid for i, goid in enumerate(chunk)}
+            in_list = ", ".join(f":{name}" for name in params)
+            result = self.session.execute(text(f"""
+                SELECT DISTINCT d.dbxref_id, f.feature_no, f.feature_name, f.gene_name
+                FROM {DB_SCHEMA}.feature f
+                JOIN {DB_SCHEMA}.go_annotation ga ON ga.feature_no = f.feature_no
+                JOIN {DB_SCHEMA}.go_ref gr ON gr.go_annotation_no = ga.go_annotation_no
+                JOIN {DB_SCHEMA}.goref_dbxref gd ON gd.go_ref_no = gr.go_ref_no
+                JOIN {DB_SCHEMA}.dbxref d ON d.dbxref_no = gd.dbxref_no
+                WHERE d.dbxref_id IN ({in_list})
+                AND d.dbxref_type = 'GOID'
+            """), params)
+            for goid, feat_no, feat_name, gene_name in result:
+                report(goid, (
+                    f"go_ref support evidence for feature_no={feat_no} "
+                    f"(feature_name='{feat_name}', gene_name='{gene_name}')."
+                ))
+
+        for goid in blocked:
+            del self.plan.go_deletes[goid]
+        for goid, type_str in self.plan.go_deletes.items():
+            logger.info(f"Deletion: {type_str.lower()} GOID {goid} from go table")
+
+    def _go_no_by_goid(self) -> dict[str, int]:
+        """go_no of every term that remains after the planned writes."""
+        go_no_by_goid = {
+            goid: row["go_no"] for goid, row in self.snapshot.go.items()
+            if goid not in self.plan.go_deletes
+        }
+        go_no_by_goid.update({goid: row["go_no"] for goid, row in self._new_go.items()})
+        return go_no_by_goid
+
+    def plan_synonyms(self, tables: OboTables) -> None:
+        """Plan GO_SYNONYM and GO_GOSYN changes for the terms in the file."""
+        go = self.snapshot.go
+        go_no_by_goid = self._go_no_by_goid()
+        synonyms = self.plan.synonyms
+
+        for goid, obsolete in zip(tables.goid, tables.obsolete):
+            if not obsolete and goid in go_no_by_goid:
+                synonyms.setdefault(go_no_by_goid[goid], set())
+        for goid, synonym in zip(tables.synonym_goid, tables.synonym):
+            if go_no_by_goid.get(goid) in synonyms and synonym:
+                synonyms[go_no_by_goid[goid]].add(synonym)
+        # A merged (secondary) term becomes a synonym of its primary term
+        for goid, alt_id in zip(tables.alt_goid, tables.alt_id):
+            if (
+                self.plan.go_deletes.get(alt_id) == "Synonymous"
+                and go_no_by_goid.get(goid) in synonyms
+                and go[alt_id]["term"]
+            ):
+                synonyms[go_no_by_goid[goid]].add(go[alt_id]["term"])
+
+        synonym_no = dict(self.snapshot.synonym_no)
+        next_synonym_no = max(synonym_no.values(), default=0) + 1
+        for synonym in sorted({s for values in synonyms.values() for s in values}):
+            if synonym not in synonym_no:
+                synonym_no[synonym] = next_synonym_no
+                self.plan.synonym_inserts.append(
+                    {"syn_no": next_synonym_no, "synonym": synonym, "user": ADMIN_USER}
                 )
-                self.check_term_err += 1
-                return True
-
-        return False
+                next_synonym_no += 1
+                logger.info(f'Insertion: "{synonym}" into go_synonym table')
 
-    def _is_synonym_in_use(self, synonym_no: int) -> bool:
-        """Check if synonym is still used by any GO entry."""
-        query = text(f"""
-            SELECT go_no FROM {DB_SCHEMA}.go_gosyn
-            WHERE go_synonym_no = :syn_no
-        """)
-        result = self.session.execute(query, {"syn_no": synonym_no}).first()
-        return result is not None
+        wanted = {
+            (go_no, synonym_no[synonym])
+            for go_no, values in synonyms.items() for synonym in values
+        }
+        deleted_go_nos = {go[goid]["go_no"] for goid in self.plan.go_deletes}
+        existing = {
+            pair for pair in self.snapshot.gosyn
+            if pair[0] in synonyms or pair[0] in deleted_go_nos
+        }
+        self.plan.gosyn_inserts = [
+            {"go_no": go_no, "syn_no": syn_no} for go_no, syn_no in sorted(wanted - existing)
+        ]
+        removed = sorted(existing - wanted)
+        self.plan.gosyn_deletes = [{"go_no": go_no, "syn_no": syn_no} for go_no, syn_no in removed]
+
+        # Synonyms whose last link is removed are deleted
+        remaining = (self.snapshot.gosyn - set(removed)) | wanted
+        still_used = {syn_no for _, syn_no in remaining}
+        synonym_by_no = {no: synonym for synonym, no in self.snapshot.synonym_no.items()}
+        for syn_no in sorted({syn_no for _, syn_no in removed} - still_used):
+            self.plan.synonym_deletes.append({"syn_no": syn_no})
+            logger.info(f"Deletion: go_synonym ({synonym_by_no.get(syn_no)}) from go_synonym table")
+
+    def plan_paths(self, tables: OboTables) -> None:
+        """Recompute the GO_PATH closure and diff it against the snapshot."""
+        go_no_by_goid = self._go_no_by_goid()
+        obsolete = {goid for goid, flag in zip(tables.goid, tables.obsolete) if flag}
+        keep = [goid not in obsolete for goid in tables.parent_child]
+        closure = compute_go_paths(
+            [c for c, k in zip(tables.parent_child, keep) if k],
+            [p for p, k in zip(tables.parent_goid, keep) if k],
+            [r for r, k in zip(tables.parent_relationship, keep) if k],
+        )
+
+        wanted: dict[tuple[str, int, int], tuple[int, str | None]] = {}
+        for child, rows in closure.items():
+            child_no = go_no_by_goid.get(child)
+            if child_no is None:
+                continue
+            for ancestor, generation, path, relationship in rows:
+                ancestor_no = go_no_by_goid.get(ancestor)
+                if ancestor_no is not None:
+                    wanted[(path, child_no, generation)] = (ancestor_no, relationship)
+
+        existing = self.snapshot.paths
+        for key, (go_path_no, ancestor_no, relationship) in existing.items():
+            target = wanted.get(key)
+            if target is None:
+                self.plan.path_deletes.append({"go_path_no": go_path_no})
+            elif target != (ancestor_no, relationship):
+                self.plan.path_updates.append({
+                    "go_path_no": go_path_no,
+                    "ancestor_go_no": target[0],
+                    "relationship": target[1],
+                })
+        for key, (ancestor_no, relationship) in wanted.items():
+            if key not in existing:
+                path, child_no, generation = key
+                self.plan.path_inserts.append({
+                    "child_go_no": child_no,
+                    "ancestor_go_no": ancestor_no,
+                    "generation": generation,
+                    "ancestor_path": path,
+                    "relationship": relationship,
+                })
+        logger.info(
+            f"GO_PATH: {len(wanted)} rows in closure, {len(self.plan.path_inserts)} to insert, "
+            f"{len(self.plan.path_updates)} to update, {len(self.plan.path_deletes)} to delete"
+        )
+
+    def _executemany(self, sql: str, rows: list[dict]) -> int:
+        """Run one statement over ``rows`` in executemany batches."""
+        statement = text(sql)
+        for batch in _chunk_list(rows, DML_BATCH_SIZE):
+            self.session.execute(statement, batch)
+        return len(rows)
+
+    def apply_go(self) -> None:
+        self.go_insert_count = self._executemany(f"""
+            INSERT INTO {DB_SCHEMA}.go
+            (go_no, goid, go_term, go_aspect, go_definition, created_by)
+            VALUES (:go_no, :goid, :term, :aspect, :definition, :user)
+        """, self.plan.go_inserts)
+        self.go_update_count = self._executemany(f"""
+            UPDATE {DB_SCHEMA}.go
+            SET go_term = :term, go_aspect = :aspect, go_definition = :definition
+            WHERE go_no = :go_no
+        """, self.plan.go_updates)
+
+    def apply_synonyms(self) -> None:
+        self.synonym_insert_count = self._executemany(f"""
+            INSERT INTO {DB_SCHEMA}.go_synonym (go_synonym_no, go_synonym, created_by)
+            VALUES (:syn_no, :synonym, :user)
+        """, self.plan.synonym_inserts)
+        self.go_gosyn_insert_count = self._executemany(f"""
+            INSERT INTO {DB_SCHEMA}.go_gosyn (go_no, go_synonym_no)
+            VALUES (:go_no, :syn_no)
+        """, self.plan.gosyn_inserts)
+        self.go_gosyn_delete_count = self._executemany(f"""
+            DELETE FROM {DB_SCHEMA}.go_gosyn
+            WHERE go_no = :go_no AND go_synonym_no = :syn_no
+        """, self.plan.gosyn_deletes)
+        self.synonym_delete_count = self._executemany(f"""
+            DELETE FROM {DB_SCHEMA}.go_synonym WHERE go_synonym_no = :syn_no
+        """, self.plan.synonym_deletes)
+
+    def apply_paths(self) -> None:
+        self.go_path_delete_count = self._executemany(f"""
+            DELETE FROM {DB_SCHEMA}.go_path WHERE go_path_no = :go_path_no
+        """, self.plan.path_deletes)
+        self.go_path_update_count = self._executemany(f"""
+            UPDATE {DB_SCHEMA}.go_path
+            SET ancestor_go_no = :ancestor_go_no, relationship_type = :relationship
+            WHERE go_path_no = :go_path_no
+        """, self.plan.path_updates)
+        self.go_path_insert_count = self._executemany(f"""
+            INSERT INTO {DB_SCHEMA}.go_path
+            (go_path_no, child_go_no, ancestor_go_no, generation,
+             ancestor_path, relationship_type)
+            VALUES ({DB_SCHEMA}.go_path_seq.NEXTVAL, :child_go_no, :ancestor_go_no,
+                    :generation, :ancestor_path, :relationship)
+        """, self.plan.path_inserts)
+
+    def apply_deletes(self) -> None:
+        """Delete obsolete and merged GOIDs (their paths and synonyms are gone)."""
+        go = self.snapshot.go
+        goids = sorted(self.plan.go_deletes)
+        self.go_delete_count = self._executemany(f"""
+            DELETE FROM {DB_SCHEMA}.go WHERE go_no = :go_no
+        """, [{"go_no": go[goid]["go_no"]} for goid in goids])
+        self._executemany(f"""
+            DELETE FROM {DB_SCHEMA}.dbxref
+            WHERE source = 'GO Consortium'
+            AND dbxref_type = 'GOID'
+            AND dbxref_id = :goid
+        """, [{"goid": goid} for goid in goids])
 
     def get_summary(self) -> dict:
         """Get summary of operations."""
@@ -780,11 +777,15 @@ class GOLoader:
             "synonym_deletes": self.synonym_delete_count,
             "go_gosyn_inserts": self.go_gosyn_insert_count,
             "go_gosyn_deletes": self.go_gosyn_delete_count,
+            "go_path_inserts": self.go_path_insert_count,
+            "go_path_updates": self.go_path_update_count,
+            "go_path_deletes": self.go_path_delete_count,
             "errors": len(self.error_messages),
             "oracle_errors": self.oracle_err,
             "obsolete_errors": self.obsolete_err,
             "secondary_errors": self.secondary_err,
             "term_errors": self.check_term_err,
+            "timings": dict(self.timings),
         }
 
 
@@ -817,13 +818,16 @@ def download_go_file(output_path: Path) -> bool:
         return False
 
 
-def load_go(obo_file: Path | None = None, download: bool = True) -> bool:
+def load_go(
+    obo_file: Path | None = None, download: bool = True, dry_run: bool = False
+) -> bool:
     """
     Main function to load/update GO information.
 
     Args:
         obo_file: Path to OBO file (default: DATA_DIR/GO/gene_ontology.obo)
         download: Whether to download the latest file
+        dry_run: Plan the changes and report them without writing
 
     Returns:
         True on success, False on failure
@@ -862,17 +866,10 @@ def load_go(obo_file: Path | None = None, download: bool = True) -> bool:
     try:
         with SessionLocal() as session:
             loader = GOLoader(session)
+            completed = loader.run(obo_file, dry_run=dry_run)
 
-            # Load existing data from database
-            loader.populate_hashes()
-
-            # Process OBO file
-            loader.process_obo_file(obo_file)
-
-            # Check for errors
-            if loader.oracle_err > 0:
-                logger.error("Oracle errors occurred, rolling back")
-                session.rollback()
+            if not completed:
+                logger.error("Errors occurred, stopping the load")
 
                 # Log error messages
                 for msg in loader.error_messages:
@@ -880,30 +877,41 @@ def load_go(obo_file: Path | None = None, download: bool = True) -> bool:
 
                 return False
 
-            # Commit changes
-            session.commit()
-
             # Log summary
             summary = loader.get_summary()
             logger.info("\n" + "=" * 40)
+            if dry_run:
+                plan = loader.plan
+                logger.info("Dry run, nothing written. Planned changes:")
+                logger.info(f"  {len(plan.go_inserts)} GO inserts, {len(plan.go_updates)} updates, "
+                            f"{len(plan.go_deletes)} deletes")
+                logger.info(f"  {len(plan.synonym_inserts)} synonym inserts, "
+                            f"{len(plan.synonym_deletes)} deletes")
+                logger.info(f"  {len(plan.gosyn_inserts)} go_gosyn inserts, "
+                            f"{len(plan.gosyn_deletes)} deletes")
+                logger.info(f"  {len(plan.path_inserts)} go_path inserts, "
+                            f"{len(plan.path_updates)} updates, {len(plan.path_deletes)} deletes")
             logger.info("Summary:")
-            if summary["go_inserts"] > 0:
-                logger.info(f"  {summary['go_inserts']} GO entries inserted")
-            if summary["go_updates"] > 0:
-                logger.info(f"  {summary['go_updates']} GO entries updated")
-            if summary["go_deletes"] > 0:
-                logger.info(f"  {summary['go_deletes']} GO entries deleted")
-            if summary["synonym_inserts"] > 0:
-                logger.info(f"  {summary['synonym_inserts']} synonyms inserted")
-            if summary["synonym_deletes"] > 0:
-                logger.info(f"  {summary['synonym_deletes']} synonyms deleted")
-            if summary["go_gosyn_inserts"] > 0:
-                logger.info(f"  {summary['go_gosyn_inserts']} go_gosyn entries inserted")
-            if summary["go_gosyn_deletes"] > 0:
-                logger.info(f"  {summary['go_gosyn_deletes']} go_gosyn entries deleted")
+            for key, label in (
+                ("go_inserts", "GO entries inserted"),
+                ("go_updates", "GO entries updated"),
+                ("go_deletes", "GO entries deleted"),
+                ("synonym_inserts", "synonyms inserted"),
+                ("synonym_deletes", "synonyms deleted"),
+                ("go_gosyn_inserts", "go_gosyn entries inserted"),
+                ("go_gosyn_deletes", "go_gosyn entries deleted"),
+                ("go_path_inserts", "go_path entries inserted"),
+                ("go_path_updates", "go_path entries updated"),
+                ("go_path_deletes", "go_path entries deleted"),
+            ):
+                if summary[key] > 0:
+                    logger.info(f"  {summary[key]} {label}")
+            logger.info("Phase timings:")
+            for name, seconds in summary["timings"].items():
+                logger.info(f"  {name}: {seconds:.2f}s")
 
             # Log annotation errors for curator review
-            if loader.error_messages and loader.oracle_err == 0:
+            if loader.error_messages:
                 logger.warning("\nAnnotation errors for curator review:")
                 for msg in loader.error_messages:
                     logger.warning(f"  {msg}")
@@ -932,10 +940,15 @@ def main() -> int:
         action="store_true",
         help="Skip downloading the latest OBO file",
     )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the planned changes without writing them",
+    )
 
     args = parser.parse_args()
 
-    success = load_go(args.obo, download=not args.no_download)
+    success = load_go(args.obo, download=not args.no_download, dry_run=args.dry_run)
     return 0 if success else 1
 
 
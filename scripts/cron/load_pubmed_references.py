@@ -28,6 +28,7 @@ Environment Variables:
     DATA_DIR: Directory for data files
     LOG_DIR: Directory for log files
     NCBI_EMAIL: Email for NCBI E-utilities
+    NCBI_API_KEY: NCBI API key (optional; allows 10 requests/s instead of 3)
     PROJECT_ACRONYM: Project acronym (e.g., CGD)
     CURATOR_EMAIL: Email for curator reports
 """
@@ -43,7 +44,6 @@ from typing import TextIO
 from urllib.parse import quote_plus
 
 import requests
-from Bio import Entrez, Medline
 from dotenv import load_dotenv
 from sqlalchemy import text
 
@@ -56,6 +56,7 @@ load_dotenv(PROJECT_ROOT / ".env")
 # Add parent directory to path to import cgd modules
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from cgd.core.pubmed import PubMedError, get_pubmed_client
 from cgd.db.engine import SessionLocal
 
 # Configuration
@@ -64,8 +65,6 @@ DATA_DIR = Path(os.getenv("DATA_DIR", str(PROJECT_ROOT / "data")))
 LOG_DIR = Path(os.getenv("LOG_DIR", str(PROJECT_ROOT / "logs")))
 PROJECT_ACRONYM = os.getenv("PROJECT_ACRONYM", "CGD")
 CURATOR_EMAIL = os.getenv("CURATOR_EMAIL", "")
-NCBI_EMAIL = os.getenv("NCBI_EMAIL", "admin@candidagenome.org")
-NCBI_API_KEY = os.getenv("NCBI_API_KEY")
 ADMIN_USER = os.getenv("ADMIN_USER", "cgdadmin").upper()
 
 # NCBI URLs
@@ -75,11 +74,6 @@ NCBI_JOURNAL_URL = "ftp://ftp.ncbi.nih.gov/pubmed/J_Medline.txt"
 PDF_STATUS_N = "N"
 PDF_STATUS_NAP = "NAP"
 
-# Configure Entrez
-Entrez.email = NCBI_EMAIL
-if NCBI_API_KEY:
-    Entrez.api_key = NCBI_API_KEY
-
 # Gene names to avoid using in query (common words that produce false positives)
 IGNORE_WORDS = {
     "CGD": {
@@ -544,68 +538,46 @@ class PubMedLoader:
         self.log("Querying NCBI PubMed for references...")
         logger.info("Querying NCBI PubMed for references...")
 
-        total_features = len(self.query_terms_by_feat)
-        processed = 0
-        query_count = 0
-        error_count = 0
-
+        # Batch all terms for each feature into ONE query using OR; the
+        # queries run concurrently within the NCBI rate limit
+        feature_names = []
+        queries = []
         for feature_name, terms in self.query_terms_by_feat.items():
-            processed += 1
-
             if not terms:
                 continue
-
-            # Log progress every 100 features
-            if processed % 100 == 0:
-                msg = (f"Progress: {processed}/{total_features} features processed, "
-                       f"{query_count} queries, {error_count} errors")
-                self.log(msg)
-                logger.info(msg)
-
-            # Batch all terms for this feature into ONE query using OR
-            # This is much faster than querying each term separately
             term_queries = [f'"{term}"[TW]' for term in terms]
             combined_terms = " OR ".join(term_queries)
-            query = f"({combined_terms}) AND ({self.species_query})"
-            query_count += 1
+            feature_names.append(feature_name)
+            queries.append(f"({combined_terms}) AND ({self.species_query})")
 
-            try:
-                # Search PubMed
-                handle = Entrez.esearch(
-                    db="pubmed",
-                    term=query,
-                    retmax=9000,
-                    usehistory="n"
-                )
-                record = Entrez.read(handle)
-                handle.close()
-
-                pmids = [int(pmid) for pmid in record.get("IdList", [])]
-
-                # Filter PMIDs
-                for pmid in pmids:
-                    # Skip curated, bad, temp, or unlinked PMIDs
-                    if pmid in self.curated_pmids:
-                        continue
-                    if pmid in self.bad_pmids:
-                        continue
-                    if pmid in self.temp_pmids:
-                        continue
-                    if pmid in self.unlink_pmids and feature_name in self.unlink_pmids[pmid]:
-                        continue
-
-                    if feature_name not in self.ncbi_pmids_by_feat:
-                        self.ncbi_pmids_by_feat[feature_name] = set()
-                    self.ncbi_pmids_by_feat[feature_name].add(pmid)
+        results = get_pubmed_client().search_many_sync(queries, retmax=9000)
 
-            except Exception as e:
+        error_count = 0
+        for feature_name, result in zip(feature_names, results):
+            if isinstance(result, PubMedError):
                 error_count += 1
-                self.log(f"Error querying PubMed for {feature_name}: {e}")
+                self.log(f"Error querying PubMed for {feature_name}: {result}")
                 continue
 
+            # Filter PMIDs
+            for pmid in result:
+                # Skip curated, bad, temp, or unlinked PMIDs
+                if pmid in self.curated_pmids:
+                    continue
+                if pmid in self.bad_pmids:
+                    continue
+                if pmid in self.temp_pmids:
+                    continue
+                if pmid in self.unlink_pmids and feature_name in self.unlink_pmids[pmid]:
+                    continue
+
+                if feature_name not in self.ncbi_pmids_by_feat:
+                    self.ncbi_pmids_by_feat[feature_name] = set()
+                self.ncbi_pmids_by_feat[feature_name].add(pmid)
+
         total_pmids = sum(len(pmids) for pmids in self.ncbi_pmids_by_feat.values())
-        msg1 = (f"Completed: {processed}/{total_features} features, "
-                f"{query_count} queries, {error_count} errors")
+        msg1 = (f"Completed: {len(self.query_terms_by_feat)} features, "
+                f"{len(queries)} queries, {error_count} errors")
         msg2 = f"Retrieved {total_pmids} PMIDs for {len(self.ncbi_pmids_by_feat)} features"
         self.log(msg1)
         self.log(msg2)
@@ -638,24 +610,13 @@ class PubMedLoader:
         self.log(f"Found {len(self.new_ncbi_pmids)} new PubMed IDs to load")
         self.log(f"Found {sum(len(p) for p in self.new_ncbi_obj_pmids.values())} new feature-PMID associations")
 
-    def get_medline_record(self, pmid: int) -> dict | None:
-        """Fetch Medline record for a PubMed ID."""
+    def get_medline_records(self, pmids: set[int]) -> dict[int, dict]:
+        """Fetch Medline records for PubMed IDs in batched efetch calls."""
         try:
-            handle = Entrez.efetch(
-                db="pubmed",
-                id=str(pmid),
-                rettype="medline",
-                retmode="text"
-            )
-            records = list(Medline.parse(handle))
-            handle.close()
-
-            if records:
-                return records[0]
-            return None
-        except Exception as e:
-            self.log(f"Error fetching Medline for {pmid}: {e}")
-            return None
+            return get_pubmed_client().fetch_sync(sorted(pmids))
+        except PubMedError as e:
+            self.log(f"Error fetching Medline for {len(e.failed)} PubMed IDs: {e}")
+            return e.partial
 
     def clean_text(self, text: str | None) -> str:
         """Clean text by removing unwanted characters."""
@@ -980,8 +941,9 @@ class PubMedLoader:
         """Fetch Medline records and load references."""
         self.log(f"Loading {len(self.new_ncbi_pmids)} new references...")
 
+        records = self.get_medline_records(self.new_ncbi_pmids)
         for pmid in self.new_ncbi_pmids:
-            record = self.get_medline_record(pmid)
+            record = records.get(pmid)
             if not record:
                 self.not_loaded_pmids.add(pmid)
                 self.bad_ref_count += 1
@@ -14,6 +14,7 @@ Based on checkSeqIntegrity.pl by CGD team.
 Usage:
     python check_seq_integrity.py
     python check_seq_integrity.py --seq-source "C. albicans SC5314 Assembly 22"
+    python check_seq_integrity.py --workers 4
 
 Environment Variables:
     DATABASE_URL: Database connection URL
@@ -25,9 +26,11 @@ Environment Variables:
 
 import argparse
 import logging
+import multiprocessing
 import os
 import sys
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from pathlib import Path
 
@@ -38,6 +41,7 @@ from sqlalchemy import text
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from cgd.db.engine import SessionLocal
+from cgd.utils import seqkernels
 
 # Load environment variables
 load_dotenv()
@@ -49,6 +53,21 @@ HTML_ROOT_DIR = Path(os.getenv("HTML_ROOT_DIR", "/var/www/html"))
 LOG_DIR = Path(os.getenv("LOG_DIR", "/var/log/cgd"))
 PROJECT_URL = os.getenv("PROJECT_URL", "http://www.candidagenome.org")
 
+# Rows fetched per round trip when streaming features and subfeatures
+FETCH_SIZE = 5000
+
+# Features with a current location and stored sequence, and their root sequence
+FEATURE_JOINS = f"""
+        FROM {DB_SCHEMA}.feature f
+        JOIN {DB_SCHEMA}.feat_location fl ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
+        JOIN {DB_SCHEMA}.seq s ON (fl.seq_no = s.seq_no AND s.is_seq_current = 'Y')
+        JOIN {DB_SCHEMA}.seq rs ON (fl.root_seq_no = rs.seq_no AND rs.is_seq_current = 'Y')
+        JOIN {DB_SCHEMA}.feature rf ON rs.feature_no = rf.feature_no
+        WHERE f.organism_no = :organism_no
+        AND s.source = :seq_source
+        AND f.feature_type NOT IN ('chromosome', 'contig')
+"""
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -80,13 +99,18 @@ class IntegrityStats:
     coord_diff_error: int = 0
     errors: list = field(default_factory=list)
 
+    def merge(self, other: "IntegrityStats") -> None:
+        """Add the counts and errors of another run to this one."""
+        for stat in fields(self):
+            if stat.name == "errors":
+                self.errors.extend(other.errors)
+            else:
+                setattr(self, stat.name, getattr(self, stat.name) + getattr(other, stat.name))
+
 
 def reverse_complement(seq: str) -> str:
     """Return reverse complement of a DNA sequence."""
-    complement = {"A": "T", "T": "A", "G": "C", "C": "G",
-                  "a": "t", "t": "a", "g": "c", "c": "g",
-                  "N": "N", "n": "n"}
-    return "".join(complement.get(base, base) for base in reversed(seq))
+    return seqkernels.reverse_complement(seq)
 
 
 def get_strains(session) -> list[dict]:
@@ -113,61 +137,86 @@ def get_seq_sources_for_strain(session, organism_no: int) -> list[str]:
     return [row[0] for row in session.execute(query, {"organism_no": organism_no}).fetchall()]
 
 
-def is_feature_deleted(session, feature_no: int) -> bool:
-    """Check if a feature is marked as deleted."""
+def get_deleted_features(session, organism_no: int) -> set[int]:
+    """Get the feature_nos of a strain's features marked as deleted."""
     query = text(f"""
-        SELECT 1 FROM {DB_SCHEMA}.feat_property
-        WHERE feature_no = :feature_no
-        AND property_value LIKE 'Deleted%'
+        SELECT DISTINCT fp.feature_no
+        FROM {DB_SCHEMA}.feat_property fp
+        JOIN {DB_SCHEMA}.feature f ON fp.feature_no = f.feature_no
+        WHERE f.organism_no = :organism_no
+        AND fp.property_value LIKE 'Deleted%'
     """)
-    result = session.execute(query, {"feature_no": feature_no}).fetchone()
-    return result is not None
+    return {row[0] for row in session.execute(query, {"organism_no": organism_no})}
+
 
+def get_chromosome_sequences(session, seq_source: str) -> dict[str, str]:
+    """
+    Get all chromosome and contig sequences of a seq source, upper-cased.
 
-def get_chromosome_sequence(session, chr_name: str, seq_source: str) -> str | None:
-    """Get chromosome sequence."""
+    Upper-casing once here lets the per-feature comparison slice the
+    chromosome without converting every computed sequence.
+    """
     query = text(f"""
-        SELECT s.residues
-        FROM {DB_SCHEMA}.seq s
-        JOIN {DB_SCHEMA}.feature f ON s.feature_no = f.feature_no
-        WHERE f.feature_name = :chr_name
+        SELECT f.feature_name, s.residues
+        FROM {DB_SCHEMA}.feature f
+        JOIN {DB_SCHEMA}.seq s ON f.feature_no = s.feature_no
+        WHERE f.feature_type IN ('chromosome', 'contig')
         AND s.source = :seq_source
         AND s.is_seq_current = 'Y'
     """)
-    result = session.execute(
-        query, {"chr_name": chr_name, "seq_source": seq_source}
-    ).fetchone()
-    return result[0] if result else None
+    return {
+        row[0]: row[1].upper() if row[1] else row[1]
+        for row in session.execute(query, {"seq_source": seq_source})
+    }
+
 
+def stream_rows(session, query, params: dict):
+    """Execute a query and stream its rows in FETCH_SIZE batches."""
+    return session.execute(
+        query.execution_options(stream_results=True, yield_per=FETCH_SIZE), params
+    )
 
-def get_features_with_sequences(
+
+def get_check_roots(session, organism_no: int, seq_source: str) -> list[str]:
+    """Get the root sequences that carry features with stored sequences."""
+    query = text(f"""
+        SELECT DISTINCT rf.feature_name
+        {FEATURE_JOINS}
+        AND s.seq_type IN ('genomic', 'protein')
+        ORDER BY rf.feature_name
+    """)
+    return [
+        row[0]
+        for row in session.execute(query, {"organism_no": organism_no, "seq_source": seq_source})
+    ]
+
+
+def stream_features_with_sequences(
     session,
     organism_no: int,
     seq_source: str,
+    root_name: str,
     seq_type: str = "genomic"
-) -> list[dict]:
-    """Get features with their stored sequences."""
+):
+    """Stream the features on one root with their stored sequences, in coordinate order."""
     query = text(f"""
         SELECT f.feature_no, f.feature_name, f.feature_type,
                fl.start_coord, fl.stop_coord, fl.strand,
                s.residues, s.seq_length,
                rf.feature_name as root_name
-        FROM {DB_SCHEMA}.feature f
-        JOIN {DB_SCHEMA}.feat_location fl ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
-        JOIN {DB_SCHEMA}.seq s ON (fl.seq_no = s.seq_no AND s.is_seq_current = 'Y')
-        JOIN {DB_SCHEMA}.seq rs ON (fl.root_seq_no = rs.seq_no AND rs.is_seq_current = 'Y')
-        JOIN {DB_SCHEMA}.feature rf ON rs.feature_no = rf.feature_no
-        WHERE f.organism_no = :organism_no
-        AND s.source = :seq_source
+        {FEATURE_JOINS}
         AND s.seq_type = :seq_type
-        AND f.feature_type NOT IN ('chromosome', 'contig')
+        AND rf.feature_name = :root_name
+        ORDER BY fl.start_coord, f.feature_no
     """)
-
-    features = []
-    for row in session.execute(
-        query, {"organism_no": organism_no, "seq_source": seq_source, "seq_type": seq_type}
-    ).fetchall():
-        features.append({
+    params = {
+        "organism_no": organism_no,
+        "seq_source": seq_source,
+        "seq_type": seq_type,
+        "root_name": root_name,
+    }
+    for row in stream_rows(session, query, params):
+        yield {
             "feature_no": row[0],
             "feature_name": row[1],
             "feature_type": row[2],
@@ -177,37 +226,48 @@ def get_features_with_sequences(
             "residues": row[6],
             "seq_length": row[7],
             "root_name": row[8],
-        })
+        }
 
-    return features
 
+def get_root_subfeatures(
+    session,
+    organism_no: int,
+    seq_source: str,
+    root_name: str
+) -> dict[int, list[dict]]:
+    """
+    Get the subfeatures of all features on one root, keyed by parent feature_no.
 
-def get_subfeatures(session, feature_no: int, seq_source: str) -> list[dict]:
-    """Get subfeatures for a parent feature."""
+    Each parent's subfeatures are ordered by start coordinate.
+    """
     query = text(f"""
-        SELECT f.feature_no, f.feature_name, f.feature_type,
+        SELECT fr.parent_feature_no, f.feature_no, f.feature_name, f.feature_type,
                fl.start_coord, fl.stop_coord, fl.strand
         FROM {DB_SCHEMA}.feature f
         JOIN {DB_SCHEMA}.feat_relationship fr ON (f.feature_no = fr.child_feature_no
             AND fr.relationship_type = 'part of' AND fr.rank = 2)
         JOIN {DB_SCHEMA}.feat_location fl ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
         JOIN {DB_SCHEMA}.seq s ON (fl.seq_no = s.seq_no AND s.is_seq_current = 'Y')
-        WHERE fr.parent_feature_no = :feature_no
-        AND s.source = :seq_source
-        ORDER BY fl.start_coord
+        WHERE s.source = :seq_source
+        AND fr.parent_feature_no IN (
+            SELECT f.feature_no
+            {FEATURE_JOINS}
+            AND s.seq_type = 'genomic'
+            AND rf.feature_name = :root_name
+        )
+        ORDER BY fr.parent_feature_no, fl.start_coord, f.feature_no
     """)
-
-    subfeatures = []
-    for row in session.execute(
-        query, {"feature_no": feature_no, "seq_source": seq_source}
-    ).fetchall():
-        subfeatures.append({
-            "feature_no": row[0],
-            "feature_name": row[1],
-            "feature_type": row[2],
-            "start_coord": row[3],
-            "stop_coord": row[4],
-            "strand": row[5],
+    params = {"organism_no": organism_no, "seq_source": seq_source, "root_name": root_name}
+
+    subfeatures: dict[int, list[dict]] = {}
+    for row in stream_rows(session, query, params):
+        subfeatures.setdefault(row[0], []).append({
+            "feature_no": row[1],
+            "feature_name": row[2],
+            "feature_type": row[3],
+            "start_coord": row[4],
+            "stop_coord": row[5],
+            "strand": row[6],
         })
 
     return subfeatures
@@ -235,15 +295,18 @@ def compute_sequence_from_coords(
 
 
 def check_single_feature(
-    session,
     feature: dict,
     chr_sequences: dict[str, str],
+    deleted_features: set[int],
     stats: IntegrityStats,
     seq_type: str = "genomic"
 ) -> bool:
     """
     Check a single feature's sequence integrity.
 
+    ``chr_sequences`` must be upper-cased, as returned by
+    get_chromosome_sequences.
+
     Returns True if further checking (subfeatures) should proceed.
     """
     stats.total_features += 1
@@ -252,7 +315,7 @@ def check_single_feature(
     feature_type = feature["feature_type"]
 
     # Check if deleted
-    if is_feature_deleted(session, feature["feature_no"]):
+    if feature["feature_no"] in deleted_features:
         stats.deleted_features += 1
         return False
 
@@ -335,7 +398,7 @@ def check_single_feature(
         return False
 
     # Compare sequences
-    if computed_seq.upper() != feature["residues"].upper():
+    if computed_seq != feature["residues"].upper():
         if seq_type == "protein":
             stats.protein_seq_mismatch += 1
             tag = 10
@@ -544,13 +607,133 @@ def generate_html_report(stats: IntegrityStats, output_file: Path):
 """)
 
 
+def check_root(
+    session,
+    organism_no: int,
+    seq_source: str,
+    root_name: str,
+    chr_sequences: dict[str, str],
+    deleted_features: set[int],
+) -> tuple[IntegrityStats, IntegrityStats]:
+    """
+    Check the genomic and protein sequences of the features on one root.
+
+    Returns the genomic and protein results separately so the caller can
+    report all genomic errors of a seq source before its protein errors.
+    """
+    genomic = IntegrityStats()
+    subfeatures = get_root_subfeatures(session, organism_no, seq_source, root_name)
+
+    for feat in stream_features_with_sequences(
+        session, organism_no, seq_source, root_name, "genomic"
+    ):
+        genomic.gene_features += 1
+        check_further = check_single_feature(
+            feat, chr_sequences, deleted_features, genomic, "genomic"
+        )
+
+        if check_further:
+            # Check subfeatures
+            feat_subfeatures = subfeatures.get(feat["feature_no"])
+            if feat_subfeatures:
+                check_subfeature_adjacency(
+                    feat["feature_name"],
+                    feat["feature_type"],
+                    feat_subfeatures,
+                    genomic
+                )
+
+    protein = IntegrityStats()
+    for feat in stream_features_with_sequences(
+        session, organism_no, seq_source, root_name, "protein"
+    ):
+        check_single_feature(feat, chr_sequences, deleted_features, protein, "protein")
+
+    return genomic, protein
+
+
+# Per-process state of the root workers, set by _init_root_worker
+_worker_session_factory = None
+_worker_chr_sequences: dict[str, str] = {}
+_worker_deleted_features: set[int] = set()
+
+
+def _init_root_worker(
+    session_factory, chr_sequences: dict[str, str], deleted_features: set[int]
+) -> None:
+    global _worker_session_factory, _worker_chr_sequences, _worker_deleted_features
+    # Pooled connections inherited over fork belong to the parent process
+    session_factory.kw["bind"].dispose(close=False)
+    _worker_session_factory = session_factory
+    # Inherited over fork, so the chromosome buffers are shared copy-on-write
+    # and never pickled
+    _worker_chr_sequences = chr_sequences
+    _worker_deleted_features = deleted_features
+
+
+def _check_root_task(task: tuple) -> tuple[IntegrityStats, IntegrityStats]:
+    organism_no, seq_source, root_name = task
+    with _worker_session_factory() as session:
+        return check_root(
+            session, organism_no, seq_source, root_name,
+            _worker_chr_sequences, _worker_deleted_features,
+        )
+
+
+def check_roots(
+    session,
+    organism_no: int,
+    seq_source: str,
+    root_names: list[str],
+    chr_sequences: dict[str, str],
+    deleted_features: set[int],
+    workers: int = 1,
+    session_factory=None,
+):
+    """
+    Yield the (genomic, protein) results of each root, in root order.
+
+    With ``workers`` > 1 the roots are checked in a forked process pool.
+    """
+    if workers <= 1:
+        for root_name in root_names:
+            yield check_root(
+                session, organism_no, seq_source, root_name, chr_sequences, deleted_features
+            )
+        return
+
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_root_worker,
+        initargs=(session_factory or SessionLocal, chr_sequences, deleted_features),
+    ) as executor:
+        tasks = [(organism_no, seq_source, root_name) for root_name in root_names]
+        yield from executor.map(_check_root_task, tasks)
+
+
 def check_sequence_integrity(
     session,
     seq_source: str | None = None,
+    workers: int = 1,
+    session_factory=None,
 ) -> IntegrityStats:
-    """Run sequence integrity check."""
+    """
+    Run sequence integrity check.
+
+    Each seq source's chromosome sequences and deleted features are loaded
+    once, then the features of each root sequence are checked with bulk
+    queries, in ``workers`` processes when more than one is given.
+    Errors are reported per seq source, genomic before protein, in root
+    and coordinate order.
+    """
     stats = IntegrityStats()
 
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Process pool needs the fork start method; checking serially")
+        workers = 1
+
     strains = get_strains(session)
     logger.info(f"Found {len(strains)} strains")
 
@@ -564,47 +747,27 @@ def check_sequence_integrity(
         else:
             seq_sources = get_seq_sources_for_strain(session, organism_no)
 
+        deleted_features = get_deleted_features(session, organism_no)
+
         for src in seq_sources:
             logger.info(f"Checking {strain_abbrev} - {src}")
 
-            # Get and cache chromosome sequences
-            chr_query = text(f"""
-                SELECT f.feature_name, s.residues
-                FROM {DB_SCHEMA}.feature f
-                JOIN {DB_SCHEMA}.seq s ON f.feature_no = s.feature_no
-                WHERE f.feature_type IN ('chromosome', 'contig')
-                AND s.source = :seq_source
-                AND s.is_seq_current = 'Y'
-            """)
-            chr_sequences = {}
-            for row in session.execute(chr_query, {"seq_source": src}).fetchall():
-                chr_sequences[row[0]] = row[1]
-
-            # Check genomic sequences
-            features = get_features_with_sequences(session, organism_no, src, "genomic")
-            logger.info(f"  Found {len(features)} genomic features")
-
-            for feat in features:
-                stats.gene_features += 1
-                check_further = check_single_feature(session, feat, chr_sequences, stats, "genomic")
-
-                if check_further:
-                    # Check subfeatures
-                    subfeatures = get_subfeatures(session, feat["feature_no"], src)
-                    if subfeatures:
-                        check_subfeature_adjacency(
-                            feat["feature_name"],
-                            feat["feature_type"],
-                            subfeatures,
-                            stats
-                        )
-
-            # Check protein sequences
-            protein_features = get_features_with_sequences(session, organism_no, src, "protein")
-            logger.info(f"  Found {len(protein_features)} protein features")
-
-            for feat in protein_features:
-                check_single_feature(session, feat, chr_sequences, stats, "protein")
+            chr_sequences = get_chromosome_sequences(session, src)
+            root_names = get_check_roots(session, organism_no, src)
+
+            genomic = IntegrityStats()
+            protein = IntegrityStats()
+            for root_genomic, root_protein in check_roots(
+                session, organism_no, src, root_names, chr_sequences, deleted_features,
+                workers, session_factory,
+            ):
+                genomic.merge(root_genomic)
+                protein.merge(root_protein)
+
+            logger.info(f"  Checked {genomic.gene_features} genomic features")
+            logger.info(f"  Checked {protein.total_features} protein features")
+            stats.merge(genomic)
+            stats.merge(protein)
 
     return stats
 
@@ -625,6 +788,12 @@ def main() -> int:
         default=None,
         help="Output HTML report file",
     )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=1,
+        help="Number of processes checking root sequences in parallel (default: 1)",
+    )
 
     args = parser.parse_args()
 
@@ -641,7 +810,7 @@ def main() -> int:
 
     try:
         with SessionLocal() as session:
-            stats = check_sequence_integrity(session, args.seq_source)
+            stats = check_sequence_integrity(session, args.seq_source, workers=args.workers)
 
             logger.info(f"Total features checked: {stats.total_features}")
             logger.info(f"Total errors found: {len(stats.errors)}")
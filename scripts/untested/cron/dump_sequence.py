@@ -38,6 +38,7 @@ from sqlalchemy import text
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from cgd.db.engine import SessionLocal
+from cgd.utils import seqkernels
 
 # Load environment variables
 load_dotenv()
@@ -292,10 +293,7 @@ def get_feature_coding_sequence(session, feature_no: int, seq_source: str) -> st
 
 def reverse_complement(seq: str) -> str:
     """Return reverse complement of a DNA sequence."""
-    complement = {"A": "T", "T": "A", "G": "C", "C": "G",
-                  "a": "t", "t": "a", "g": "c", "c": "g",
-                  "N": "N", "n": "n"}
-    return "".join(complement.get(base, base) for base in reversed(seq))
+    return seqkernels.reverse_complement(seq)
 
 
 def translate_sequence(dna_seq: str, trans_table: int = 12) -> str:
@@ -304,36 +302,8 @@ def translate_sequence(dna_seq: str, trans_table: int = 12) -> str:
 
     Uses genetic code table (default: 12 = alternative yeast nuclear code).
     """
-    # Standard genetic code with CTG -> Ser for table 12
-    codon_table = {
-        "TTT": "F", "TTC": "F", "TTA": "L", "TTG": "L",
-        "TCT": "S", "TCC": "S", "TCA": "S", "TCG": "S",
-        "TAT": "Y", "TAC": "Y", "TAA": "*", "TAG": "*",
-        "TGT": "C", "TGC": "C", "TGA": "*", "TGG": "W",
-        "CTT": "L", "CTC": "L", "CTA": "L", "CTG": "S" if trans_table == 12 else "L",
-        "CCT": "P", "CCC": "P", "CCA": "P", "CCG": "P",
-        "CAT": "H", "CAC": "H", "CAA": "Q", "CAG": "Q",
-        "CGT": "R", "CGC": "R", "CGA": "R", "CGG": "R",
-        "ATT": "I", "ATC": "I", "ATA": "I", "ATG": "M",
-        "ACT": "T", "ACC": "T", "ACA": "T", "ACG": "T",
-        "AAT": "N", "AAC": "N", "AAA": "K", "AAG": "K",
-        "AGT": "S", "AGC": "S", "AGA": "R", "AGG": "R",
-        "GTT": "V", "GTC": "V", "GTA": "V", "GTG": "V",
-        "GCT": "A", "GCC": "A", "GCA": "A", "GCG": "A",
-        "GAT": "D", "GAC": "D", "GAA": "E", "GAG": "E",
-        "GGT": "G", "GGC": "G", "GGA": "G", "GGG": "G",
-    }
-
-    protein = []
-    seq = dna_seq.upper()
-    for i in range(0, len(seq) - 2, 3):
-        codon = seq[i:i + 3]
-        aa = codon_table.get(codon, "X")
-        if aa == "*":  # Stop codon
-            break
-        protein.append(aa)
-
-    return "".join(protein)
+    table = 12 if trans_table == 12 else 1
+    return seqkernels.translate(dna_seq, table=table, to_stop=True)
 
 
 def format_fasta(seq_id: str, description: str, sequence: str, line_length: int = 60) -> str:
@@ -35,6 +35,11 @@ from sqlalchemy import text
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from cgd.db.engine import SessionLocal
+from cgd.utils.annotation_export import (
+    GPI_FEATURE_TYPES,
+    iter_export_features,
+    iter_gpi_rows,
+)
 
 # Load environment variables
 load_dotenv()
@@ -54,17 +59,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# SO (Sequence Ontology) codes for feature types
-CODE_FOR_TYPE = {
-    "ORF": "SO:0001217",
-    "ncRNA": "SO:0001263",
-    "rRNA": "SO:0001263",
-    "snRNA": "SO:0001263",
-    "snoRNA": "SO:0001263",
-    "tRNA": "SO:0001263",
-    "pseudogene": "SO:0000336",
-}
-
 
 def get_date() -> str:
     """Get current date in YYYY-MM-DD format."""
@@ -124,67 +118,6 @@ def get_strain_config(session, strain_abbrev: str) -> dict | None:
     }
 
 
-def get_features(session, seq_source: str):
-    """Get all features for a given sequence source."""
-    query = text(f"""
-        SELECT f.feature_no, f.feature_name, f.dbxref_id, f.feature_type,
-               f.gene_name, f.headline
-        FROM   {DB_SCHEMA}.feature f
-        JOIN   {DB_SCHEMA}.feat_location fl
-               ON (f.feature_no = fl.feature_no AND fl.is_loc_current = 'Y')
-        JOIN   {DB_SCHEMA}.seq s
-               ON (fl.root_seq_no = s.seq_no AND s.is_seq_current = 'Y'
-                   AND s.source = :seq_source)
-        JOIN   {DB_SCHEMA}.genome_version gv
-               ON (s.genome_version_no = gv.genome_version_no
-                   AND gv.is_ver_current = 'Y')
-        WHERE  f.feature_type in ('ORF', 'ncRNA', 'rRNA', 'snRNA', 'snoRNA',
-                                   'tRNA', 'pseudogene')
-    """)
-    return session.execute(query, {"seq_source": seq_source}).fetchall()
-
-
-def get_aliases(session, feature_no: int) -> list[str]:
-    """Get aliases for a feature."""
-    query = text(f"""
-        SELECT a.alias_name
-        FROM   {DB_SCHEMA}.alias a
-        JOIN   {DB_SCHEMA}.feat_alias fa
-               ON (fa.alias_no = a.alias_no AND fa.feature_no = :feature_no)
-    """)
-    results = session.execute(query, {"feature_no": feature_no}).fetchall()
-    return [row[0] for row in results if row[0]]
-
-
-def get_uniprot_ids(session, feature_no: int) -> list[str]:
-    """Get UniProt IDs for a feature."""
-    query = text(f"""
-        SELECT d.dbxref_id
-        FROM   {DB_SCHEMA}.dbxref d
-        JOIN   {DB_SCHEMA}.dbxref_feat df
-               ON (d.dbxref_no = df.dbxref_no AND df.feature_no = :feature_no)
-        WHERE  d.dbxref_type in ('SwissProt', 'UniProtKB')
-    """)
-    results = session.execute(query, {"feature_no": feature_no}).fetchall()
-    return [row[0] for row in results if row[0]]
-
-
-def clean_description(headline: str | None) -> str:
-    """Clean and format the description from headline."""
-    if not headline:
-        return ""
-
-    desc = headline
-    # Extract first part before semicolon if present
-    if ";" in desc:
-        desc = desc.split(";")[0]
-
-    # Remove HTML italic tags
-    desc = desc.replace("<i>", "").replace("</i>", "")
-
-    return desc
-
-
 def generate_gpi_file(
     session,
     strain_abbrev: str,
@@ -208,57 +141,12 @@ def generate_gpi_file(
         gpi.write(f"!URL: {PROJECT_URL}\n")
         gpi.write(f"!Project-release: {seq_source} genome version {genome_version}\n")
 
-        features = get_features(session, seq_source)
+        features = iter_export_features(
+            session, seq_source, GPI_FEATURE_TYPES, taxon_id=taxon_id
+        )
         count = 0
-
-        for row in features:
-            feature_no, feature_name, dbxref_id, feature_type, gene_name, headline = row
-
-            if not feature_no:
-                continue
-
-            # Format DBID
-            dbid = f"{PROJECT_ACRONYM}:{dbxref_id}"
-
-            # Get SO code for feature type
-            so_code = CODE_FOR_TYPE.get(feature_type, "")
-
-            # Format taxon
-            taxon = f"NCBITaxon:{taxon_id}"
-
-            # Clean description
-            desc = clean_description(headline)
-
-            # Build name list (gene name + aliases)
-            names = []
-            if gene_name:
-                names.append(gene_name)
-            aliases = get_aliases(session, feature_no)
-            names.extend(aliases)
-            name_list = " | ".join(names)
-
-            # Get UniProt IDs for ORFs
-            up_list = ""
-            if feature_type == "ORF":
-                uniprot_ids = get_uniprot_ids(session, feature_no)
-                up_list = " | ".join(f"UniProtKB:{up}" for up in uniprot_ids)
-
-            # Write GPI line (tab-separated)
-            # GPI 2.0 columns:
-            # 1. DB_Object_ID
-            # 2. DB_Object_Symbol
-            # 3. DB_Object_Name
-            # 4. DB_Object_Synonym(s)
-            # 5. DB_Object_Type
-            # 6. Taxon
-            # 7. Parent_Object_ID (empty)
-            # 8. DB_Xref(s)
-            # 9. Gene_Product_Properties (empty)
-            # 10. Annotation_Target_Set (empty)
-            gpi.write(
-                f"{dbid}\t{feature_name}\t{desc}\t{name_list}\t{so_code}\t"
-                f"{taxon}\t\t{dbid}\t\t{up_list}\t\n"
-            )
+        for row in iter_gpi_rows(features):
+            gpi.write("\t".join(row) + "\n")
             count += 1
 
     return count
@@ -41,6 +41,7 @@ from sqlalchemy import text
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from cgd.db.engine import SessionLocal
+from cgd.utils import seqkernels
 
 # Load environment variables
 load_dotenv()
@@ -61,50 +62,15 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-# Genetic code for translation (standard code)
-CODON_TABLE = {
-    "TTT": "F", "TTC": "F", "TTA": "L", "TTG": "L",
-    "TCT": "S", "TCC": "S", "TCA": "S", "TCG": "S",
-    "TAT": "Y", "TAC": "Y", "TAA": "*", "TAG": "*",
-    "TGT": "C", "TGC": "C", "TGA": "*", "TGG": "W",
-    "CTT": "L", "CTC": "L", "CTA": "L", "CTG": "L",
-    "CCT": "P", "CCC": "P", "CCA": "P", "CCG": "P",
-    "CAT": "H", "CAC": "H", "CAA": "Q", "CAG": "Q",
-    "CGT": "R", "CGC": "R", "CGA": "R", "CGG": "R",
-    "ATT": "I", "ATC": "I", "ATA": "I", "ATG": "M",
-    "ACT": "T", "ACC": "T", "ACA": "T", "ACG": "T",
-    "AAT": "N", "AAC": "N", "AAA": "K", "AAG": "K",
-    "AGT": "S", "AGC": "S", "AGA": "R", "AGG": "R",
-    "GTT": "V", "GTC": "V", "GTA": "V", "GTG": "V",
-    "GCT": "A", "GCC": "A", "GCA": "A", "GCG": "A",
-    "GAT": "D", "GAC": "D", "GAA": "E", "GAG": "E",
-    "GGT": "G", "GGC": "G", "GGA": "G", "GGG": "G",
-}
-
-# CTG clade alternative code (CTG = Ser instead of Leu)
-CTG_CODON_TABLE = CODON_TABLE.copy()
-CTG_CODON_TABLE["CTG"] = "S"
-
-
 def translate_sequence(dna_seq: str, use_ctg_code: bool = False) -> str:
-    """Translate DNA sequence to protein."""
-    codon_table = CTG_CODON_TABLE if use_ctg_code else CODON_TABLE
-    protein = []
-    for i in range(0, len(dna_seq) - 2, 3):
-        codon = dna_seq[i:i + 3].upper()
-        aa = codon_table.get(codon, "X")
-        if aa == "*":
-            break
-        protein.append(aa)
-    return "".join(protein)
+    """Translate DNA sequence to protein (CTG clade code uses table 12)."""
+    table = 12 if use_ctg_code else 1
+    return seqkernels.translate(dna_seq, table=table, to_stop=True)
 
 
 def reverse_complement(seq: str) -> str:
     """Get reverse complement of DNA sequence."""
-    complement = {"A": "T", "T": "A", "G": "C", "C": "G",
-                  "a": "t", "t": "a", "g": "c", "c": "g",
-                  "N": "N", "n": "n"}
-    return "".join(complement.get(base, "N") for base in reversed(seq))
+    return seqkernels.reverse_complement(seq, unknown="N")
 
 
 class SequenceDumper:
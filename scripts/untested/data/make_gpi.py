@@ -36,6 +36,11 @@ from sqlalchemy import text
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from cgd.db.engine import SessionLocal
+from cgd.utils.annotation_export import (
+    GPI_FEATURE_TYPES,
+    iter_export_features,
+    iter_gpi_rows,
+)
 
 # Load environment variables
 load_dotenv()
@@ -45,17 +50,6 @@ DB_SCHEMA = os.getenv("DB_SCHEMA", "MULTI")
 HTML_ROOT_DIR = Path(os.getenv("HTML_ROOT_DIR", "/var/www/html"))
 PROJECT_ACRONYM = os.getenv("PROJECT_ACRONYM", "CGD")
 
-# SO (Sequence Ontology) codes for feature types
-FEATURE_TYPE_SO_CODES = {
-    "ORF": "SO:0001217",
-    "ncRNA": "SO:0001263",
-    "rRNA": "SO:0001263",
-    "snRNA": "SO:0001263",
-    "snoRNA": "SO:0001263",
-    "tRNA": "SO:0001263",
-    "pseudogene": "SO:0000336",
-}
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -134,80 +128,6 @@ class GPIGenerator:
             return self.genome_version
         return None
 
-    def get_features(self) -> list[dict]:
-        """Get features for GPI file."""
-        query = text(f"""
-            SELECT f.feature_no, f.feature_name, f.dbxref_id, f.feature_type,
-                   f.gene_name, f.headline
-            FROM {DB_SCHEMA}.feature f
-            JOIN {DB_SCHEMA}.feat_location fl ON f.feature_no = fl.feature_no
-                AND fl.is_loc_current = 'Y'
-            JOIN {DB_SCHEMA}.seq s ON fl.root_seq_no = s.seq_no
-                AND s.is_seq_current = 'Y'
-                AND s.source = :seq_source
-            JOIN {DB_SCHEMA}.genome_version gv ON s.genome_version_no = gv.genome_version_no
-                AND gv.is_ver_current = 'Y'
-            WHERE f.feature_type IN ('ORF', 'ncRNA', 'rRNA', 'snRNA', 'snoRNA', 'tRNA', 'pseudogene')
-            ORDER BY f.feature_name
-        """)
-
-        result = self.session.execute(query, {"seq_source": self.seq_source})
-
-        features = []
-        for row in result:
-            features.append({
-                "feature_no": row[0],
-                "feature_name": row[1],
-                "dbxref_id": row[2],
-                "feature_type": row[3],
-                "gene_name": row[4],
-                "headline": row[5],
-            })
-
-        return features
-
-    def get_aliases(self, feature_no: int) -> list[str]:
-        """Get aliases for a feature."""
-        query = text(f"""
-            SELECT a.alias_name
-            FROM {DB_SCHEMA}.alias a
-            JOIN {DB_SCHEMA}.feat_alias fa ON fa.alias_no = a.alias_no
-            WHERE fa.feature_no = :feature_no
-        """)
-
-        result = self.session.execute(query, {"feature_no": feature_no})
-        return [row[0] for row in result if row[0]]
-
-    def get_uniprot_ids(self, feature_no: int) -> list[str]:
-        """Get UniProt cross-references for a feature."""
-        query = text(f"""
-            SELECT d.dbxref_id
-            FROM {DB_SCHEMA}.dbxref d
-            JOIN {DB_SCHEMA}.dbxref_feat df ON d.dbxref_no = df.dbxref_no
-            WHERE df.feature_no = :feature_no
-            AND d.dbxref_type IN ('SwissProt', 'UniProtKB')
-        """)
-
-        result = self.session.execute(query, {"feature_no": feature_no})
-        return [row[0] for row in result if row[0]]
-
-    def clean_description(self, headline: str | None) -> str:
-        """Clean headline for use as description."""
-        if not headline:
-            return ""
-
-        # Extract first part before semicolon
-        if ";" in headline:
-            desc = headline.split(";")[0].strip()
-        else:
-            desc = headline
-
-        # Remove HTML tags
-        import re
-        desc = re.sub(r"<[^>]+>", "", desc)
-
-        return desc
-
     def write_header(self, f: TextIO) -> None:
         """Write GPI file header."""
         date_str = datetime.now().strftime("%Y-%m-%d")
@@ -218,58 +138,6 @@ class GPIGenerator:
         f.write(f"!URL: http://www.candidagenome.org\n")
         f.write(f"!Project-release: {self.seq_source} genome version {self.genome_version}\n")
 
-    def write_feature(self, f: TextIO, feature: dict) -> None:
-        """Write a single feature to GPI file."""
-        dbid = f"{PROJECT_ACRONYM}:{feature['dbxref_id']}"
-        feature_name = feature["feature_name"]
-        feature_type = feature["feature_type"]
-
-        # Get SO code
-        so_code = FEATURE_TYPE_SO_CODES.get(feature_type, "")
-
-        # Get taxon
-        taxon = f"NCBITaxon:{self.taxon_id}"
-
-        # Get description
-        description = self.clean_description(feature["headline"])
-
-        # Build name list (gene name + aliases)
-        names = []
-        if feature["gene_name"]:
-            names.append(feature["gene_name"])
-
-        aliases = self.get_aliases(feature["feature_no"])
-        names.extend(aliases)
-
-        name_list = " | ".join(names) if names else ""
-
-        # Get UniProt IDs (only for ORFs)
-        uniprot_list = ""
-        if feature_type == "ORF":
-            uniprot_ids = self.get_uniprot_ids(feature["feature_no"])
-            if uniprot_ids:
-                uniprot_list = " | ".join(f"UniProtKB:{up}" for up in uniprot_ids)
-
-        # Write GPI row
-        # Format: DB_Object_ID, DB_Object_Symbol, DB_Object_Name, DB_Object_Synonym,
-        #         DB_Object_Type, DB_Object_Taxon, Encoded_by, Parent_Protein,
-        #         Protein_Containing_Complex_Members, DB_Xref(s), Gene_Product_Properties
-        row = [
-            dbid,                # DB_Object_ID
-            feature_name,        # DB_Object_Symbol
-            description,         # DB_Object_Name
-            name_list,           # DB_Object_Synonym
-            so_code,             # DB_Object_Type
-            taxon,               # DB_Object_Taxon
-            "",                  # Encoded_by
-            dbid,                # Parent_Protein
-            "",                  # Protein_Containing_Complex_Members
-            uniprot_list,        # DB_Xref(s)
-            "",                  # Gene_Product_Properties
-        ]
-
-        f.write("\t".join(row) + "\n")
-
     def generate_gpi(self, output_file: Path) -> int:
         """
         Generate GPI file.
@@ -288,19 +156,21 @@ class GPIGenerator:
 
         self.get_genome_version()
 
-        features = self.get_features()
-        logger.info(f"Found {len(features)} features")
-
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
+        features = iter_export_features(
+            self.session, self.seq_source, GPI_FEATURE_TYPES, taxon_id=self.taxon_id
+        )
+        count = 0
         with open(output_file, "w") as f:
             self.write_header(f)
 
-            for feature in features:
-                self.write_feature(f, feature)
+            for row in iter_gpi_rows(features):
+                f.write("\t".join(row) + "\n")
+                count += 1
 
-        logger.info(f"Wrote {len(features)} features to {output_file}")
-        return len(features)
+        logger.info(f"Wrote {count} features to {output_file}")
+        return count
 
 
 def make_gpi(strain_abbrev: str) -> bool:
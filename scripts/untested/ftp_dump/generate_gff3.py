@@ -35,6 +35,7 @@ import logging
 import os
 import re
 import sys
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import quote
@@ -339,8 +340,13 @@ def get_all_features(session, app_name: str) -> list[dict]:
     return features
 
 
-def get_chromosome_sequences(session) -> dict[str, str]:
-    """Get chromosome sequences for FASTA section."""
+def iter_chromosome_sequences(session) -> Iterator[tuple[str, str]]:
+    """
+    Yield (chromosome name, sequence) for the FASTA section, by name.
+
+    Fetched one row at a time from a server-side cursor so only one
+    chromosome sequence is held in memory.
+    """
     query = text(f"""
         SELECT f.feature_name, s.residues
         FROM {DB_SCHEMA}.feature f
@@ -348,15 +354,12 @@ def get_chromosome_sequences(session) -> dict[str, str]:
         WHERE f.feature_type = 'chromosome'
         AND s.seq_type = 'genomic'
         AND s.is_seq_current = 'Y'
-    """)
+        ORDER BY f.feature_name
+    """).execution_options(stream_results=True, yield_per=1)
 
-    sequences = {}
-    for row in session.execute(query).fetchall():
-        chr_name, seq = row
+    for chr_name, seq in session.execute(query):
         if seq:
-            sequences[chr_name] = seq
-
-    return sequences
+            yield chr_name, seq
 
 
 def calculate_phase(cds_coords: list[tuple], strand: str) -> dict[int, int]:
@@ -430,7 +433,7 @@ def write_gff3_file(
     goids: dict[str, list[str]],
     subfeatures: dict[str, dict[str, list[tuple]]],
     chr_symbol_map: dict[str, str],
-    chr_sequences: dict[str, str],
+    chr_sequences: Iterable[tuple[str, str]],
     log_file: Path,
 ) -> None:
     """Write GFF3 output file."""
@@ -617,13 +620,15 @@ def write_gff3_file(
             previous_chr = chromosome
 
         # Write FASTA section for ORFMAP
-        if app_name == "ORFMAP" and chr_sequences:
-            gff.write("###\n")
-            gff.write("##FASTA\n")
+        if app_name == "ORFMAP":
+            fasta_started = False
+            for chr_name, seq in chr_sequences:
+                if not fasta_started:
+                    gff.write("###\n")
+                    gff.write("##FASTA\n")
+                    fasta_started = True
 
-            for chr_name in sorted(chr_sequences.keys()):
                 seqid = get_seqid(chr_name, chr_symbol_map)
-                seq = chr_sequences[chr_name]
 
                 gff.write(f">{seqid}\n")
 
@@ -693,10 +698,10 @@ def main() -> int:
             logger.info(f"Found {len(features)} features")
 
             # Load chromosome sequences for ORFMAP
-            chr_sequences = {}
+            chr_sequences = ()
             if args.app_name == "ORFMAP":
-                logger.info("Loading chromosome sequences...")
-                chr_sequences = get_chromosome_sequences(session)
+                # Streamed while the FASTA section is written
+                chr_sequences = iter_chromosome_sequences(session)
 
             logger.info("Writing GFF3 file...")
             write_gff3_file(
@@ -8,11 +8,17 @@ This script calculates and updates protein properties including:
 - Amino acid composition
 - Protein detail information (atomic composition, instability index, etc.)
 
+Protein properties are computed with NumPy over chunks of the proteome in
+a process pool, and codonW runs on split inputs in parallel. Results are
+compared with the stored rows and only changed rows are written, in
+executemany batches.
+
 Original Perl: ProteinPropUpdate.pl (by Jon Binkley, December 2009)
 Converted to Python: 2024
 
 Usage:
     python protein_prop_update.py --strain-abbrev SC5314 --created-by DBUSER
+    python protein_prop_update.py --strain-abbrev SC5314 --created-by DBUSER --workers 8
 """
 
 import argparse
@@ -21,14 +27,18 @@ import os
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
 from pathlib import Path
 
+import numpy as np
 from Bio import SeqIO
-from Bio.SeqUtils.ProtParam import ProteinAnalysis
+from Bio.Data import IUPACData
+from Bio.SeqUtils import IsoelectricPoint, ProtParamData
 from dotenv import load_dotenv
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.orm import Session
 
 # Add parent directory to path for imports
@@ -70,6 +80,55 @@ DETAIL_GROUPS = {
 # Default fragment length for N-term/C-term sequences
 FRAG_LENGTH = 7
 
+# Proteins per chunk handed to a worker process
+PROTEIN_CHUNK_SIZE = 2000
+
+# Rows per executemany batch when writing protein_info and protein_detail
+DML_BATCH_SIZE = 5000
+
+CODONW_STATS_OPTIONS = "-silent -nomenu -machine -coa_rscu"
+CODONW_USAGE_OPTIONS = "-all_indices -silent -nomenu -machine -c_type 2"
+
+# protein_info columns written by the updater, with the scale of their
+# NUMBER type (None for text) so computed values compare like stored ones
+INFO_COLUMNS = {
+    'molecular_weight': 0,
+    'pi': 2,
+    'protein_length': 0,
+    'n_term_seq': None,
+    'c_term_seq': None,
+    'gravy_score': 6,
+    'aromaticity_score': 6,
+    'cai': 3,
+    'codon_bias': 3,
+    'fop_score': 3,
+    **{THREE_LETTER[aa].lower(): 0 for aa in AMINO_ACIDS},
+}
+
+# Per-residue lookup tables indexed by position in AMINO_ACIDS, taken from
+# the tables ProteinAnalysis uses so both give the same results
+_AA_SET = frozenset(AMINO_ACIDS)
+_AA_CODE = np.zeros(256, dtype=np.intp)
+for _code, _aa in enumerate(AMINO_ACIDS):
+    _AA_CODE[ord(_aa)] = _code
+_AA_INDEX = {aa: code for code, aa in enumerate(AMINO_ACIDS)}
+# Residue weights (4 decimals), hydropathy (1 decimal) and dipeptide
+# instability weights (3 decimals) as integers, so per-protein sums are exact
+_AA_WEIGHT = np.array([round(IUPACData.protein_weights[aa] * 10**4) for aa in AMINO_ACIDS])
+_AA_HYDROPATHY = np.array([round(ProtParamData.kd[aa] * 10) for aa in AMINO_ACIDS])
+_DIPEPTIDE_INSTABILITY = np.array(
+    [round(ProtParamData.DIWV[a][b] * 10**3) for a in AMINO_ACIDS for b in AMINO_ACIDS]
+)
+_NTERM_PK = np.array([
+    IsoelectricPoint.pKnterminal.get(aa, IsoelectricPoint.positive_pKs['Nterm'])
+    for aa in AMINO_ACIDS
+])
+_CTERM_PK = np.array([
+    IsoelectricPoint.pKcterminal.get(aa, IsoelectricPoint.negative_pKs['Cterm'])
+    for aa in AMINO_ACIDS
+])
+WATER_WEIGHT = 180153  # 18.0153 in the units of _AA_WEIGHT
+
 
 def setup_logging(verbose: bool = False, log_file: Path = None) -> None:
     """Configure logging."""
@@ -112,6 +171,190 @@ class ProteinProperties:
     aliphatic_index: float = 0.0
 
 
+def _chunk_list(lst: list, chunk_size: int = 900) -> list[list]:
+    """Split list into chunks (Oracle IN lists are limited to 1000 items)."""
+    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+
+
+def _stored_value(value, scale: int | None):
+    """Value as a column of the given NUMBER scale stores it ('ND' is NULL)."""
+    if value is None or value == 'ND':
+        return None
+    if scale is None:
+        return value
+    return Decimal(str(value)).quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+
+
+def _isoelectric_points(counts: np.ndarray, nterm_pk: np.ndarray, cterm_pk: np.ndarray) -> np.ndarray:
+    """
+    Bisect the isoelectric point of every protein at once.
+
+    Follows IsoelectricPoint.pi step for step (same interval, stopping
+    width and summation order), so each result equals the per-protein one.
+    """
+    n = len(counts)
+    ones = np.ones(n)
+    positive = [
+        (ones, nterm_pk) if aa == 'Nterm' else (counts[:, _AA_INDEX[aa]].astype(float), pk)
+        for aa, pk in IsoelectricPoint.positive_pKs.items()
+    ]
+    negative = [
+        (ones, cterm_pk) if aa == 'Cterm' else (counts[:, _AA_INDEX[aa]].astype(float), pk)
+        for aa, pk in IsoelectricPoint.negative_pKs.items()
+    ]
+
+    ph = np.full(n, 7.775)
+    low = np.full(n, 4.05)
+    high = np.full(n, 12.0)
+    while True:
+        active = high - low > 0.0001
+        if not active.any():
+            return ph
+
+        positive_charge = 0.0
+        for content, pk in positive:
+            positive_charge = positive_charge + content * (1.0 / (10 ** (ph - pk) + 1.0))
+        negative_charge = 0.0
+        for content, pk in negative:
+            negative_charge = negative_charge + content * (1.0 / (10 ** (pk - ph) + 1.0))
+        charged = positive_charge - negative_charge > 0.0
+
+        low = np.where(active & charged, ph, low)
+        high = np.where(active & ~charged, ph, high)
+        ph = np.where(active, (low + high) / 2, ph)
+
+
+def calculate_protein_properties(
+    proteins: list[tuple[str, str]],
+) -> tuple[dict[str, ProteinProperties], dict[str, str]]:
+    """
+    Calculate the properties of a batch of (orf_id, sequence) proteins.
+
+    Sequences are checked one by one; the metrics are computed with NumPy
+    over the whole batch and match Bio.SeqUtils.ProtParam.ProteinAnalysis.
+
+    Returns the properties by ORF, and the problem of each ORF skipped.
+    """
+    properties: dict[str, ProteinProperties] = {}
+    problems: dict[str, str] = {}
+
+    orf_ids = []
+    seqs = []
+    for orf_id, seq in proteins:
+        # Remove stop codon if present
+        seq = seq.rstrip('*')
+        upper = seq.upper()
+
+        # Check for invalid amino acids
+        if any(aa in upper for aa in 'BJOUXZ'):
+            problems[orf_id] = 'Ambiguous'
+            logger.warning(f"Protein {orf_id}: Ambiguous amino acids")
+            continue
+
+        if '*' in seq:
+            problems[orf_id] = 'Internal Stop'
+            logger.warning(f"Protein {orf_id}: Internal stop codon")
+            continue
+
+        if not seq or not _AA_SET.issuperset(upper):
+            if seq:
+                letter = next(aa for aa in upper if aa not in _AA_SET)
+                problems[orf_id] = f"'{letter!r}' is not a valid unambiguous letter for protein"
+            else:
+                problems[orf_id] = 'Empty sequence'
+            logger.error(f"Error calculating properties for {orf_id}: {problems[orf_id]}")
+            continue
+
+        orf_ids.append(orf_id)
+        seqs.append(seq)
+
+    if not seqs:
+        return properties, problems
+
+    uppers = "".join(seqs).upper()
+    codes = _AA_CODE[np.frombuffer(uppers.encode('ascii'), dtype=np.uint8)]
+    lengths = np.fromiter(map(len, seqs), dtype=np.int64, count=len(seqs))
+    starts = np.zeros(len(seqs), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    protein = np.repeat(np.arange(len(seqs)), lengths)
+
+    counts = np.bincount(protein * 20 + codes, minlength=len(seqs) * 20).reshape(-1, 20)
+
+    def count(aa: str) -> np.ndarray:
+        return counts[:, _AA_INDEX[aa]]
+
+    def percent(aa: str) -> np.ndarray:
+        return count(aa) * 100 / lengths
+
+    def fraction_percent(aa_count: np.ndarray) -> np.ndarray:
+        return aa_count / lengths * 100
+
+    # Weighted sums are exact integers, divided once into the float result
+    molecular_weight = (counts @ _AA_WEIGHT - (lengths - 1) * WATER_WEIGHT) / 10**4
+    gravy = (counts @ _AA_HYDROPATHY) / (lengths * 10)
+    aromaticity = 0 + percent('Y') / 100 + percent('W') / 100 + percent('F') / 100
+
+    # Instability index: dipeptides spanning two proteins are not counted
+    within = np.ones(len(codes) - 1, dtype=bool)
+    within[starts[1:] - 1] = False
+    dipeptides = np.bincount(
+        protein[:-1][within] * 400 + codes[:-1][within] * 20 + codes[1:][within],
+        minlength=len(seqs) * 400,
+    ).reshape(-1, 400)
+    instability = (dipeptides @ _DIPEPTIDE_INSTABILITY) / (lengths * 100)
+
+    pis = _isoelectric_points(
+        counts, _NTERM_PK[codes[starts]], _CTERM_PK[codes[starts + lengths - 1]]
+    )
+
+    # A = X(Ala) + a * X(Val) + b * X(Ile + Leu), where a = 2.9 and b = 3.9
+    aliphatic = (
+        fraction_percent(count('A'))
+        + 2.9 * fraction_percent(count('V'))
+        + 3.9 * fraction_percent(count('I') + count('L'))
+    )
+
+    extinction_reduced = count('W') * 5500 + count('Y') * 1490
+    extinction_cystines = extinction_reduced + (count('C') // 2) * 125
+
+    for i, (orf_id, seq) in enumerate(zip(orf_ids, seqs)):
+        props = ProteinProperties()
+        props.protein_length = len(seq)
+        props.molecular_weight = round(float(molecular_weight[i]), 1)
+        props.pi = round(float(pis[i]), 2)
+        props.gravy_score = round(float(gravy[i]), 2)
+        props.aromaticity_score = round(float(aromaticity[i]), 2)
+
+        # N-term and C-term sequences
+        if len(seq) < FRAG_LENGTH:
+            props.n_term_seq = seq
+            props.c_term_seq = seq
+        else:
+            props.n_term_seq = seq[:FRAG_LENGTH]
+            props.c_term_seq = seq[-FRAG_LENGTH:]
+
+        for code, aa in enumerate(AMINO_ACIDS):
+            props.aa_counts[THREE_LETTER[aa]] = int(counts[i, code])
+
+        props.instability_index = round(float(instability[i]), 2)
+        # Both extinction coefficients are at 280nm
+        props.extinction_all_cys = int(extinction_reduced[i])
+        props.extinction_no_cys = int(extinction_cystines[i])
+        props.aliphatic_index = round(float(aliphatic[i]), 2)
+
+        # Atomic composition (approximate based on average)
+        # These are estimates; exact values require full formula
+        props.carbon = len(seq) * 5
+        props.hydrogen = len(seq) * 8
+        props.nitrogen = len(seq) * 1
+        props.oxygen = len(seq) * 2
+        props.sulphur = props.aa_counts['MET'] + props.aa_counts['CYS']
+
+        properties[orf_id] = props
+
+    return properties, problems
+
+
 class ProteinPropertyUpdater:
     """Update protein properties in the database."""
 
@@ -126,6 +369,7 @@ class ProteinPropertyUpdater:
         codonw_path: str = CODONW_PATH,
         nuclear_translation_table: int = 1,
         mito_translation_table: int = 3,
+        workers: int = 1,
     ):
         self.session = session
         self.strain_abbrev = strain_abbrev
@@ -136,11 +380,13 @@ class ProteinPropertyUpdater:
         self.codonw_path = codonw_path
         self.nuclear_trans = nuclear_translation_table
         self.mito_trans = mito_translation_table
+        self.workers = max(1, workers)
 
         # Data structures
         self.org_no = None
         self.feat_no_for_orf: dict[str, int] = {}
         self.pi_no_for_feat: dict[int, int] = {}
+        self.info_for_pi: dict[int, dict] = {}
         self.pd_nos_for_pi: dict[int, list] = {}
         self.is_orf_mito: dict[str, bool] = {}
         self.is_orf_verified: dict[str, bool] = {}
@@ -156,8 +402,10 @@ class ProteinPropertyUpdater:
             'coding_seqs_processed': 0,
             'protein_info_inserted': 0,
             'protein_info_updated': 0,
+            'protein_info_unchanged': 0,
             'protein_detail_inserted': 0,
             'protein_detail_updated': 0,
+            'protein_detail_unchanged': 0,
             'errors': 0,
             'skipped': 0,
         }
@@ -272,23 +520,28 @@ class ProteinPropertyUpdater:
             self.default_feat.add(feat_name)
 
     def get_existing_protein_info(self) -> None:
-        """Get existing protein info from database."""
+        """Get existing protein info from database, with the stored values."""
         # Get protein_info records
         result = self.session.execute(
             text(f"""
-                SELECT pi.protein_info_no, pi.feature_no
+                SELECT pi.protein_info_no, pi.feature_no, {", ".join(INFO_COLUMNS)}
                 FROM {DB_SCHEMA}.protein_info pi
             """)
         )
 
-        for pi_no, feat_no in result:
+        for pi_no, feat_no, *values in result:
             self.pi_no_for_feat[feat_no] = pi_no
+            self.info_for_pi[pi_no] = {
+                column: _stored_value(value, scale)
+                for (column, scale), value in zip(INFO_COLUMNS.items(), values)
+            }
 
         # Get protein_detail records
         result = self.session.execute(
             text(f"""
                 SELECT pd.protein_detail_no, pd.protein_info_no,
-                       pd.protein_detail_group, pd.protein_detail_type
+                       pd.protein_detail_group, pd.protein_detail_type,
+                       pd.protein_detail_value
                 FROM {DB_SCHEMA}.protein_detail pd
                 WHERE pd.protein_detail_group IN (
                     'ATOMIC COMPOSITION', 'INSTABILITY INDEX',
@@ -297,93 +550,18 @@ class ProteinPropertyUpdater:
             """)
         )
 
-        for pd_no, pi_no, group, detail_type in result:
+        for pd_no, pi_no, group, detail_type, value in result:
             if pi_no not in self.pd_nos_for_pi:
                 self.pd_nos_for_pi[pi_no] = []
             self.pd_nos_for_pi[pi_no].append({
                 'pd_no': pd_no,
                 'group': group,
                 'type': detail_type,
+                'value': value,
             })
 
         logger.info(f"Found {len(self.pi_no_for_feat)} existing protein_info records")
 
-    def calculate_protein_properties(self, seq: str, orf_id: str) -> ProteinProperties:
-        """Calculate protein properties from sequence."""
-        props = ProteinProperties()
-
-        # Remove stop codon if present
-        seq = seq.rstrip('*')
-
-        # Check for invalid amino acids
-        if any(aa in seq.upper() for aa in 'BJOUXZ'):
-            self.problem_with_orf[orf_id] = 'Ambiguous'
-            logger.warning(f"Protein {orf_id}: Ambiguous amino acids")
-            return None
-
-        if '*' in seq:
-            self.problem_with_orf[orf_id] = 'Internal Stop'
-            logger.warning(f"Protein {orf_id}: Internal stop codon")
-            return None
-
-        try:
-            analysis = ProteinAnalysis(seq)
-
-            props.protein_length = len(seq)
-            props.molecular_weight = round(analysis.molecular_weight(), 1)
-            props.pi = round(analysis.isoelectric_point(), 2)
-            props.gravy_score = round(analysis.gravy(), 2)
-            props.aromaticity_score = round(analysis.aromaticity(), 2)
-
-            # N-term and C-term sequences
-            if len(seq) < FRAG_LENGTH:
-                props.n_term_seq = seq
-                props.c_term_seq = seq
-            else:
-                props.n_term_seq = seq[:FRAG_LENGTH]
-                props.c_term_seq = seq[-FRAG_LENGTH:]
-
-            # Amino acid counts
-            aa_counts = analysis.count_amino_acids()
-            for aa in AMINO_ACIDS:
-                props.aa_counts[THREE_LETTER[aa]] = aa_counts.get(aa, 0)
-
-            # Instability index
-            props.instability_index = round(analysis.instability_index(), 2)
-
-            # Extinction coefficients (at 280nm)
-            # With all Cys as cystines (reduced=False)
-            props.extinction_all_cys = round(
-                analysis.molar_extinction_coefficient()[0], 2
-            )
-            # With no Cys as cystines (reduced=True)
-            props.extinction_no_cys = round(
-                analysis.molar_extinction_coefficient()[1], 2
-            )
-
-            # Aliphatic index
-            # A = X(Ala) + a * X(Val) + b * X(Ile + Leu)
-            # where a = 2.9 and b = 3.9
-            ala_pct = aa_counts.get('A', 0) / len(seq) * 100 if seq else 0
-            val_pct = aa_counts.get('V', 0) / len(seq) * 100 if seq else 0
-            ile_leu_pct = (aa_counts.get('I', 0) + aa_counts.get('L', 0)) / len(seq) * 100 if seq else 0
-            props.aliphatic_index = round(ala_pct + 2.9 * val_pct + 3.9 * ile_leu_pct, 2)
-
-            # Atomic composition (approximate based on average)
-            # These are estimates; exact values require full formula
-            props.carbon = sum(aa_counts.values()) * 5  # Approximate
-            props.hydrogen = sum(aa_counts.values()) * 8
-            props.nitrogen = sum(aa_counts.values()) * 1
-            props.oxygen = sum(aa_counts.values()) * 2
-            props.sulphur = aa_counts.get('M', 0) + aa_counts.get('C', 0)
-
-        except Exception as e:
-            logger.error(f"Error calculating properties for {orf_id}: {e}")
-            self.problem_with_orf[orf_id] = str(e)
-            return None
-
-        return props
-
     def check_coding_sequence(self, seq: str, orf_id: str, is_mito: bool = False) -> bool:
         """Check coding sequence for validity."""
         seq = seq.upper()
@@ -502,14 +680,45 @@ class ProteinPropertyUpdater:
 
         return results
 
+    def run_codonw_jobs(self, jobs: list[list[tuple]]) -> None:
+        """
+        Run codonW jobs concurrently, up to one per worker.
+
+        Each job is a list of run_codonw argument tuples that run in order,
+        for runs that write the same output file.
+        """
+        def run_job(job: list[tuple]) -> None:
+            for args in job:
+                self.run_codonw(*args)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(run_job, jobs))
+
+    def apply_codonw_results(self, output_files: list[Path]) -> None:
+        """Set CAI, CBI and Fop of the computed proteins from codonW output."""
+        for output_file in output_files:
+            codonw_results = self.parse_codonw_output(output_file)
+
+            for orf_id, values in codonw_results.items():
+                if orf_id in self.type_vals_for_orf:
+                    self.type_vals_for_orf[orf_id].cai = values['CAI']
+                    self.type_vals_for_orf[orf_id].codon_bias = values['CBI']
+                    self.type_vals_for_orf[orf_id].fop_score = values['FOP']
+
     def process_protein_sequences(self) -> None:
-        """Process protein sequences and calculate properties."""
+        """
+        Process protein sequences and calculate properties.
+
+        The proteome is split into PROTEIN_CHUNK_SIZE chunks that are
+        calculated in a process pool when more than one worker is used.
+        """
         if not self.protein_seq_file or not self.protein_seq_file.exists():
             logger.warning("Protein sequence file not specified or not found")
             return
 
         logger.info(f"Processing protein sequences from {self.protein_seq_file}")
 
+        proteins = []
         for record in SeqIO.parse(self.protein_seq_file, "fasta"):
             feature_name = record.id
 
@@ -519,15 +728,31 @@ class ProteinPropertyUpdater:
 
             # Handle allele mapping
             orf_id = self.orf_for_allele.get(feature_name, feature_name)
+            proteins.append((orf_id, str(record.seq)))
+
+        chunks = _chunk_list(proteins, PROTEIN_CHUNK_SIZE)
+        if self.workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(calculate_protein_properties, chunks))
+        else:
+            results = [calculate_protein_properties(chunk) for chunk in chunks]
 
-            # Calculate properties
-            props = self.calculate_protein_properties(str(record.seq), orf_id)
-            if props:
-                self.type_vals_for_orf[orf_id] = props
-                self.stats['proteins_processed'] += 1
+        # Chunks are merged in file order, so a later record for the same
+        # ORF wins as before
+        for properties, problems in results:
+            self.problem_with_orf.update(problems)
+            self.type_vals_for_orf.update(properties)
+            self.stats['proteins_processed'] += len(properties)
 
     def process_coding_sequences(self) -> None:
-        """Process coding sequences for codonW analysis."""
+        """
+        Process coding sequences for codonW analysis.
+
+        The per-gene indices of all nuclear ORFs do not depend on the other
+        genes in the input, so that run is split into one input file per
+        worker; the correspondence analysis of verified ORFs and the
+        mitochondrial runs each see their full input.
+        """
         if not self.coding_seq_file or not self.coding_seq_file.exists():
             logger.warning("Coding sequence file not specified or not found")
             return
@@ -570,34 +795,27 @@ class ProteinPropertyUpdater:
 
             self.stats['coding_seqs_processed'] += 1
 
-        # Write sequences and run codonW for nuclear ORFs
+        jobs = []
+        output_files = []
+
+        # Write sequences for codonW for nuclear ORFs
         if verified_nuc_seqs:
             verified_file = nuc_dir / 'nuclear_verified.fasta'
-            all_nuc_file = nuc_dir / 'nuclear_full.fasta'
-
             SeqIO.write(verified_nuc_seqs, verified_file, "fasta")
-            SeqIO.write(nuc_seqs, all_nuc_file, "fasta")
-
             logger.info(f"Created {verified_file} with {len(verified_nuc_seqs)} sequences")
 
-            # Run codonW for statistics
-            stats_options = "-silent -nomenu -machine -coa_rscu"
-            usage_options = "-all_indices -silent -nomenu -machine -c_type 2"
-
-            self.run_codonw(verified_file, verified_file.with_suffix('.out'),
-                          stats_options, self.nuclear_trans)
-            self.run_codonw(all_nuc_file, all_nuc_file.with_suffix('.out'),
-                          usage_options, self.nuclear_trans)
-
-            # Parse results
-            output_file = all_nuc_file.with_suffix('.out')
-            codonw_results = self.parse_codonw_output(output_file)
+            # Statistics over the verified set
+            jobs.append([(verified_file, verified_file.with_suffix('.out'),
+                          CODONW_STATS_OPTIONS, self.nuclear_trans)])
 
-            for orf_id, values in codonw_results.items():
-                if orf_id in self.type_vals_for_orf:
-                    self.type_vals_for_orf[orf_id].cai = values['CAI']
-                    self.type_vals_for_orf[orf_id].codon_bias = values['CBI']
-                    self.type_vals_for_orf[orf_id].fop_score = values['FOP']
+            # Per-gene indices, one input per worker
+            chunk_size = -(-len(nuc_seqs) // self.workers)
+            for n, chunk in enumerate(_chunk_list(nuc_seqs, chunk_size)):
+                chunk_file = nuc_dir / f'nuclear_full_{n:02d}.fasta'
+                SeqIO.write(chunk, chunk_file, "fasta")
+                jobs.append([(chunk_file, chunk_file.with_suffix('.out'),
+                              CODONW_USAGE_OPTIONS, self.nuclear_trans)])
+                output_files.append(chunk_file.with_suffix('.out'))
 
         # Process mitochondrial ORFs similarly
         if mito_seqs:
@@ -606,27 +824,31 @@ class ProteinPropertyUpdater:
 
             logger.info(f"Created {mito_file} with {len(mito_seqs)} sequences")
 
-            stats_options = "-silent -nomenu -machine -coa_rscu"
-            usage_options = "-all_indices -silent -nomenu -machine -c_type 2"
-
-            self.run_codonw(mito_file, mito_file.with_suffix('.out'),
-                          stats_options, self.mito_trans)
-            self.run_codonw(mito_file, mito_file.with_suffix('.out'),
-                          usage_options, self.mito_trans)
-
-            output_file = mito_file.with_suffix('.out')
-            codonw_results = self.parse_codonw_output(output_file)
+            # Both runs write mito_full.out, so they stay in order
+            jobs.append([
+                (mito_file, mito_file.with_suffix('.out'), CODONW_STATS_OPTIONS, self.mito_trans),
+                (mito_file, mito_file.with_suffix('.out'), CODONW_USAGE_OPTIONS, self.mito_trans),
+            ])
+            output_files.append(mito_file.with_suffix('.out'))
 
-            for orf_id, values in codonw_results.items():
-                if orf_id in self.type_vals_for_orf:
-                    self.type_vals_for_orf[orf_id].cai = values['CAI']
-                    self.type_vals_for_orf[orf_id].codon_bias = values['CBI']
-                    self.type_vals_for_orf[orf_id].fop_score = values['FOP']
+        self.run_codonw_jobs(jobs)
+        self.apply_codonw_results(output_files)
 
     def load_properties_to_db(self, dry_run: bool = False) -> None:
-        """Load calculated properties into database."""
+        """
+        Load calculated properties into database.
+
+        Computed values are compared with the stored ones and only new or
+        changed rows are written, in executemany batches.
+        """
         logger.info("Loading properties into database")
 
+        info_inserts = []
+        info_updates = []
+        detail_inserts = []
+        detail_updates = []
+        new_info_props: dict[int, ProteinProperties] = {}
+
         for orf_id, props in self.type_vals_for_orf.items():
             if orf_id in self.problem_with_orf:
                 logger.debug(f"Skipping {orf_id}: {self.problem_with_orf[orf_id]}")
@@ -639,29 +861,59 @@ class ProteinPropertyUpdater:
                 self.stats['skipped'] += 1
                 continue
 
-            try:
-                pi_no = self.pi_no_for_feat.get(feat_no)
+            info = self._info_values(props)
+            pi_no = self.pi_no_for_feat.get(feat_no)
 
-                if pi_no:
-                    # Update existing protein_info
-                    self._update_protein_info(pi_no, props)
-                    self.stats['protein_info_updated'] += 1
-                else:
-                    # Insert new protein_info
-                    pi_no = self._insert_protein_info(feat_no, props)
-                    self.stats['protein_info_inserted'] += 1
+            if not pi_no:
+                # Insert new protein_info, details once its number is known
+                info_inserts.append({'created_by': self.created_by, 'feat_no': feat_no, **info})
+                new_info_props[feat_no] = props
+                continue
+
+            stored = self.info_for_pi.get(pi_no, {})
+            if any(
+                _stored_value(info[column], scale) != stored.get(column)
+                for column, scale in INFO_COLUMNS.items()
+            ):
+                info_updates.append({'pi_no': pi_no, **info})
+                self.stats['protein_info_updated'] += 1
+            else:
+                self.stats['protein_info_unchanged'] += 1
 
-                # Handle protein_detail
-                if pi_no in self.pd_nos_for_pi:
-                    self._update_protein_detail(pi_no, props)
+            # Handle protein_detail
+            if pi_no in self.pd_nos_for_pi:
+                changed = self._detail_updates(pi_no, props)
+                detail_updates.extend(changed)
+                if changed:
                     self.stats['protein_detail_updated'] += 1
                 else:
-                    self._insert_protein_detail(pi_no, props)
-                    self.stats['protein_detail_inserted'] += 1
-
-            except Exception as e:
-                logger.error(f"Error loading properties for {orf_id}: {e}")
-                self.stats['errors'] += 1
+                    self.stats['protein_detail_unchanged'] += 1
+            else:
+                detail_inserts.extend(self._detail_inserts(pi_no, props))
+                self.stats['protein_detail_inserted'] += 1
+
+        self._executemany(self._update_info_sql(), info_updates)
+        self._executemany(self._insert_info_sql(), info_inserts)
+        self.stats['protein_info_inserted'] += len(info_inserts)
+
+        for pi_no, feat_no in self._get_pi_nos(list(new_info_props)):
+            detail_inserts.extend(self._detail_inserts(pi_no, new_info_props[feat_no]))
+            self.stats['protein_detail_inserted'] += 1
+
+        self._executemany(f"""
+            UPDATE {DB_SCHEMA}.protein_detail SET
+                protein_detail_value = :value
+            WHERE protein_detail_no = :pd_no
+        """, detail_updates)
+        self._executemany(f"""
+            INSERT INTO {DB_SCHEMA}.protein_detail (
+                created_by, protein_info_no,
+                protein_detail_group, protein_detail_type,
+                protein_detail_value
+            ) VALUES (
+                :created_by, :pi_no, :group, :type, :value
+            )
+        """, detail_inserts)
 
         if not dry_run:
             self.session.commit()
@@ -670,144 +922,92 @@ class ProteinPropertyUpdater:
             self.session.rollback()
             logger.info("Dry run - changes rolled back")
 
-    def _update_protein_info(self, pi_no: int, props: ProteinProperties) -> None:
-        """Update existing protein_info record."""
-        aa_columns = ", ".join([f"{THREE_LETTER[aa]} = :{THREE_LETTER[aa].lower()}"
-                               for aa in AMINO_ACIDS])
-
-        sql = f"""
-            UPDATE {DB_SCHEMA}.protein_info SET
-                molecular_weight = :mw,
-                pi = :pi,
-                protein_length = :length,
-                n_term_seq = :nterm,
-                c_term_seq = :cterm,
-                gravy_score = :gravy,
-                aromaticity_score = :aroma,
-                cai = :cai,
-                codon_bias = :cbi,
-                fop_score = :fop,
-                {aa_columns}
-            WHERE protein_info_no = :pi_no
-        """
+    def _executemany(self, sql: str, rows: list[dict]) -> None:
+        """Run one statement over ``rows`` in executemany batches."""
+        statement = text(sql)
+        for batch in _chunk_list(rows, DML_BATCH_SIZE):
+            self.session.execute(statement, batch)
 
-        params = {
-            'mw': props.molecular_weight,
+    def _info_values(self, props: ProteinProperties) -> dict:
+        """protein_info column values for the calculated properties."""
+        values = {
+            'molecular_weight': props.molecular_weight,
             'pi': props.pi,
-            'length': props.protein_length,
-            'nterm': props.n_term_seq,
-            'cterm': props.c_term_seq,
-            'gravy': props.gravy_score,
-            'aroma': props.aromaticity_score,
-            'cai': props.cai,
-            'cbi': props.codon_bias,
-            'fop': props.fop_score,
-            'pi_no': pi_no,
+            'protein_length': props.protein_length,
+            'n_term_seq': props.n_term_seq,
+            'c_term_seq': props.c_term_seq,
+            'gravy_score': props.gravy_score,
+            'aromaticity_score': props.aromaticity_score,
+            # codonW reports ND when it cannot compute an index
+            'cai': None if props.cai == 'ND' else props.cai,
+            'codon_bias': None if props.codon_bias == 'ND' else props.codon_bias,
+            'fop_score': None if props.fop_score == 'ND' else props.fop_score,
         }
 
         for aa in AMINO_ACIDS:
-            params[THREE_LETTER[aa].lower()] = props.aa_counts.get(THREE_LETTER[aa], 0)
+            values[THREE_LETTER[aa].lower()] = props.aa_counts.get(THREE_LETTER[aa], 0)
 
-        self.session.execute(text(sql), params)
+        return values
 
-    def _insert_protein_info(self, feat_no: int, props: ProteinProperties) -> int:
-        """Insert new protein_info record."""
-        aa_columns = ", ".join([THREE_LETTER[aa] for aa in AMINO_ACIDS])
-        aa_values = ", ".join([f":{THREE_LETTER[aa].lower()}" for aa in AMINO_ACIDS])
+    def _update_info_sql(self) -> str:
+        """UPDATE statement for protein_info, keyed by :pi_no."""
+        columns = ",\n                ".join(f"{column} = :{column}" for column in INFO_COLUMNS)
+        return f"""
+            UPDATE {DB_SCHEMA}.protein_info SET
+                {columns}
+            WHERE protein_info_no = :pi_no
+        """
 
-        sql = f"""
+    def _insert_info_sql(self) -> str:
+        """INSERT statement for protein_info."""
+        return f"""
             INSERT INTO {DB_SCHEMA}.protein_info (
-                created_by, feature_no,
-                molecular_weight, pi, protein_length, n_term_seq,
-                c_term_seq, gravy_score, aromaticity_score,
-                cai, codon_bias, fop_score,
-                {aa_columns}
+                created_by, feature_no, {", ".join(INFO_COLUMNS)}
             ) VALUES (
-                :created_by, :feat_no,
-                :mw, :pi, :length, :nterm,
-                :cterm, :gravy, :aroma,
-                :cai, :cbi, :fop,
-                {aa_values}
+                :created_by, :feat_no, {", ".join(f":{column}" for column in INFO_COLUMNS)}
             )
         """
 
-        params = {
-            'created_by': self.created_by,
-            'feat_no': feat_no,
-            'mw': props.molecular_weight,
-            'pi': props.pi,
-            'length': props.protein_length,
-            'nterm': props.n_term_seq,
-            'cterm': props.c_term_seq,
-            'gravy': props.gravy_score,
-            'aroma': props.aromaticity_score,
-            'cai': props.cai,
-            'cbi': props.codon_bias,
-            'fop': props.fop_score,
-        }
-
-        for aa in AMINO_ACIDS:
-            params[THREE_LETTER[aa].lower()] = props.aa_counts.get(THREE_LETTER[aa], 0)
+    def _get_pi_nos(self, feat_nos: list[int]) -> list[tuple[int, int]]:
+        """Get (protein_info_no, feature_no) of the given features."""
+        query = text(f"""
+            SELECT protein_info_no, feature_no FROM {DB_SCHEMA}.protein_info
+            WHERE feature_no IN :feat_nos
+        """).bindparams(bindparam("feat_nos", expanding=True))
 
-        self.session.execute(text(sql), params)
+        pi_nos = []
+        for chunk in _chunk_list(feat_nos):
+            pi_nos.extend(tuple(row) for row in self.session.execute(query, {"feat_nos": chunk}))
+        return pi_nos
 
-        # Get the inserted ID
-        result = self.session.execute(
-            text(f"""
-                SELECT protein_info_no FROM {DB_SCHEMA}.protein_info
-                WHERE feature_no = :feat_no
-            """),
-            {"feat_no": feat_no}
-        ).fetchone()
-
-        return result[0] if result else None
-
-    def _update_protein_detail(self, pi_no: int, props: ProteinProperties) -> None:
-        """Update existing protein_detail records."""
+    def _detail_updates(self, pi_no: int, props: ProteinProperties) -> list[dict]:
+        """Update rows for the existing protein_detail records whose value changed."""
         detail_values = self._get_detail_values(props)
 
+        updates = []
         for pd_info in self.pd_nos_for_pi.get(pi_no, []):
-            group = pd_info['group']
-            detail_type = pd_info['type']
-            pd_no = pd_info['pd_no']
-
-            value = detail_values.get(detail_type)
-            if value is not None:
-                self.session.execute(
-                    text(f"""
-                        UPDATE {DB_SCHEMA}.protein_detail SET
-                            protein_detail_value = :value
-                        WHERE protein_detail_no = :pd_no
-                    """),
-                    {"value": str(value), "pd_no": pd_no}
-                )
+            value = detail_values.get(pd_info['type'])
+            if value is not None and str(value) != pd_info['value']:
+                updates.append({"value": str(value), "pd_no": pd_info['pd_no']})
+        return updates
 
-    def _insert_protein_detail(self, pi_no: int, props: ProteinProperties) -> None:
-        """Insert new protein_detail records."""
+    def _detail_inserts(self, pi_no: int, props: ProteinProperties) -> list[dict]:
+        """Insert rows for the protein_detail records of a protein."""
         detail_values = self._get_detail_values(props)
 
+        inserts = []
         for group, types in DETAIL_GROUPS.items():
             for detail_type in types:
                 value = detail_values.get(detail_type)
                 if value is not None:
-                    self.session.execute(
-                        text(f"""
-                            INSERT INTO {DB_SCHEMA}.protein_detail (
-                                created_by, protein_info_no,
-                                protein_detail_group, protein_detail_type,
-                                protein_detail_value
-                            ) VALUES (
-                                :created_by, :pi_no, :group, :type, :value
-                            )
-                        """),
-                        {
-                            "created_by": self.created_by,
-                            "pi_no": pi_no,
-                            "group": group,
-                            "type": detail_type,
-                            "value": str(value),
-                        }
-                    )
+                    inserts.append({
+                        "created_by": self.created_by,
+                        "pi_no": pi_no,
+                        "group": group,
+                        "type": detail_type,
+                        "value": str(value),
+                    })
+        return inserts
 
     def _get_detail_values(self, props: ProteinProperties) -> dict:
         """Get protein detail values as a dict."""
@@ -894,6 +1094,12 @@ def main():
         default=3,
         help="Mitochondrial translation table (default: 3)",
     )
+    parser.add_argument(
+        "--workers", "-j",
+        type=int,
+        default=1,
+        help="Processes for property calculation and concurrent codonW runs (default: 1)",
+    )
     parser.add_argument(
         "--log-file",
         type=Path,
@@ -936,6 +1142,7 @@ def main():
                 codonw_path=args.codonw_path,
                 nuclear_translation_table=args.nuclear_trans_table,
                 mito_translation_table=args.mito_trans_table,
+                workers=args.workers,
             )
 
             stats = updater.run(args.dry_run)
@@ -946,8 +1153,10 @@ def main():
             logger.info(f"  Coding sequences processed: {stats['coding_seqs_processed']}")
             logger.info(f"  Protein info inserted: {stats['protein_info_inserted']}")
             logger.info(f"  Protein info updated: {stats['protein_info_updated']}")
+            logger.info(f"  Protein info unchanged: {stats['protein_info_unchanged']}")
             logger.info(f"  Protein detail inserted: {stats['protein_detail_inserted']}")
             logger.info(f"  Protein detail updated: {stats['protein_detail_updated']}")
+            logger.info(f"  Protein detail unchanged: {stats['protein_detail_unchanged']}")
             logger.info(f"  Skipped: {stats['skipped']}")
             logger.info(f"  Errors: {stats['errors']}")
             logger.info("=" * 50)
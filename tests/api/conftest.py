@@ -248,3 +248,28 @@ def sample_go_paths():
 def sample_organism():
     """Sample organism for testing."""
     return MockOrganism(1, "Candida albicans SC5314", 1)
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Start every test with empty per-process maps and response caches."""
+    from cgd.api.services.cv_tree_service import invalidate_cv_tree
+    from cgd.api.services.go_dag_service import invalidate_go_dag
+    from cgd.api.services.region_service import invalidate_region_index
+    from cgd.api.services.relationship_map_service import invalidate_relationship_map
+    from cgd.auth.session_cache import invalidate_auth_caches
+    from cgd.core.http_compression import invalidate_precompressed
+
+    invalidate_cv_tree()
+    invalidate_go_dag()
+    invalidate_region_index()
+    invalidate_relationship_map()
+    invalidate_auth_caches()
+    invalidate_precompressed()
+    yield
+    invalidate_cv_tree()
+    invalidate_go_dag()
+    invalidate_region_index()
+    invalidate_relationship_map()
+    invalidate_auth_caches()
+    invalidate_precompressed()
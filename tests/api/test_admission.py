@@ -0,0 +1,215 @@
+"""
+Tests for cost-based admission control.
+
+Tests cover:
+- Local and file-lock slot pools
+- Immediate admission, queueing, queue-full and timeout rejections
+- Per-client share and Retry-After estimates
+- The route dependency: 429 responses, cheap routes unaffected, applies
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from cgd.core import admission as admission_module
+from cgd.core.admission import (
+    BULK,
+    AdmissionController,
+    CostClass,
+    FileSlots,
+    LocalSlots,
+    admission,
+)
+
+
+def make_controller(directory=None, slots=1, queue_size=1, client_share=2, queue_timeout=0.5):
+    return AdmissionController(
+        {BULK: CostClass(BULK, slots, queue_size, client_share, queue_timeout)},
+        directory=directory,
+        poll_interval=0.01,
+    )
+
+
+@pytest.fixture(params=["local", "file"])
+def slots(request, tmp_path):
+    if request.param == "local":
+        return LocalSlots(2)
+    return FileSlots(str(tmp_path), 2)
+
+
+class TestSlots:
+    """Tests for LocalSlots and FileSlots."""
+
+    def test_limits_and_releases(self, slots):
+        first = slots.try_acquire("bulk.run")
+        second = slots.try_acquire("bulk.run")
+
+        assert first is not None and second is not None
+        assert slots.try_acquire("bulk.run") is None
+        assert slots.try_acquire("bulk.queue") is not None
+
+        slots.release(first)
+        assert slots.try_acquire("bulk.run") is not None
+
+    def test_file_slots_sweep_removes_unlocked(self, tmp_path):
+        slots = FileSlots(str(tmp_path), 1)
+        held = slots.try_acquire("bulk.client.a")
+        slots.release(slots.try_acquire("bulk.client.b"))
+
+        slots.sweep("bulk.client.", max_age=-1)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["bulk.client.a.0.lock"]
+        slots.release(held)
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    @pytest.fixture(params=["local", "file"])
+    def directory(self, request, tmp_path):
+        return None if request.param == "local" else str(tmp_path)
+
+    def test_waits_for_a_slot(self, directory):
+        controller = make_controller(directory)
+
+        async def scenario():
+            first = await controller.acquire(BULK, "a")
+            waiting = asyncio.create_task(controller.acquire(BULK, "b"))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+            controller.release(first)
+            controller.release(await waiting)
+
+        asyncio.run(scenario())
+
+    def test_rejects_when_queue_full(self, directory):
+        controller = make_controller(directory)
+
+        async def scenario():
+            first = await controller.acquire(BULK, "a")
+            waiting = asyncio.create_task(controller.acquire(BULK, "b"))
+            await asyncio.sleep(0.02)
+            with pytest.raises(HTTPException) as exc:
+                await controller.acquire(BULK, "c")
+            controller.release(first)
+            controller.release(await waiting)
+            return exc.value
+
+        exc = asyncio.run(scenario())
+        assert exc.status_code == 429
+        assert int(exc.headers["Retry-After"]) >= 1
+
+    def test_rejects_after_queue_timeout(self, directory):
+        controller = make_controller(directory, queue_timeout=0.05)
+
+        async def scenario():
+            first = await controller.acquire(BULK, "a")
+            try:
+                with pytest.raises(HTTPException) as exc:
+                    await controller.acquire(BULK, "b")
+            finally:
+                controller.release(first)
+            return exc.value
+
+        assert asyncio.run(scenario()).status_code == 429
+
+    def test_client_share(self, directory):
+        controller = make_controller(directory, slots=4, client_share=1)
+
+        async def scenario():
+            first = await controller.acquire(BULK, "a")
+            with pytest.raises(HTTPException) as exc:
+                await controller.acquire(BULK, "a")
+            other = await controller.acquire(BULK, "b")
+            controller.release(first)
+            controller.release(other)
+            controller.release(await controller.acquire(BULK, "a"))
+            return exc.value
+
+        assert asyncio.run(scenario()).status_code == 429
+
+    def test_retry_after_follows_run_time(self):
+        cost = CostClass(BULK, slots=2, queue_size=3, client_share=1, queue_timeout=1)
+        for _ in range(50):
+            cost.record_run_time(10.0)
+
+        assert cost.retry_after() == 20
+
+
+class TestAdmissionDependency:
+    """Tests for the admission route dependency."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        controller = make_controller(slots=1, queue_size=0, client_share=1)
+        monkeypatch.setattr(admission_module, "_controller", controller)
+        release = threading.Event()
+        entered = threading.Event()
+
+        app = FastAPI()
+
+        @app.get("/heavy", dependencies=[Depends(admission(BULK))])
+        def heavy(block: bool = False):
+            if block:
+                entered.set()
+                release.wait(5)
+            return {"ok": True}
+
+        @app.post("/maybe", dependencies=[Depends(admission(BULK, applies=lambda b: b["big"]))])
+        def maybe(body: dict):
+            return body
+
+        @app.get("/cheap")
+        def cheap():
+            return {"ok": True}
+
+        client = TestClient(app)
+        client.release = release
+        client.entered = entered
+        return client
+
+    def _hold_slot(self, client):
+        thread = threading.Thread(
+            target=client.get, args=("/heavy",), kwargs={"params": {"block": True}}
+        )
+        thread.start()
+        assert client.entered.wait(5)
+        return thread
+
+    def test_admits_and_releases(self, client):
+        assert client.get("/heavy").status_code == 200
+        assert client.get("/heavy").status_code == 200
+
+    def test_busy_class_gets_429_cheap_routes_do_not(self, client):
+        thread = self._hold_slot(client)
+        try:
+            response = client.get("/heavy", headers={"X-Real-IP": "10.0.0.2"})
+            assert response.status_code == 429
+            assert "retry-after" in response.headers
+            assert client.get("/cheap").status_code == 200
+        finally:
+            client.release.set()
+            thread.join()
+
+    def test_applies_predicate(self, client):
+        thread = self._hold_slot(client)
+        try:
+            assert client.post("/maybe", json={"big": False}).status_code == 200
+            assert client.post(
+                "/maybe", json={"big": True}, headers={"X-Real-IP": "10.0.0.2"}
+            ).status_code == 429
+        finally:
+            client.release.set()
+            thread.join()
+
+    def test_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(admission_module.settings, "admission_enabled", False)
+        thread = self._hold_slot(client)
+        try:
+            assert client.get("/heavy").status_code == 200
+        finally:
+            client.release.set()
+            thread.join()
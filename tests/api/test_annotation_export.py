@@ -0,0 +1,382 @@
+"""
+Tests for the GO annotation export layer.
+
+Tests cover:
+- GPI rows against the output of the per-feature make_gpi scripts
+- GAF rows against the output of the lookup-dict dump_gene_association
+- GAF queries restricted to the exported features
+- GAF 2.2 qualifier column
+- Fixed number of queries regardless of the number of features
+"""
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from cgd.utils.annotation_export import (
+    GPI_FEATURE_TYPES,
+    gaf_qualifier,
+    get_go_ref_qualifiers,
+    get_go_ref_support,
+    get_search_feature_types,
+    iter_export_features,
+    iter_gaf_rows,
+    iter_gpi_rows,
+)
+
+SEQ_SOURCE = "C. albicans SC5314 Assembly 22"
+TAXON_ID = 237561
+
+SCHEMA = """
+CREATE TABLE organism (organism_no INTEGER PRIMARY KEY, organism_name TEXT, taxon_id INTEGER);
+CREATE TABLE genome_version (
+    genome_version_no INTEGER PRIMARY KEY, genome_version TEXT, is_ver_current TEXT
+);
+CREATE TABLE feature (
+    feature_no INTEGER PRIMARY KEY, organism_no INTEGER, feature_name TEXT, dbxref_id TEXT,
+    feature_type TEXT, gene_name TEXT, headline TEXT
+);
+CREATE TABLE seq (
+    seq_no INTEGER PRIMARY KEY, feature_no INTEGER, genome_version_no INTEGER,
+    source TEXT, is_seq_current TEXT
+);
+CREATE TABLE feat_location (
+    feature_no INTEGER, root_seq_no INTEGER, is_loc_current TEXT
+);
+CREATE TABLE feat_property (feature_no INTEGER, property_type TEXT, property_value TEXT);
+CREATE TABLE alias (alias_no INTEGER PRIMARY KEY, alias_name TEXT);
+CREATE TABLE feat_alias (feature_no INTEGER, alias_no INTEGER);
+CREATE TABLE dbxref (
+    dbxref_no INTEGER PRIMARY KEY, source TEXT, dbxref_type TEXT, dbxref_id TEXT
+);
+CREATE TABLE dbxref_feat (dbxref_no INTEGER, feature_no INTEGER);
+CREATE TABLE web_metadata (
+    application_name TEXT, tab_name TEXT, col_name TEXT, col_value TEXT
+);
+CREATE TABLE go (go_no INTEGER PRIMARY KEY, goid INTEGER, go_aspect TEXT);
+CREATE TABLE go_path (ancestor_go_no INTEGER, child_go_no INTEGER);
+CREATE TABLE reference (reference_no INTEGER PRIMARY KEY, dbxref_id TEXT, pubmed INTEGER);
+CREATE TABLE go_annotation (
+    go_annotation_no INTEGER PRIMARY KEY, go_no INTEGER, feature_no INTEGER,
+    go_evidence TEXT, source TEXT
+);
+CREATE TABLE go_ref (
+    go_ref_no INTEGER PRIMARY KEY, reference_no INTEGER, go_annotation_no INTEGER,
+    has_qualifier TEXT, date_created TIMESTAMP
+);
+CREATE TABLE go_qualifier (go_ref_no INTEGER, qualifier TEXT);
+CREATE TABLE goref_dbxref (go_ref_no INTEGER, dbxref_no INTEGER);
+"""
+
+# feature_no: (name, dbxref_id, type, gene, headline), inserted in name order
+FEATURES = {
+    10: ("C1_00010W_A", "CAL0000001", "ORF", "ACT1", "<i>Actin</i>; cytoskeleton"),
+    11: ("C1_00020C_A", "CAL0000002", "ORF", None, "Protein of <b>unknown</b> function"),
+    12: ("C1_00030W_A", "CAL0000003", "tRNA", None, "tRNA-Ala ; anticodon AGC"),
+    13: ("C1_00040W_A", "CAL0000004", "ORF", "DUB1", "Dubious open reading frame"),
+    14: ("C1_00050W_A", "CAL0000005", "pseudogene", None, None),
+    15: ("C1_00060W_A", "CAL0000006", "long_terminal_repeat", None, "LTR"),
+    16: ("C1_00070W_A", None, "ORF", "NOID1", "No dbxref"),
+    17: ("C2_00010C_A", "CAL0000007", "ORF", "HWP1", "Hyphal wall protein"),
+    # not on the current assembly
+    18: ("C1_00080W_A", "CAL0000008", "ORF", "OLD1", "Old assembly only"),
+}
+
+# feature_no: aliases, in name order
+ALIASES = {
+    10: ["CaACT1", "orf19.5007"],
+    11: ["orf19.5008"],
+    13: ["orf19.5009"],
+    17: ["HYR2", "orf19.1321"],
+    18: ["orf19.9999"],
+}
+
+# feature_no: UniProt IDs (and one non-UniProt dbxref)
+DBXREFS = {
+    10: [("UniProtKB", "P14235")],
+    11: [("SwissProt", "Q59X11"), ("UniProtKB", "Q59X12")],
+    12: [("UniProtKB", "T00001")],
+    17: [("EntrezGene", "3648372")],
+}
+
+# go_no: (goid, aspect)
+GO_TERMS = {
+    1: (3779, "F"),       # actin binding
+    2: (7010, "P"),       # cytoskeleton organization
+    3: (5737, "C"),       # cytoplasm
+    4: (32991, "C"),      # protein-containing complex
+    5: (5885, "C"),       # Arp2/3 protein complex
+    6: (9277, "C"),       # fungal-type cell wall
+}
+
+# go_annotation_no: (go_no, feature_no, evidence, source)
+ANNOTATIONS = {
+    1: (1, 10, "IDA", "CGD"),
+    2: (2, 10, "IMP", "CGD"),
+    3: (5, 10, "IPI", "CGD"),
+    4: (3, 11, "IEA", "UniProt"),
+    5: (1, 13, "ISS", "CGD"),
+    6: (6, 17, "IDA", "CGD"),
+    7: (2, 16, "IMP", "CGD"),
+    8: (3, 17, "IDA", "CGD"),
+}
+
+# go_ref_no: (reference_no, go_annotation_no, has_qualifier, date_created)
+GO_REFS = {
+    1: (1, 1, "N", "2010-03-04 00:00:00"),
+    2: (2, 1, "Y", "2011-05-06 00:00:00"),
+    3: (1, 2, "N", "2012-07-08 00:00:00"),
+    4: (2, 3, "N", "2013-09-10 00:00:00"),
+    5: (3, 4, "N", "2014-11-12 00:00:00"),
+    6: (1, 5, "N", "2015-01-02 00:00:00"),
+    7: (2, 6, "Y", "2016-03-04 00:00:00"),
+    8: (1, 7, "N", "2017-05-06 00:00:00"),
+    9: (3, 8, "Y", "2018-07-08 00:00:00"),
+}
+
+QUALIFIERS = [(2, "contributes_to"), (7, "NOT"), (9, "colocalizes_with")]
+
+# go_ref_no: (source, dbxref_type, dbxref_id)
+SUPPORT = {
+    4: [("CGD", "Gene ID", "CAL0000009"), ("UniProt", "UniProtKB", "P31001")],
+    5: [("InterPro", "InterPro ID", "IPR004000")],
+    6: [("SGD", "Gene ID", "S000001855")],
+}
+
+DB_CODE_MAPPING = "CGD\tCGD\tGene ID\nUniProtKB\tUniProt\tUniProtKB\nSGD\tSGD\tGene ID\n"
+
+# Rows written for the fixture by the per-feature scripts/untested/cron/make_gpi.py
+CRON_MAKE_GPI_ROWS = """\
+CGD:CAL0000001\tC1_00010W_A\tActin\tACT1 | CaACT1 | orf19.5007\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000001\t\tUniProtKB:P14235\t
+CGD:CAL0000002\tC1_00020C_A\tProtein of <b>unknown</b> function\torf19.5008\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000002\t\tUniProtKB:Q59X11 | UniProtKB:Q59X12\t
+CGD:CAL0000003\tC1_00030W_A\ttRNA-Ala \t\tSO:0001263\tNCBITaxon:237561\t\tCGD:CAL0000003\t\t\t
+CGD:CAL0000004\tC1_00040W_A\tDubious open reading frame\tDUB1 | orf19.5009\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000004\t\t\t
+CGD:CAL0000005\tC1_00050W_A\t\t\tSO:0000336\tNCBITaxon:237561\t\tCGD:CAL0000005\t\t\t
+CGD:None\tC1_00070W_A\tNo dbxref\tNOID1\tSO:0001217\tNCBITaxon:237561\t\tCGD:None\t\t\t
+CGD:CAL0000007\tC2_00010C_A\tHyphal wall protein\tHWP1 | HYR2 | orf19.1321\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000007\t\t\t
+"""
+
+# Rows written for the fixture by scripts/untested/data/make_gpi.py
+DATA_MAKE_GPI_ROWS = """\
+CGD:CAL0000001\tC1_00010W_A\tActin\tACT1 | CaACT1 | orf19.5007\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000001\t\tUniProtKB:P14235\t
+CGD:CAL0000002\tC1_00020C_A\tProtein of unknown function\torf19.5008\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000002\t\tUniProtKB:Q59X11 | UniProtKB:Q59X12\t
+CGD:CAL0000003\tC1_00030W_A\ttRNA-Ala\t\tSO:0001263\tNCBITaxon:237561\t\tCGD:CAL0000003\t\t\t
+CGD:CAL0000004\tC1_00040W_A\tDubious open reading frame\tDUB1 | orf19.5009\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000004\t\t\t
+CGD:CAL0000005\tC1_00050W_A\t\t\tSO:0000336\tNCBITaxon:237561\t\tCGD:CAL0000005\t\t\t
+CGD:None\tC1_00070W_A\tNo dbxref\tNOID1\tSO:0001217\tNCBITaxon:237561\t\tCGD:None\t\t\t
+CGD:CAL0000007\tC2_00010C_A\tHyphal wall protein\tHWP1 | HYR2 | orf19.1321\tSO:0001217\tNCBITaxon:237561\t\tCGD:CAL0000007\t\t\t
+"""
+
+# Rows written for the fixture by the lookup-dict dump_gene_association.py (GAF 2.0)
+GAF_2_0_ROWS = """\
+CGD\tCAL0000001\tACT1\t\tGO:0003779\tCGD_REF:CAL0100001|PMID:1234567\tIDA\t\tF\t\tC1_00010W_A|CaACT1|orf19.5007\tgene_product\ttaxon:237561\t20100304\tCGD\t\t
+CGD\tCAL0000001\tACT1\tcontributes_to\tGO:0003779\tCGD_REF:CAL0100002\tIDA\t\tF\t\tC1_00010W_A|CaACT1|orf19.5007\tgene_product\ttaxon:237561\t20110506\tCGD\t\t
+CGD\tCAL0000001\tACT1\t\tGO:0007010\tCGD_REF:CAL0100001|PMID:1234567\tIMP\t\tP\t\tC1_00010W_A|CaACT1|orf19.5007\tgene_product\ttaxon:237561\t20120708\tCGD\t\t
+CGD\tCAL0000001\tACT1\t\tGO:0005885\tCGD_REF:CAL0100002\tIPI\tCGD:CAL0000009|UniProtKB:P31001\tC\t\tC1_00010W_A|CaACT1|orf19.5007\tgene_product\ttaxon:237561\t20130910\tCGD\t\t
+CGD\tCAL0000002\tC1_00020C_A\t\tGO:0005737\tCGD_REF:CAL0121033|PMID:7654321\tIEA\tInterPro:IPR004000\tC\t\tC1_00020C_A|orf19.5008\tgene_product\ttaxon:237561\t20141112\tUniProt\t\t
+CGD\tCAL0000007\tHWP1\tNOT\tGO:0009277\tCGD_REF:CAL0100002\tIDA\t\tC\t\tC2_00010C_A|HYR2|orf19.1321\tgene_product\ttaxon:237561\t20160304\tCGD\t\t
+CGD\tCAL0000007\tHWP1\tcolocalizes_with\tGO:0005737\tCGD_REF:CAL0121033|PMID:7654321\tIDA\t\tC\t\tC2_00010C_A|HYR2|orf19.1321\tgene_product\ttaxon:237561\t20180708\tCGD\t\t
+"""
+
+
+def build_database(path) -> None:
+    """Write the fixture tables to the SQLite file at ``path``."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO organism VALUES (1, 'Candida albicans SC5314', ?)", (TAXON_ID,))
+    conn.executemany("INSERT INTO genome_version VALUES (?, ?, ?)", [
+        (1, "s01-m01-r01", "Y"), (2, "s01-m01-r00", "N"),
+    ])
+    conn.executemany("INSERT INTO seq VALUES (?, ?, ?, ?, ?)", [
+        (1, 1, 1, SEQ_SOURCE, "Y"),
+        (2, 2, 1, SEQ_SOURCE, "Y"),
+        (9, 1, 2, "C. albicans SC5314 Assembly 21", "N"),
+    ])
+    conn.executemany("INSERT INTO feature VALUES (?, 1, ?, ?, ?, ?, ?)", [
+        (no, *values) for no, values in FEATURES.items()
+    ])
+    conn.executemany("INSERT INTO feat_location VALUES (?, ?, 'Y')", [
+        (no, 2 if FEATURES[no][0].startswith("C2") else 9 if no == 18 else 1)
+        for no in FEATURES
+    ])
+    conn.execute("INSERT INTO feat_property VALUES (13, 'feature_qualifier', 'Dubious')")
+    alias_no = 0
+    for feature_no, names in ALIASES.items():
+        for name in names:
+            alias_no += 1
+            conn.execute("INSERT INTO alias VALUES (?, ?)", (alias_no, name))
+            conn.execute("INSERT INTO feat_alias VALUES (?, ?)", (feature_no, alias_no))
+    dbxref_no = 0
+    for feature_no, dbxrefs in DBXREFS.items():
+        for dbxref_type, dbxref_id in dbxrefs:
+            dbxref_no += 1
+            conn.execute(
+                "INSERT INTO dbxref VALUES (?, 'UniProt', ?, ?)", (dbxref_no, dbxref_type, dbxref_id)
+            )
+            conn.execute("INSERT INTO dbxref_feat VALUES (?, ?)", (dbxref_no, feature_no))
+    for go_ref_no, entries in SUPPORT.items():
+        for source, dbxref_type, dbxref_id in entries:
+            dbxref_no += 1
+            conn.execute(
+                "INSERT INTO dbxref VALUES (?, ?, ?, ?)", (dbxref_no, source, dbxref_type, dbxref_id)
+            )
+            conn.execute("INSERT INTO goref_dbxref VALUES (?, ?)", (go_ref_no, dbxref_no))
+    conn.executemany(
+        "INSERT INTO web_metadata VALUES ('Chromosomal Feature Search', 'FEATURE', 'FEATURE_TYPE', ?)",
+        [("ORF",), ("tRNA",), ("pseudogene",)],
+    )
+    conn.executemany("INSERT INTO go VALUES (?, ?, ?)", [
+        (no, *values) for no, values in GO_TERMS.items()
+    ])
+    conn.execute("INSERT INTO go_path VALUES (4, 5)")
+    conn.executemany("INSERT INTO reference VALUES (?, ?, ?)", [
+        (1, "CAL0100001", 1234567), (2, "CAL0100002", None), (3, "CAL0121033", 7654321),
+    ])
+    conn.executemany("INSERT INTO go_annotation VALUES (?, ?, ?, ?, ?)", [
+        (no, *values) for no, values in ANNOTATIONS.items()
+    ])
+    conn.executemany("INSERT INTO go_ref VALUES (?, ?, ?, ?, ?)", [
+        (no, *values) for no, values in GO_REFS.items()
+    ])
+    conn.executemany("INSERT INTO go_qualifier VALUES (?, ?)", QUALIFIERS)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def session(tmp_path):
+    """Session whose connection sees the fixture tables as MULTI.*"""
+    db_path = tmp_path / "multi.db"
+    build_database(db_path)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'main.db'}",
+        connect_args={"detect_types": sqlite3.PARSE_DECLTYPES},
+    )
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE '{db_path}' AS MULTI")
+
+    with sessionmaker(bind=engine)() as db:
+        yield db
+    engine.dispose()
+
+
+def rows(block: str) -> list[list[str]]:
+    return [line.split("\t") for line in block.splitlines()]
+
+
+def gpi_rows(session) -> list[list[str]]:
+    features = iter_export_features(session, SEQ_SOURCE, GPI_FEATURE_TYPES, taxon_id=TAXON_ID)
+    return list(iter_gpi_rows(features))
+
+
+def gaf_rows(session) -> list[list[str]]:
+    db_code_map = {
+        f"{db.upper()}:{db_type.upper()}": code
+        for code, db, db_type in (line.split("\t") for line in DB_CODE_MAPPING.splitlines())
+    }
+    feature_types = get_search_feature_types(session)
+    features = {
+        feature.feature_no: feature
+        for feature in iter_export_features(
+            session, SEQ_SOURCE, feature_types, taxon_id=TAXON_ID,
+            exclude_deleted_and_dubious=True, with_uniprot=False,
+        )
+    }
+    return list(iter_gaf_rows(
+        session, features, db_code_map, [SEQ_SOURCE], feature_types,
+        exclude_deleted_and_dubious=True,
+    ))
+
+
+@pytest.fixture
+def count_queries(session):
+    """Returns a function counting the statements a callable executes."""
+    def _count(operation):
+        statements = []
+        engine = session.get_bind()
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            result = operation()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return len(statements), result
+    return _count
+
+
+class TestGpi:
+    """Tests for the GPI rows."""
+
+    def test_matches_data_make_gpi(self, session):
+        assert gpi_rows(session) == rows(DATA_MAKE_GPI_ROWS)
+
+    def test_matches_cron_make_gpi_except_description(self, session):
+        old = rows(CRON_MAKE_GPI_ROWS)
+        new = gpi_rows(session)
+        assert [row[:2] + row[3:] for row in new] == [row[:2] + row[3:] for row in old]
+        # Descriptions are now stripped of every HTML tag and of whitespace
+        changed = {row[1]: (old_row[2], row[2]) for row, old_row in zip(new, old) if row[2] != old_row[2]}
+        assert changed == {
+            "C1_00020C_A": ("Protein of <b>unknown</b> function", "Protein of unknown function"),
+            "C1_00030W_A": ("tRNA-Ala ", "tRNA-Ala"),
+        }
+
+    def test_fixed_number_of_queries(self, session, count_queries):
+        count, result = count_queries(lambda: gpi_rows(session))
+        assert len(result) == 7
+        assert count == 3
+
+
+class TestGaf:
+    """Tests for the GAF rows."""
+
+    def test_matches_gaf_2_0_except_qualifier(self, session):
+        old = rows(GAF_2_0_ROWS)
+        new = gaf_rows(session)
+        assert [row[:3] + row[4:] for row in new] == [row[:3] + row[4:] for row in old]
+
+    def test_gaf_2_2_qualifiers(self, session):
+        assert [row[3] for row in gaf_rows(session)] == [
+            "enables",
+            "contributes_to",
+            "involved_in",
+            "part_of",
+            "located_in",
+            "NOT|located_in",
+            "colocalizes_with",
+        ]
+
+    def test_fixed_number_of_queries(self, session, count_queries):
+        count, result = count_queries(lambda: gaf_rows(session))
+        assert len(result) == 7
+        # feature types, aliases, features; qualifiers, support, complex terms, annotations
+        assert count == 7
+
+
+    def test_reads_only_exported_annotations(self, session):
+        scope = ([SEQ_SOURCE], ["ORF", "tRNA", "pseudogene"], True)
+
+        # go_ref 6 annotates Dubious feature 13
+        assert set(get_go_ref_support(session, {}, *scope)) == {4, 5}
+        assert set(get_go_ref_qualifiers(session, *scope)) == {2, 7, 9}
+        assert set(get_go_ref_support(session, {}, [SEQ_SOURCE], ["ORF"])) == {4, 5, 6}
+        assert get_go_ref_qualifiers(session, ["C. albicans SC5314 Assembly 21"], ["ORF"]) == {}
+
+
+class TestGafQualifier:
+    """Tests for the GAF 2.2 qualifier column."""
+
+    @pytest.mark.parametrize("qualifiers,aspect,in_complex,expected", [
+        ([], "F", False, "enables"),
+        ([], "P", False, "involved_in"),
+        ([], "C", False, "located_in"),
+        ([], "C", True, "part_of"),
+        (["NOT"], "F", False, "NOT|enables"),
+        (["contributes to"], "F", False, "contributes_to"),
+        (["NOT", "colocalizes_with"], "C", False, "NOT|colocalizes_with"),
+    ])
+    def test_relation(self, qualifiers, aspect, in_complex, expected):
+        assert gaf_qualifier(qualifiers, aspect, in_complex) == expected
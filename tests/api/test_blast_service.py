@@ -43,6 +43,7 @@ from cgd.core.blast_config import (
     extract_organism_tag_from_database,
     load_blast_clade_conf,
 )
+from cgd.api.services.relationship_map_service import build_relationship_map
 
 
 class TestBlastTaskSelection:
@@ -193,6 +194,24 @@ class TestOrf19Mapping:
 
         assert result is None
 
+    def test_maps_a22_feature_to_orf19(self):
+        """Should return the Assembly 21 child of an Assembly 22 feature."""
+        relationship_map = build_relationship_map([
+            (1, "C1_00010W_A", 11, "orf19.6115", "ORF", "Assembly 21 Primary Allele", 3),
+        ])
+
+        with patch(
+            "cgd.api.services.blast_service.get_relationship_map",
+            return_value=relationship_map,
+        ):
+            result = _map_to_orf19_id(
+                db=MagicMock(),
+                feature_name="c1_00010w_a",
+                organism_tag="C_albicans_SC5314_A22"
+            )
+
+        assert result == "orf19.6115"
+
 
 class TestBlastOrganismConfig:
     """Tests for organism configuration."""
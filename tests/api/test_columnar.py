@@ -0,0 +1,231 @@
+"""
+Tests for the columnar response format.
+
+Tests cover:
+- Column transposition and dictionary encoding
+- Tables read from model attributes, and decoding back to rows
+- Format selection by query parameter and Accept header, with Vary: Accept
+- orjson rendering of nested models
+- Columnar feature search and GO Term Finder payloads
+"""
+import orjson
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from cgd.api.services.feature_search_service import (
+    FEATURE_COLUMNS,
+    QuerySummary,
+    _FeatureMatches,
+    search_features_columnar,
+)
+from cgd.api.services.go_term_finder_service import columnar_go_term_finder_response
+from cgd.core.columnar import (
+    COLUMNAR_MEDIA_TYPE,
+    ColumnarResponse,
+    columnar_requested,
+    decode_columns,
+    encode_columns,
+    encode_objects,
+)
+from cgd.core.http_compression import CompressionMiddleware
+from cgd.schemas.feature_search_schema import FeatureSearchRequest, GoTermBrief
+from cgd.schemas.go_term_finder_schema import (
+    EnrichedGoTerm,
+    GeneHit,
+    GoTermFinderResponse,
+    GoTermFinderResult,
+)
+from cgd.schemas.search_schema import TextSearchResult
+
+
+class TestEncodeColumns:
+    """Tests for encode_columns and encode_objects."""
+
+    def test_transposes_rows(self):
+        table = encode_columns([(1, "ACT1"), (2, "ALS1")], ("id", "name"))
+
+        assert table["fields"] == ["id", "name"]
+        assert table["row_count"] == 2
+        assert table["columns"] == {"id": [1, 2], "name": ["ACT1", "ALS1"]}
+        assert table["dictionaries"] == {}
+
+    def test_dictionary_encoding_keeps_nulls(self):
+        rows = [(1, "ORF"), (2, "tRNA"), (3, "ORF"), (4, None)]
+        table = encode_columns(rows, ("id", "type"), dictionary=("type",))
+
+        assert table["columns"]["type"] == [0, 1, 0, None]
+        assert table["dictionaries"] == {"type": ["ORF", "tRNA"]}
+        assert decode_columns(table)[3] == {"id": 4, "type": None}
+
+    def test_empty(self):
+        table = encode_columns([], ("id", "type"), dictionary=("type",))
+
+        assert table["row_count"] == 0
+        assert table["columns"] == {"id": [], "type": []}
+        assert decode_columns(table) == []
+
+    def test_encode_objects_round_trip(self):
+        results = [
+            TextSearchResult(category="genes", id="1", name="ACT1", organism="C. albicans"),
+            TextSearchResult(category="genes", id="2", name="ALS1"),
+        ]
+        table = encode_objects(results, ("id", "name", "organism"), dictionary=("organism",))
+
+        assert decode_columns(table) == [
+            {"id": "1", "name": "ACT1", "organism": "C. albicans"},
+            {"id": "2", "name": "ALS1", "organism": None},
+        ]
+
+    def test_encode_objects_single_field(self):
+        table = encode_objects([GoTermBrief(goid="GO:0000001", term="t")], ("goid",))
+        assert table["columns"] == {"goid": ["GO:0000001"]}
+
+
+class TestColumnarRequested:
+    """Tests for format selection."""
+
+    @staticmethod
+    def client():
+        app = FastAPI()
+
+        @app.get("/items")
+        def items(columnar: bool = Depends(columnar_requested)):
+            return {"columnar": columnar}
+
+        @app.get("/rows")
+        def rows(columnar: bool = Depends(columnar_requested)):
+            rows = [(n,) for n in range(200)]
+            if columnar:
+                return ColumnarResponse({"rows": encode_columns(rows, ["feature_id"])})
+            return {"rows": [{"feature_id": n} for n, in rows]}
+
+        app.add_middleware(CompressionMiddleware, min_size=0)
+        return TestClient(app)
+
+    def test_default_json(self):
+        assert self.client().get("/items").json() == {"columnar": False}
+
+    def test_query_parameter(self):
+        client = self.client()
+        assert client.get("/items?format=columnar").json() == {"columnar": True}
+        assert client.get("/items?format=json").json() == {"columnar": False}
+        assert client.get("/items?format=csv").status_code == 422
+
+    def test_accept_header(self):
+        response = self.client().get("/items", headers={"Accept": COLUMNAR_MEDIA_TYPE})
+        assert response.json() == {"columnar": True}
+
+    def test_vary_accept_on_both_formats(self):
+        client = self.client()
+        plain = {"Accept-Encoding": "identity"}
+
+        assert client.get("/rows", headers=plain).headers["vary"] == "Accept"
+        columnar = client.get("/rows", headers={**plain, "Accept": COLUMNAR_MEDIA_TYPE})
+        assert columnar.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+        assert columnar.headers["vary"] == "Accept"
+
+    def test_vary_merged_with_accept_encoding(self):
+        client = self.client()
+        gzip = {"Accept-Encoding": "gzip"}
+
+        for headers in (gzip, {**gzip, "Accept": COLUMNAR_MEDIA_TYPE}):
+            response = client.get("/rows", headers=headers)
+            assert response.headers["content-encoding"] == "gzip"
+            assert response.headers["vary"] == "Accept, Accept-Encoding"
+
+
+class TestColumnarResponse:
+    """Tests for ColumnarResponse rendering."""
+
+    def test_renders_nested_models(self):
+        response = ColumnarResponse({"terms": [GoTermBrief(goid="GO:0000001", term="t")]})
+
+        assert response.media_type == COLUMNAR_MEDIA_TYPE
+        assert orjson.loads(response.body) == {"terms": [{"goid": "GO:0000001", "term": "t"}]}
+
+
+class TestSearchFeaturesColumnar:
+    """Tests for search_features_columnar."""
+
+    def test_builds_feature_table(self):
+        summary = QuerySummary(
+            organism_name="Candida albicans SC5314", feature_types=["ORF"], total_results=2
+        )
+        matches = _FeatureMatches(summary, [1, 2], True, False, {})
+        rows = [
+            (1, "orf19.1", "ALS1", "ORF", "Verified", "Adhesin",
+             "Ca22chr1A", "W", 100, 400, [], [], []),
+            (2, "orf19.2", None, "ORF", None, None,
+             "Ca22chr1A", "C", 900, 600, [], [], []),
+        ]
+        request = FeatureSearchRequest(organism="C_albicans_SC5314", feature_types=["ORF"])
+
+        with patch(
+            "cgd.api.services.feature_search_service._find_features", return_value=matches
+        ), patch(
+            "cgd.api.services.feature_search_service._get_feature_rows", return_value=rows
+        ):
+            result = search_features_columnar(MagicMock(), request)
+
+        assert result["success"] is True
+        assert result["total_count"] == 2
+        assert result["show_position"] is True
+        assert result["features"]["fields"] == list(FEATURE_COLUMNS)
+        assert result["features"]["dictionaries"]["chromosome"] == ["Ca22chr1A"]
+        assert result["features"]["columns"]["strand"] == [0, 1]
+        assert decode_columns(result["features"])[1]["orf"] == "orf19.2"
+
+    def test_returns_errors_as_json(self):
+        request = FeatureSearchRequest(organism="", feature_types=["ORF"])
+
+        result = search_features_columnar(MagicMock(), request)
+
+        assert result["success"] is False
+        assert "Organism is required" in result["error"]
+
+
+class TestColumnarGoTermFinderResponse:
+    """Tests for columnar_go_term_finder_response."""
+
+    @staticmethod
+    def term(go_no, aspect, genes):
+        return EnrichedGoTerm(
+            go_no=go_no, goid=f"GO:{go_no:07d}", go_term=f"term {go_no}",
+            go_aspect=aspect, aspect_name=aspect, query_count=len(genes), query_total=10,
+            background_count=20, background_total=100, query_frequency=10.0,
+            background_frequency=20.0, fold_enrichment=0.5, p_value=0.001,
+            genes=[
+                GeneHit(feature_no=n, systematic_name=f"orf19.{n}", evidence_codes=["IDA"])
+                for n in genes
+            ],
+        )
+
+    def test_flattens_terms_and_hits(self):
+        result = GoTermFinderResult(
+            query_genes_submitted=3, query_genes_found=3, query_genes_with_go=3,
+            background_size=100, background_type="default", ontology_filter="all",
+            p_value_cutoff=0.01, correction_method="none",
+            process_terms=[self.term(1, "P", [10, 11])],
+            component_terms=[self.term(2, "C", [12])],
+            total_enriched_terms=2,
+        )
+        payload = columnar_go_term_finder_response(
+            GoTermFinderResponse(success=True, result=result)
+        )
+
+        assert payload["success"] is True
+        assert "process_terms" not in payload["result"]
+        assert payload["result"]["total_enriched_terms"] == 2
+        terms = decode_columns(payload["result"]["terms"])
+        assert [t["go_no"] for t in terms] == [1, 2]
+        assert payload["result"]["terms"]["dictionaries"]["go_aspect"] == ["P", "C"]
+        hits = decode_columns(payload["result"]["gene_hits"])
+        assert [(h["term"], h["feature_no"]) for h in hits] == [(0, 10), (0, 11), (1, 12)]
+
+    def test_error_response(self):
+        payload = columnar_go_term_finder_response(
+            GoTermFinderResponse(success=False, error="No valid genes found in the database")
+        )
+        assert payload["result"] is None
+        assert payload["error"] == "No valid genes found in the database"
@@ -0,0 +1,290 @@
+"""
+Tests for CV Tree Service.
+
+Tests cover:
+- Building trees from term, relationship and count rows
+- Loading observable and literature topic trees with their counts
+- Tree reuse, version checks and invalidation
+- Pre-serialized tree responses
+"""
+from unittest.mock import patch
+
+import pytest
+from starlette.requests import Request
+
+from cgd.api.services import cv_tree_service
+from cgd.api.services.cv_tree_service import (
+    CvTreeCache,
+    build_cv_tree,
+    cv_tree_response,
+    get_cv_tree,
+    invalidate_cv_tree,
+)
+from cgd.api.services.curation.phenotype_curation_service import cv_term_tree
+from cgd.api.services.literature_topic_service import literature_topic_tree
+from cgd.api.services.phenotype_service import observable_tree
+from cgd.core.settings import settings
+from cgd.models.models import (
+    Cv,
+    CvTerm,
+    CvtermRelationship,
+    PhenoAnnotation,
+    Phenotype,
+    RefProperty,
+)
+from tests.sqlite_schema import sqlite_session
+
+
+# cv_term_no, term_name
+TERMS = [
+    (1, "viability"),
+    (2, "Colony morphology"),
+    (3, "filamentous growth"),
+    (4, "chlamydospore formation"),
+]
+
+# parent cv_term_no, child cv_term_no
+RELATIONSHIPS = [(2, 3), (2, 4), (99, 1)]
+
+
+def make_request(accept_encoding=""):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestBuildCvTree:
+    """Tests for build_cv_tree."""
+
+    def test_roots_and_children(self):
+        tree = build_cv_tree("observable", TERMS, RELATIONSHIPS)
+
+        assert tree.roots == [1, 2]
+        assert tree.children == {2: [3, 4]}
+
+    def test_counts_by_term_name(self):
+        tree = build_cv_tree("observable", TERMS, RELATIONSHIPS, [("viability", 7)])
+
+        assert tree.count(1) == 7
+        assert tree.count(2) == 0
+
+    def test_sorted_terms(self):
+        tree = build_cv_tree("observable", TERMS, RELATIONSHIPS)
+
+        assert tree.sorted_terms(tree.terms) == [2, 4, 3, 1]
+        assert tree.sorted_terms(tree.terms, key=str.lower) == [4, 2, 3, 1]
+
+    def test_curation_tree(self):
+        tree = build_cv_tree("observable", TERMS, RELATIONSHIPS)
+
+        assert cv_term_tree(tree) == [
+            {"term": "Colony morphology", "depth": 0, "children": [
+                {"term": "chlamydospore formation", "depth": 1, "children": []},
+                {"term": "filamentous growth", "depth": 1, "children": []},
+            ]},
+            {"term": "viability", "depth": 0, "children": []},
+        ]
+        assert cv_term_tree(build_cv_tree("qualifier", [], [])) == []
+
+
+class TestLoadCvTree:
+    """Tests for loading trees from the database."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        session = sqlite_session(
+            tmp_path / "cv_tree.db",
+            Cv, CvTerm, CvtermRelationship, Phenotype, PhenoAnnotation, RefProperty,
+        )
+        session.add(Cv(cv_no=1, cv_name="observable"))
+        session.add(Cv(cv_no=2, cv_name="literature_topic"))
+        for cv_term_no, term_name in TERMS:
+            session.add(CvTerm(cv_term_no=cv_term_no, cv_no=1, term_name=term_name))
+        session.add(CvTerm(cv_term_no=10, cv_no=2, term_name="Genome-wide Analysis"))
+        session.add(CvTerm(cv_term_no=11, cv_no=2, term_name="Gene Expression"))
+        for n, (parent_no, child_no) in enumerate(RELATIONSHIPS[:2], start=1):
+            session.add(CvtermRelationship(
+                cvterm_relationship_no=n, parent_cv_term_no=parent_no,
+                child_cv_term_no=child_no, relationship_type="is_a",
+            ))
+        for phenotype_no, observable in [(1, "viability"), (2, "filamentous growth")]:
+            session.add(Phenotype(
+                phenotype_no=phenotype_no, source="CGD", experiment_type="classical genetics",
+                mutant_type="null", observable=observable,
+            ))
+        for n, phenotype_no in enumerate([1, 1, 2], start=1):
+            session.add(PhenoAnnotation(pheno_annotation_no=n, feature_no=n, phenotype_no=phenotype_no))
+        for n, (reference_no, topic) in enumerate(
+            [(1, "Gene Expression"), (2, "Gene Expression"), (1, "Gene Expression"),
+             (3, "Genome-wide Analysis"), (3, "Not yet curated")],
+            start=1,
+        ):
+            session.add(RefProperty(
+                ref_property_no=n, reference_no=reference_no, source="CGD" if n != 3 else "SGD",
+                property_type="literature_topic", property_value=topic,
+            ))
+        session.commit()
+        yield session
+        session.close()
+
+    def test_observable_tree(self, db):
+        tree = get_cv_tree(db, "Observable")
+
+        assert tree.cv_name == "observable"
+        assert tree.version == (1, 4, 4, 2, 2, 3, 3)
+        assert tree.roots == [1, 2]
+        assert tree.counts == {"filamentous growth": 1, "viability": 2}
+
+        response = observable_tree(tree)
+        assert [node.term for node in response.tree] == ["Colony morphology", "viability"]
+        assert response.tree[1].count == 2
+        assert [(c.term, c.count) for c in response.tree[0].children] == [
+            ("chlamydospore formation", 0), ("filamentous growth", 1),
+        ]
+
+    def test_literature_topic_tree(self, db):
+        tree = get_cv_tree(db, "literature_topic")
+
+        # References per topic; values outside the CV are not counted
+        assert tree.counts == {"Gene Expression": 2, "Genome-wide Analysis": 1}
+        response = literature_topic_tree(tree)
+        assert [(node.term, node.count) for node in response.tree] == [
+            ("Gene Expression", 2), ("Genome-wide Analysis", 1),
+        ]
+
+    def test_counts_only_cv_terms(self, db):
+        db.add(Phenotype(
+            phenotype_no=3, source="CGD", experiment_type="classical genetics",
+            mutant_type="null", observable="retired observable",
+        ))
+        db.add(PhenoAnnotation(pheno_annotation_no=4, feature_no=4, phenotype_no=3))
+        db.commit()
+
+        tree = get_cv_tree(db, "observable")
+        assert tree.counts == {"filamentous growth": 1, "viability": 2}
+
+    def test_observables_flat_without_cv(self, db):
+        db.query(CvTerm).filter(CvTerm.cv_no == 1).delete()
+        db.query(Cv).filter(Cv.cv_no == 1).delete()
+        db.commit()
+
+        tree = get_cv_tree(db, "observable")
+        assert tree.terms == {}
+        assert [(node.term, node.count) for node in observable_tree(tree).tree] == [
+            ("filamentous growth", 1), ("viability", 2),
+        ]
+        assert get_cv_tree(db, "observable") is tree
+
+    def test_observables_flat_with_empty_cv(self, db):
+        db.query(CvTerm).filter(CvTerm.cv_no == 1).delete()
+        db.commit()
+
+        response = observable_tree(get_cv_tree(db, "observable"))
+        assert [(node.term, node.count, node.children) for node in response.tree] == [
+            ("filamentous growth", 1, []), ("viability", 2, []),
+        ]
+
+    def test_unknown_cv(self, db):
+        tree = get_cv_tree(db, "no_such_cv")
+
+        assert tree.terms == {}
+        assert tree.version[0] is None
+        assert cv_tree_service._get_cache()._trees == {}
+
+    def test_reloads_after_invalidate(self, db):
+        tree = get_cv_tree(db, "observable")
+        assert get_cv_tree(db, "observable") is tree
+
+        db.add(PhenoAnnotation(pheno_annotation_no=4, feature_no=4, phenotype_no=2))
+        db.commit()
+        assert get_cv_tree(db, "observable") is tree
+        invalidate_cv_tree("observable")
+
+        refreshed = get_cv_tree(db, "observable")
+        assert refreshed is not tree
+        assert refreshed.counts["filamentous growth"] == 2
+
+
+class TestCvTreeCache:
+    """Tests for tree reuse and refresh."""
+
+    @pytest.fixture
+    def loads(self):
+        """Patch the version query and loader; yields (versions, loaded names)."""
+        versions = {"observable": (1, 4), "qualifier": (2, 3), "no_such_cv": (None, 0)}
+        loaded = []
+
+        def load(db, cv_name, version=()):
+            loaded.append(cv_name)
+            return build_cv_tree(cv_name, TERMS, [], version=version)
+
+        with patch.object(cv_tree_service, "_tree_version", lambda db, name: versions[name]), \
+                patch.object(cv_tree_service, "load_cv_tree", load):
+            yield versions, loaded
+
+    def test_checks_version_after_interval(self, loads):
+        versions, loaded = loads
+        now = [0.0]
+        cache = CvTreeCache(check_interval=60, clock=lambda: now[0])
+
+        first = cache.get(None, "observable")
+        now[0] = 61.0
+        assert cache.get(None, "OBSERVABLE") is first
+        assert loaded == ["observable"]
+
+        versions["observable"] = (1, 5)
+        now[0] = 90.0
+        assert cache.get(None, "observable") is first
+        now[0] = 122.0
+        assert cache.get(None, "observable").version == (1, 5)
+
+    def test_invalidate_one_cv(self, loads):
+        _, loaded = loads
+        cache = CvTreeCache(check_interval=60)
+
+        observable = cache.get(None, "observable")
+        qualifier = cache.get(None, "qualifier")
+        cache.invalidate("Observable")
+
+        assert cache.get(None, "qualifier") is qualifier
+        assert cache.get(None, "observable") is not observable
+        assert loaded == ["observable", "qualifier", "observable"]
+
+
+    def test_unknown_cv_not_kept(self, loads):
+        _, loaded = loads
+        cache = CvTreeCache(check_interval=60)
+
+        for cv_name in ("no_such_cv", "No_Such_CV"):
+            assert cache.get(None, cv_name).terms == {}
+        assert loaded == []
+        assert cache._trees == {}
+
+
+class TestCvTreeResponse:
+    """Tests for pre-serialized tree responses."""
+
+    def test_serializes_view_once(self, monkeypatch):
+        monkeypatch.setattr(settings, "compression_min_size", 0)
+        tree = build_cv_tree("observable", TERMS, RELATIONSHIPS, [("viability", 7)])
+        builds = []
+
+        def build(t):
+            builds.append(t)
+            return observable_tree(t)
+
+        first = cv_tree_response(make_request(), tree, "observable", build)
+        second = cv_tree_response(make_request("gzip"), tree, "observable", build)
+
+        assert len(builds) == 1
+        assert first.body == observable_tree(tree).model_dump_json(by_alias=True).encode()
+        assert first.media_type == "application/json"
+        assert second.headers.get("content-encoding") == "gzip"
+
+    def test_views_are_per_tree(self):
+        tree = build_cv_tree("observable", TERMS, RELATIONSHIPS)
+        cv_tree_response(make_request(), tree, "observable", observable_tree)
+
+        replaced = build_cv_tree("observable", TERMS[:1], [])
+        response = cv_tree_response(make_request(), replaced, "observable", observable_tree)
+
+        assert b"Colony morphology" not in response.body
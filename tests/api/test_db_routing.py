@@ -0,0 +1,144 @@
+"""
+Tests for per-workload engines and route-based session routing.
+
+Two SQLite files stand in for the primary database and the read replica;
+each holds a marker row naming the database.
+
+Tests cover:
+- Workload selection from route tags
+- One bounded pool per workload, replica used for read and analysis
+- get_db handing public, analysis, curation and auth routes a session on
+  the right database
+"""
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from cgd.db import engine as db_engine
+from cgd.db.deps import get_db, workload_for_tags
+from cgd.db.engine import (
+    ANALYSIS,
+    CURATION,
+    PRIMARY,
+    READ,
+    WORKLOADS,
+    create_session_factories,
+    create_workload_engines,
+)
+
+
+def _make_database(path, name):
+    url = f"sqlite:///{path}"
+    eng = create_engine(url)
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE marker (name TEXT)"))
+        conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+    eng.dispose()
+    return url
+
+
+@pytest.fixture
+def databases(tmp_path):
+    return (
+        _make_database(tmp_path / "primary.db", "primary"),
+        _make_database(tmp_path / "replica.db", "replica"),
+    )
+
+
+@pytest.fixture
+def engines(databases):
+    engines = create_workload_engines(*databases)
+    yield engines
+    for eng in engines.values():
+        eng.dispose()
+
+
+@pytest.fixture
+def client(engines, monkeypatch):
+    monkeypatch.setattr(db_engine, "session_factories", create_session_factories(engines))
+    app = FastAPI()
+
+    def which_database(db: Session = Depends(get_db)):
+        return {"database": db.execute(text("SELECT name FROM marker")).scalar()}
+
+    for prefix, tags in [
+        ("/api/locus", ["locus"]),
+        ("/api/go-term-finder", ["go-term-finder"]),
+        ("/api/curation/locus", ["curation-locus"]),
+        ("/api/curation/litreview", ["Literature Review Curation"]),
+        ("/api/auth", ["auth"]),
+    ]:
+        router = APIRouter(prefix=prefix, tags=tags)
+        router.add_api_route("/db", which_database)
+        app.include_router(router)
+    app.add_api_route("/untagged/db", which_database)
+    return TestClient(app)
+
+
+class TestWorkloadForTags:
+    """Tests for workload_for_tags."""
+
+    def test_public_routes_read(self):
+        assert workload_for_tags(["locus"]) == READ
+        assert workload_for_tags([]) == READ
+
+    def test_curation_routes(self):
+        assert workload_for_tags(["curation-go"]) == CURATION
+        assert workload_for_tags(["Literature Review Curation"]) == CURATION
+
+    def test_analysis_routes(self):
+        assert workload_for_tags(["feature-search"]) == ANALYSIS
+        assert workload_for_tags(["batch-download"]) == ANALYSIS
+
+    def test_auth_routes_primary(self):
+        assert workload_for_tags(["auth"]) == PRIMARY
+
+
+class TestWorkloadEngines:
+    """Tests for create_workload_engines."""
+
+    def test_separate_bounded_pools(self, engines):
+        assert set(engines) == set(WORKLOADS)
+        pools = {id(eng.pool) for eng in engines.values()}
+        assert len(pools) == len(WORKLOADS)
+        analysis_pool = engines[ANALYSIS].pool
+        assert analysis_pool.size() == 3
+        assert analysis_pool._max_overflow == 2
+
+    def test_replica_urls(self, engines, databases):
+        primary, replica = databases
+        assert str(engines[PRIMARY].url) == primary
+        assert str(engines[CURATION].url) == primary
+        assert str(engines[READ].url) == replica
+        assert str(engines[ANALYSIS].url) == replica
+
+    def test_without_replica(self, databases):
+        engines = create_workload_engines(databases[0])
+        try:
+            assert {str(eng.url) for eng in engines.values()} == {databases[0]}
+        finally:
+            for eng in engines.values():
+                eng.dispose()
+
+
+class TestGetDbRouting:
+    """Tests for get_db picking the engine by route tag."""
+
+    @pytest.mark.parametrize("path, database", [
+        ("/api/locus/db", "replica"),
+        ("/api/go-term-finder/db", "replica"),
+        ("/api/curation/locus/db", "primary"),
+        ("/api/curation/litreview/db", "primary"),
+        ("/api/auth/db", "primary"),
+        ("/untagged/db", "replica"),
+    ])
+    def test_route_database(self, client, path, database):
+        assert client.get(path).json() == {"database": database}
+
+    def test_sessions_returned_to_pool(self, client, engines):
+        client.get("/api/curation/locus/db")
+        client.get("/api/locus/db")
+        assert engines[CURATION].pool.checkedout() == 0
+        assert engines[READ].pool.checkedout() == 0
@@ -432,14 +432,27 @@ class TestFilterByChromosomes:
     def test_filters_by_chromosomes(self, mock_db):
         """Should filter features by chromosome."""
         mock_db.query.side_effect = [
-            MockQuery([(10,)]),  # Chr feature_no
-            MockQuery([(100,)]),  # Chr seq_no
-            MockQuery([(1,), (2,)]),  # Feature locations
+            MockQuery([(100, "Chr1", 5000, 1, "A22")]),  # Current root seqs
+            MockQuery([
+                (1, "CAL0001", None, "ORF", 100, 400, "W"),
+                (2, "CAL0002", None, "ORF", 900, 600, "C"),
+                (7, "CAL0007", None, "ORF", 1000, 1300, "W"),
+            ]),  # Root feature locations
         ]
 
         result, count = _filter_by_chromosomes(mock_db, {1, 2, 3}, ["Chr1"])
 
-        assert len(result) == 2
+        assert result == {1, 2}
+        assert count == 2
+
+    def test_unknown_chromosome(self, mock_db):
+        """Should return nothing when no chromosome has a current sequence."""
+        mock_db.query.side_effect = [MockQuery([])]
+
+        result, count = _filter_by_chromosomes(mock_db, {1, 2}, ["ChrX"])
+
+        assert result == set()
+        assert count == 0
 
 
 class TestFilterByIntrons:
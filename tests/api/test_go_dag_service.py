@@ -0,0 +1,281 @@
+"""
+Tests for GO DAG Service.
+
+Tests cover:
+- Adjacency arrays and relationship types
+- Ancestor/descendant walks, level limits and subgraphs
+- Direct and inherited gene counts, with Assembly 21 exclusions
+- Loading from GO, GO_PATH and GO_ANNOTATION tables
+- DAG reuse, version checks (including in-place updates), max age and
+  invalidation
+"""
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from cgd.api.services import go_dag_service
+from cgd.api.services.go_dag_service import GoDagCache, build_go_dag, get_go_dag
+from cgd.models.models import Feature, FeatRelationship, Go, GoAnnotation, GoPath
+from tests.sqlite_schema import sqlite_session
+
+
+# go_no, goid, go_term, go_aspect
+TERMS = [
+    (1, 5575, "cellular_component", "C"),
+    (2, 43226, "organelle", "C"),
+    (3, 43227, "membrane-bounded organelle", "C"),
+    (4, 43229, "intracellular organelle", "C"),
+    (5, 5634, "nucleus", "C"),
+    (6, 5730, "nucleolus", "C"),
+]
+
+# parent go_no, child go_no, relationship_type (GO_PATH generation 1)
+EDGES = [
+    (1, 2, "is a"),
+    (2, 3, "is a"),
+    (2, 4, "is a"),
+    # nucleus has two parents: a diamond below organelle
+    (3, 5, "is a"),
+    (4, 5, "is a"),
+    (5, 6, "part of"),
+    # Unknown terms and self-edges are ignored
+    (99, 5, "is a"),
+    (6, 6, "is a"),
+]
+
+# go_no, feature_no
+ANNOTATIONS = [
+    (5, 100),
+    (5, 100),
+    (6, 100),
+    (6, 101),
+    (3, 102),
+    (6, 103),  # Assembly 21 feature with an Assembly 22 equivalent
+    (99, 104),
+]
+
+
+@pytest.fixture
+def dag():
+    return build_go_dag(TERMS, EDGES, ANNOTATIONS, excluded_features=frozenset({103}))
+
+
+def goids(dag, levels):
+    return {int(dag.goid[i]): level for i, level in levels.items()}
+
+
+class TestBuildGoDag:
+    """Tests for build_go_dag."""
+
+    def test_terms(self, dag):
+        assert len(dag) == 6
+        term = dag.term(dag.index_of(5634))
+        assert (term.go_no, term.go_term, term.go_aspect) == (5, "nucleus", "C")
+        assert dag.index_of(9999999) is None
+
+    def test_parents_and_children(self, dag):
+        nucleus = dag.index_of(5634)
+        nucleolus = dag.index_of(5730)
+
+        assert sorted(int(dag.goid[p]) for p, _ in dag.parents(nucleus)) == [43227, 43229]
+        assert dag.children(nucleus) == [(nucleolus, "part_of")]
+        assert dag.parents(dag.index_of(5575)) == []
+        assert dag.children(nucleolus) == []
+
+    def test_ancestors_use_shortest_path(self, dag):
+        ancestors = dag.ancestors(dag.index_of(5730))
+        assert goids(dag, ancestors) == {5634: 1, 43227: 2, 43229: 2, 43226: 3, 5575: 4}
+
+    def test_level_limits(self, dag):
+        assert goids(dag, dag.ancestors(dag.index_of(5730), 2)) == {5634: 1, 43227: 2, 43229: 2}
+        assert goids(dag, dag.descendants(dag.index_of(5575), 1)) == {43226: 1}
+        assert dag.descendants(dag.index_of(5575), 0) == {}
+
+    def test_descendant_goids(self, dag):
+        assert dag.descendant_goids([43227]) == {5634, 5730}
+        assert dag.descendant_goids([43227, 43229, 1]) == {5634, 5730}
+        assert dag.descendant_goids([5730]) == set()
+
+    def test_subgraph(self, dag):
+        subgraph = dag.subgraph(dag.index_of(5634), ancestor_levels=1, descendant_levels=1)
+
+        assert goids(dag, subgraph.levels) == {5634: 0, 43227: -1, 43229: -1, 5730: 1}
+        assert sorted(
+            (int(dag.goid[p]), int(dag.goid[c]), rel) for p, c, rel in subgraph.edges
+        ) == [(5634, 5730, "part_of"), (43227, 5634, "is_a"), (43229, 5634, "is_a")]
+
+    def test_subgraph_keeps_nearest_nodes(self, dag):
+        subgraph = dag.subgraph(dag.index_of(5634), 5, 2, max_nodes=3)
+
+        levels = goids(dag, subgraph.levels)
+        assert len(levels) == 3
+        assert levels[5634] == 0
+        assert all(abs(level) == 1 for goid, level in levels.items() if goid != 5634)
+
+    def test_direct_gene_counts(self, dag):
+        counts = {int(dag.goid[i]): int(c) for i, c in enumerate(dag.direct_gene_count)}
+        assert counts == {5575: 0, 43226: 0, 43227: 1, 43229: 0, 5634: 1, 5730: 2}
+
+    def test_inherited_gene_counts(self, dag):
+        counts = {int(dag.goid[i]): int(c) for i, c in enumerate(dag.inherited_gene_count)}
+        # Feature 100 is counted once per term, though it reaches
+        # organelle through both parents of nucleus
+        assert counts == {5575: 3, 43226: 3, 43227: 3, 43229: 2, 5634: 2, 5730: 2}
+
+    def test_empty(self):
+        dag = build_go_dag([], [], [])
+        assert len(dag) == 0
+        assert dag.index_of(5634) is None
+        assert dag.descendant_goids([5634]) == set()
+
+
+class TestLoadGoDag:
+    """Tests for loading the DAG from the database."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        session = sqlite_session(
+            tmp_path / "go_dag.db", Go, GoPath, GoAnnotation, Feature, FeatRelationship,
+        )
+        for go_no, goid, go_term, go_aspect in TERMS:
+            session.add(Go(
+                go_no=go_no, goid=goid, go_term=go_term, go_aspect=go_aspect,
+                created_by="test",
+            ))
+        go_path_no = 0
+        for parent_no, child_no, relationship_type in EDGES[:6]:
+            go_path_no += 1
+            session.add(GoPath(
+                go_path_no=go_path_no, ancestor_go_no=parent_no, child_go_no=child_no,
+                generation=1, ancestor_path=str(parent_no), relationship_type=relationship_type,
+            ))
+        # A longer path is not an edge
+        session.add(GoPath(
+            go_path_no=go_path_no + 1, ancestor_go_no=1, child_go_no=6,
+            generation=4, ancestor_path="5::3::2::1",
+        ))
+        for feature_no in (100, 101, 102, 103, 110):
+            session.add(Feature(
+                feature_no=feature_no, organism_no=1, feature_name=f"orf19.{feature_no}",
+                dbxref_id=f"CAL{feature_no:07d}", feature_type="ORF", source="CGD",
+                created_by="test",
+            ))
+        # 103 is the Assembly 21 equivalent of 110
+        session.add(FeatRelationship(
+            feat_relationship_no=1, parent_feature_no=110, child_feature_no=103,
+            relationship_type="Assembly 21 Primary Allele", rank=3, created_by="test",
+        ))
+        for go_annotation_no, (go_no, feature_no) in enumerate(ANNOTATIONS[2:6], start=1):
+            session.add(GoAnnotation(
+                go_annotation_no=go_annotation_no, go_no=go_no, feature_no=feature_no,
+                go_evidence="IDA", annotation_type="manually curated", source="CGD",
+                created_by="test",
+            ))
+        session.commit()
+        yield session
+        session.close()
+
+    def test_loads_terms_edges_and_counts(self, db):
+        dag = get_go_dag(db)
+
+        assert len(dag) == 6
+        assert dag.version[:6] == (6, 6, 7, 7, 4, 4)
+        assert len(dag.parent_index) == 6
+        assert goids(dag, dag.ancestors(dag.index_of(5730))) == {
+            5634: 1, 43227: 2, 43229: 2, 43226: 3, 5575: 4,
+        }
+        nucleolus = dag.term(dag.index_of(5730))
+        assert (nucleolus.direct_gene_count, nucleolus.inherited_gene_count) == (2, 2)
+        assert dag.term(dag.index_of(5575)).inherited_gene_count == 3
+
+    def test_version_sees_in_place_updates(self, db):
+        version = go_dag_service._dag_version(db)
+
+        # As load_go.py applies an ontology refresh: no rows added or removed
+        db.query(Go).filter(Go.go_no == 6).update({"go_term": "nucleolar region"})
+        db.commit()
+        renamed = go_dag_service._dag_version(db)
+        assert renamed[:6] == version[:6]
+        assert renamed != version
+
+        db.query(GoPath).filter(GoPath.go_path_no == 6).update({"relationship_type": "is a"})
+        db.commit()
+        assert go_dag_service._dag_version(db) != renamed
+
+
+class TestGoDagCache:
+    """Tests for DAG reuse and refresh."""
+
+    @pytest.fixture
+    def loads(self):
+        """Patch the version query and loader; yields (versions, loaded versions)."""
+        versions = [(6, 6)]
+        loaded = []
+
+        def load(db, version=()):
+            loaded.append(version)
+            return build_go_dag(TERMS[:len(loaded)], [], [], version=version)
+
+        with patch.object(go_dag_service, "_dag_version", lambda db: versions[0]), \
+                patch.object(go_dag_service, "load_go_dag", load):
+            yield versions, loaded
+
+    def test_checks_version_after_interval(self, loads):
+        versions, loaded = loads
+        now = [0.0]
+        cache = GoDagCache(check_interval=60, max_age=3600, clock=lambda: now[0])
+
+        first = cache.get(None)
+        now[0] = 61.0
+        assert cache.get(None) is first
+        assert loaded == [(6, 6)]
+
+        versions[0] = (7, 7)
+        now[0] = 90.0
+        assert cache.get(None) is first
+        now[0] = 122.0
+        refreshed = cache.get(None)
+        assert refreshed.version == (7, 7)
+        assert len(refreshed) == 2
+
+    def test_rebuilds_after_max_age(self, loads):
+        _, loaded = loads
+        now = [0.0]
+        cache = GoDagCache(check_interval=60, max_age=300, clock=lambda: now[0])
+
+        cache.get(None)
+        now[0] = 240.0
+        cache.get(None)
+        now[0] = 300.0
+        cache.get(None)
+        assert len(loaded) == 2
+
+    def test_serves_current_dag_during_rebuild(self, loads):
+        versions, _ = loads
+        now = [0.0]
+        cache = GoDagCache(check_interval=60, max_age=3600, clock=lambda: now[0])
+        first = cache.get(None)
+
+        now[0] = 61.0
+        versions[0] = (7, 7)
+        cache._build_lock.acquire()
+        try:
+            result = []
+            reader = threading.Thread(target=lambda: result.append(cache.get(None)))
+            reader.start()
+            reader.join(timeout=5)
+            assert result == [first]
+        finally:
+            cache._build_lock.release()
+        assert cache.get(None).version == (7, 7)
+
+    def test_invalidate(self, loads):
+        _, loaded = loads
+
+        first = go_dag_service.get_go_dag(None)
+        assert go_dag_service.get_go_dag(None) is first
+        go_dag_service.invalidate_go_dag()
+
+        assert go_dag_service.get_go_dag(None) is not first
+        assert len(loaded) == 2
@@ -16,6 +16,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from fastapi import HTTPException
 
+from cgd.api.services.go_dag_service import build_go_dag
 from cgd.api.services.go_service import (
     _format_goid,
     _parse_goid,
@@ -210,10 +211,26 @@ class MockQuery:
     def first(self):
         return self._results[0] if self._results else None
 
+    def scalar(self):
+        return self._results[0] if self._results else None
+
     def all(self):
         return self._results
 
 
+def use_dag(gos, paths=(), annotations=()):
+    """Patch the GO DAG with one built from mock terms, paths and (go_no, feature_no) rows."""
+    dag = build_go_dag(
+        [(go.go_no, go.goid, go.go_term, go.go_aspect) for go in gos],
+        [
+            (path.ancestor_go_no, path.child_go_no, path.relationship_type)
+            for path in paths if path.generation == 1
+        ],
+        annotations,
+    )
+    return patch("cgd.api.services.go_service.get_go_dag", return_value=dag)
+
+
 @pytest.fixture
 def mock_db():
     """Create a mock database session."""
@@ -574,6 +591,7 @@ class TestGetGoTermInfo:
         assert result.term.go_term == "nucleus"
         assert result.term.go_aspect == "C"
         assert result.term.aspect_name == "Cellular Component"
+        assert result.term.go_definition == "A membrane-bounded organelle."
 
     def test_includes_synonyms(self, mock_db, sample_go):
         """Should include synonyms."""
@@ -676,40 +694,26 @@ class TestGetGoHierarchy:
 
     def test_raises_on_not_found(self, mock_db):
         """Should raise HTTPException when GO term not found."""
-        mock_db.query.return_value = MockQuery([])
-
-        with pytest.raises(HTTPException) as exc_info:
-            get_go_hierarchy(mock_db, "GO:9999999")
+        with use_dag([]):
+            with pytest.raises(HTTPException) as exc_info:
+                get_go_hierarchy(mock_db, "GO:9999999")
 
         assert exc_info.value.status_code == 404
 
     def test_returns_focus_node(self, mock_db, sample_go):
         """Should return focus node."""
-        mock_db.query.side_effect = [
-            MockQuery([sample_go]),  # Go query
-            MockQuery([]),  # Ancestor paths query
-            MockQuery([]),  # Descendant paths query
-            MockQuery([sample_go]),  # Go records query
-            MockQuery([]),  # Annotation counts query
-        ]
-
-        result = get_go_hierarchy(mock_db, "GO:0005634")
+        with use_dag([sample_go]):
+            result = get_go_hierarchy(mock_db, "GO:0005634")
 
         assert result.focus_term is not None
         assert result.focus_term.goid == "GO:0005634"
         assert result.focus_term.is_focus is True
+        mock_db.query.assert_not_called()
 
     def test_includes_nodes(self, mock_db, sample_go):
         """Should include nodes in response."""
-        mock_db.query.side_effect = [
-            MockQuery([sample_go]),  # Go query
-            MockQuery([]),  # Ancestor paths query
-            MockQuery([]),  # Descendant paths query
-            MockQuery([sample_go]),  # Go records query
-            MockQuery([]),  # Annotation counts query
-        ]
-
-        result = get_go_hierarchy(mock_db, "GO:0005634")
+        with use_dag([sample_go]):
+            result = get_go_hierarchy(mock_db, "GO:0005634")
 
         assert len(result.nodes) >= 1
 
@@ -718,87 +722,81 @@ class TestGetGoHierarchy:
         parent_go = MockGo(2, 5575, "cellular_component", "C")
         ancestor_path = MockGoPath(2, 1, 1, "is_a")
 
-        mock_db.query.side_effect = [
-            MockQuery([sample_go]),  # Go query
-            MockQuery([ancestor_path]),  # Ancestor paths query
-            MockQuery([]),  # Descendant paths query
-            MockQuery([sample_go, parent_go]),  # Go records query
-            MockQuery([]),  # Annotation counts query
-            MockQuery([ancestor_path]),  # Inter-node paths query
-        ]
-
-        result = get_go_hierarchy(mock_db, "GO:0005634")
+        with use_dag([sample_go, parent_go], [ancestor_path]):
+            result = get_go_hierarchy(mock_db, "GO:0005634")
 
         assert len(result.nodes) == 2
         assert result.can_go_up is True
+        assert {n.goid: n.level for n in result.nodes}["GO:0005575"] == -1
 
     def test_includes_edges(self, mock_db, sample_go):
         """Should include edges between nodes."""
         parent_go = MockGo(2, 5575, "cellular_component", "C")
-        ancestor_path = MockGoPath(2, 1, 1, "is_a")
-
-        mock_db.query.side_effect = [
-            MockQuery([sample_go]),  # Go query
-            MockQuery([ancestor_path]),  # Ancestor paths query
-            MockQuery([]),  # Descendant paths query
-            MockQuery([sample_go, parent_go]),  # Go records query
-            MockQuery([]),  # Annotation counts query
-            MockQuery([ancestor_path]),  # Inter-node paths query
-        ]
+        ancestor_path = MockGoPath(2, 1, 1, "part of")
 
-        result = get_go_hierarchy(mock_db, "GO:0005634")
+        with use_dag([sample_go, parent_go], [ancestor_path]):
+            result = get_go_hierarchy(mock_db, "GO:0005634")
 
-        assert len(result.edges) >= 1
+        assert len(result.edges) == 1
+        assert result.edges[0].source == "GO:0005575"
+        assert result.edges[0].target == "GO:0005634"
+        assert result.edges[0].relationship_type == "part_of"
 
     def test_includes_descendant_nodes(self, mock_db, sample_go):
         """Should include descendant nodes."""
         child_go = MockGo(3, 5640, "nucleolus", "C")
         descendant_path = MockGoPath(1, 3, 1, "is_a")
 
-        mock_db.query.side_effect = [
-            MockQuery([sample_go]),  # Go query
-            MockQuery([]),  # Ancestor paths query
-            MockQuery([descendant_path]),  # Descendant paths query
-            MockQuery([sample_go, child_go]),  # Go records query
-            MockQuery([]),  # Annotation counts query
-            MockQuery([descendant_path]),  # Inter-node paths query
-        ]
-
-        result = get_go_hierarchy(mock_db, "GO:0005634")
+        with use_dag([sample_go, child_go], [descendant_path]):
+            result = get_go_hierarchy(mock_db, "GO:0005634")
 
         assert len(result.nodes) == 2
         assert result.can_go_down is True
 
     def test_limits_max_nodes(self, mock_db, sample_go):
         """Should limit to max_nodes."""
-        # Create many ancestor paths
+        # Create many parent terms
         ancestor_paths = [MockGoPath(i, 1, 1) for i in range(2, 50)]
         ancestor_gos = [MockGo(i, 1000 + i, f"term_{i}") for i in range(2, 50)]
 
-        mock_db.query.side_effect = [
-            MockQuery([sample_go]),  # Go query
-            MockQuery(ancestor_paths),  # Ancestor paths query
-            MockQuery([]),  # Descendant paths query
-            MockQuery([sample_go] + ancestor_gos),  # Go records query
-            MockQuery([]),  # Annotation counts query
-            MockQuery([]),  # Inter-node paths query
-        ]
-
-        result = get_go_hierarchy(mock_db, "GO:0005634", max_nodes=10)
+        with use_dag([sample_go] + ancestor_gos, ancestor_paths):
+            result = get_go_hierarchy(mock_db, "GO:0005634", max_nodes=10)
 
         assert len(result.nodes) <= 10
+        assert result.focus_term.is_focus is True
+
+    def test_limits_levels(self, mock_db, sample_go):
+        """Should only include nodes within the requested generations."""
+        chain = [MockGo(i, 1000 + i, f"term_{i}") for i in range(2, 6)]
+        # 5 -> 4 -> 3 -> 2 -> sample_go (1)
+        paths = [MockGoPath(i + 1, i, 1) for i in range(1, 5)]
+
+        with use_dag([sample_go] + chain, paths):
+            result = get_go_hierarchy(mock_db, "GO:0005634", ancestor_levels=2)
+
+        assert sorted(n.level for n in result.nodes) == [-2, -1, 0]
+        assert len(result.edges) == 2
+
+    def test_gene_counts(self, mock_db, sample_go):
+        """Should report direct and inherited gene counts."""
+        child_go = MockGo(3, 5640, "nucleolus", "C")
+        descendant_path = MockGoPath(1, 3, 1, "is_a")
+        annotations = [(1, 100), (3, 100), (3, 101)]
+
+        with use_dag([sample_go, child_go], [descendant_path], annotations):
+            result = get_go_hierarchy(mock_db, "GO:0005634")
+
+        counts = {
+            n.goid: (n.direct_gene_count, n.inherited_gene_count, n.has_annotations)
+            for n in result.nodes
+        }
+        assert counts["GO:0005634"] == (1, 2, True)
+        assert counts["GO:0005640"] == (2, 2, True)
 
     def test_sets_navigation_flags(self, mock_db, sample_go):
         """Should set can_go_up and can_go_down flags."""
-        mock_db.query.side_effect = [
-            MockQuery([sample_go]),  # Go query
-            MockQuery([]),  # Ancestor paths query
-            MockQuery([]),  # Descendant paths query
-            MockQuery([sample_go]),  # Go records query
-            MockQuery([]),  # Annotation counts query
-        ]
-
-        result = get_go_hierarchy(mock_db, "GO:0005634")
+        with use_dag([sample_go]):
+            result = get_go_hierarchy(mock_db, "GO:0005634")
 
         assert result.can_go_up is False
         assert result.can_go_down is False
@@ -0,0 +1,255 @@
+"""
+Tests for HTTP response compression.
+
+Tests cover:
+- Accept-Encoding negotiation (q-values, wildcard, identity)
+- Middleware thresholds, content types and already-encoded responses
+- Streamed responses compressed chunk by chunk
+- Precompressed response cache: variants, expiry, eviction, errors
+"""
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from cgd.core import http_compression
+from cgd.core.http_compression import (
+    CompressionMiddleware,
+    PrecompressedCache,
+    PrecompressedEntry,
+    StreamEncoder,
+    negotiate_encoding,
+    precompressed_response,
+)
+
+BIG = {"features": [{"feature_name": f"orf19.{n}", "gene_name": None} for n in range(500)]}
+
+
+class Snapshot(BaseModel):
+    organism: str
+    counts: list[int]
+
+
+class TestNegotiateEncoding:
+    """Tests for negotiate_encoding."""
+
+    def test_server_preference(self):
+        available = ("zstd", "br", "gzip")
+        assert negotiate_encoding("gzip, br, zstd", available) == "zstd"
+        assert negotiate_encoding("gzip, br", available) == "br"
+        assert negotiate_encoding("gzip", available) == "gzip"
+
+    def test_q_values(self):
+        available = ("zstd", "br", "gzip")
+        assert negotiate_encoding("zstd;q=0.5, gzip;q=1.0", available) == "gzip"
+        assert negotiate_encoding("gzip;q=0", available) is None
+
+    def test_wildcard(self):
+        assert negotiate_encoding("*", ("br", "gzip")) == "br"
+        assert negotiate_encoding("br;q=0, *", ("br", "gzip")) == "gzip"
+
+    def test_identity(self):
+        assert negotiate_encoding("", ("gzip",)) is None
+        assert negotiate_encoding("identity", ("gzip",)) is None
+        assert negotiate_encoding("deflate", ("gzip",)) is None
+
+
+def make_client(min_size=100):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, min_size=min_size)
+
+    @app.get("/big")
+    def big():
+        return BIG
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\x00" * 5000, media_type="application/octet-stream")
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(
+            gzip.compress(b"x" * 5000), media_type="text/plain",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (f"row\t{n}\n" for n in range(1000)), media_type="text/tab-separated-values"
+        )
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("line\n" * 1000)
+
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware."""
+
+    def test_compresses_large_json(self):
+        response = make_client().get("/big", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.text)
+        assert response.json() == BIG
+
+    def test_skips_small_bodies(self):
+        response = make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_identity_without_accept_encoding(self):
+        response = make_client().get("/big", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == BIG
+
+    def test_skips_binary(self):
+        response = make_client().get("/binary", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert len(response.content) == 5000
+
+    def test_leaves_encoded_responses(self):
+        response = make_client().get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "x" * 5000
+
+    def test_streams_compressed_chunks(self):
+        with make_client().stream(
+            "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw).decode().count("row\t") == 1000
+
+    def test_text(self):
+        response = make_client().get("/text", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "line\n" * 1000
+
+
+class TestStreamEncoder:
+    """Tests for StreamEncoder."""
+
+    def test_each_write_is_decodable(self):
+        encoder = StreamEncoder("gzip")
+        decoder = zlib.decompressobj(31)
+
+        assert decoder.decompress(encoder.write(b"first chunk ")) == b"first chunk "
+        assert decoder.decompress(encoder.write(b"second")) == b"second"
+        decoder.decompress(encoder.finish())
+        assert decoder.eof
+
+    def test_unknown_coding(self):
+        with pytest.raises(ValueError):
+            StreamEncoder("compress")
+
+
+class TestPrecompressedCache:
+    """Tests for PrecompressedCache."""
+
+    def test_builds_once(self):
+        cache = PrecompressedCache(max_age=60, max_entries=10)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return b'{"a": 1}' * 500
+
+        first = cache.get_or_build("k", build)
+        assert cache.get_or_build("k", build) is first
+        assert calls == [1]
+        assert gzip.decompress(first.bodies["gzip"]) == first.bodies["identity"]
+
+    def test_small_bodies_stored_uncompressed(self):
+        entry = PrecompressedEntry.build(b"{}")
+        assert list(entry.bodies) == ["identity"]
+        assert "content-encoding" not in entry.response("gzip").headers
+
+    def test_expires(self):
+        now = [0.0]
+        cache = PrecompressedCache(max_age=60, max_entries=10, clock=lambda: now[0])
+        cache.get_or_build("k", lambda: b"old")
+        now[0] = 61.0
+
+        assert cache.get_or_build("k", lambda: b"new").bodies["identity"] == b"new"
+
+    def test_evicts_least_recently_used(self):
+        cache = PrecompressedCache(max_age=60, max_entries=2)
+        for key in ("a", "b"):
+            cache.get_or_build(key, lambda: b"{}")
+        cache.get("a")
+        cache.get_or_build("c", lambda: b"{}")
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    def test_invalidate_prefix(self):
+        cache = PrecompressedCache(max_age=60, max_entries=10)
+        for key in ("go_slim:A", "genome_snapshot:A"):
+            cache.get_or_build(key, lambda: b"{}")
+        cache.invalidate("go_slim:")
+
+        assert cache.get("go_slim:A") is None
+        assert cache.get("genome_snapshot:A") is not None
+
+
+class TestPrecompressedResponse:
+    """Tests for precompressed_response behind the middleware."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware)
+        calls = []
+
+        @app.get("/snapshot/{abbrev}", response_model=Snapshot)
+        def snapshot(abbrev: str, request: Request):
+            def build():
+                calls.append(abbrev)
+                if abbrev == "missing":
+                    raise HTTPException(status_code=404, detail="Organism not found")
+                return Snapshot(organism=abbrev, counts=list(range(1000)))
+            return precompressed_response(request, f"snapshot:{abbrev}", build)
+
+        client = TestClient(app)
+        client.calls = calls
+        return client
+
+    def test_serves_variants_from_one_build(self, client):
+        gz = client.get("/snapshot/Ca", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/snapshot/Ca", headers={"Accept-Encoding": "identity"})
+
+        assert gz.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert gz.json() == plain.json() == {"organism": "Ca", "counts": list(range(1000))}
+        assert client.calls == ["Ca"]
+
+    def test_errors_not_cached(self, client):
+        assert client.get("/snapshot/missing").status_code == 404
+        assert client.get("/snapshot/missing").status_code == 404
+        assert client.calls == ["missing", "missing"]
+
+    def test_unavailable_codings_served_as_identity(self, client, monkeypatch):
+        monkeypatch.setattr(http_compression, "available_encodings", lambda: ("gzip",))
+        response = client.get("/snapshot/Ca", headers={"Accept-Encoding": "zstd, br"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json()["organism"] == "Ca"
@@ -0,0 +1,149 @@
+"""
+Tests for the interval index module.
+
+Tests cover:
+- Overlap queries against a brute-force scan, including nested intervals
+- Crick-strand (start > stop) normalization
+- Nearest-upstream, nearest-downstream and k-nearest ordering and distances
+- Empty indexes and input validation
+"""
+import random
+
+import numpy as np
+import pytest
+
+from cgd.utils.intervals import IntervalIndex
+
+
+def random_intervals(rng, n, length=5000):
+    """Random intervals, half of them given Crick-style (start > stop)."""
+    starts, stops = [], []
+    for _ in range(n):
+        lo = rng.randint(1, length)
+        hi = lo + rng.randint(0, 300)
+        if rng.random() < 0.5:
+            lo, hi = hi, lo
+        starts.append(lo)
+        stops.append(hi)
+    return starts, stops
+
+
+def gap(start, stop, qs, qe):
+    """Reference distance between an interval and a query region."""
+    lo, hi = min(start, stop), max(start, stop)
+    if hi < qs:
+        return qs - hi
+    if lo > qe:
+        return lo - qe
+    return 0
+
+
+class TestOverlap:
+    """Tests for overlap queries."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        starts, stops = random_intervals(rng, 400)
+        index = IntervalIndex(starts, stops)
+        for _ in range(200):
+            qs = rng.randint(1, 5400)
+            qe = qs + rng.randint(0, 200)
+            ids, distances = index.overlap(qs, qe)
+            expected = {
+                i for i in range(len(starts))
+                if gap(starts[i], stops[i], qs, qe) == 0
+            }
+            assert sorted(ids.tolist()) == sorted(expected)
+            assert not distances.any()
+
+    def test_results_ordered_by_start(self):
+        index = IntervalIndex([500, 100, 300], [600, 200, 900])
+        ids, _ = index.overlap(1, 1000)
+        assert ids.tolist() == [1, 2, 0]
+
+    def test_finds_nested_intervals(self):
+        # 0 contains 1, which contains 2; 3 sits after 0
+        index = IntervalIndex([1, 100, 150, 2000], [1000, 400, 160, 2100])
+        ids, _ = index.overlap(155, 155)
+        assert sorted(ids.tolist()) == [0, 1, 2]
+        ids, _ = index.overlap(500, 2050)
+        assert sorted(ids.tolist()) == [0, 3]
+
+    def test_crick_strand_coordinates(self):
+        index = IntervalIndex([200], [100])
+        assert index.overlap(150, 150)[0].tolist() == [0]
+        assert index.overlap(250, 210)[0].tolist() == []
+
+    def test_duplicate_intervals(self):
+        index = IntervalIndex([10, 10, 20], [50, 50, 30])
+        assert sorted(index.overlap(25, 25)[0].tolist()) == [0, 1, 2]
+
+
+class TestNearest:
+    """Tests for directional and k-nearest queries."""
+
+    @pytest.fixture
+    def index(self):
+        # Intervals: [10,20] [30,40] [35,90] [100,110] [200,210]
+        return IntervalIndex([10, 40, 35, 100, 210], [20, 30, 90, 110, 200])
+
+    def test_upstream(self, index):
+        ids, distances = index.upstream(100, k=3)
+        assert ids.tolist() == [2, 1, 0]
+        assert distances.tolist() == [10, 60, 80]
+
+    def test_upstream_excludes_overlapping(self, index):
+        ids, _ = index.upstream(35, k=5)
+        assert ids.tolist() == [0]
+
+    def test_downstream(self, index):
+        ids, distances = index.downstream(95, k=2)
+        assert ids.tolist() == [3, 4]
+        assert distances.tolist() == [5, 105]
+
+    def test_nearest_puts_overlaps_first(self, index):
+        ids, distances = index.nearest(38, 38, k=4)
+        assert ids.tolist() == [1, 2, 0, 3]
+        assert distances.tolist() == [0, 0, 18, 62]
+
+    def test_nearest_truncates_overlaps(self, index):
+        ids, _ = index.nearest(1, 300, k=2)
+        assert ids.tolist() == [0, 1]
+
+    def test_nearest_matches_brute_force(self):
+        rng = random.Random(11)
+        starts, stops = random_intervals(rng, 300)
+        index = IntervalIndex(starts, stops)
+        for _ in range(200):
+            qs = rng.randint(1, 5400)
+            qe = qs + rng.randint(0, 50)
+            k = rng.randint(1, 12)
+            ids, distances = index.nearest(qs, qe, k)
+            reference = sorted(gap(a, b, qs, qe) for a, b in zip(starts, stops))
+            assert distances.tolist() == sorted(distances.tolist())
+            assert distances.tolist() == reference[:k]
+            assert all(
+                gap(starts[i], stops[i], qs, qe) == d
+                for i, d in zip(ids.tolist(), distances.tolist())
+            )
+
+
+class TestEdgeCases:
+    """Tests for empty input and validation."""
+
+    def test_empty_index(self):
+        index = IntervalIndex([], [])
+        assert len(index) == 0
+        assert index.overlap(1, 100)[0].tolist() == []
+        assert index.upstream(50, k=3)[0].tolist() == []
+        assert index.downstream(50, k=3)[0].tolist() == []
+        assert index.nearest(1, 100, k=3)[0].tolist() == []
+
+    def test_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            IntervalIndex([1, 2], [3])
+
+    def test_accepts_numpy_arrays(self):
+        index = IntervalIndex(np.array([5, 50]), np.array([10, 60]))
+        assert len(index) == 2
+        assert index.nearest(30, 30, k=1)[1].tolist() == [20]
@@ -4,11 +4,13 @@ Tests for Literature Review Curation Service.
 Tests cover:
 - Getting pending papers from REF_TEMP
 - Triage operations (add, high priority, discard)
-- Batch triage processing
+- Batch triage processing: prefetch, in-memory plan, bulk write in one
+  transaction, per-action results
 - Reference creation from REF_TEMP
 - Curation status management
 """
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from datetime import datetime
 
@@ -19,6 +21,7 @@ from cgd.api.services.curation.litreview_curation_service import (
     HIGH_PRIORITY,
     NOT_YET_CURATED,
     REF_SOURCE,
+    TriagePrefetch,
 )
 
 
@@ -111,6 +114,9 @@ class MockQuery:
     def filter(self, *args, **kwargs):
         return self
 
+    def join(self, *args, **kwargs):
+        return self
+
     def order_by(self, *args):
         return self
 
@@ -129,6 +135,9 @@ class MockQuery:
     def scalar(self):
         return self._results[0] if self._results else 0
 
+    def delete(self, synchronize_session=None):
+        return len(self._results)
+
 
 @pytest.fixture
 def mock_db():
@@ -363,6 +372,29 @@ class TestTriageDiscard:
         mock_db.add.assert_called_once()
 
 
+def _feature(feature_no, feature_name, gene_name=None, organism_abbrev="C_albicans_SC5314"):
+    """Prefetched feature row."""
+    return SimpleNamespace(
+        feature_no=feature_no,
+        feature_name=feature_name,
+        gene_name=gene_name,
+        organism_abbrev=organism_abbrev,
+    )
+
+
+@pytest.fixture
+def prefetch(sample_ref_temps):
+    """Batch prefetch with both sample papers in the review queue."""
+    return TriagePrefetch(
+        ref_temps={ref_temp.pubmed: ref_temp for ref_temp in sample_ref_temps},
+        features=[
+            _feature(1, "C1_00010W_A", "ALS1"),
+            _feature(2, "C2_00020W_A", "ALS3"),
+            _feature(3, "CAALFM_C100010WA", "ALS1", organism_abbrev="C_glabrata_CBS138"),
+        ],
+    )
+
+
 class TestTriageBatch:
     """Tests for batch triage processing."""
 
@@ -385,15 +417,8 @@ class TestTriageBatch:
         assert result["results"][0]["success"] is False
         assert "Unknown action" in result["results"][0]["messages"][0]
 
-    def test_processes_multiple_actions(self, mock_db, sample_ref_temps):
+    def test_processes_multiple_actions(self, mock_db):
         """Should process multiple actions."""
-        # Setup for discard action
-        mock_db.query.side_effect = [
-            MockQuery([]),  # Not in REF_BAD
-            MockQuery([]),  # Not in Reference
-            MockQuery([sample_ref_temps[0]]),  # Get REF_TEMP for delete
-        ]
-
         service = LitReviewCurationService(mock_db)
         result = service.triage_batch(
             [{"pubmed": 12345678, "action": "discard"}],
@@ -401,6 +426,183 @@ class TestTriageBatch:
         )
 
         assert result["total_processed"] == 1
+        assert result["successful"] == 1
+        mock_db.commit.assert_called_once()
+
+    def test_prefetches_in_a_few_queries(self, mock_db):
+        """Query count should not grow with the number of actions."""
+        actions = [
+            {"pubmed": pubmed, "action": "high_priority", "feature_names": [f"GENE{pubmed}"]}
+            for pubmed in range(1, 301)
+        ]
+
+        LitReviewCurationService(mock_db)._prefetch_triage(actions)
+
+        # REF_TEMP, REFERENCE and REF_BAD by pubmed, then features
+        assert mock_db.query.call_count == 4
+
+    def test_writes_batch_in_one_transaction(self, mock_db, prefetch, monkeypatch):
+        """Should bulk insert every new row and commit once."""
+        service = LitReviewCurationService(mock_db)
+        monkeypatch.setattr(service, "_prefetch_triage", lambda actions: prefetch)
+        mock_db.execute.return_value.scalars.return_value.all.side_effect = [
+            [101, 102],  # reference_seq
+            [201, 202],  # ref_property_seq
+        ]
+
+        result = service.triage_batch(
+            [
+                {"pubmed": 12345678, "action": "add"},
+                {"pubmed": 87654321, "action": "high_priority",
+                 "feature_names": ["als3"]},
+            ],
+            "curator1",
+        )
+
+        assert [r["reference_no"] for r in result["results"]] == [101, 102]
+        assert result["results"][1]["linked_features"] == ["C2_00020W_A"]
+        assert result["results"][0]["messages"] == [
+            "Created reference 101 from PubMed 12345678",
+            f"Set status to '{NOT_YET_CURATED}'",
+            "Removed PubMed 12345678 from review queue",
+        ]
+        mock_db.commit.assert_called_once()
+
+        executemany = [
+            c.args[1] for c in mock_db.execute.call_args_list
+            if len(c.args) > 1 and isinstance(c.args[1], list)
+        ]
+        references, properties, abstracts, links = executemany
+        assert [row["pubmed"] for row in references] == [12345678, 87654321]
+        assert [row["property_value"] for row in properties] == [NOT_YET_CURATED, HIGH_PRIORITY]
+        assert len(abstracts) == 2
+        assert links == [{"ref_property_no": 202, "feature_no": 2, "created_by": "curator1"}]
+
+    def test_rolls_back_whole_batch(self, mock_db, prefetch, monkeypatch):
+        """A failed write should leave no action applied."""
+        service = LitReviewCurationService(mock_db)
+        prefetch.references[11111111] = 5
+        monkeypatch.setattr(service, "_prefetch_triage", lambda actions: prefetch)
+        sequence = MagicMock()
+        sequence.scalars.return_value.all.return_value = [101]
+        mock_db.execute.side_effect = [sequence, sequence, Exception("ORA-00001")]
+
+        result = service.triage_batch(
+            [
+                {"pubmed": 12345678, "action": "add"},
+                {"pubmed": 11111111, "action": "add"},
+            ],
+            "curator1",
+        )
+
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+        added, existing = result["results"]
+        assert added["success"] is False
+        assert added["reference_no"] is None
+        assert "rolled back" in added["messages"][0]
+        assert existing["messages"] == ["PubMed 11111111 already exists (reference_no: 5)"]
+
+
+class TestPlanTriage:
+    """Tests for deciding triage actions against prefetched state."""
+
+    def plan(self, mock_db, prefetch, actions):
+        return LitReviewCurationService(mock_db)._plan_triage(actions, prefetch)
+
+    def test_builds_new_reference(self, mock_db, prefetch):
+        """Should build the reference and status rows for an added paper."""
+        plan = self.plan(mock_db, prefetch, [{"pubmed": 12345678, "action": "add"}])
+
+        new_reference, = plan.new_references
+        assert new_reference.citation == "Smith et al. (2024) J Cell Biol"
+        assert new_reference.year == 2024
+        assert new_reference.status == NOT_YET_CURATED
+        assert plan.results[0]["success"] is True
+        assert plan.removals == plan.results
+
+    def test_existing_reference(self, mock_db, prefetch):
+        """Should not recreate a paper already in REFERENCE."""
+        prefetch.references[12345678] = 7
+        plan = self.plan(mock_db, prefetch, [{"pubmed": 12345678, "action": "high_priority"}])
+
+        assert plan.new_references == []
+        assert plan.results[0]["success"] is False
+        assert plan.results[0]["reference_no"] == 7
+        assert plan.results[0]["linked_features"] == []
+        assert len(plan.removals) == 1
+
+    def test_not_in_review_queue(self, mock_db, prefetch):
+        """Should fail papers missing from REF_TEMP."""
+        plan = self.plan(mock_db, prefetch, [{"pubmed": 99999999, "action": "add"}])
+
+        assert plan.new_references == []
+        assert "not found in review queue" in plan.results[0]["messages"][0]
+
+    def test_duplicate_pubmed_in_batch(self, mock_db, prefetch):
+        """Should only act on the first action for a paper."""
+        plan = self.plan(mock_db, prefetch, [
+            {"pubmed": 12345678, "action": "add"},
+            {"pubmed": 12345678, "action": "discard"},
+        ])
+
+        assert len(plan.new_references) == 1
+        assert plan.discards == []
+        assert "more than once" in plan.results[1]["messages"][0]
+
+    def test_citation_conflicts(self, mock_db, prefetch, sample_ref_temps):
+        """Should catch unique key conflicts before writing."""
+        prefetch.citations.add("Smith et al. (2024) J Cell Biol")
+        sample_ref_temps[1].citation = "Doe et al. (2023) Nature"
+        plan = self.plan(mock_db, prefetch, [
+            {"pubmed": 12345678, "action": "add"},
+            {"pubmed": 87654321, "action": "add"},
+        ])
+
+        assert [r.pubmed for r in plan.new_references] == [87654321]
+        assert "Unique constraint" in plan.results[0]["messages"][0]
+
+    def test_discard(self, mock_db, prefetch):
+        """Should discard new papers and skip ones already handled."""
+        prefetch.discarded.add(1)
+        prefetch.references[2] = 8
+        plan = self.plan(mock_db, prefetch, [
+            {"pubmed": 1, "action": "discard"},
+            {"pubmed": 2, "action": "discard"},
+            {"pubmed": 3, "action": "discard"},
+        ])
+
+        assert plan.discards == [3]
+        assert [r["success"] for r in plan.results] == [True, False, True]
+        assert len(plan.removals) == 3
+
+    def test_resolves_features(self, mock_db, prefetch):
+        """Should match feature names, then gene names, within the organism."""
+        plan = self.plan(mock_db, prefetch, [{
+            "pubmed": 87654321,
+            "action": "high_priority",
+            "feature_names": ["c1_00010w_a", "ALS1", "ALS3", "NOPE", " "],
+            "organism_abbrev": "C_albicans_SC5314",
+        }])
+
+        new_reference, = plan.new_references
+        assert new_reference.status == HIGH_PRIORITY
+        assert new_reference.feature_nos == [1, 2]
+        assert plan.results[0]["linked_features"] == ["C1_00010W_A", "C2_00020W_A"]
+        assert new_reference.link_messages[-1] == (
+            "Feature 'NOPE' not found for organism C_albicans_SC5314"
+        )
+
+    def test_resolves_features_in_other_organism(self, mock_db, prefetch):
+        """The organism filter should pick that organism's gene."""
+        plan = self.plan(mock_db, prefetch, [{
+            "pubmed": 87654321,
+            "action": "high_priority",
+            "feature_names": ["ALS1"],
+            "organism_abbrev": "C_glabrata_CBS138",
+        }])
+
+        assert plan.new_references[0].feature_nos == [3]
 
 
 class TestCreateReferenceFromRefTemp:
@@ -11,6 +11,7 @@ Tests cover:
 - URL add/remove
 """
 import pytest
+import time
 from unittest.mock import MagicMock, PropertyMock
 from datetime import datetime
 
@@ -18,6 +19,8 @@ from cgd.api.services.curation.locus_curation_service import (
     LocusCurationService,
     LocusCurationError,
 )
+from cgd.core import http_compression
+from cgd.core.http_compression import PrecompressedEntry
 
 
 class MockFeature:
@@ -397,6 +400,18 @@ class TestUpdateFeature:
         assert result is True
         assert sample_features[0].name_description == "New description"
 
+    def test_drops_cached_homology_details(self, mock_db, sample_features):
+        """Should drop cached homology details, which show gene names."""
+        mock_db.query.return_value = MockQuery([sample_features[0]])
+        cache = http_compression._get_cache()
+        for key in ("homology_details:ACT1", "go_slim:C_albicans_SC5314"):
+            cache.put(key, PrecompressedEntry.build(b"{}", created=time.monotonic()))
+
+        LocusCurationService(mock_db).update_feature(1, "curator1", gene_name="ACT1_NEW")
+
+        assert cache.get("homology_details:ACT1") is None
+        assert cache.get("go_slim:C_albicans_SC5314") is not None
+
     def test_raises_for_unknown_feature(self, mock_db):
         """Should raise error for unknown feature."""
         mock_db.query.return_value = MockQuery([])
@@ -0,0 +1,164 @@
+"""
+Row-count regression tests for locus page loaders.
+
+The locus summary, protein and homology pages eager-load several
+collections per feature. Loaded with chained joinedloads, the database
+returns the product of those collections (for a large ortholog cluster,
+internal members x external members) and the ORM throws the duplicates
+away. These tests run the loaders against SQLite and count the raw rows
+fetched, which must grow with the sum of the collections.
+
+Tests cover:
+- Locus summary options: aliases, URLs and homology groups
+- Homology details for a 200-member CGOB cluster
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cgd.api.services import locus_service
+from cgd.api.services.locus_service import _locus_summary_options
+from cgd.models.models import (
+    Alias,
+    Dbxref,
+    DbxrefFeat,
+    DbxrefHomology,
+    FeatAlias,
+    FeatHomology,
+    FeatProperty,
+    FeatUrl,
+    Feature,
+    HomologyGroup,
+    Organism,
+    Url,
+    WebDisplay,
+)
+from tests.query_plans import capture_selects, count_rows
+from tests.sqlite_schema import sqlite_session
+
+CLUSTER_MEMBERS = 200
+EXTERNAL_MEMBERS = 100
+
+
+def add_feature(db, feature_no, organism_no=1):
+    db.add(Feature(
+        feature_no=feature_no, organism_no=organism_no, feature_name=f"orf19.{feature_no}",
+        gene_name=None, dbxref_id=f"CAL{feature_no:07d}", feature_type="ORF",
+        source="CGD", created_by="test",
+    ))
+
+
+@pytest.fixture
+def db(tmp_path):
+    session = sqlite_session(
+        tmp_path / "locus_loaders.db",
+        Feature, Organism, Alias, FeatAlias, FeatUrl, Url, WebDisplay,
+        HomologyGroup, FeatHomology, DbxrefHomology, Dbxref, DbxrefFeat, FeatProperty,
+    )
+    for organism_no, name in [(1, "Candida albicans SC5314"), (2, "Candida dubliniensis CD36")]:
+        session.add(Organism(
+            organism_no=organism_no, organism_name=name, organism_abbrev=f"org{organism_no}",
+            taxon_id=organism_no, taxonomic_rank="Strain", organism_order=organism_no,
+            created_by="test",
+        ))
+    yield session
+    session.close()
+
+
+class TestLocusSummaryOptions:
+    """Tests for the locus summary page loader options."""
+
+    def test_rows_are_sum_of_collections(self, db):
+        add_feature(db, 1)
+        for n in range(1, 6):
+            db.add(Alias(alias_no=n, alias_name=f"ALIAS{n}", alias_type="Uniform", created_by="test"))
+            db.add(FeatAlias(feat_alias_no=n, feature_no=1, alias_no=n))
+            db.add(Url(url_no=n, source="CGD", url_type="Query", url=f"http://x/{n}", created_by="test"))
+            db.add(FeatUrl(feat_url_no=n, feature_no=1, url_no=n))
+            db.add(WebDisplay(
+                web_display_no=n, url_no=n, web_page_name="Locus",
+                label_location="External Links", label_type="Text", label_name=f"Link {n}",
+                is_default="N", created_by="test",
+            ))
+            db.add(HomologyGroup(
+                homology_group_no=n, homology_group_type="ortholog", method="CGOB",
+                created_by="test",
+            ))
+            db.add(FeatHomology(feat_homology_no=n, feature_no=1, homology_group_no=n))
+        db.commit()
+        db.expunge_all()
+
+        with capture_selects(db.get_bind()) as statements:
+            feature = (
+                db.query(Feature)
+                .options(*_locus_summary_options())
+                .filter(Feature.feature_no == 1)
+                .one()
+            )
+
+        assert len(feature.feat_alias) == len(feature.feat_url) == len(feature.feat_homology) == 5
+        assert all(fu.url.web_display for fu in feature.feat_url)
+        # 1 feature + 5 aliases + 5 URLs + 5 web_display + 5 groups (not 5 x 5 x 5)
+        assert count_rows(db.get_bind(), statements) == 21
+
+
+class TestHomologyDetailsRows:
+    """Tests for get_locus_homology_details on a large ortholog cluster."""
+
+    @pytest.fixture
+    def cluster(self, db):
+        """
+        orf19.1 in a CGOB cluster with 199 other CGD features (half in
+        another organism), each with a qualifier, and 100 external members.
+        """
+        db.add(HomologyGroup(
+            homology_group_no=1, homology_group_type="ortholog", method="CGOB",
+            homology_group_id="CGOB_1", created_by="test",
+        ))
+        for feature_no in range(1, CLUSTER_MEMBERS + 1):
+            add_feature(db, feature_no, organism_no=1 if feature_no % 2 else 2)
+            db.add(FeatHomology(
+                feat_homology_no=feature_no, feature_no=feature_no, homology_group_no=1,
+            ))
+            db.add(FeatProperty(
+                feat_property_no=feature_no, feature_no=feature_no, source="CGD",
+                property_type="feature_qualifier", property_value="Verified",
+                created_by="test",
+            ))
+        for n in range(1, EXTERNAL_MEMBERS + 1):
+            db.add(Dbxref(
+                dbxref_no=n, source="EnsemblFungi", dbxref_type="Gene ID",
+                dbxref_id=f"EXT{n}", created_by="test",
+            ))
+            db.add(DbxrefHomology(
+                dbxref_homology_no=n, dbxref_no=n, homology_group_no=1,
+                name="Candida glabrata", created_by="test",
+            ))
+        db.commit()
+        db.expunge_all()
+        return db
+
+    def test_rows_grow_linearly(self, cluster):
+        db = cluster
+        relationship_map = MagicMock()
+        relationship_map.a21_for_a22.return_value = None
+        with patch.object(locus_service, "get_relationship_map", return_value=relationship_map), \
+                patch.object(locus_service, "_load_phylogenetic_tree", return_value=None), \
+                patch.object(locus_service, "_load_sequence_alignment", return_value=None), \
+                capture_selects(db.get_bind()) as statements:
+            response = locus_service.get_locus_homology_details(db, "orf19.1")
+
+        details = response.results["Candida albicans SC5314"]
+        [group] = details.homology_groups
+        assert len(group.members) == CLUSTER_MEMBERS - 1 + EXTERNAL_MEMBERS
+        orthologs = details.ortholog_cluster.orthologs
+        assert len(orthologs) == CLUSTER_MEMBERS + EXTERNAL_MEMBERS
+        assert {o.status for o in orthologs if o.source == "CGD"} == {"VERIFIED"}
+
+        # A fixed number of queries, whatever the cluster size
+        assert len(statements) <= 8
+        # Chained joinedloads fetched members x external members
+        # (20,000 rows here); each member is now fetched a bounded number
+        # of times: the loaders, and one qualifier query
+        rows = count_rows(db.get_bind(), statements)
+        assert rows <= 2 * CLUSTER_MEMBERS + EXTERNAL_MEMBERS + 10
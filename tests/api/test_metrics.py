@@ -0,0 +1,163 @@
+"""
+Tests for Prometheus metrics.
+
+Tests cover:
+- Subprocess duration and timeout tracking
+- Cache hit/miss counters
+- DB pool occupancy and checkout wait metrics
+- Per-route request metrics and the /metrics endpoint
+- Multiprocess aggregation across worker processes
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from cgd.api.routers.metrics_router import router as metrics_router
+from cgd.core.metrics import (
+    MULTIPROC_DIR_ENV,
+    MetricsMiddleware,
+    instrument_pool,
+    record_cache_lookup,
+    render_metrics,
+    track_in_flight,
+    track_subprocess,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestTrackSubprocess:
+    """Tests for track_subprocess."""
+
+    def test_records_duration(self):
+        before = _sample("cgd_tool_duration_seconds_count", tool="test_ok", outcome="ok")
+        with track_subprocess("test_ok"):
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+        after = _sample("cgd_tool_duration_seconds_count", tool="test_ok", outcome="ok")
+        assert after == before + 1
+
+    def test_counts_timeouts(self):
+        with pytest.raises(subprocess.TimeoutExpired):
+            with track_subprocess("test_timeout"):
+                subprocess.run(
+                    [sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.1
+                )
+        assert _sample("cgd_tool_timeouts_total", tool="test_timeout") == 1
+        assert _sample(
+            "cgd_tool_duration_seconds_count", tool="test_timeout", outcome="timeout"
+        ) == 1
+
+    def test_records_errors(self):
+        with pytest.raises(FileNotFoundError):
+            with track_subprocess("test_error"):
+                subprocess.run(["/nonexistent/tool"])
+        assert _sample(
+            "cgd_tool_duration_seconds_count", tool="test_error", outcome="error"
+        ) == 1
+
+
+class TestCacheLookups:
+    """Tests for record_cache_lookup."""
+
+    def test_hits_and_misses(self):
+        record_cache_lookup("test_cache", hit=False)
+        record_cache_lookup("test_cache", hit=True)
+        record_cache_lookup("test_cache", hit=True)
+        assert _sample("cgd_cache_lookups_total", cache="test_cache", result="hit") == 2
+        assert _sample("cgd_cache_lookups_total", cache="test_cache", result="miss") == 1
+
+
+class TestInstrumentPool:
+    """Tests for instrument_pool."""
+
+    def test_checked_out_gauge_and_wait(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2)
+        instrument_pool(engine, name="test_pool")
+        instrument_pool(engine, name="test_pool")  # idempotent
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert _sample("cgd_db_pool_checked_out", pool="test_pool") == 1
+        assert _sample("cgd_db_pool_checked_out", pool="test_pool") == 0
+        assert _sample("cgd_db_pool_checkout_wait_seconds_count", pool="test_pool") == 1
+        engine.dispose()
+
+
+class TestMetricsEndpoint:
+    """Tests for the middleware and /metrics endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI(dependencies=[Depends(track_in_flight)])
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router)
+
+        # Routes of included routers are only resolved during dispatch
+        router = APIRouter(prefix="/api/items")
+
+        @router.get("/{item_id}")
+        def get_item(item_id: str):
+            in_flight = _sample(
+                "cgd_http_requests_in_progress", method="GET", route="/api/items/{item_id}"
+            )
+            return {"id": item_id, "in_flight": in_flight}
+
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_route_template_label(self, client):
+        assert client.get("/api/items/ACT1").json()["in_flight"] == 1
+        client.get("/api/items/TUB1")
+        assert _sample(
+            "cgd_http_request_duration_seconds_count",
+            method="GET", route="/api/items/{item_id}", status="200",
+        ) == 2
+        assert _sample(
+            "cgd_http_requests_in_progress", method="GET", route="/api/items/{item_id}"
+        ) == 0
+
+    def test_unmatched_route(self, client):
+        client.get("/no/such/path")
+        assert _sample(
+            "cgd_http_request_duration_seconds_count",
+            method="GET", route="unmatched", status="404",
+        ) >= 1
+
+    def test_metrics_endpoint(self, client):
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "cgd_http_request_duration_seconds" in response.text
+
+
+class TestMultiprocess:
+    """Metrics written by several worker processes are aggregated."""
+
+    def test_aggregates_worker_processes(self, tmp_path, monkeypatch):
+        env = dict(os.environ, **{MULTIPROC_DIR_ENV: str(tmp_path)})
+        script = (
+            "from cgd.core.metrics import record_cache_lookup; "
+            "record_cache_lookup('mp_cache', hit=True)"
+        )
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, "-c", script], env=env, cwd=REPO_ROOT, check=True
+            )
+
+        monkeypatch.setenv(MULTIPROC_DIR_ENV, str(tmp_path))
+        content, _ = render_metrics()
+        assert (
+            'cgd_cache_lookups_total{cache="mp_cache",result="hit"} 2.0'
+            in content.decode()
+        )
@@ -7,13 +7,14 @@ Tests cover:
 - Observable tree building
 """
 import pytest
-from unittest.mock import MagicMock, PropertyMock
+from unittest.mock import MagicMock, PropertyMock, patch
 
 from cgd.api.services.phenotype_service import (
     _build_citation_links_for_phenotype,
     search_phenotypes,
     get_observable_tree,
 )
+from cgd.api.services.cv_tree_service import build_cv_tree
 
 
 class MockReference:
@@ -119,31 +120,6 @@ class MockPhenoAnnotation:
         self.experiment = experiment
 
 
-class MockCv:
-    """Mock Cv model."""
-
-    def __init__(self, cv_no: int, cv_name: str):
-        self.cv_no = cv_no
-        self.cv_name = cv_name
-
-
-class MockCvTerm:
-    """Mock CvTerm model."""
-
-    def __init__(self, cv_term_no: int, cv_no: int, term_name: str):
-        self.cv_term_no = cv_term_no
-        self.cv_no = cv_no
-        self.term_name = term_name
-
-
-class MockCvtermRelationship:
-    """Mock CvtermRelationship model."""
-
-    def __init__(self, parent_cv_term_no: int, child_cv_term_no: int):
-        self.parent_cv_term_no = parent_cv_term_no
-        self.child_cv_term_no = child_cv_term_no
-
-
 class MockQuery:
     """Mock SQLAlchemy query."""
 
@@ -421,64 +397,33 @@ class TestSearchPhenotypes:
         assert result.query.mutant_type == "null"
 
 
+def use_tree(terms=(), relationships=(), counts=()):
+    """Serve get_observable_tree from a tree built from the given rows."""
+    tree = build_cv_tree("observable", terms, relationships, counts)
+    return patch("cgd.api.services.phenotype_service.get_cv_tree", return_value=tree)
+
+
 class TestGetObservableTree:
     """Tests for get_observable_tree."""
 
     def test_returns_empty_tree_when_no_observables(self, mock_db):
         """Should return empty tree when no observables."""
-        mock_db.query.side_effect = [
-            MockQuery([]),  # observable counts
-            MockQuery([]),  # cv lookup
-        ]
-
-        result = get_observable_tree(mock_db)
+        with use_tree():
+            result = get_observable_tree(mock_db)
 
         assert result.tree == []
 
-    def test_returns_flat_tree_when_no_cv(self, mock_db):
-        """Should return flat tree when no observable CV exists."""
-        observable_counts = [
-            ("colony morphology", 10),
-            ("growth rate", 5),
-        ]
-        mock_db.query.side_effect = [
-            MockQuery(observable_counts),  # observable counts
-            MockQuery([]),  # cv lookup - not found
-        ]
-
-        result = get_observable_tree(mock_db)
-
-        assert len(result.tree) == 2
-        assert result.tree[0].term == "colony morphology"
-        assert result.tree[0].count == 10
-        assert result.tree[1].term == "growth rate"
-        assert result.tree[1].count == 5
-
     def test_includes_annotation_counts(self, mock_db):
         """Should include annotation counts for each term."""
-        observable_counts = [
-            ("morphology", 15),
-        ]
-        mock_db.query.side_effect = [
-            MockQuery(observable_counts),
-            MockQuery([]),  # No CV
-        ]
-
-        result = get_observable_tree(mock_db)
+        with use_tree(counts=[("morphology", 15)]):
+            result = get_observable_tree(mock_db)
 
         assert result.tree[0].count == 15
 
     def test_children_default_to_empty_list(self, mock_db):
         """Should have empty children list for flat terms."""
-        observable_counts = [
-            ("term1", 1),
-        ]
-        mock_db.query.side_effect = [
-            MockQuery(observable_counts),
-            MockQuery([]),  # No CV
-        ]
-
-        result = get_observable_tree(mock_db)
+        with use_tree(counts=[("term1", 1)]):
+            result = get_observable_tree(mock_db)
 
         assert result.tree[0].children == []
 
@@ -488,23 +433,11 @@ class TestGetObservableTree:
             ("parent term", 5),
             ("child term", 3),
         ]
-        cv = MockCv(1, "observable")
-        cv_terms = [
-            MockCvTerm(1, 1, "parent term"),
-            MockCvTerm(2, 1, "child term"),
-        ]
-        relationships = [
-            MockCvtermRelationship(1, 2),  # parent -> child
-        ]
+        cv_terms = [(1, "parent term"), (2, "child term")]
+        relationships = [(1, 2)]  # parent -> child
 
-        mock_db.query.side_effect = [
-            MockQuery(observable_counts),  # observable counts
-            MockQuery([cv]),  # cv lookup
-            MockQuery(cv_terms),  # cv terms
-            MockQuery(relationships),  # relationships
-        ]
-
-        result = get_observable_tree(mock_db)
+        with use_tree(cv_terms, relationships, observable_counts):
+            result = get_observable_tree(mock_db)
 
         # Should have one root (parent term) with one child
         assert len(result.tree) == 1
@@ -514,23 +447,17 @@ class TestGetObservableTree:
         assert result.tree[0].children[0].term == "child term"
         assert result.tree[0].children[0].count == 3
 
-    def test_fallback_to_flat_when_empty_tree_from_cv(self, mock_db):
-        """Should fall back to flat list when CV produces empty tree."""
-        observable_counts = [
-            ("term1", 1),
-        ]
-        cv = MockCv(1, "observable")
-        cv_terms = []  # No terms in CV
-
-        mock_db.query.side_effect = [
-            MockQuery(observable_counts),  # observable counts
-            MockQuery([cv]),  # cv lookup
-            MockQuery(cv_terms),  # no cv terms
-            MockQuery([]),  # no relationships
-        ]
+    def test_sorts_terms_by_name(self, mock_db):
+        """Should order roots and children by term name."""
+        cv_terms = [(1, "viability"), (2, "colony morphology"), (3, "filamentous growth"),
+                    (4, "chlamydospore formation")]
+        relationships = [(2, 3), (2, 4)]
 
-        result = get_observable_tree(mock_db)
+        with use_tree(cv_terms, relationships):
+            result = get_observable_tree(mock_db)
 
-        # Should fall back to flat list
-        assert len(result.tree) == 1
-        assert result.tree[0].term == "term1"
+        assert [node.term for node in result.tree] == ["colony morphology", "viability"]
+        assert [node.term for node in result.tree[0].children] == [
+            "chlamydospore formation", "filamentous growth",
+        ]
+        assert result.tree[1].count == 0
@@ -0,0 +1,341 @@
+"""
+Tests for the shared PubMed E-utilities client.
+
+Tests cover:
+- MEDLINE text parsing and conversion to reference metadata
+- Token bucket spacing
+- Batched efetch, retries and partial failures against a local mock
+  E-utilities server
+- The on-disk record cache and revision replacement
+- Concurrent esearch
+- Reference curation metadata lookups through the client
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from cgd.api.services.curation import reference_curation_service
+from cgd.api.services.curation.reference_curation_service import (
+    ReferenceCurationError,
+    ReferenceCurationService,
+)
+from cgd.core.pubmed import (
+    EFETCH_BATCH_SIZE,
+    MedlineCache,
+    PubMedClient,
+    PubMedError,
+    TokenBucket,
+    medline_to_metadata,
+    parse_medline,
+)
+
+SAMPLE_MEDLINE = """
+PMID- 12345
+OWN - NLM
+STAT- MEDLINE
+DCOM- 20200110
+LR  - 20200315
+IS  - 1234-5678 (Electronic)
+VI  - 12
+IP  - 3
+DP  - 2019 Dec 5
+TI  - Hyphal growth of Candida albicans requires the
+      transcription factor Efg1.
+PG  - 101-110
+AB  - Candida albicans switches between yeast and hyphal forms.
+      Here we show that Efg1 is required.
+FAU - Smith, John A
+AU  - Smith JA
+AD  - Department of Microbiology, University of Somewhere,
+      Somewhere, USA.
+FAU - Doe, Jane
+AU  - Doe J
+LA  - eng
+PT  - Journal Article
+TA  - Mol Microbiol
+JT  - Molecular microbiology
+MH  - Candida albicans/*genetics/growth &
+      development
+AID - 10.1111/mmi.12345 [doi]
+AID - mmi12345 [pii]
+
+PMID- 67890
+STAT- Publisher
+DP  - 2024
+TI  - A second paper.
+AU  - Lee K
+TA  - Genetics
+"""
+
+
+def medline_record(pmid, revised="20200101", stat="MEDLINE", title=None):
+    return (
+        f"PMID- {pmid}\nSTAT- {stat}\nLR  - {revised}\nDP  - 2020 Jan\n"
+        f"TI  - {title or f'Paper {pmid}.'}\nAU  - Author{pmid} A\nTA  - Genetics\n"
+    )
+
+
+class MockEutils:
+    """State of the mock E-utilities server."""
+
+    def __init__(self):
+        self.records = {}       # pmid -> MEDLINE text
+        self.searches = {}      # term -> list of pmids
+        self.requests = []      # (endpoint, params)
+        self.fail_next = []     # status codes to return before succeeding
+        self.lock = threading.Lock()
+
+    def efetch_ids(self):
+        return [
+            [int(pmid) for pmid in params["id"].split(",")]
+            for endpoint, params in self.requests if endpoint == "efetch.fcgi"
+        ]
+
+
+@pytest.fixture
+def eutils():
+    state = MockEutils()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode())
+            params = {key: values[0] for key, values in form.items()}
+            endpoint = urlparse(self.path).path.rsplit("/", 1)[-1]
+            with state.lock:
+                state.requests.append((endpoint, params))
+                status = state.fail_next.pop(0) if state.fail_next else 200
+            if status != 200:
+                self.send_response(status)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+
+            if endpoint == "efetch.fcgi":
+                ids = [int(pmid) for pmid in params["id"].split(",")]
+                body = "\n".join(state.records[i] for i in ids if i in state.records)
+                content_type = "text/plain"
+            elif endpoint == "esearch.fcgi":
+                if params["term"] not in state.searches:
+                    result = {"ERROR": "Invalid query"}
+                else:
+                    result = {"idlist": [str(i) for i in state.searches[params["term"]]]}
+                body = json.dumps({"esearchresult": result})
+                content_type = "application/json"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}/entrez/eutils"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MedlineCache(tmp_path / "pubmed.sqlite", max_age=30 * 86400)
+
+
+@pytest.fixture
+def client(eutils, cache):
+    return PubMedClient(
+        eutils.url, TokenBucket(1000), cache=cache, email="test@example.org"
+    )
+
+
+class TestParseMedline:
+    """Tests for MEDLINE text parsing."""
+
+    def test_parses_records(self):
+        first, second = parse_medline(SAMPLE_MEDLINE)
+        assert first["PMID"] == "12345"
+        assert first["TI"] == (
+            "Hyphal growth of Candida albicans requires the transcription factor Efg1."
+        )
+        assert first["AU"] == ["Smith JA", "Doe J"]
+        assert first["AID"] == ["10.1111/mmi.12345 [doi]", "mmi12345 [pii]"]
+        assert first["MH"] == ["Candida albicans/*genetics/growth & development"]
+        assert second["PMID"] == "67890"
+        assert second["AU"] == ["Lee K"]
+
+    def test_matches_biopython(self):
+        Medline = pytest.importorskip("Bio.Medline")
+        from io import StringIO
+
+        expected = [dict(r) for r in Medline.parse(StringIO(SAMPLE_MEDLINE.lstrip()))]
+        assert list(parse_medline(SAMPLE_MEDLINE)) == expected
+
+
+class TestMedlineToMetadata:
+    """Tests for reference metadata from MEDLINE records."""
+
+    def test_full_record(self):
+        record = next(parse_medline(SAMPLE_MEDLINE))
+        metadata = medline_to_metadata(record)
+        assert metadata["title"].startswith("Hyphal growth")
+        assert metadata["journal_name"] == "Molecular microbiology"
+        assert metadata["journal_abbrev"] == "Mol Microbiol"
+        assert metadata["year"] == 2019
+        assert (metadata["volume"], metadata["issue"], metadata["pages"]) == ("12", "3", "101-110")
+        assert metadata["authors"] == [
+            {"last_name": "Smith", "first_name": "John A", "initials": "JA"},
+            {"last_name": "Doe", "first_name": "Jane", "initials": "J"},
+        ]
+        assert metadata["abstract"].endswith("Efg1 is required.")
+        assert metadata["doi"] == "10.1111/mmi.12345"
+
+    def test_short_author_names_only(self):
+        record = list(parse_medline(SAMPLE_MEDLINE))[1]
+        metadata = medline_to_metadata(record)
+        assert metadata["authors"] == [{"last_name": "Lee", "first_name": "", "initials": "K"}]
+        assert metadata["doi"] is None
+
+
+class TestTokenBucket:
+    """Tests for request spacing."""
+
+    def test_spaces_requests_at_rate(self):
+        now = [0.0]
+        bucket = TokenBucket(4, clock=lambda: now[0])
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.25, 0.5, 0.75]
+
+    def test_refills_over_time(self):
+        now = [0.0]
+        bucket = TokenBucket(4, clock=lambda: now[0])
+        bucket.reserve()
+        now[0] = 10.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.25
+
+
+class TestFetch:
+    """Tests for batched efetch against the mock server."""
+
+    def test_batches_requests(self, eutils, client):
+        pmids = list(range(1, 451))
+        eutils.records = {pmid: medline_record(pmid) for pmid in pmids}
+
+        records = client.fetch_sync(pmids)
+
+        assert sorted(records) == pmids
+        assert records[7]["TI"] == "Paper 7."
+        batches = eutils.efetch_ids()
+        assert sorted(len(batch) for batch in batches) == [50, EFETCH_BATCH_SIZE, EFETCH_BATCH_SIZE]
+        params = eutils.requests[0][1]
+        assert params["rettype"] == "medline"
+        assert params["email"] == "test@example.org"
+
+    def test_unknown_pmids_omitted(self, eutils, client):
+        eutils.records = {1: medline_record(1)}
+        assert list(client.fetch_sync([1, 2])) == [1]
+
+    def test_retries_rate_limit_and_server_errors(self, eutils, client):
+        eutils.records = {1: medline_record(1)}
+        eutils.fail_next = [429, 503]
+        assert list(client.fetch_sync([1])) == [1]
+        assert len(eutils.requests) == 3
+
+    def test_failed_batch_raises_with_partial_results(self, eutils, cache):
+        eutils.records = {pmid: medline_record(pmid) for pmid in range(1, 301)}
+        eutils.fail_next = [400]
+        client = PubMedClient(eutils.url, TokenBucket(1000), cache=cache, max_concurrency=1)
+
+        with pytest.raises(PubMedError) as excinfo:
+            client.fetch_sync(range(1, 301))
+
+        assert sorted(excinfo.value.failed) == list(range(1, EFETCH_BATCH_SIZE + 1))
+        assert sorted(excinfo.value.partial) == list(range(EFETCH_BATCH_SIZE + 1, 301))
+
+
+class TestCache:
+    """Tests for the on-disk MEDLINE cache."""
+
+    def test_second_fetch_served_from_cache(self, eutils, client, cache):
+        eutils.records = {pmid: medline_record(pmid) for pmid in range(1, 11)}
+        client.fetch_sync(range(1, 6))
+        eutils.requests.clear()
+
+        # A new client on the same file, as in another worker
+        other = PubMedClient(eutils.url, TokenBucket(1000), cache=MedlineCache(cache.path, 86400))
+        records = other.fetch_sync(range(1, 11))
+
+        assert sorted(records) == list(range(1, 11))
+        assert eutils.efetch_ids() == [[6, 7, 8, 9, 10]]
+
+    def test_refresh_replaces_old_revision(self, eutils, client, cache):
+        eutils.records = {1: medline_record(1, revised="20200101", title="Old.")}
+        client.fetch_sync([1])
+        eutils.records = {1: medline_record(1, revised="20240101", title="New.")}
+
+        assert client.fetch_sync([1])[1]["TI"] == "Old."
+        assert client.fetch_sync([1], refresh=True)[1]["TI"] == "New."
+        assert cache.get_many([1])[1]["LR"] == "20240101"
+
+    def test_in_process_records_expire_sooner(self, tmp_path):
+        cache = MedlineCache(tmp_path / "c.sqlite", max_age=86400, in_process_max_age=-1)
+        cache.put_many([
+            next(parse_medline(medline_record(1, stat="MEDLINE"))),
+            next(parse_medline(medline_record(2, stat="In-Process"))),
+        ])
+        assert list(cache.get_many([1, 2])) == [1]
+
+    def test_unwritable_cache_is_skipped(self, eutils, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        client = PubMedClient(
+            eutils.url, TokenBucket(1000), cache=MedlineCache(blocker / "c.sqlite", 86400)
+        )
+        eutils.records = {1: medline_record(1)}
+        assert list(client.fetch_sync([1])) == [1]
+
+
+class TestSearch:
+    """Tests for concurrent esearch."""
+
+    def test_search_many(self, eutils, client):
+        eutils.searches = {"efg1": [3, 2, 1], "cph1": []}
+        results = client.search_many_sync(["efg1", "bad query", "cph1"])
+        assert results[0] == [3, 2, 1]
+        assert isinstance(results[1], PubMedError)
+        assert results[2] == []
+        assert {params["retmode"] for _, params in eutils.requests} == {"json"}
+
+
+class TestReferenceCurationMetadata:
+    """Tests for fetch_pubmed_metadata through the shared client."""
+
+    @pytest.fixture
+    def service(self, monkeypatch, client):
+        monkeypatch.setattr(reference_curation_service, "get_pubmed_client", lambda: client)
+        return ReferenceCurationService(MagicMock())
+
+    def test_returns_metadata(self, eutils, service):
+        eutils.records = {12345: SAMPLE_MEDLINE.split("\n\n")[0]}
+        metadata = service.fetch_pubmed_metadata(12345)
+        assert metadata["journal_abbrev"] == "Mol Microbiol"
+        assert metadata["authors"][0]["last_name"] == "Smith"
+
+    def test_unknown_pmid(self, service):
+        with pytest.raises(ReferenceCurationError):
+            service.fetch_pubmed_metadata(99999)
+
+    def test_server_error(self, eutils, service):
+        eutils.fail_next = [404]
+        with pytest.raises(ReferenceCurationError):
+            service.fetch_pubmed_metadata(12345)
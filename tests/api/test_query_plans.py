@@ -0,0 +1,188 @@
+"""
+Query-plan regression tests for name and current-row lookups.
+
+Runs hot service functions against tables created from the models plus
+the DDL migrations, captures the SQL they send and asserts that the
+database plans each lookup through the index created for it
+(``cgd/db/migrations/v0001_name_indexes.py``). Uses a SQLite file by
+default; set ``QUERY_PLAN_DATABASE_URL`` to a scratch PostgreSQL database
+to check PostgreSQL plans instead (its tables are dropped and recreated).
+
+Prefix ``LIKE`` searches on ``UPPER(...)`` are not checked: SQLite never
+uses an expression index for ``LIKE``.
+
+Tests cover:
+- Migration runner: discovery, recording and idempotent re-runs
+- Identifier resolution, locus name lookup and batch feature resolution
+- Sequence lookups for a feature (sequence and BLAST services)
+"""
+import os
+from datetime import datetime
+
+import pytest
+
+from cgd.api.crud.locus_crud import get_features_for_locus_name
+from cgd.api.services import batch_download_service, blast_service, search_service
+from cgd.api.services import sequence_service
+from cgd.db import migrations
+from cgd.models.models import (
+    Alias,
+    Dbxref,
+    FeatAlias,
+    FeatLocation,
+    Feature,
+    Go,
+    Organism,
+    Reference,
+    Seq,
+)
+from cgd.schemas.sequence_schema import SeqType
+from tests.query_plans import capture_selects, explain
+from tests.sqlite_schema import schema_session
+
+MODELS = (Feature, Organism, Alias, FeatAlias, FeatLocation, Seq, Reference, Go, Dbxref)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Migrated tables with one feature (ACT1 / orf19.5007) with an alias,
+    a genomic sequence and a current and a retired location.
+    """
+    url = os.environ.get("QUERY_PLAN_DATABASE_URL") or f"sqlite:///{tmp_path / 'plans.db'}"
+    session = schema_session(url, *MODELS)
+    engine = session.get_bind()
+    migrations.schema_migration.drop(engine, checkfirst=True)
+    migrations.upgrade(engine)
+
+    session.add(Organism(
+        organism_no=1, organism_name="Candida albicans SC5314",
+        organism_abbrev="C_albicans_SC5314", taxon_id=237561,
+        taxonomic_rank="Strain", organism_order=1, created_by="test",
+    ))
+    for feature_no, name, gene in [(1, "Ca22chr1A", None), (2, "orf19.5007", "ACT1")]:
+        session.add(Feature(
+            feature_no=feature_no, organism_no=1, feature_name=name, gene_name=gene,
+            dbxref_id=f"CAL000000{feature_no}", feature_type="ORF", source="CGD",
+            created_by="test",
+        ))
+    session.add(Alias(alias_no=1, alias_name="CaACT1", alias_type="Uniform", created_by="test"))
+    session.add(FeatAlias(feat_alias_no=1, feature_no=2, alias_no=1))
+    for seq_no, feature_no in [(1, 1), (2, 2)]:
+        session.add(Seq(
+            seq_no=seq_no, feature_no=feature_no, genome_version_no=1,
+            seq_version=datetime(2024, 1, 1),
+            seq_type="genomic", source="CGD", is_seq_current="Y", seq_length=12,
+            residues="ATGGATGGTGAA", created_by="test",
+        ))
+    for feat_location_no, year, current in [(1, 2023, "N"), (2, 2024, "Y")]:
+        session.add(FeatLocation(
+            feat_location_no=feat_location_no, feature_no=2, root_seq_no=1,
+            coord_version=datetime(year, 1, 1), start_coord=100, stop_coord=111,
+            strand="W", is_loc_current=current, created_by="test",
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+def assert_plans(db, statements, expected):
+    """
+    Each statement containing an ``expected`` SQL fragment is planned
+    through every index listed for it. Fragments are lowercase and leave
+    out the schema, e.g. ``feature.gene_name) =`` for an ``UPPER(gene_name)``
+    comparison.
+    """
+    engine = db.get_bind()
+    for fragment, indexes in expected.items():
+        matching = [(sql, params) for sql, params in statements if fragment in sql.lower()]
+        assert matching, f"no captured statement contains {fragment!r}"
+        for sql, params in matching:
+            plan = explain(engine, sql, params)
+            for index in indexes:
+                assert index in plan, f"{index} not used for {fragment!r}:\n{sql}\n{plan}"
+
+
+class TestMigrations:
+    """Tests for the DDL migration runner."""
+
+    def test_discovers_versions_in_order(self):
+        found = migrations.discover()
+        assert [m.version for m in found] == sorted(m.version for m in found)
+        assert found[0].name == "v0001_name_indexes"
+
+    def test_records_and_skips_applied(self, db):
+        engine = db.get_bind()
+
+        assert migrations.pending(engine) == []
+        assert migrations.upgrade(engine) == []
+
+    def test_rerun_with_existing_indexes(self, db):
+        engine = db.get_bind()
+        migrations.schema_migration.drop(engine)
+
+        assert [m.version for m in migrations.upgrade(engine)] == [1]
+
+
+class TestNameLookupPlans:
+    """Tests that case-insensitive name lookups use the upper_* indexes."""
+
+    def test_resolve_identifier(self, db):
+        with capture_selects(db.get_bind()) as statements:
+            assert search_service.resolve_identifier(db, "nosuchgene").resolved is False
+
+        assert_plans(db, statements, {
+            "feature.gene_name) =": ["upper_gene_name_i"],
+            "feature.feature_name) =": ["upper_feature_name_i"],
+            "feature.dbxref_id) =": ["upper_feat_dbxref_id_i"],
+            "reference.dbxref_id) =": ["upper_ref_dbxref_id_i"],
+        })
+
+    def test_locus_name_and_alias(self, db):
+        with capture_selects(db.get_bind()) as statements:
+            features = get_features_for_locus_name(db, "caact1")
+
+        assert [f.feature_name for f in features] == ["orf19.5007"]
+        assert_plans(db, statements, {
+            "feature.gene_name) =": ["upper_gene_name_i", "upper_feature_name_i"],
+            "alias.alias_name) =": ["upper_alias_name_i"],
+        })
+
+    def test_batch_resolve_features(self, db):
+        with capture_selects(db.get_bind()) as statements:
+            found, not_found = batch_download_service.resolve_features(
+                db, ["act1", "CAL0000002", "missing"]
+            )
+
+        assert [f.feature_name for f in found] == ["orf19.5007"]
+        assert [n.query for n in not_found] == ["missing"]
+        assert_plans(db, statements, {
+            "feature.gene_name) in": [
+                "upper_gene_name_i", "upper_feature_name_i", "upper_feat_dbxref_id_i",
+            ],
+            "feat_location.is_loc_current =": ["fl_feat_current_i"],
+        })
+
+
+class TestCurrentRowPlans:
+    """Tests that current sequence/location lookups use the composite indexes."""
+
+    def test_sequence_by_feature(self, db):
+        with capture_selects(db.get_bind()) as statements:
+            response = sequence_service.get_sequence_by_feature(db, "ACT1", SeqType.GENOMIC)
+
+        assert response.info.start == 100
+        assert_plans(db, statements, {
+            "seq.seq_type =": ["seq_feat_type_current_i"],
+            "feat_location.is_loc_current =": ["fl_feat_current_i"],
+        })
+
+    def test_blast_sequence_for_locus(self, db):
+        with capture_selects(db.get_bind()) as statements:
+            header, residues = blast_service._get_sequence_for_locus(db, "orf19.5007")
+
+        assert header == "ACT1"
+        assert_plans(db, statements, {
+            "feature.feature_name) =": ["upper_feature_name_i"],
+            "seq.seq_type =": ["seq_feat_type_current_i"],
+        })
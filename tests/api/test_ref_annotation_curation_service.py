@@ -7,7 +7,8 @@ Tests cover:
 - Literature guide entry management (delete, transfer)
 - GO annotation management (delete, transfer)
 - REF_LINK management (delete, transfer)
-- Bulk operations (delete, transfer)
+- Bulk operations (delete, transfer) as set-based statements on SQLite,
+  including per-table row counts and rollback on failure
 """
 import pytest
 from unittest.mock import MagicMock
@@ -17,6 +18,17 @@ from cgd.api.services.curation.ref_annotation_curation_service import (
     RefAnnotationCurationService,
     RefAnnotationCurationError,
 )
+from cgd.models.models import (
+    GoAnnotation,
+    GoQualifier,
+    GoRef,
+    GorefDbxref,
+    RefLink,
+    RefProperty,
+    Reference,
+    RefpropFeat,
+)
+from tests.sqlite_schema import sqlite_session
 
 
 class MockReference:
@@ -732,8 +744,89 @@ class TestTransferRefLinkEntry:
         assert ref_link.reference_no == 2
 
 
+GO_TABLES = (GoAnnotation, GoRef, GoQualifier, GorefDbxref)
+LIT_GUIDE_TABLES = (RefProperty, RefpropFeat)
+
+
+@pytest.fixture
+def bulk_db(tmp_path):
+    """
+    SQLite session with annotations for references 1-3.
+
+    Reference 1 cites GO annotation 1 alone (with a qualifier and support),
+    annotation 2 with reference 3 and annotation 3 with reference 2. Its
+    literature guide has a gene topic (features 10, 11), a non-gene topic
+    and an unrelated property; reference 2 already links feature 11 to the
+    gene topic. Of its ref_links, one is shared with reference 3 and one
+    with reference 2.
+    """
+    db = sqlite_session(
+        tmp_path / "ref_annotation.db",
+        Reference, RefLink, *GO_TABLES, *LIT_GUIDE_TABLES,
+    )
+    for reference_no in (1, 2, 3):
+        db.add(Reference(
+            reference_no=reference_no, source="PubMed", status="Published",
+            pdf_status="N", dbxref_id=f"CGD_REF{reference_no}",
+            citation=f"Citation {reference_no}", year=2024,
+            created_by="test",
+        ))
+    for go_annotation_no in (1, 2, 3):
+        db.add(GoAnnotation(
+            go_annotation_no=go_annotation_no, go_no=go_annotation_no,
+            feature_no=10, go_evidence="IDA", annotation_type="manually curated",
+            source="CGD", created_by="test",
+        ))
+    for go_ref_no, reference_no, go_annotation_no, flag in [
+        (1, 1, 1, "Y"), (2, 1, 2, "N"), (3, 3, 2, "N"),
+        (4, 1, 3, "N"), (5, 2, 3, "N"),
+    ]:
+        db.add(GoRef(
+            go_ref_no=go_ref_no, reference_no=reference_no,
+            go_annotation_no=go_annotation_no, has_qualifier=flag,
+            has_supporting_evidence=flag, created_by="test",
+        ))
+    db.add(GoQualifier(go_ref_no=1, qualifier="contributes_to"))
+    db.add(GorefDbxref(go_ref_no=1, dbxref_no=99, support_type="With"))
+
+    for ref_property_no, reference_no, property_type, value in [
+        (1, 1, "Topic", "Phenotype"),
+        (2, 1, "Topic", "Review"),
+        (3, 1, "Other", "Kept"),
+        (4, 2, "Topic", "Phenotype"),
+    ]:
+        db.add(RefProperty(
+            ref_property_no=ref_property_no, reference_no=reference_no,
+            source="CGD", property_type=property_type, property_value=value,
+            created_by="test",
+        ))
+    for ref_property_no, feature_no in [(1, 10), (1, 11), (4, 11)]:
+        db.add(RefpropFeat(
+            ref_property_no=ref_property_no, feature_no=feature_no, created_by="test",
+        ))
+
+    for ref_link_no, reference_no, tab_name, primary_key in [
+        (1, 1, "FEATURE", 10), (2, 1, "FEATURE", 11), (3, 3, "FEATURE", 11),
+        (4, 1, "PHENO_ANNOTATION", 5), (5, 2, "PHENO_ANNOTATION", 5),
+    ]:
+        db.add(RefLink(
+            ref_link_no=ref_link_no, reference_no=reference_no, tab_name=tab_name,
+            primary_key=primary_key, col_name="ID", created_by="test",
+        ))
+    db.commit()
+    yield db
+    db.close()
+
+
+def _rows(db, *columns, **filters):
+    query = db.query(*columns)
+    for name, value in filters.items():
+        query = query.filter(getattr(columns[0].class_, name) == value)
+    return sorted(query.all())
+
+
 class TestBulkDelete:
-    """Tests for bulk delete operations."""
+    """Tests for set-based bulk delete."""
 
     def test_raises_for_invalid_entry_type(self, mock_db):
         """Should raise error for invalid entry type."""
@@ -743,62 +836,63 @@ class TestBulkDelete:
             service.bulk_delete(1, "invalid_type", "curator1")
 
         assert "Invalid entry type" in str(exc_info.value)
-
-    def test_bulk_deletes_lit_guide(self, mock_db):
-        """Should bulk delete literature guide entries."""
-        ref_prop = MockRefProperty(1, 1, "Topic", "Phenotype")
-        refprop_feat = MockRefpropFeat(1, 1, 1)
-
-        mock_db.query.side_effect = [
-            MockQuery([ref_prop]),  # RefProperties
-            MockQuery([refprop_feat]),  # Children
-        ]
-
-        service = RefAnnotationCurationService(mock_db)
-        result = service.bulk_delete(1, "lit_guide", "curator1")
-
-        assert result["success"] is True
-        mock_db.delete.assert_called()
-
-    def test_bulk_deletes_go_annotation(self, mock_db):
-        """Should bulk delete GO annotation entries."""
-        go_ref = MockGoRef(1, 1, 1)
-
-        # Mock the query().filter().delete() chain for GoQualifier and GorefDbxref
-        mock_delete_query = MagicMock()
-        mock_delete_query.delete.return_value = 0
-
-        mock_db.query.side_effect = [
-            MockQuery([go_ref]),  # GoRefs
-            mock_delete_query,  # GoQualifier delete
-            mock_delete_query,  # GorefDbxref delete
-            MockQuery([0]),  # No remaining go_refs
-            MockQuery([]),  # GoAnnotation
-        ]
-
-        service = RefAnnotationCurationService(mock_db)
-        result = service.bulk_delete(1, "go_annotation", "curator1")
-
-        assert result["success"] is True
-
-    def test_bulk_deletes_ref_link(self, mock_db):
-        """Should bulk delete ref_link entries."""
-        ref_link = MockRefLink(1, 1, "FEATURE", "FEATURE_NO", 1)
-
-        mock_db.query.side_effect = [
-            MockQuery([ref_link]),  # RefLinks
-            MockQuery([0]),  # No remaining links
-        ]
-
-        service = RefAnnotationCurationService(mock_db)
-        result = service.bulk_delete(1, "ref_link", "curator1")
-
-        assert result["success"] is True
-        assert result["count"] == 1
+        mock_db.rollback.assert_called_once()
+
+    def test_bulk_deletes_lit_guide(self, bulk_db):
+        """Should delete topics and feature links, counting both kinds of entry."""
+        result = RefAnnotationCurationService(bulk_db).bulk_delete(1, "lit_guide", "curator1")
+
+        assert result["count"] == 3
+        assert result["counts"] == {"deleted": {"refprop_feat": 2, "ref_property": 2}}
+        assert _rows(bulk_db, RefProperty.ref_property_no) == [(3,), (4,)]
+        assert _rows(bulk_db, RefpropFeat.ref_property_no) == [(4,)]
+
+    def test_bulk_deletes_go_annotation(self, bulk_db):
+        """Should delete go_refs and only the annotations left unreferenced."""
+        result = RefAnnotationCurationService(bulk_db).bulk_delete(1, "go_annotation", "curator1")
+
+        assert result["count"] == 3
+        assert result["counts"]["deleted"] == {
+            "go_qualifier": 1,
+            "goref_dbxref": 1,
+            "go_ref": 3,
+            "go_annotation": 1,
+        }
+        assert _rows(bulk_db, GoAnnotation.go_annotation_no) == [(2,), (3,)]
+        assert _rows(bulk_db, GoRef.go_ref_no) == [(3,), (5,)]
+        assert _rows(bulk_db, GoQualifier.go_ref_no) == []
+
+    def test_bulk_deletes_ref_link(self, bulk_db):
+        """Should delete ref_links and warn about data left without a reference."""
+        result = RefAnnotationCurationService(bulk_db).bulk_delete(1, "ref_link", "curator1")
+
+        assert result["count"] == 3
+        assert result["counts"] == {"deleted": {"ref_link": 3}}
+        assert "Warning: 1 data entries are now orphaned" in result["messages"]
+        assert _rows(bulk_db, RefLink.ref_link_no) == [(3,), (5,)]
+
+    def test_rolls_back_on_failure(self, bulk_db, monkeypatch):
+        """A failure part way through should leave every table untouched."""
+        service = RefAnnotationCurationService(bulk_db)
+        original_delete = service._delete
+        calls = []
+
+        def failing_delete(query):
+            calls.append(query)
+            if len(calls) == 3:
+                raise RuntimeError("connection lost")
+            return original_delete(query)
+
+        monkeypatch.setattr(service, "_delete", failing_delete)
+        with pytest.raises(RuntimeError):
+            service.bulk_delete(1, "go_annotation", "curator1")
+
+        assert len(_rows(bulk_db, GoQualifier.go_ref_no)) == 1
+        assert len(_rows(bulk_db, GoRef.go_ref_no)) == 5
 
 
 class TestBulkTransfer:
-    """Tests for bulk transfer operations."""
+    """Tests for set-based bulk transfer."""
 
     def test_raises_for_unknown_target(self, mock_db):
         """Should raise error for unknown target reference."""
@@ -822,22 +916,55 @@ class TestBulkTransfer:
 
         assert "Invalid entry type" in str(exc_info.value)
 
-    def test_bulk_transfers_ref_link(self, mock_db, sample_references):
-        """Should bulk transfer ref_link entries."""
-        ref_link = MockRefLink(1, 1, "FEATURE", "FEATURE_NO", 1)
-
-        mock_db.query.side_effect = [
-            MockQuery([sample_references[1]]),  # Target reference
-            MockQuery([ref_link]),  # RefLinks to transfer
-            MockQuery([sample_references[1]]),  # Verify target for transfer_ref_link_entry
-            MockQuery([ref_link]),  # RefLink
-            MockQuery([]),  # No existing link
+    def test_raises_for_same_reference(self, bulk_db):
+        """Should refuse to transfer entries onto their own reference."""
+        with pytest.raises(RefAnnotationCurationError):
+            RefAnnotationCurationService(bulk_db).bulk_transfer(1, "go_annotation", 1, "curator1")
+        assert len(_rows(bulk_db, GoRef.go_ref_no, reference_no=1)) == 3
+
+    def test_bulk_transfers_lit_guide(self, bulk_db):
+        """Should reuse the new reference's topics and skip existing links."""
+        result = RefAnnotationCurationService(bulk_db).bulk_transfer(1, "lit_guide", 2, "curator1")
+
+        assert result["count"] == 3
+        assert result["counts"]["inserted"] == {"ref_property": 1, "refprop_feat": 1}
+        assert _rows(
+            bulk_db, RefProperty.property_type, RefProperty.property_value, reference_no=2
+        ) == [("Topic", "Phenotype"), ("Topic", "Review")]
+        assert _rows(bulk_db, RefpropFeat.feature_no, ref_property_no=4) == [(10,), (11,)]
+        assert _rows(bulk_db, RefProperty.ref_property_no, reference_no=1) == [(3,)]
+
+    def test_bulk_transfers_go_annotation(self, bulk_db):
+        """Should copy go_refs with their qualifiers and support."""
+        result = RefAnnotationCurationService(bulk_db).bulk_transfer(1, "go_annotation", 2, "curator1")
+
+        assert result["count"] == 3
+        assert result["counts"]["inserted"] == {
+            "go_ref": 2, "go_qualifier": 1, "goref_dbxref": 1,
+        }
+        assert _rows(bulk_db, GoRef.go_annotation_no, reference_no=2) == [(1,), (2,), (3,)]
+        assert _rows(bulk_db, GoRef.go_ref_no, reference_no=1) == []
+        new_go_ref_no = (
+            bulk_db.query(GoRef.go_ref_no)
+            .filter(GoRef.reference_no == 2, GoRef.go_annotation_no == 1)
+            .scalar()
+        )
+        assert _rows(bulk_db, GoQualifier.go_ref_no, GoQualifier.qualifier) == [
+            (new_go_ref_no, "contributes_to")
         ]
-
-        service = RefAnnotationCurationService(mock_db)
-        result = service.bulk_transfer(1, "ref_link", 2, "curator1")
-
-        assert result["success"] is True
+        assert _rows(bulk_db, GorefDbxref.go_ref_no) == [(new_go_ref_no,)]
+        assert _rows(bulk_db, GoRef.created_by, reference_no=2)[0] == ("curator1",)
+
+    def test_bulk_transfers_ref_link(self, bulk_db):
+        """Should repoint ref_links, dropping those the new reference has."""
+        result = RefAnnotationCurationService(bulk_db).bulk_transfer(1, "ref_link", 2, "curator1")
+
+        assert result["count"] == 3
+        assert result["counts"] == {
+            "updated": {"ref_link": 2},
+            "deleted": {"ref_link": 1},
+        }
+        assert _rows(bulk_db, RefLink.ref_link_no, reference_no=2) == [(1,), (2,), (5,)]
 
 
 class TestServiceInitialization:
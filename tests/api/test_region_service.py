@@ -0,0 +1,181 @@
+"""
+Tests for Region Service.
+
+Tests cover:
+- Region feature queries (overlap, upstream, downstream, nearest)
+- Request validation and unknown chromosomes
+- Index caching per root, genome version changes, expiry and invalidation
+- Features on named root sequences
+"""
+import pytest
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+
+from cgd.api.services.region_service import (
+    RegionIndexCache,
+    RootSeq,
+    feature_nos_on_roots,
+    get_region_features,
+    invalidate_region_index,
+)
+
+
+class MockQuery:
+    """Mock SQLAlchemy query."""
+
+    def __init__(self, results=None):
+        self._results = results or []
+
+    def join(self, *args, **kwargs):
+        return self
+
+    def filter(self, *args, **kwargs):
+        return self
+
+    def all(self):
+        return self._results
+
+
+ROOT_ROW = (100, "Ca22chr1A_C_albicans_SC5314", 10000, 7, "A22-s07-m01-r01")
+
+LOCATIONS = [
+    (1, "orf19.1", "ALS1", "ORF", 100, 400, "W"),
+    (2, "orf19.2", None, "ORF", 900, 600, "C"),
+    (3, "orf19.3", "TUP1", "ORF", 1000, 1300, "W"),
+    (4, "orf19.3.intron", None, "intron", 1100, 1150, "W"),
+    (5, "orf19.5", None, "ORF", 5000, 5500, "W"),
+]
+
+
+@pytest.fixture
+def mock_db():
+    """Mock session answering the root lookup, then the location load."""
+    db = MagicMock()
+    db.query.side_effect = [MockQuery([ROOT_ROW]), MockQuery(LOCATIONS)]
+    return db
+
+
+class TestGetRegionFeatures:
+    """Tests for get_region_features."""
+
+    def test_overlap(self, mock_db):
+        result = get_region_features(mock_db, "ca22chr1a_c_albicans_sc5314", 850, 1120)
+
+        assert result.chromosome == "Ca22chr1A_C_albicans_SC5314"
+        assert result.genome_version == "A22-s07-m01-r01"
+        assert [f.feature_no for f in result.features] == [2, 3, 4]
+        assert all(f.distance == 0 for f in result.features)
+        assert result.features[0].start_coord == 900
+        assert result.features[0].stop_coord == 600
+
+    def test_position_only(self, mock_db):
+        result = get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 200)
+
+        assert result.end == 200
+        assert [f.feature_name for f in result.features] == ["orf19.1"]
+
+    def test_upstream(self, mock_db):
+        result = get_region_features(
+            mock_db, "Ca22chr1A_C_albicans_SC5314", 1400, 1500, mode="upstream", k=2
+        )
+
+        assert [f.feature_no for f in result.features] == [3, 4]
+        assert [f.distance for f in result.features] == [100, 250]
+
+    def test_downstream(self, mock_db):
+        result = get_region_features(
+            mock_db, "Ca22chr1A_C_albicans_SC5314", 450, 500, mode="downstream", k=2
+        )
+
+        assert [f.feature_no for f in result.features] == [2, 3]
+        assert [f.distance for f in result.features] == [100, 500]
+
+    def test_nearest(self, mock_db):
+        result = get_region_features(
+            mock_db, "Ca22chr1A_C_albicans_SC5314", 1125, mode="nearest", k=3
+        )
+
+        assert [f.feature_no for f in result.features] == [3, 4, 2]
+        assert [f.distance for f in result.features] == [0, 0, 225]
+
+    def test_invalid_mode(self, mock_db):
+        with pytest.raises(HTTPException) as exc_info:
+            get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 1, mode="closest")
+
+        assert exc_info.value.status_code == 400
+
+    def test_end_before_start(self, mock_db):
+        with pytest.raises(HTTPException) as exc_info:
+            get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 500, 100)
+
+        assert exc_info.value.status_code == 400
+
+    def test_unknown_chromosome(self):
+        db = MagicMock()
+        db.query.return_value = MockQuery([])
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_region_features(db, "ChrX", 1)
+
+        assert exc_info.value.status_code == 404
+
+
+class TestRegionIndexCache:
+    """Tests for index reuse and reloading."""
+
+    def test_reuses_index(self, mock_db):
+        get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 100)
+        mock_db.query.side_effect = [MockQuery([ROOT_ROW])]
+
+        result = get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 5200)
+
+        assert mock_db.query.call_count == 3
+        assert [f.feature_no for f in result.features] == [5]
+
+    def test_reloads_on_genome_version_change(self, mock_db):
+        get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 100)
+        new_version = (100, ROOT_ROW[1], 10000, 8, "A22-s07-m01-r02")
+        mock_db.query.side_effect = [
+            MockQuery([new_version]),
+            MockQuery([(9, "orf19.9", None, "ORF", 50, 150, "W")]),
+        ]
+
+        result = get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 100)
+
+        assert result.genome_version == "A22-s07-m01-r02"
+        assert [f.feature_no for f in result.features] == [9]
+
+    def test_invalidate(self, mock_db):
+        get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 100)
+        invalidate_region_index()
+        mock_db.query.side_effect = [MockQuery([ROOT_ROW]), MockQuery([])]
+
+        result = get_region_features(mock_db, "Ca22chr1A_C_albicans_SC5314", 100)
+
+        assert result.features == []
+
+    def test_expires_entries(self):
+        now = [0.0]
+        cache = RegionIndexCache(max_age=60, clock=lambda: now[0])
+        root = RootSeq(*ROOT_ROW)
+        db = MagicMock()
+        db.query.side_effect = [MockQuery(LOCATIONS), MockQuery(LOCATIONS[:1])]
+
+        first = cache.get(db, root)
+        now[0] = 30.0
+        assert cache.get(db, root) is first
+        now[0] = 61.0
+        assert len(cache.get(db, root).index) == 1
+        assert db.query.call_count == 2
+
+
+class TestFeatureNosOnRoots:
+    """Tests for feature_nos_on_roots."""
+
+    def test_collects_features(self, mock_db):
+        assert feature_nos_on_roots(mock_db, ["Ca22chr1A_C_albicans_SC5314"]) == {1, 2, 3, 4, 5}
+
+    def test_no_names(self):
+        db = MagicMock()
+        assert feature_nos_on_roots(db, []) == set()
+        db.query.assert_not_called()
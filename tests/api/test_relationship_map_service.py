@@ -0,0 +1,133 @@
+"""
+Tests for Relationship Map Service.
+
+Tests cover:
+- Indexing Assembly 21/22 and allele relationships
+- Assembly 21 exclusion sets (direct and alleles)
+- Map reuse, version checks and invalidation
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from cgd.api.services.relationship_map_service import (
+    RelationshipMapCache,
+    build_relationship_map,
+    get_relationship_map,
+    invalidate_relationship_map,
+)
+
+
+A21 = "Assembly 21 Primary Allele"
+
+# (parent_no, parent_name, child_no, child_name, child_type, relationship_type, rank)
+ROWS = [
+    (1, "C1_00010W_A", 11, "orf19.6115", "ORF", A21, 3),
+    (2, "C1_00020C_A", 12, "orf19.6116", "ORF", A21, 1),
+    (2, "C1_00020C_A", 13, "orf19.6117", "ORF", A21, 3),
+    (11, "orf19.6115", 21, "orf19.13515", "ORF", "allele", 3),
+    (1, "C1_00010W_A", 31, "C1_00010W_B", "allele", "allele", 3),
+    (1, "C1_00010W_A", 32, "C1_00010W_C", "Allele", "allele", 1),
+    (1, "C1_00010W_A", 33, "C1_00010W_D", "ORF", "allele", 3),
+]
+
+
+class MockQuery:
+    """Mock SQLAlchemy query."""
+
+    def __init__(self, results=None):
+        self._results = results or []
+
+    def join(self, *args, **kwargs):
+        return self
+
+    def filter(self, *args, **kwargs):
+        return self
+
+    def order_by(self, *args):
+        return self
+
+    def one(self):
+        return self._results[0]
+
+    def all(self):
+        return self._results
+
+
+class TestBuildRelationshipMap:
+    """Tests for build_relationship_map."""
+
+    @pytest.fixture
+    def relationship_map(self):
+        return build_relationship_map(ROWS, version=(7, 107))
+
+    def test_a21_for_a22(self, relationship_map):
+        assert relationship_map.a21_for_a22(1) == (11, "orf19.6115")
+        assert relationship_map.a21_for_a22(2) == (12, "orf19.6116")
+        assert relationship_map.a21_for_a22(2, rank=3) == (13, "orf19.6117")
+        assert relationship_map.a21_for_a22(99) is None
+
+    def test_a22_for_a21_uses_rank_3(self, relationship_map):
+        assert relationship_map.a22_for_a21(11) == 1
+        assert relationship_map.a22_for_a21(13) == 2
+        assert relationship_map.a22_for_a21(12) is None
+
+    def test_orf19_for_name(self, relationship_map):
+        assert relationship_map.orf19_for_name("c1_00010w_a") == "orf19.6115"
+        assert relationship_map.orf19_for_name("C1_99999W_A") is None
+
+    def test_alleles_of_keeps_allele_features(self, relationship_map):
+        assert relationship_map.alleles_of(1) == [31, 32]
+        assert relationship_map.alleles_of(2) == []
+
+    def test_exclusions(self, relationship_map):
+        assert relationship_map.a21_with_a22 == {11, 13}
+        assert relationship_map.a21_exclusions == {11, 13, 21}
+
+    def test_empty(self):
+        relationship_map = build_relationship_map([])
+        assert relationship_map.a21_exclusions == frozenset()
+        assert relationship_map.orf19_for_name("C1_00010W_A") is None
+
+
+class TestRelationshipMapCache:
+    """Tests for map reuse and refresh."""
+
+    def test_checks_version_after_interval(self):
+        now = [0.0]
+        cache = RelationshipMapCache(check_interval=60, clock=lambda: now[0])
+        db = MagicMock()
+        db.query.side_effect = [
+            MockQuery([(7, 107)]),  # Version
+            MockQuery(ROWS),  # Load
+            MockQuery([(7, 107)]),  # Version unchanged
+            MockQuery([(8, 108)]),  # Version changed
+            MockQuery(ROWS[:1]),  # Reload
+        ]
+
+        first = cache.get(db)
+        now[0] = 30.0
+        assert cache.get(db) is first
+        assert db.query.call_count == 2
+
+        now[0] = 61.0
+        assert cache.get(db) is first
+        assert db.query.call_count == 3
+
+        now[0] = 122.0
+        refreshed = cache.get(db)
+        assert refreshed.version == (8, 108)
+        assert refreshed.a21_exclusions == {11}
+
+    def test_invalidate(self):
+        db = MagicMock()
+        db.query.side_effect = [
+            MockQuery([(7, 107)]),
+            MockQuery(ROWS),
+            MockQuery([(7, 107)]),
+            MockQuery([]),
+        ]
+
+        assert get_relationship_map(db).a21_exclusions == {11, 13, 21}
+        invalidate_relationship_map()
+
+        assert get_relationship_map(db).a21_exclusions == frozenset()
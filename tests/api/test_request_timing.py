@@ -0,0 +1,198 @@
+"""
+Tests for per-request SQL instrumentation.
+
+Tests cover:
+- SQL shape normalization
+- Cursor listeners accumulating statements, time and rows
+- Slow query and N+1 logging
+- Server-Timing header and request log line from the middleware
+- Per-request profiling switch
+"""
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from cgd.core.request_timing import RequestTimingMiddleware
+from cgd.core.settings import settings
+from cgd.db.query_stats import (
+    QueryStats,
+    get_query_stats,
+    install_query_listeners,
+    log_query_stats,
+    normalize_statement,
+    start_query_stats,
+    stop_query_stats,
+)
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with the listeners installed."""
+    eng = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    install_query_listeners(eng)
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE feature (feature_no INTEGER, name TEXT)"))
+        conn.execute(text("INSERT INTO feature VALUES (1, 'ACT1'), (2, 'TUB1')"))
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def app(engine):
+    """Small app with one endpoint issuing a query per feature."""
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+
+    @app.get("/features/{count}")
+    def features(count: int):
+        with engine.connect() as conn:
+            for i in range(count):
+                conn.execute(
+                    text("SELECT name FROM feature WHERE feature_no = :n"), {"n": i}
+                )
+        return {"ok": True}
+
+    return app
+
+
+class TestNormalizeStatement:
+    """Tests for normalize_statement."""
+
+    def test_collapses_whitespace(self):
+        assert normalize_statement("SELECT  a\n  FROM t") == "SELECT a FROM t"
+
+    def test_folds_literals(self):
+        assert normalize_statement("SELECT a FROM t WHERE b = 'x' AND c = 12") == (
+            "SELECT a FROM t WHERE b = ? AND c = ?"
+        )
+
+    def test_folds_in_lists(self):
+        a = normalize_statement("SELECT a FROM t WHERE b IN (:b_1, :b_2)")
+        b = normalize_statement("SELECT a FROM t WHERE b IN (:b_1, :b_2, :b_3)")
+        assert a == b
+
+    def test_keeps_identifiers(self):
+        assert "t1.feature_no" in normalize_statement("SELECT t1.feature_no FROM t t1")
+
+
+class TestQueryListeners:
+    """Tests for the cursor execute listeners."""
+
+    def test_accumulates_statements(self, engine):
+        stats = start_query_stats()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT * FROM feature")).fetchall()
+                conn.execute(text("SELECT * FROM feature")).fetchall()
+        finally:
+            stop_query_stats()
+
+        assert stats.statements == 2
+        assert stats.db_time > 0
+        assert sum(stats.shapes.values()) == 2
+        assert get_query_stats() is None
+
+    def test_counts_affected_rows(self, engine):
+        stats = start_query_stats()
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("UPDATE feature SET name = 'X'"))
+        finally:
+            stop_query_stats()
+        assert stats.rows == 2
+
+    def test_no_collection_outside_request(self, engine):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert get_query_stats() is None
+
+    def test_install_is_idempotent(self, engine):
+        install_query_listeners(engine)
+        stats = start_query_stats()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        finally:
+            stop_query_stats()
+        assert stats.statements == 1
+
+    def test_slow_statement_recorded(self, engine, monkeypatch):
+        monkeypatch.setattr(settings, "sql_slow_query_ms", 0)
+        stats = start_query_stats()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        finally:
+            stop_query_stats()
+        assert len(stats.slow) == 1
+
+
+class TestLogQueryStats:
+    """Tests for slow query and N+1 reporting."""
+
+    def test_reports_repeated_shapes(self, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "sql_n_plus_one_threshold", 2)
+        stats = QueryStats(route="/api/locus/{name}")
+        stats.shapes["SELECT a FROM t WHERE b = ?"] = 3
+        stats.shapes["SELECT c FROM u"] = 1
+
+        with caplog.at_level(logging.WARNING, logger="cgd.sql"):
+            log_query_stats(stats)
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert len(messages) == 1
+        assert "n_plus_one route=/api/locus/{name} count=3" in messages[0]
+
+    def test_reports_slow_statements(self, caplog):
+        stats = QueryStats(route="/api/go/{goid}", slow=[(1.5, "SELECT 1")])
+        with caplog.at_level(logging.WARNING, logger="cgd.sql"):
+            log_query_stats(stats)
+        assert "slow_query route=/api/go/{goid} duration_ms=1500.0" in caplog.text
+
+
+class TestRequestTimingMiddleware:
+    """Tests for the middleware."""
+
+    def test_server_timing_header(self, app):
+        response = TestClient(app).get("/features/3")
+        assert response.status_code == 200
+        header = response.headers["server-timing"]
+        assert header.startswith("db;dur=")
+        assert 'desc="3 queries"' in header
+        assert "app;dur=" in header
+
+    def test_request_log_line(self, app, caplog):
+        with caplog.at_level(logging.INFO, logger="cgd.request"):
+            TestClient(app).get("/features/2")
+        line = next(r.getMessage() for r in caplog.records if r.name == "cgd.request")
+        assert "route=/features/{count}" in line
+        assert "status=200" in line
+        assert "db_queries=2" in line
+
+    def test_n_plus_one_logged_with_route(self, app, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "sql_n_plus_one_threshold", 5)
+        with caplog.at_level(logging.WARNING, logger="cgd.sql"):
+            TestClient(app).get("/features/6")
+        assert "n_plus_one route=/features/{count} count=6" in caplog.text
+
+    def test_profiling_disabled_in_production(self, app, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "environment", "production")
+        monkeypatch.setattr(settings, "request_profile_dir", str(tmp_path))
+        TestClient(app).get("/features/1", headers={"X-CGD-Profile": "1"})
+        assert list(tmp_path.iterdir()) == []
+
+    def test_profiling_writes_collapsed_stacks(self, app, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "environment", "development")
+        monkeypatch.setattr(settings, "request_profile_dir", str(tmp_path))
+        TestClient(app).get("/features/50?_profile=1")
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1
+        assert files[0].suffix == ".folded"
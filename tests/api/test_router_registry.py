@@ -0,0 +1,127 @@
+"""
+Tests for the router registry and lazy router loading.
+
+Tests cover:
+- Every router assigned to exactly one lazy group
+- Path prefix matching on segment boundaries
+- Lazy mode serving /health without importing services, scipy or the models
+- Router groups included on first request and for the OpenAPI schema
+- Lazy attribute access on the router and service packages
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from cgd.api.routers.registry import (
+    CORE_GROUP,
+    LAZY_GROUPS,
+    ROUTER_ORDER,
+    RouterGroup,
+    load_router,
+)
+from cgd.core.settings import settings
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+LAZY_STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from cgd.main import app
+import_seconds = time.perf_counter() - started
+from fastapi.testclient import TestClient
+status = TestClient(app).get("/health").status_code
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "health_status": status,
+    "loaded": [m for m in ("scipy", "cgd.api.services.locus_service", "cgd.models.models")
+               if m in sys.modules],
+}))
+"""
+
+
+class TestRouterGroups:
+    """Tests for the group definitions."""
+
+    def test_every_router_in_one_group(self):
+        grouped = list(CORE_GROUP.routers)
+        for group in LAZY_GROUPS:
+            grouped.extend(group.routers)
+        assert sorted(grouped) == sorted(ROUTER_ORDER)
+        assert len(set(grouped)) == len(grouped)
+
+    def test_prefixes_cover_router_paths(self):
+        for group in LAZY_GROUPS:
+            for target in group.routers:
+                for route in load_router(target).routes:
+                    assert group.matches(route.path), (group.name, route.path)
+
+    def test_matches_on_segment_boundary(self):
+        group = RouterGroup("go", (), ("/api/go",))
+        assert group.matches("/api/go")
+        assert group.matches("/api/go/GO:0005634")
+        assert not group.matches("/api/go-slim-mapper/run")
+        assert not group.matches("/api/gopher")
+
+
+class TestLazyMode:
+    """Tests for lazy router registration."""
+
+    @pytest.fixture
+    def lazy_app(self, monkeypatch):
+        from cgd.main import create_app
+
+        monkeypatch.setattr(settings, "lazy_routers", True)
+        return create_app()
+
+    def test_startup_is_light(self):
+        env = dict(os.environ, CGD_LAZY_ROUTERS="true")
+        result = subprocess.run(
+            [sys.executable, "-c", LAZY_STARTUP_SCRIPT],
+            env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        assert report["health_status"] == 200
+        assert report["loaded"] == []
+
+    def test_group_loaded_on_first_request(self, lazy_app):
+        assert set(lazy_app.openapi()["paths"]) == {"/health", "/api/health"}
+
+        TestClient(lazy_app).get("/api/phenotype/search")
+        paths = set(lazy_app.openapi()["paths"])
+        assert any(p.startswith("/api/phenotype") for p in paths)
+        assert not any(p.startswith("/api/curation") for p in paths)
+
+    def test_openapi_matches_eager_mode(self, lazy_app, monkeypatch):
+        from cgd.main import create_app
+
+        monkeypatch.setattr(settings, "lazy_routers", False)
+        eager = TestClient(create_app()).get("/openapi.json").json()
+        lazy = TestClient(lazy_app).get("/openapi.json").json()
+        assert sorted(lazy["paths"]) == sorted(eager["paths"])
+
+
+class TestLazyPackages:
+    """Tests for lazy attribute access on the router and service packages."""
+
+    def test_router_package_attribute(self):
+        import cgd.api.routers as routers
+
+        assert routers.locus_router.router.prefix == "/api/locus"
+        assert "homology_router" in dir(routers)
+
+    def test_service_package_reexport(self):
+        import cgd.api.services as services
+        from cgd.api.services.chromosome_service import get_chromosome
+
+        assert services.get_chromosome is get_chromosome
+
+    def test_unknown_attribute(self):
+        import cgd.api.services as services
+
+        with pytest.raises(AttributeError):
+            services.no_such_function
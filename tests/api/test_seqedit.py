@@ -0,0 +1,197 @@
+"""
+Tests for the batch sequence edit module.
+
+Tests cover:
+- Edit constructors for curator (1-based) coordinates
+- Validation of out-of-range and overlapping edits
+- Piece table contents, length and slicing against string rebuilding
+- Coordinate remapping and feature classification
+"""
+import random
+
+import numpy as np
+import pytest
+
+from cgd.utils.seqedit import (
+    DOWNSTREAM,
+    ENCOMPASSING,
+    OVERLAP,
+    UNAFFECTED,
+    OffsetMap,
+    PieceTable,
+    SequenceEdit,
+    sort_edits,
+)
+
+
+def rebuild(original, edits):
+    """Reference implementation: apply edits right to left with slicing."""
+    result = original
+    for edit in sorted(edits, key=lambda e: (e.start, e.end), reverse=True):
+        result = result[:edit.start] + edit.replacement + result[edit.end:]
+    return result
+
+
+def random_edits(rng, length):
+    """Non-overlapping random insertions, deletions and substitutions."""
+    edits = []
+    position = 0
+    while True:
+        position += rng.randint(1, 12)
+        if position >= length:
+            return edits
+        kind = rng.choice("ids")
+        if kind == "i":
+            edits.append(SequenceEdit(position, position, "T" * rng.randint(1, 5)))
+            continue
+        end = min(length, position + rng.randint(1, 6))
+        replacement = "" if kind == "d" else "G" * rng.randint(1, 6)
+        edits.append(SequenceEdit(position, end, replacement))
+        position = end
+
+
+class TestSequenceEdit:
+    """Tests for the SequenceEdit constructors."""
+
+    def test_insertion_after_position(self):
+        edit = SequenceEdit.insertion(10, "AAA")
+        assert (edit.start, edit.end, edit.delta) == (10, 10, 3)
+
+    def test_deletion_inclusive(self):
+        edit = SequenceEdit.deletion(10, 15)
+        assert (edit.start, edit.end, edit.delta) == (9, 15, -6)
+
+    def test_substitution(self):
+        edit = SequenceEdit.substitution(10, 12, "A")
+        assert (edit.start, edit.end, edit.delta) == (9, 12, -2)
+
+
+class TestSortEdits:
+    """Tests for edit validation."""
+
+    def test_sorts_by_position(self):
+        edits = [SequenceEdit.deletion(50, 60), SequenceEdit.insertion(5, "A")]
+        assert sort_edits(edits, 100)[0].start == 5
+
+    def test_rejects_out_of_range(self):
+        with pytest.raises(ValueError):
+            sort_edits([SequenceEdit.deletion(95, 105)], 100)
+
+    def test_rejects_overlap(self):
+        with pytest.raises(ValueError):
+            sort_edits([SequenceEdit.deletion(10, 20), SequenceEdit.deletion(20, 25)], 100)
+
+    def test_rejects_two_insertions_at_one_point(self):
+        with pytest.raises(ValueError):
+            sort_edits([SequenceEdit.insertion(10, "A"), SequenceEdit.insertion(10, "C")], 100)
+
+    def test_allows_adjacent_edits(self):
+        edits = [
+            SequenceEdit.deletion(10, 20),
+            SequenceEdit.insertion(20, "A"),
+            SequenceEdit.deletion(21, 22),
+        ]
+        assert len(sort_edits(edits, 100)) == 3
+
+
+class TestPieceTable:
+    """Tests for PieceTable against string rebuilding."""
+
+    def test_no_edits(self):
+        table = PieceTable("ACGT")
+        assert str(table) == "ACGT"
+        assert len(table) == 4
+
+    def test_matches_rebuild(self):
+        rng = random.Random(3)
+        original = "".join(rng.choices("ACGT", k=2000))
+        edits = random_edits(rng, len(original))
+        rng.shuffle(edits)
+        table = PieceTable(original, edits)
+        expected = rebuild(original, edits)
+
+        assert len(table) == len(expected)
+        assert str(table) == expected
+        for _ in range(200):
+            start = rng.randint(0, len(expected))
+            stop = rng.randint(start, len(expected) + 5)
+            assert table[start:stop] == expected[start:stop]
+        assert table[-1] == expected[-1]
+
+    def test_new_start(self):
+        table = PieceTable("A" * 100, [
+            SequenceEdit.insertion(10, "CCC"),
+            SequenceEdit.substitution(50, 52, "G"),
+        ])
+        position = table.new_start(1)
+        assert table[position:position + 1] == "G"
+
+    def test_edits_at_both_ends(self):
+        table = PieceTable("ACGT", [
+            SequenceEdit.insertion(0, "TT"),
+            SequenceEdit.insertion(4, "GG"),
+        ])
+        assert str(table) == "TTACGTGG"
+
+
+class TestOffsetMap:
+    """Tests for coordinate remapping."""
+
+    @pytest.fixture
+    def offsets(self):
+        # +3 after base 100, -10 for bases 200..209, +2 for 300..301 -> 4 bases
+        return OffsetMap(sort_edits([
+            SequenceEdit.insertion(100, "AAA"),
+            SequenceEdit.deletion(200, 209),
+            SequenceEdit.substitution(300, 301, "CCCC"),
+        ], 1000))
+
+    def test_net_change(self, offsets):
+        assert offsets.net_change == -5
+
+    def test_classification(self, offsets):
+        starts = [10, 150, 90, 205, 250, 400, 101]
+        stops = [50, 180, 120, 260, 350, 500, 101]
+        new_starts, new_stops, status = offsets.remap(starts, stops)
+
+        assert list(status) == [
+            UNAFFECTED, DOWNSTREAM, ENCOMPASSING, OVERLAP,
+            ENCOMPASSING, DOWNSTREAM, DOWNSTREAM,
+        ]
+        assert list(new_starts) == [10, 153, 90, 205, 243, 395, 104]
+        assert list(new_stops) == [50, 183, 123, 260, 345, 495, 104]
+
+    def test_crick_orientation(self, offsets):
+        new_starts, new_stops, _ = offsets.remap([500], [400])
+        assert (new_starts[0], new_stops[0]) == (495, 395)
+
+    def test_agrees_with_rebuild(self):
+        rng = random.Random(11)
+        length = 3000
+        original = "".join(rng.choices("ACGT", k=length))
+        edits = sort_edits(random_edits(rng, length), length)
+        offsets = OffsetMap(edits)
+
+        # New 0-based index of every original base the edits keep
+        kept = {}
+        result_index = 0
+        cursor = 0
+        for edit in edits:
+            for i in range(cursor, edit.start):
+                kept[i] = result_index
+                result_index += 1
+            result_index += len(edit.replacement)
+            cursor = edit.end
+        for i in range(cursor, length):
+            kept[i] = result_index
+            result_index += 1
+        assert result_index == len(PieceTable(original, edits))
+
+        positions = np.arange(1, length + 1)
+        new_starts, _, status = offsets.remap(positions, positions)
+        for position, new, code in zip(positions, new_starts, status):
+            if position - 1 in kept:
+                assert code != OVERLAP
+                assert new == kept[position - 1] + 1
+            else:
+                assert code == OVERLAP
@@ -0,0 +1,204 @@
+"""
+Tests for the sequence kernels module.
+
+Tests cover:
+- Reverse complement (IUPAC, case, unknown characters)
+- Translation under tables 1 and 12
+- Batch translation
+- Codon usage and CUG counting
+- GC content and base counts
+- IUPAC expansion
+"""
+import random
+
+import pytest
+
+from cgd.utils.seqkernels import (
+    CODONS,
+    base_counts,
+    codon_counts,
+    complement,
+    count_codon,
+    count_cug_codons,
+    expand_iupac,
+    gc_content,
+    has_ambiguous_bases,
+    iupac_to_regex,
+    reverse_complement,
+    translate,
+    translate_many,
+)
+
+
+# Reference dict-based implementations the kernels must agree with
+STANDARD_CODE = {
+    "TTT": "F", "TTC": "F", "TTA": "L", "TTG": "L",
+    "TCT": "S", "TCC": "S", "TCA": "S", "TCG": "S",
+    "TAT": "Y", "TAC": "Y", "TAA": "*", "TAG": "*",
+    "TGT": "C", "TGC": "C", "TGA": "*", "TGG": "W",
+    "CTT": "L", "CTC": "L", "CTA": "L", "CTG": "L",
+    "CCT": "P", "CCC": "P", "CCA": "P", "CCG": "P",
+    "CAT": "H", "CAC": "H", "CAA": "Q", "CAG": "Q",
+    "CGT": "R", "CGC": "R", "CGA": "R", "CGG": "R",
+    "ATT": "I", "ATC": "I", "ATA": "I", "ATG": "M",
+    "ACT": "T", "ACC": "T", "ACA": "T", "ACG": "T",
+    "AAT": "N", "AAC": "N", "AAA": "K", "AAG": "K",
+    "AGT": "S", "AGC": "S", "AGA": "R", "AGG": "R",
+    "GTT": "V", "GTC": "V", "GTA": "V", "GTG": "V",
+    "GCT": "A", "GCC": "A", "GCA": "A", "GCG": "A",
+    "GAT": "D", "GAC": "D", "GAA": "E", "GAG": "E",
+    "GGT": "G", "GGC": "G", "GGA": "G", "GGG": "G",
+}
+
+
+def _reference_translate(seq: str, table: int) -> str:
+    code = dict(STANDARD_CODE)
+    if table == 12:
+        code["CTG"] = "S"
+    seq = seq.upper()
+    return "".join(code.get(seq[i:i + 3], "X") for i in range(0, len(seq) - 2, 3))
+
+
+def _random_dna(length: int, alphabet: str = "ACGT", seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+class TestReverseComplement:
+    """Tests for reverse_complement."""
+
+    def test_simple(self):
+        assert reverse_complement("ATGC") == "GCAT"
+
+    def test_preserves_case(self):
+        assert reverse_complement("AtGc") == "gCaT"
+
+    def test_iupac_codes(self):
+        assert reverse_complement("RYKMBDHVN") == "NBDHVKMRY"
+        assert reverse_complement("SW") == "WS"
+
+    def test_unknown_passes_through(self):
+        assert reverse_complement("AXG") == "CXT"
+
+    def test_unknown_replaced(self):
+        assert reverse_complement("AXG", unknown="N") == "CNT"
+
+    def test_empty(self):
+        assert reverse_complement("") == ""
+
+    def test_involution(self):
+        seq = _random_dna(1000, "ACGTNacgtn")
+        assert reverse_complement(reverse_complement(seq)) == seq
+
+    def test_complement(self):
+        assert complement("ATGC") == "TACG"
+
+
+class TestTranslate:
+    """Tests for translate and translate_many."""
+
+    def test_table_1_ctg(self):
+        assert translate("CTG", table=1) == "L"
+
+    def test_table_12_ctg(self):
+        assert translate("CTG", table=12) == "S"
+
+    def test_all_codons_match_reference(self):
+        seq = "".join(CODONS)
+        assert translate(seq, table=1) == _reference_translate(seq, 1)
+        assert translate(seq, table=12) == _reference_translate(seq, 12)
+
+    def test_lowercase(self):
+        assert translate("atggct") == "MA"
+
+    def test_ambiguous_codon(self):
+        assert translate("ATGNNNRTG") == "MXX"
+
+    def test_partial_codon_ignored(self):
+        assert translate("ATGGC") == "M"
+
+    def test_to_stop(self):
+        assert translate("ATGTAAGCT", to_stop=True) == "M"
+
+    def test_empty(self):
+        assert translate("") == ""
+
+    def test_unsupported_table(self):
+        with pytest.raises(ValueError):
+            translate("ATG", table=99)
+
+    def test_random_matches_reference(self):
+        seq = _random_dna(3001, "ACGTN", seed=1)
+        assert translate(seq, table=12) == _reference_translate(seq, 12)
+
+    def test_translate_many(self):
+        seqs = ["ATGCTGTAA", "ATGGC", "", "GGGNNN"]
+        assert translate_many(seqs, table=12) == ["MS*", "M", "", "GX"]
+
+    def test_translate_many_empty(self):
+        assert translate_many([]) == []
+
+
+class TestCodonCounts:
+    """Tests for codon usage and CUG counting."""
+
+    def test_codon_counts(self):
+        usage = codon_counts("ATGCTGCTGTAA")
+        assert len(usage) == 64
+        assert usage["ATG"] == 1
+        assert usage["CTG"] == 2
+        assert usage["TAA"] == 1
+        assert sum(usage.values()) == 4
+
+    def test_codon_counts_ambiguous(self):
+        usage = codon_counts("ATGNNN", include_ambiguous=True)
+        assert usage["NNN"] == 1
+
+    def test_count_cug_in_frame_only(self):
+        assert count_cug_codons("ACTGTGA") == 0
+        assert count_cug_codons("CtGcTgCtG") == 3
+
+    def test_count_cug_empty(self):
+        assert count_cug_codons("") == 0
+        assert count_cug_codons(None) == 0
+
+    def test_count_codon_invalid(self):
+        with pytest.raises(ValueError):
+            count_codon("ATG", "NNN")
+
+
+class TestComposition:
+    """Tests for GC content, base counts and ambiguity checks."""
+
+    def test_gc_content(self):
+        assert gc_content("GGCCAATT") == 0.5
+        assert gc_content("ggcc") == 1.0
+        assert gc_content("") == 0.0
+
+    def test_base_counts(self):
+        assert base_counts("AAcgN") == {"A": 2, "C": 1, "G": 1, "T": 0, "N": 1}
+
+    def test_has_ambiguous_bases(self):
+        assert has_ambiguous_bases("ACGN")
+        assert not has_ambiguous_bases("acgt")
+        assert not has_ambiguous_bases("")
+
+
+class TestIupac:
+    """Tests for IUPAC expansion."""
+
+    def test_iupac_to_regex(self):
+        assert iupac_to_regex("GANTC") == "GA[ACGT]TC"
+        assert iupac_to_regex("ryk") == "[AG][CT][GT]"
+
+    def test_iupac_to_regex_escapes_unknown(self):
+        assert iupac_to_regex("A.T") == "A\\.T"
+        assert iupac_to_regex("A.T", escape_unknown=False) == "A.T"
+
+    def test_expand_iupac(self):
+        assert expand_iupac("AR") == ["AA", "AG"]
+        assert len(expand_iupac("NN")) == 16
+
+    def test_expand_iupac_invalid(self):
+        with pytest.raises(ValueError):
+            expand_iupac("AX")
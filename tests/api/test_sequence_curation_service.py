@@ -5,15 +5,17 @@ Tests cover:
 - Root sequence retrieval
 - Sequence segment extraction
 - Change preview (insertion, deletion, substitution)
-- Affected features detection
+- Affected features detection and full coordinate remap
 - Nearby features search
 """
 import pytest
 from unittest.mock import MagicMock
 
 from cgd.api.services.curation.sequence_curation_service import (
+    SequenceCurationError,
     SequenceCurationService,
 )
+from cgd.utils.seqedit import OffsetMap, SequenceEdit
 
 
 class MockFeature:
@@ -84,6 +86,19 @@ class MockRow:
             setattr(self, key, value)
 
 
+def _location_row(feature_no, name, start, stop, strand="W", gene_name=None):
+    """Column row as returned by the affected-features query."""
+    return MockRow(
+        feature_no=feature_no,
+        feature_name=name,
+        gene_name=gene_name,
+        feature_type="ORF",
+        start_coord=start,
+        stop_coord=stop,
+        strand=strand,
+    )
+
+
 class MockQuery:
     """Mock SQLAlchemy query."""
 
@@ -326,6 +341,52 @@ class TestPreviewChanges:
         assert result["net_change"] == 0
         assert result["changes"][0]["type"] == "substitution"
 
+    def test_previews_batch_in_original_coordinates(self, mock_db, sample_chromosome):
+        """Should apply several changes, all in original coordinates."""
+        feature, seq = sample_chromosome
+        mock_db.query.side_effect = [
+            MockQuery([(feature, seq)]),
+            MockQuery([]),
+        ]
+
+        service = SequenceCurationService(mock_db)
+        result = service.preview_changes("ChrA", [
+            {"type": "substitution", "start": 50, "end": 51, "sequence": "nnnnn"},
+            {"type": "deletion", "start": 10, "end": 13},
+            {"type": "insertion", "position": 4, "sequence": "gg"},
+        ])
+
+        assert result["new_length"] == 100 + 2 - 4 + 3
+        assert result["net_change"] == 1
+        assert [c["type"] for c in result["changes"]] == [
+            "insertion", "deletion", "substitution",
+        ]
+        assert result["changes"][1]["deleted_sequence"] == seq.residues[9:13]
+        substitution = result["changes"][2]
+        assert substitution["old_sequence"] == seq.residues[49:51]
+        assert "NNNNN" in substitution["new_context"]
+
+    def test_rejects_overlapping_changes(self, mock_db, sample_chromosome):
+        """Should reject changes that overlap each other."""
+        feature, seq = sample_chromosome
+        mock_db.query.return_value = MockQuery([(feature, seq)])
+
+        service = SequenceCurationService(mock_db)
+        with pytest.raises(SequenceCurationError):
+            service.preview_changes("ChrA", [
+                {"type": "deletion", "start": 10, "end": 20},
+                {"type": "substitution", "start": 15, "end": 16, "sequence": "AA"},
+            ])
+
+    def test_rejects_out_of_range_change(self, mock_db, sample_chromosome):
+        """Should reject changes past the end of the sequence."""
+        feature, seq = sample_chromosome
+        mock_db.query.return_value = MockQuery([(feature, seq)])
+
+        service = SequenceCurationService(mock_db)
+        with pytest.raises(SequenceCurationError):
+            service.preview_changes("ChrA", [{"type": "deletion", "start": 90, "end": 120}])
+
 
 class TestGetContext:
     """Tests for getting sequence context."""
@@ -347,27 +408,50 @@ class TestGetAffectedFeatures:
     def test_returns_empty_for_no_changes(self, mock_db):
         """Should return empty list for no changes."""
         service = SequenceCurationService(mock_db)
-        result = service._get_affected_features(1, [], 0)
+        result = service._get_affected_features(1, OffsetMap([]))
 
         assert result == []
 
     def test_finds_overlapping_features(self, mock_db):
         """Should find features overlapping with changes."""
-        feature = MockFeature(2, "CAL0001", "ORF", "ALS1")
-        location = MockFeatLocation(1, 2, 1, 100, 500, "W")
-
-        mock_db.query.return_value = MockQuery([(feature, location)])
+        mock_db.query.return_value = MockQuery([
+            _location_row(2, "CAL0001", 100, 500, gene_name="ALS1"),
+        ])
 
         service = SequenceCurationService(mock_db)
         result = service._get_affected_features(
-            1,
-            [{"type": "deletion", "start": 200, "end": 300}],
-            -100
+            1, OffsetMap([SequenceEdit.deletion(200, 300)])
         )
 
         assert len(result) == 1
         assert result[0]["feature_name"] == "CAL0001"
         assert result[0]["is_overlapping"] is True
+        assert result[0]["status"] == "encompassing"
+        assert (result[0]["new_start"], result[0]["new_stop"]) == (100, 399)
+
+    def test_remaps_every_feature(self, mock_db):
+        """Should remap all downstream features, in either orientation."""
+        mock_db.query.return_value = MockQuery([
+            _location_row(2, "UP", 10, 50),
+            _location_row(3, "CUT", 105, 120),
+            _location_row(4, "DOWN_W", 500, 900),
+            _location_row(5, "DOWN_C", 2000, 1500, strand="C"),
+        ] + [_location_row(10 + i, f"F{i}", 3000 + i, 3100 + i) for i in range(200)])
+
+        service = SequenceCurationService(mock_db)
+        result = service._get_affected_features(1, OffsetMap(sorted([
+            SequenceEdit.insertion(60, "AAAA"),
+            SequenceEdit.deletion(100, 109),
+        ], key=lambda e: e.start)))
+
+        by_name = {f["feature_name"]: f for f in result}
+        assert "UP" not in by_name
+        assert len(result) == 203
+        assert by_name["CUT"]["status"] == "overlap"
+        assert (by_name["CUT"]["new_start"], by_name["CUT"]["new_stop"]) == (105, 120)
+        assert (by_name["DOWN_W"]["new_start"], by_name["DOWN_W"]["new_stop"]) == (494, 894)
+        assert (by_name["DOWN_C"]["new_start"], by_name["DOWN_C"]["new_stop"]) == (1994, 1494)
+        assert by_name["F199"]["is_downstream"] is True
 
 
 class TestGetNearbyFeatures:
@@ -382,23 +466,42 @@ class TestGetNearbyFeatures:
 
         assert result == []
 
-    def test_finds_features_in_range(self, mock_db, sample_chromosome):
+    def test_finds_features_in_range(self, mock_db):
         """Should find features within range."""
-        feature, seq = sample_chromosome
-        gene = MockFeature(2, "CAL0001", "ORF", "ALS1")
-        location = MockFeatLocation(1, 2, 1, 40, 60, "W")
-
         mock_db.query.side_effect = [
-            MockQuery([(feature, seq)]),  # Root seq lookup
-            MockQuery([(gene, location)]),  # Features in range
+            MockQuery([(1, "ChrA", 100, 1, "A22-s07-m01-r01")]),  # Root seq lookup
+            MockQuery([
+                (2, "CAL0001", "ALS1", "ORF", 40, 60, "W"),
+                (3, "CAL0002", None, "ORF", 95, 75, "C"),
+                (4, "CAL0003", None, "ORF", 10, 25, "W"),
+            ]),  # Root feature locations
         ]
 
         service = SequenceCurationService(mock_db)
         result = service.get_nearby_features("ChrA", 50, range_size=20)
 
-        assert len(result) == 1
-        assert result[0]["feature_name"] == "CAL0001"
+        assert [f["feature_name"] for f in result] == ["CAL0001"]
         assert result[0]["gene_name"] == "ALS1"
+        assert "distance" not in result[0]
+
+    def test_reuses_index_for_root(self, mock_db):
+        """Should load a root's locations once and match Crick-strand features."""
+        mock_db.query.side_effect = [
+            MockQuery([(1, "ChrA", 100, 1, "A22-s07-m01-r01")]),
+            MockQuery([
+                (2, "CAL0001", "ALS1", "ORF", 40, 60, "W"),
+                (3, "CAL0002", None, "ORF", 95, 75, "C"),
+            ]),
+            MockQuery([(1, "ChrA", 100, 1, "A22-s07-m01-r01")]),
+        ]
+
+        service = SequenceCurationService(mock_db)
+        service.get_nearby_features("ChrA", 50, range_size=20)
+        result = service.get_nearby_features("ChrA", 90, range_size=5)
+
+        assert mock_db.query.call_count == 3
+        assert [f["feature_name"] for f in result] == ["CAL0002"]
+        assert (result[0]["start_coord"], result[0]["stop_coord"]) == (95, 75)
 
 
 class TestServiceInitialization:
@@ -0,0 +1,259 @@
+"""
+Tests for single-flight request coalescing.
+
+Tests cover:
+- Concurrent calls with one key sharing a single computation
+- Followers receiving the leader's exception
+- Request key normalization
+- The endpoint decorator and its enable switch
+- Cross-worker coalescing through a shared lock directory
+- Sweeping unused files without removing held locks
+"""
+import os
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from cgd.core.singleflight import SingleFlight, request_key, single_flight
+
+
+def run_concurrently(group, key, fn, n):
+    """Call group.do(key, fn) from n threads; return results and errors."""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(group.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def blocking(result, started, release, calls):
+    """Function that records its call and blocks until released."""
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return fn
+
+
+def age(path, seconds=120):
+    """Set a file's mtime ``seconds`` in the past."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+class TestSingleFlight:
+    """Tests for in-process coalescing."""
+
+    def test_concurrent_calls_share_result(self):
+        group = SingleFlight()
+        started, release, calls = threading.Event(), threading.Event(), []
+        fn = blocking({"locus": "ALS1"}, started, release, calls)
+
+        leader = threading.Thread(target=group.do, args=("k", fn))
+        leader.start()
+        started.wait(5)
+        results = []
+        followers = threading.Thread(
+            target=lambda: results.extend(run_concurrently(group, "k", fn, 5)[0])
+        )
+        followers.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        followers.join()
+
+        assert calls == [1]
+        assert results == [{"locus": "ALS1"}] * 5
+
+    def test_followers_get_leader_exception(self):
+        group = SingleFlight()
+        started, release, calls = threading.Event(), threading.Event(), []
+        fn = blocking(ValueError("boom"), started, release, calls)
+
+        errors = []
+        leader = threading.Thread(
+            target=lambda: errors.extend(run_concurrently(group, "k", fn, 1)[1])
+        )
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(
+            target=lambda: errors.extend(run_concurrently(group, "k", fn, 1)[1])
+        )
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        assert calls == [1]
+        assert len(errors) == 2
+        assert all(str(e) == "boom" for e in errors)
+
+    def test_sequential_calls_recompute(self):
+        group = SingleFlight()
+        calls = []
+        fn = lambda: calls.append(1) or len(calls)
+
+        assert group.do("k", fn) == 1
+        assert group.do("k", fn) == 2
+
+    def test_distinct_keys_not_coalesced(self):
+        group = SingleFlight()
+        assert group.do("a", lambda: 1) == 1
+        assert group.do("b", lambda: 2) == 2
+
+
+class TestRequestKey:
+    """Tests for request_key."""
+
+    def test_ignores_order_whitespace_and_session(self):
+        first = request_key("locus", {"name": " ACT1 ", "limit": 10, "db": MagicMock()})
+        second = request_key("locus", {"limit": 10, "name": "ACT1", "db": MagicMock()})
+        assert first == second
+
+    def test_distinguishes_name_and_params(self):
+        assert request_key("locus", {"name": "ACT1"}) != request_key("locus", {"name": "ALS1"})
+        assert request_key("locus", {"name": "ACT1"}) != request_key("go_term", {"name": "ACT1"})
+
+
+class TestDecorator:
+    """Tests for the single_flight decorator."""
+
+    def test_keys_on_endpoint_arguments(self):
+        group = MagicMock()
+        group.do.side_effect = lambda key, fn, name: fn()
+
+        @single_flight("locus")
+        def endpoint(name, db=None):
+            return name.upper()
+
+        with patch("cgd.core.singleflight.get_single_flight", return_value=group):
+            assert endpoint("act1", db=MagicMock()) == "ACT1"
+
+        key = group.do.call_args[0][0]
+        assert key == request_key("locus", {"name": "act1"})
+        assert group.do.call_args[1] == {"name": "locus"}
+
+    def test_disabled(self):
+        @single_flight("locus")
+        def endpoint(name):
+            return name
+
+        with patch("cgd.core.singleflight.settings") as mock_settings, \
+                patch("cgd.core.singleflight.get_single_flight") as mock_group:
+            mock_settings.single_flight_enabled = False
+            assert endpoint("ACT1") == "ACT1"
+
+        mock_group.assert_not_called()
+
+    def test_rejects_async_endpoints(self):
+        with pytest.raises(TypeError):
+            @single_flight("locus")
+            async def endpoint(name):
+                return name
+
+
+class TestCrossWorker:
+    """Tests for coalescing through a shared lock directory."""
+
+    def test_waiting_worker_reuses_result(self, tmp_path):
+        # Two groups stand in for two worker processes
+        worker_a = SingleFlight(lock_dir=str(tmp_path), poll_interval=0.005)
+        worker_b = SingleFlight(lock_dir=str(tmp_path), poll_interval=0.005)
+        started, release, calls = threading.Event(), threading.Event(), []
+        fn = blocking({"goid": 5}, started, release, calls)
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(worker_a.do("k", fn)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(worker_b.do("k", fn)))
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        assert calls == [1]
+        assert results == [{"goid": 5}] * 2
+
+    def test_stale_result_not_reused(self, tmp_path):
+        worker_a = SingleFlight(lock_dir=str(tmp_path))
+        worker_b = SingleFlight(lock_dir=str(tmp_path))
+
+        assert worker_a.do("k", lambda: "old") == "old"
+        assert worker_b.do("k", lambda: "new") == "new"
+
+    def test_falls_back_after_timeout(self, tmp_path):
+        worker_a = SingleFlight(lock_dir=str(tmp_path), poll_interval=0.005)
+        worker_b = SingleFlight(lock_dir=str(tmp_path), wait_timeout=0.05, poll_interval=0.005)
+        started, release, calls = threading.Event(), threading.Event(), []
+        fn = blocking("slow", started, release, calls)
+
+        leader = threading.Thread(target=worker_a.do, args=("k", fn))
+        leader.start()
+        started.wait(5)
+        try:
+            assert worker_b.do("k", lambda: "own") == "own"
+        finally:
+            release.set()
+            leader.join()
+
+    def test_sweep_keeps_held_lock(self, tmp_path):
+        worker_a = SingleFlight(lock_dir=str(tmp_path), poll_interval=0.005)
+        worker_b = SingleFlight(lock_dir=str(tmp_path), poll_interval=0.005)
+        started, release, calls = threading.Event(), threading.Event(), []
+        fn = blocking("slow", started, release, calls)
+
+        leader = threading.Thread(target=worker_a.do, args=("k", fn))
+        leader.start()
+        started.wait(5)
+        try:
+            [lock_path] = tmp_path.glob("*.lock")
+            age(lock_path)
+            worker_b._sweep()
+            assert lock_path.exists()
+        finally:
+            release.set()
+            leader.join()
+
+        # Once released, the leader's own sweep removes it
+        assert not lock_path.exists()
+
+    def test_acquire_marks_lock_in_use(self, tmp_path):
+        worker = SingleFlight(lock_dir=str(tmp_path))
+        worker.do("k", lambda: 1)
+        [lock_path] = tmp_path.glob("*.lock")
+        age(lock_path)
+
+        worker.do("k", lambda: 2)
+        assert lock_path.stat().st_mtime > time.time() - 60
+
+    def test_sweep_keeps_results_being_written(self, tmp_path):
+        worker = SingleFlight(lock_dir=str(tmp_path))
+        dead_pid = 2 ** 22 + 1  # above the default pid_max
+        writing = tmp_path / f"abc.{os.getpid()}.tmp"
+        orphaned = tmp_path / f"def.{dead_pid}.tmp"
+        result = tmp_path / "abc.result"
+        for path in (writing, orphaned, result):
+            path.write_bytes(b"x")
+            age(path)
+
+        worker._sweep()
+        assert writing.exists()
+        assert not orphaned.exists()
+        assert not result.exists()
@@ -0,0 +1,11 @@
+"""
+CGD Micro-benchmarks
+
+Timing benchmarks for performance-sensitive code paths. They are skipped
+by default; run them with:
+
+    CGD_RUN_BENCHMARKS=1 pytest tests/benchmarks -s
+
+Each benchmark prints its timings and asserts only coarse sanity bounds,
+so results are comparable across runs without making CI flaky.
+"""
@@ -0,0 +1,37 @@
+"""
+Pytest fixtures for CGD benchmarks.
+
+Benchmarks only run when CGD_RUN_BENCHMARKS is set, and provide a small
+timing helper that reports the best of several runs.
+"""
+import os
+import time
+from typing import Callable
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless explicitly requested."""
+    if os.environ.get("CGD_RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="set CGD_RUN_BENCHMARKS=1 to run benchmarks")
+    bench_dir = os.path.dirname(__file__)
+    for item in items:
+        if str(item.fspath).startswith(bench_dir):
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def bench():
+    """Time a callable; returns (best_seconds, last_result)."""
+    def _bench(label: str, fn: Callable, repeat: int = 3):
+        best = float("inf")
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+        print(f"\n  {label:<48s} {best * 1000:10.2f} ms")
+        return best, result
+    return _bench
@@ -0,0 +1,188 @@
+"""
+Benchmarks for connection pool occupancy under curator traffic.
+
+Concurrent curators call an edit endpoint (30 ms of request handling
+before one short query) and the auth check endpoint, against a 4-slot
+curation pool on SQLite. With the old dependency, authenticating looked
+the session up in CURATOR_SESSION on the request's session, so every
+request held a connection from authentication until it finished; the
+stateless path only checks one out for the query. Reports peak and mean
+connections checked out, connection-seconds held and wall time for each.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+import pytest
+from fastapi import Cookie, Depends, FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from cgd.auth.deps import CurrentUser, get_current_user, security
+from cgd.auth.models import CuratorSession
+from cgd.auth.schemas import UserInfo
+from cgd.auth.service import JWT_ALGORITHM, AuthenticationError, AuthService
+from cgd.auth.session_cache import invalidate_auth_caches
+from cgd.core.settings import settings
+from cgd.db import engine as db_engine
+from cgd.db.deps import get_db
+from cgd.db.engine import CURATION, PRIMARY
+from tests.sqlite_schema import sqlite_session
+
+POOL_SIZE = 4
+CURATORS = 16
+REQUESTS_PER_CURATOR = 8
+HANDLING_SECONDS = 0.03
+
+
+def legacy_current_user(
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    access_token: Optional[str] = Cookie(default=None),
+) -> UserInfo:
+    """The previous get_current_user: revocation checked on the request's session."""
+    token = credentials.credentials if credentials else access_token
+    try:
+        payload = AuthService(db).verify_token(token, token_type="access")
+    except AuthenticationError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    return UserInfo(
+        dbuser_no=payload["dbuser_no"], userid=payload["sub"],
+        first_name=payload["first_name"], last_name=payload["last_name"],
+        email=payload["email"], status="Current",
+    )
+
+
+class PoolOccupancy:
+    """Connections checked out of a pool over time."""
+
+    def __init__(self, pool):
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.peak = 0
+        self.connection_seconds = 0.0
+        self.checkouts = 0
+        self.wall_seconds = 0.0
+        self._last = time.perf_counter()
+        event.listen(pool, "checkout", lambda *_: self._change(1))
+        event.listen(pool, "checkin", lambda *_: self._change(-1))
+
+    def _change(self, delta: int) -> None:
+        with self._lock:
+            now = time.perf_counter()
+            self.connection_seconds += self.in_use * (now - self._last)
+            self._last = now
+            self.in_use += delta
+            self.peak = max(self.peak, self.in_use)
+            self.checkouts += delta > 0
+
+    def stop(self, wall_seconds: float) -> None:
+        self._change(0)
+        self.wall_seconds = wall_seconds
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/curation/bench/edit", tags=["curation-bench"])
+    def edit(current_user: CurrentUser, db: Session = Depends(get_db)):
+        time.sleep(HANDLING_SECONDS)  # validation, formatting, other services
+        db.execute(text("SELECT 1")).scalar()
+        return {"userid": current_user.userid}
+
+    @app.get("/api/curation/bench/check", tags=["curation-bench"])
+    def check(current_user: CurrentUser):
+        return {"authenticated": True}
+
+    return app
+
+
+@pytest.fixture
+def database(tmp_path):
+    """A 4-connection pool on a SQLite file holding one curator session."""
+    path = tmp_path / "auth_pool.db"
+    seed = sqlite_session(path, CuratorSession)
+    seed.add(CuratorSession(
+        session_id="bench-session", userid="CURATOR1",
+        expires_at=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1),
+    ))
+    seed.commit()
+    seed.close()
+
+    engine = create_engine(
+        f"sqlite:///{path}", pool_size=POOL_SIZE, max_overflow=0, pool_timeout=60,
+        connect_args={"check_same_thread": False},
+    ).execution_options(schema_translate_map={"MULTI": None})
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    original = db_engine.session_factories
+    db_engine.session_factories = {PRIMARY: factory, CURATION: factory}
+    invalidate_auth_caches()
+    yield engine
+    db_engine.session_factories = original
+    invalidate_auth_caches()
+    engine.dispose()
+
+
+def access_token() -> str:
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {
+            "sub": "CURATOR1", "dbuser_no": 1, "first_name": "Bench", "last_name": "Curator",
+            "email": "curator@example.org", "jti": "bench-session",
+            "exp": now + timedelta(minutes=15), "iat": now, "type": "access",
+        },
+        settings.jwt_secret_key,
+        algorithm=JWT_ALGORITHM,
+    )
+
+
+def run_traffic(app: FastAPI, engine) -> PoolOccupancy:
+    occupancy = PoolOccupancy(engine.pool)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {access_token()}"}
+
+    def curator(_: int) -> None:
+        for i in range(REQUESTS_PER_CURATOR):
+            if i % 2:
+                response = client.get("/api/curation/bench/check", headers=headers)
+            else:
+                response = client.post("/api/curation/bench/edit", headers=headers)
+            assert response.status_code == 200
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CURATORS) as executor:
+        list(executor.map(curator, range(CURATORS)))
+    occupancy.stop(time.perf_counter() - started)
+    return occupancy
+
+
+def test_pool_occupancy(database):
+    legacy_app = make_app()
+    legacy_app.dependency_overrides[get_current_user] = legacy_current_user
+    results = {
+        "session lookup (old)": run_traffic(legacy_app, database),
+        "stateless": run_traffic(make_app(), database),
+    }
+
+    requests = CURATORS * REQUESTS_PER_CURATOR
+    print(f"\n  {requests} requests from {CURATORS} curators, pool of {POOL_SIZE}")
+    print(f"  {'auth path':<22s} {'peak':>5s} {'mean':>6s} {'conn-s':>8s} "
+          f"{'checkouts':>10s} {'wall s':>8s}")
+    for label, occupancy in results.items():
+        print(
+            f"  {label:<22s} {occupancy.peak:5d} "
+            f"{occupancy.connection_seconds / occupancy.wall_seconds:6.2f} "
+            f"{occupancy.connection_seconds:8.3f} {occupancy.checkouts:10d} "
+            f"{occupancy.wall_seconds:8.3f}"
+        )
+
+    old, new = results["session lookup (old)"], results["stateless"]
+    # Auth-only requests no longer touch the pool; edits hold a
+    # connection for the query, not the whole request
+    assert new.checkouts < old.checkouts
+    assert new.connection_seconds < old.connection_seconds / 2
@@ -0,0 +1,89 @@
+"""
+Benchmarks for the columnar response format.
+
+A 30,000-feature advanced search result (the size of an all-types search
+over a large organism), serialized the way the JSON endpoint does it
+(validated FeatureSearchResult models, re-validated by the response model
+and encoded with the standard JSON encoder) and in the columnar format
+(row tuples, dictionary-encoded columns, orjson). Reports time and
+payload size for each.
+"""
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from cgd.api.services.feature_search_service import (
+    FEATURE_COLUMNS,
+    FEATURE_DICTIONARY_COLUMNS,
+)
+from cgd.core.columnar import ColumnarResponse, encode_columns
+from cgd.schemas.feature_search_schema import (
+    FeatureSearchResponse,
+    FeatureSearchResult,
+    QuerySummary,
+)
+
+ROW_COUNT = 30_000
+FEATURE_TYPES = ("ORF", "tRNA", "ncRNA", "long_terminal_repeat", "pseudogene")
+QUALIFIERS = ("Verified", "Uncharacterized", "Dubious", None)
+CHROMOSOMES = [f"Ca22chr{c}A_C_albicans_SC5314" for c in "1234567R"]
+
+
+def _rows():
+    return [
+        (
+            n,
+            f"C{n % 7 + 1}_{n:05d}W_A",
+            f"GEN{n}" if n % 3 == 0 else None,
+            FEATURE_TYPES[n % len(FEATURE_TYPES)],
+            QUALIFIERS[n % len(QUALIFIERS)],
+            f"Protein of unknown function; ortholog of S. cerevisiae YGR{n % 999:03d}W",
+            CHROMOSOMES[n % len(CHROMOSOMES)],
+            "W" if n % 2 else "C",
+            n * 100,
+            n * 100 + 1500,
+            [], [], [],
+        )
+        for n in range(1, ROW_COUNT + 1)
+    ]
+
+
+SUMMARY = QuerySummary(
+    organism_name="Candida albicans SC5314", feature_types=["All"], total_results=ROW_COUNT
+)
+
+
+def _json_payload(rows):
+    response = FeatureSearchResponse(
+        success=True,
+        query_summary=SUMMARY,
+        features=[FeatureSearchResult(**dict(zip(FEATURE_COLUMNS, row))) for row in rows],
+        total_count=ROW_COUNT,
+    )
+    # What FastAPI does with the returned model: validate against the
+    # response model, then encode with the standard library
+    validated = FeatureSearchResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def _columnar_payload(rows):
+    return ColumnarResponse({
+        "success": True,
+        "query_summary": SUMMARY.model_dump(),
+        "features": encode_columns(rows, FEATURE_COLUMNS, FEATURE_DICTIONARY_COLUMNS),
+        "total_count": ROW_COUNT,
+    }).body
+
+
+def test_feature_search_serialization(bench):
+    rows = _rows()
+    json_time, json_body = bench("JSON (models + json.dumps)", lambda: _json_payload(rows))
+    columnar_time, columnar_body = bench(
+        "columnar (tuples + orjson)", lambda: _columnar_payload(rows)
+    )
+    print(f"  JSON payload      {len(json_body) / 1024:10.0f} KiB")
+    print(f"  columnar payload  {len(columnar_body) / 1024:10.0f} KiB")
+    print(f"  speedup           {json_time / columnar_time:10.1f}x")
+
+    assert len(columnar_body) < len(json_body)
+    assert columnar_time < json_time
@@ -0,0 +1,130 @@
+"""
+Benchmarks for response compression.
+
+Synthetic payloads shaped like the large responses (locus page, feature
+search, GO hierarchy, BLAST results), served through
+``CompressionMiddleware`` with each available content coding and without
+compression. Reports request latency and bytes on the wire per endpoint,
+then compares a precompressed cache hit with compressing on every
+request for a genome snapshot.
+"""
+import random
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from cgd.core.http_compression import (
+    CompressionMiddleware,
+    available_encodings,
+    precompressed_response,
+)
+
+rng = random.Random(3)
+
+
+def _locus():
+    return {
+        "feature_name": "orf19.1", "gene_name": "ALS1",
+        "references": [
+            {"citation": f"Author {n} et al. ({2000 + n % 25}) J Biol {n}", "pubmed": 10_000_000 + n}
+            for n in range(800)
+        ],
+        "go_annotations": [
+            {"goid": f"GO:{rng.randint(1, 99999):07d}", "evidence": "IDA", "term": f"term {n}"}
+            for n in range(600)
+        ],
+    }
+
+
+def _feature_search():
+    return {"features": [
+        {"feature_id": n, "orf": f"C1_{n:05d}W_A", "gene": None, "feature_type": "ORF",
+         "qualifier": "Verified", "description": "Protein of unknown function",
+         "chromosome": "Ca22chr1A_C_albicans_SC5314", "strand": "W",
+         "start_coord": n * 100, "stop_coord": n * 100 + 900}
+        for n in range(20_000)
+    ]}
+
+
+def _go_hierarchy():
+    return {"nodes": [
+        {"id": f"GO:{n:07d}", "label": f"biological process term {n}", "aspect": "P",
+         "children": [f"GO:{c:07d}" for c in range(n * 3, n * 3 + 3)]}
+        for n in range(5_000)
+    ]}
+
+
+def _blast():
+    residues = "ACDEFGHIKLMNPQRSTVWY"
+    return {"hits": [
+        {"id": f"orf19.{n}", "evalue": 10 ** -rng.randint(5, 180),
+         "hsps": [{"query": "".join(rng.choice(residues) for _ in range(300)),
+                   "midline": "|" * 300,
+                   "subject": "".join(rng.choice(residues) for _ in range(300))}]}
+        for n in range(500)
+    ]}
+
+
+PAYLOADS = {
+    "locus": _locus(),
+    "feature_search": _feature_search(),
+    "go_hierarchy": _go_hierarchy(),
+    "blast": _blast(),
+}
+
+
+class Snapshot(BaseModel):
+    organism: str
+    rows: list[dict]
+
+
+SNAPSHOT = Snapshot(organism="C_albicans_SC5314", rows=PAYLOADS["feature_search"]["features"][:5000])
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    for name, payload in PAYLOADS.items():
+        app.add_api_route(f"/{name}", lambda payload=payload: payload)
+
+    @app.get("/snapshot")
+    def snapshot():
+        return SNAPSHOT
+
+    @app.get("/snapshot/precompressed")
+    def snapshot_precompressed(request: Request):
+        return precompressed_response(request, "bench:snapshot", lambda: SNAPSHOT)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("endpoint", list(PAYLOADS))
+def test_endpoint_compression(bench, client, endpoint):
+    for encoding in ("identity",) + available_encodings():
+        headers = {"Accept-Encoding": encoding}
+        _, response = bench(
+            f"{endpoint:<15s} {encoding:<9s}",
+            lambda: client.get(f"/{endpoint}", headers=headers),
+        )
+        wire = len(response.content) if encoding == "identity" else int(
+            response.headers["content-length"]
+        )
+        print(f"  {'':<48s} {wire / 1024:10.0f} KiB")
+
+
+def test_precompressed_snapshot(bench, client):
+    headers = {"Accept-Encoding": "gzip"}
+    client.get("/snapshot/precompressed", headers=headers)
+    per_request, _ = bench(
+        "snapshot: compress per request", lambda: client.get("/snapshot", headers=headers)
+    )
+    cached, response = bench(
+        "snapshot: precompressed hit", lambda: client.get("/snapshot/precompressed", headers=headers)
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert cached < per_request
@@ -0,0 +1,144 @@
+"""
+Benchmarks for reference annotation bulk curation.
+
+A heavily cited paper with 5,000 linked rows of each kind (go_refs, half
+of them sharing their annotation with another paper; literature guide
+feature links; ref_links), cleaned up with the set-based bulk operations
+and, for comparison, with the per-entry methods the old bulk loop called
+row by row.
+"""
+import shutil
+
+import pytest
+from sqlalchemy import insert
+
+from cgd.api.services.curation.ref_annotation_curation_service import (
+    RefAnnotationCurationService,
+)
+from cgd.models.models import (
+    GoAnnotation,
+    GoQualifier,
+    GoRef,
+    GorefDbxref,
+    RefLink,
+    RefProperty,
+    Reference,
+    RefpropFeat,
+)
+from tests.sqlite_schema import sqlite_session
+
+ROW_COUNT = 5_000
+TOPIC_COUNT = 50
+MODELS = (
+    Reference, GoAnnotation, GoRef, GoQualifier, GorefDbxref,
+    RefProperty, RefpropFeat, RefLink,
+)
+
+
+def _seed(db):
+    db.execute(insert(Reference), [
+        {"reference_no": n, "source": "PubMed", "status": "Published",
+         "pdf_status": "N", "dbxref_id": f"CGD_REF{n}", "citation": f"Ref {n}",
+         "year": 2024, "created_by": "bench"}
+        for n in (1, 2, 3)
+    ])
+    db.execute(insert(GoAnnotation), [
+        {"go_annotation_no": n, "go_no": n, "feature_no": n, "go_evidence": "IDA",
+         "annotation_type": "manually curated", "source": "CGD", "created_by": "bench"}
+        for n in range(1, ROW_COUNT + 1)
+    ])
+    go_refs = [
+        {"go_ref_no": n, "reference_no": 1, "go_annotation_no": n,
+         "has_qualifier": "Y" if n % 10 == 0 else "N",
+         "has_supporting_evidence": "N", "created_by": "bench"}
+        for n in range(1, ROW_COUNT + 1)
+    ]
+    go_refs += [
+        {"go_ref_no": ROW_COUNT + n, "reference_no": 3, "go_annotation_no": n,
+         "has_qualifier": "N", "has_supporting_evidence": "N", "created_by": "bench"}
+        for n in range(1, ROW_COUNT + 1, 2)
+    ]
+    db.execute(insert(GoRef), go_refs)
+    db.execute(insert(GoQualifier), [
+        {"go_ref_no": n, "qualifier": "contributes_to"}
+        for n in range(10, ROW_COUNT + 1, 10)
+    ])
+    db.execute(insert(RefProperty), [
+        {"ref_property_no": n, "reference_no": 1, "source": "CGD",
+         "property_type": "Topic", "property_value": f"Topic {n}", "created_by": "bench"}
+        for n in range(1, TOPIC_COUNT + 1)
+    ])
+    db.execute(insert(RefpropFeat), [
+        {"ref_property_no": n % TOPIC_COUNT + 1, "feature_no": n, "created_by": "bench"}
+        for n in range(1, ROW_COUNT + 1)
+    ])
+    db.execute(insert(RefLink), [
+        {"reference_no": 1, "tab_name": "FEATURE", "primary_key": n,
+         "col_name": "FEATURE_NO", "created_by": "bench"}
+        for n in range(1, ROW_COUNT + 1)
+    ])
+    db.commit()
+
+
+@pytest.fixture(scope="module")
+def template(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ref_annotation") / "template.db"
+    db = sqlite_session(path, *MODELS)
+    _seed(db)
+    db.close()
+    return path
+
+
+@pytest.fixture
+def fresh_service(template, tmp_path):
+    """Returns a factory for services on fresh copies of the seeded database."""
+    sessions = []
+
+    def _make():
+        path = tmp_path / f"copy{len(sessions)}.db"
+        shutil.copy(template, path)
+        db = sqlite_session(path)
+        sessions.append(db)
+        return RefAnnotationCurationService(db)
+
+    yield _make
+    for db in sessions:
+        db.close()
+
+
+def _timed(bench, label, make_service, operation, repeat=3):
+    services = iter([make_service() for _ in range(repeat)])
+    return bench(label, lambda: operation(next(services)), repeat=repeat)
+
+
+@pytest.mark.parametrize("entry_type", ["go_annotation", "lit_guide", "ref_link"])
+def test_bulk_delete(bench, fresh_service, entry_type):
+    _, result = _timed(
+        bench, f"bulk_delete {entry_type}", fresh_service,
+        lambda service: service.bulk_delete(1, entry_type, "bench"),
+    )
+    assert result["count"] == ROW_COUNT
+
+
+@pytest.mark.parametrize("entry_type", ["go_annotation", "lit_guide", "ref_link"])
+def test_bulk_transfer(bench, fresh_service, entry_type):
+    _, result = _timed(
+        bench, f"bulk_transfer {entry_type}", fresh_service,
+        lambda service: service.bulk_transfer(1, entry_type, 2, "bench"),
+    )
+    assert result["count"] == ROW_COUNT
+
+
+def test_per_entry_go_delete(bench, fresh_service):
+    def delete_each(service):
+        go_ref_nos = [
+            n for (n,) in service.db.query(GoRef.go_ref_no).filter(GoRef.reference_no == 1)
+        ]
+        for go_ref_no in go_ref_nos:
+            service.delete_go_ref_entry(go_ref_no, "bench")
+        return len(go_ref_nos)
+
+    _, count = _timed(
+        bench, "per-entry delete_go_ref_entry", fresh_service, delete_each, repeat=1
+    )
+    assert count == ROW_COUNT
@@ -0,0 +1,112 @@
+"""
+Benchmarks for cgd.utils.seqkernels.
+
+Inputs are sized like C. albicans SC5314: a 3.2 Mb chromosome and a
+6,200-gene proteome of ~1.5 kb CDSs. Each kernel is timed against the
+per-character implementation it replaced.
+"""
+import random
+
+import pytest
+
+from cgd.utils import seqkernels
+
+CHROMOSOME_LENGTH = 3_200_000
+PROTEOME_SIZE = 6_200
+CDS_LENGTH = 1_500
+
+LEGACY_CODE = dict(zip(
+    seqkernels.CODONS, seqkernels.TRANSLATION_TABLES[12]
+))
+LEGACY_COMPLEMENT = {
+    "A": "T", "T": "A", "G": "C", "C": "G",
+    "a": "t", "t": "a", "g": "c", "c": "g",
+    "N": "N", "n": "n",
+}
+
+
+def legacy_reverse_complement(seq):
+    return "".join(LEGACY_COMPLEMENT.get(base, base) for base in reversed(seq))
+
+
+def legacy_translate(cds):
+    protein = []
+    cds_upper = cds.upper()
+    for i in range(0, len(cds_upper) - 2, 3):
+        codon = cds_upper[i:i + 3]
+        if any(base not in "ACGT" for base in codon):
+            protein.append("X")
+        else:
+            protein.append(LEGACY_CODE.get(codon, "X"))
+    return "".join(protein)
+
+
+def legacy_count_cug(cds):
+    cds_upper = cds.upper()
+    return sum(
+        1 for i in range(0, len(cds_upper) - 2, 3) if cds_upper[i:i + 3] == "CTG"
+    )
+
+
+@pytest.fixture(scope="module")
+def chromosome():
+    rng = random.Random(42)
+    return "".join(rng.choices("ACGT", k=CHROMOSOME_LENGTH))
+
+
+@pytest.fixture(scope="module")
+def proteome():
+    rng = random.Random(7)
+    return [
+        "ATG" + "".join(rng.choices("ACGT", k=CDS_LENGTH - 6)) + "TAA"
+        for _ in range(PROTEOME_SIZE)
+    ]
+
+
+def test_chromosome_reverse_complement(bench, chromosome):
+    fast, result = bench("reverse_complement (chromosome)",
+                         lambda: seqkernels.reverse_complement(chromosome))
+    slow, expected = bench("legacy reverse_complement (chromosome)",
+                           lambda: legacy_reverse_complement(chromosome), repeat=1)
+    assert result == expected
+    assert fast < slow
+
+
+def test_chromosome_gc_and_codon_usage(bench, chromosome):
+    bench("gc_content (chromosome)", lambda: seqkernels.gc_content(chromosome))
+    _, usage = bench("codon_counts (chromosome)",
+                     lambda: seqkernels.codon_counts(chromosome))
+    assert sum(usage.values()) == CHROMOSOME_LENGTH // 3
+
+
+def test_chromosome_translate(bench, chromosome):
+    _, protein = bench("translate table 12 (chromosome)",
+                       lambda: seqkernels.translate(chromosome, table=12))
+    assert len(protein) == CHROMOSOME_LENGTH // 3
+
+
+def test_proteome_translate(bench, proteome):
+    fast, result = bench(
+        "translate per CDS (proteome)",
+        lambda: [seqkernels.translate(cds, table=12) for cds in proteome],
+    )
+    batch, batched = bench("translate_many (proteome)",
+                           lambda: seqkernels.translate_many(proteome, table=12))
+    slow, expected = bench("legacy translate (proteome)",
+                           lambda: [legacy_translate(cds) for cds in proteome],
+                           repeat=1)
+    assert result == expected == batched
+    assert fast < slow
+    assert batch < slow
+
+
+def test_proteome_cug_counts(bench, proteome):
+    fast, result = bench(
+        "count_cug_codons (proteome)",
+        lambda: [seqkernels.count_cug_codons(cds) for cds in proteome],
+    )
+    slow, expected = bench("legacy count_cug (proteome)",
+                           lambda: [legacy_count_cug(cds) for cds in proteome],
+                           repeat=1)
+    assert result == expected
+    assert fast < slow
@@ -0,0 +1,73 @@
+"""
+Benchmarks for worker start-up.
+
+Imports ``cgd.main`` in a fresh interpreter under ``-X importtime``, in
+eager and lazy router mode, and reports the total import time, the time to
+the first ``/health`` response and the slowest top-level imports. The lazy
+mode run must stay under one second.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from cgd.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+TestClient(app).get("/health")
+print(json.dumps({
+    "import_s": imported - started,
+    "health_s": time.perf_counter() - started,
+}))
+"""
+
+LAZY_BUDGET_SECONDS = 1.0
+
+
+def run_startup(lazy: bool) -> tuple[dict, list[tuple[int, str]]]:
+    """Return the timing report and (cumulative_us, module) for the imports
+    made directly by cgd.main."""
+    env = dict(os.environ, CGD_LAZY_ROUTERS="true" if lazy else "false")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    # importtime prints children before their parent, indented two spaces
+    # per level: collect depth-1 lines until the cgd.main line closes them.
+    children, main_imports = [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == "cgd.main":
+                main_imports = children
+            children = []
+    return json.loads(result.stdout.strip().splitlines()[-1]), main_imports
+
+
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+def test_worker_startup(lazy):
+    # Take the best of three cold starts
+    runs = [run_startup(lazy) for _ in range(3)]
+    report, imports = min(runs, key=lambda run: run[0]["health_s"])
+
+    mode = "lazy" if lazy else "eager"
+    print(f"\n  {mode} import cgd.main        {report['import_s'] * 1000:10.1f} ms")
+    print(f"  {mode} first /health response {report['health_s'] * 1000:10.1f} ms")
+    for cumulative_us, module in sorted(imports, reverse=True)[:8]:
+        print(f"    {module:<44s} {cumulative_us / 1000:10.1f} ms")
+
+    if lazy:
+        assert report["health_s"] < LAZY_BUDGET_SECONDS
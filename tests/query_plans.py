@@ -0,0 +1,54 @@
+"""
+Query-plan helpers for index regression tests.
+
+``capture_selects`` records the SELECT statements (with their parameters)
+that service code sends through an engine; ``explain`` returns the plan
+the database chooses for one of them: SQLite's ``EXPLAIN QUERY PLAN``, or
+PostgreSQL's ``EXPLAIN`` with sequential scans disabled, so the planner
+still shows the index it can use on a test-sized table. ``count_rows``
+re-runs captured statements and counts the raw rows they return, for
+tests that guard against loaders multiplying rows.
+"""
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def capture_selects(engine: Engine) -> Iterator[list[tuple[str, Any]]]:
+    """Collect ``(sql, parameters)`` for each SELECT executed in the block."""
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> str:
+    """The database's plan for ``statement``, one line per plan step."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "\n".join(row[-1] for row in rows)
+        if engine.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            return "\n".join(row[0] for row in rows)
+    raise NotImplementedError(f"No EXPLAIN support for {engine.dialect.name}")
+
+
+def count_rows(engine: Engine, statements: list[tuple[str, Any]]) -> int:
+    """Total raw rows the captured statements return."""
+    with engine.connect() as conn:
+        return sum(
+            len(conn.exec_driver_sql(statement, parameters).fetchall())
+            for statement, parameters in statements
+        )
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/cron/dump_gff.py
+
+Runs the dumper against a small SQLite copy of the tables it reads and
+compares the output byte for byte with what the list-based dumper wrote
+for the same data.
+"""
+
+import io
+import sqlite3
+
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "scripts"))
+
+pytest.importorskip("requests")
+
+from cron import dump_gff as dump_gff_module
+from cron.dump_gff import GroupStream, dump_gff
+
+SEQ_SOURCE = "C. albicans SC5314 Assembly 22"
+
+SCHEMA = """
+CREATE TABLE organism (
+    organism_no INTEGER PRIMARY KEY, organism_name TEXT, organism_abbrev TEXT, taxon_id INTEGER
+);
+CREATE TABLE genome_version (genome_version_no INTEGER PRIMARY KEY, is_ver_current TEXT);
+CREATE TABLE feature (
+    feature_no INTEGER PRIMARY KEY, organism_no INTEGER, feature_name TEXT, gene_name TEXT,
+    feature_type TEXT, dbxref_id TEXT, headline TEXT
+);
+CREATE TABLE seq (
+    seq_no INTEGER PRIMARY KEY, feature_no INTEGER, genome_version_no INTEGER,
+    source TEXT, seq_type TEXT, is_seq_current TEXT
+);
+CREATE TABLE feat_location (
+    feat_location_no INTEGER PRIMARY KEY, feature_no INTEGER, seq_no INTEGER,
+    root_seq_no INTEGER, start_coord INTEGER, stop_coord INTEGER, strand TEXT,
+    is_loc_current TEXT
+);
+CREATE TABLE feat_property (
+    feat_property_no INTEGER PRIMARY KEY, feature_no INTEGER, property_type TEXT,
+    property_value TEXT
+);
+CREATE TABLE alias (alias_no INTEGER PRIMARY KEY, alias_name TEXT);
+CREATE TABLE feat_alias (feature_no INTEGER, alias_no INTEGER);
+CREATE TABLE feat_relationship (
+    parent_feature_no INTEGER, child_feature_no INTEGER, relationship_type TEXT, rank INTEGER
+);
+"""
+
+# feature_no: (organism_no, name, gene, type, headline)
+FEATURES = {
+    1: (1, "Ca22chr1A_C_albicans_SC5314", None, "chromosome", None),
+    2: (1, "Ca22chr2A_C_albicans_SC5314", None, "chromosome", None),
+    3: (1, "Ca22chrM_C_albicans_SC5314", None, "contig", None),
+    10: (1, "C1_00010W_A", "ACT1", "ORF", "<i>Actin</i>; role in cell shape=growth, 100%"),
+    11: (1, "C1_00020C_A", None, "ORF", "Protein of unknown function"),
+    12: (1, "C1_00030W_A", None, "tRNA", "tRNA-Ala"),
+    13: (1, "C1_00040W_A", "OLD1", "ORF", "Merged into C1_00010W_A"),
+    14: (1, "C1_00010W_A_allele", None, "allele", None),
+    15: (1, "C1_00050W_B", None, "allele", None),
+    16: (1, "C1_00060W_A", None, "pseudogene", None),
+    17: (1, "C2_00010C_A", "HWP1", "ORF", "Hyphal wall protein"),
+    18: (1, "C2_00020W_A", None, "long terminal repeat", "LTR"),
+    19: (1, "CM_00010W_A", None, "ORF", None),
+    30: (2, "OTHER_ORG_1", None, "ORF", "Other organism"),
+    # subfeatures
+    100: (1, "C1_00010W_A_CDS1", None, "CDS", None),
+    101: (1, "C1_00010W_A_intron", None, "intron", None),
+    102: (1, "C1_00010W_A_CDS2", None, "CDS", None),
+    103: (1, "C1_00020C_A_CDS", None, "CDS", None),
+    104: (1, "C1_00040W_A_CDS", None, "CDS", None),
+    105: (1, "C2_00010C_A_CDS", None, "CDS", None),
+    106: (1, "C2_00010C_A_5UTR", None, "five_prime_UTR", None),
+    107: (1, "C1_00010W_A_CDS_old", None, "CDS", None),
+    108: (1, "C1_00060W_A_exon", None, "noncoding_exon", None),
+}
+
+# feature_no: (seq_no, root_seq_no, start, stop, strand, is_loc_current)
+LOCATIONS = {
+    1: (1, 1, 1, 9000, "W", "Y"),
+    2: (2, 2, 1, 6000, "W", "Y"),
+    3: (3, 3, 1, 400, "W", "Y"),
+    10: (1, 1, 100, 900, "W", "Y"),
+    11: (1, 1, 2000, 1500, "C", "Y"),
+    12: (1, 1, 3000, 3070, "W", "Y"),
+    13: (1, 1, 4000, 4500, "W", "Y"),
+    14: (1, 1, 950, 1000, "W", "Y"),
+    15: (1, 1, 5000, 5600, "W", "Y"),
+    16: (1, 1, 7000, 7300, "W", "Y"),
+    17: (2, 2, 900, 100, "C", "Y"),
+    18: (2, 2, 2000, 2300, "W", "Y"),
+    19: (3, 3, 10, 300, "W", "Y"),
+    30: (1, 1, 6000, 6500, "W", "Y"),
+    100: (1, 1, 100, 400, "W", "Y"),
+    101: (1, 1, 401, 500, "W", "Y"),
+    102: (1, 1, 501, 900, "W", "Y"),
+    103: (1, 1, 2000, 1500, "C", "Y"),
+    104: (1, 1, 4000, 4500, "W", "Y"),
+    105: (2, 2, 800, 100, "C", "Y"),
+    106: (2, 2, 900, 801, "C", "Y"),
+    # a location on the previous assembly
+    107: (9, 9, 100, 900, "W", "Y"),
+    108: (1, 1, 7000, 7300, "W", "Y"),
+}
+
+FEATURE_QUALIFIERS = {
+    10: "Verified",
+    11: "Uncharacterized",
+    13: "Deleted|Merged",
+    17: "Verified|Ambiguous",
+}
+
+# feature_no: alias names, in insertion order
+ALIASES = {
+    10: ["orf19.5007", "CaACT1", "ACT1 a/b"],
+    11: ["orf19.5008"],
+    13: ["orf19.5009"],
+    16: ["orf19.5010"],
+    17: ["orf19.1321", "HYR2"],
+    30: ["other"],
+    100: ["cds alias"],
+}
+
+# (parent, child, relationship_type, rank)
+RELATIONSHIPS = [
+    (10, 100, "part of", 2),
+    (10, 101, "part of", 2),
+    (10, 102, "part of", 2),
+    (10, 107, "part of", 2),
+    (11, 103, "part of", 2),
+    (13, 104, "part of", 2),
+    (17, 105, "part of", 2),
+    (17, 106, "part of", 2),
+    (16, 108, "part of", 2),
+    (10, 14, "allele", 3),
+]
+
+# Written by the list-based dumper (get_features, get_all_feature_aliases
+# and get_all_subfeatures) for the tables above
+EXPECTED_GFF = """\
+##gff-version\t3
+# Organism: Candida albicans SC5314
+# Genome version: A22
+# Date created: Tue Jan 02 03:04:05 2024
+# Created by: The Candida Genome Database (http://www.candidagenome.org/)
+# Contact Email: candida-curator AT lists DOT stanford DOT edu
+# Funding: NIDCR at US NIH, grant number 1-R01-DE015873-01
+#
+Ca22chr1A_C_albicans_SC5314\tCGD\tchromosome\t1\t9000\t.\t.\t.\tID=Ca22chr1A_C_albicans_SC5314;Name=Ca22chr1A_C_albicans_SC5314
+Ca22chr2A_C_albicans_SC5314\tCGD\tchromosome\t1\t6000\t.\t.\t.\tID=Ca22chr2A_C_albicans_SC5314;Name=Ca22chr2A_C_albicans_SC5314
+Ca22chrM_C_albicans_SC5314\tCGD\tcontig\t1\t400\t.\t.\t.\tID=Ca22chrM_C_albicans_SC5314;Name=Ca22chrM_C_albicans_SC5314
+Ca22chr1A_C_albicans_SC5314\tCGD\tORF\t100\t900\t.\t+\t.\tID=C1_00010W_A;Name=C1_00010W_A;Gene=ACT1;Note=Actin%3B%20role%20in%20cell%20shape%3Dgrowth%2C%20100%25;orf_classification=Verified;Alias=ACT1%20a%2Fb,CaACT1,orf19.5007
+Ca22chr1A_C_albicans_SC5314\tCGD\tCDS\t100\t400\t.\t+\t.\tParent=C1_00010W_A;orf_classification=Verified;parent_feature_type=ORF
+Ca22chr1A_C_albicans_SC5314\tCGD\tCDS\t501\t900\t.\t+\t.\tParent=C1_00010W_A;orf_classification=Verified;parent_feature_type=ORF
+Ca22chr1A_C_albicans_SC5314\tCGD\tintron\t401\t500\t.\t+\t.\tParent=C1_00010W_A;parent_feature_type=ORF
+Ca22chr1A_C_albicans_SC5314\tCGD\tORF\t950\t1000\t.\t+\t.\tID=C1_00010W_A_allele;Name=C1_00010W_A_allele
+Ca22chr1A_C_albicans_SC5314\tCGD\tORF\t1500\t2000\t.\t-\t.\tID=C1_00020C_A;Name=C1_00020C_A;Note=Protein%20of%20unknown%20function;orf_classification=Uncharacterized;Alias=orf19.5008
+Ca22chr1A_C_albicans_SC5314\tCGD\tCDS\t1500\t2000\t.\t-\t.\tParent=C1_00020C_A;orf_classification=Uncharacterized;parent_feature_type=ORF
+Ca22chr1A_C_albicans_SC5314\tCGD\ttRNA\t3000\t3070\t.\t+\t.\tID=C1_00030W_A;Name=C1_00030W_A;Note=tRNA-Ala
+Ca22chr1A_C_albicans_SC5314\tCGD\tORF\t5000\t5600\t.\t+\t.\tID=C1_00050W_B;Name=C1_00050W_B
+Ca22chr1A_C_albicans_SC5314\tCGD\tpseudogene\t7000\t7300\t.\t+\t.\tID=C1_00060W_A;Name=C1_00060W_A;Alias=orf19.5010
+Ca22chr1A_C_albicans_SC5314\tCGD\tnoncoding_exon\t7000\t7300\t.\t+\t.\tParent=C1_00060W_A;parent_feature_type=pseudogene
+Ca22chr2A_C_albicans_SC5314\tCGD\tORF\t100\t900\t.\t-\t.\tID=C2_00010C_A;Name=C2_00010C_A;Gene=HWP1;Note=Hyphal%20wall%20protein;orf_classification=Verified;Alias=HYR2,orf19.1321
+Ca22chr2A_C_albicans_SC5314\tCGD\tCDS\t100\t800\t.\t-\t.\tParent=C2_00010C_A;orf_classification=Verified;parent_feature_type=ORF
+Ca22chr2A_C_albicans_SC5314\tCGD\tfive_prime_UTR\t801\t900\t.\t-\t.\tParent=C2_00010C_A;parent_feature_type=ORF
+Ca22chr2A_C_albicans_SC5314\tCGD\tlong_terminal_repeat\t2000\t2300\t.\t+\t.\tID=C2_00020W_A;Name=C2_00020W_A;Note=LTR
+Ca22chrM_C_albicans_SC5314\tCGD\tORF\t10\t300\t.\t+\t.\tID=CM_00010W_A;Name=CM_00010W_A
+"""
+
+
+def build_database(path: Path) -> None:
+    """Write the fixture tables to the SQLite file at ``path``."""
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO organism VALUES (?, ?, ?, ?)", [
+        (1, "Candida albicans SC5314", "C_albicans_SC5314", 237561),
+        (2, "Candida dubliniensis CD36", "C_dubliniensis_CD36", 573826),
+    ])
+    conn.executemany("INSERT INTO genome_version VALUES (?, ?)", [(1, "Y"), (2, "N")])
+    conn.executemany("INSERT INTO seq VALUES (?, ?, ?, ?, ?, ?)", [
+        (1, 1, 1, SEQ_SOURCE, "genomic", "Y"),
+        (2, 2, 1, SEQ_SOURCE, "genomic", "Y"),
+        (3, 3, 1, SEQ_SOURCE, "genomic", "Y"),
+        (9, 1, 2, "C. albicans SC5314 Assembly 21", "genomic", "N"),
+    ])
+    conn.executemany("INSERT INTO feature VALUES (?, ?, ?, ?, ?, NULL, ?)", [
+        (no, *values) for no, values in FEATURES.items()
+    ])
+    conn.executemany("INSERT INTO feat_location VALUES (NULL, ?, ?, ?, ?, ?, ?, ?)", [
+        (no, *values) for no, values in LOCATIONS.items()
+    ])
+    conn.executemany("INSERT INTO feat_property VALUES (NULL, ?, 'feature_qualifier', ?)", [
+        (no, value) for no, value in FEATURE_QUALIFIERS.items()
+    ])
+    alias_no = 0
+    for feature_no, names in ALIASES.items():
+        for name in names:
+            alias_no += 1
+            conn.execute("INSERT INTO alias VALUES (?, ?)", (alias_no, name))
+            conn.execute("INSERT INTO feat_alias VALUES (?, ?)", (feature_no, alias_no))
+    conn.executemany("INSERT INTO feat_relationship VALUES (?, ?, ?, ?)", RELATIONSHIPS)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def session_factory(temp_dir):
+    """Session factory whose connections see the fixture tables as MULTI.*"""
+    db_path = temp_dir / "multi.db"
+    build_database(db_path)
+    engine = create_engine(f"sqlite:///{temp_dir / 'main.db'}")
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_connection, connection_record):
+        dbapi_connection.execute(f"ATTACH DATABASE '{db_path}' AS MULTI")
+
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def fixed_date(monkeypatch):
+    """Pin the 'Date created' header."""
+    class FixedDatetime:
+        @staticmethod
+        def now():
+            from datetime import datetime
+            return datetime(2024, 1, 2, 3, 4, 5)
+
+    monkeypatch.setattr(dump_gff_module, "datetime", FixedDatetime)
+
+
+def run_dump(session_factory, **kwargs) -> tuple[int, str]:
+    output = io.StringIO()
+    with session_factory() as session:
+        count = dump_gff(
+            session, 1, "C_albicans_SC5314", SEQ_SOURCE, output,
+            session_factory=session_factory, **kwargs,
+        )
+    return count, output.getvalue()
+
+
+class TestDumpGff:
+    """Tests for dump_gff against the list-based dumper's output."""
+
+    def test_matches_previous_output(self, session_factory):
+        count, output = run_dump(session_factory)
+        assert output == EXPECTED_GFF
+        assert count == 9
+
+    def test_parallel_sections_match_serial(self, session_factory):
+        count, output = run_dump(session_factory, workers=2)
+        assert output == EXPECTED_GFF
+        assert count == 9
+
+    def test_small_fetch_size(self, session_factory, monkeypatch):
+        monkeypatch.setattr(dump_gff_module, "FETCH_SIZE", 1)
+        assert run_dump(session_factory)[1] == EXPECTED_GFF
+
+    def test_duplicate_qualifier_rows_keep_aliases_and_subfeatures(self, session_factory):
+        with session_factory() as session:
+            session.execute(dump_gff_module.text(
+                "INSERT INTO MULTI.feat_property VALUES (NULL, 10, 'feature_qualifier', 'Dubious')"
+            ))
+            session.commit()
+        output = run_dump(session_factory)[1]
+        lines = [line for line in output.splitlines() if "C1_00010W_A" in line]
+        assert [line.split("\t")[2] for line in lines] == [
+            "ORF", "CDS", "CDS", "intron", "ORF", "CDS", "CDS", "intron", "ORF",
+        ]
+        assert "orf_classification=Dubious" in lines[0]
+        assert lines[0].endswith("Alias=ACT1%20a%2Fb,CaACT1,orf19.5007")
+        assert lines[4].endswith("Alias=ACT1%20a%2Fb,CaACT1,orf19.5007")
+
+
+class TestGroupStream:
+    """Tests for the merge join helper."""
+
+    def test_take_skips_unmatched_keys(self):
+        stream = GroupStream([(1, "a"), (2, "b"), (2, "c"), (4, "d")], key=lambda row: row[0])
+        assert stream.take(2) == [(2, "b"), (2, "c")]
+        assert stream.take(3) == []
+        assert stream.take(4) == [(4, "d")]
+        assert stream.take(5) == []
+
+    def test_repeated_key_returns_same_group(self):
+        stream = GroupStream([(1, "a"), (1, "b")], key=lambda row: row[0])
+        assert stream.take(1) == [(1, "a"), (1, "b")]
+        assert stream.take(1) == [(1, "a"), (1, "b")]
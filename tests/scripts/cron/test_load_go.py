@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/cron/load_go.py
+
+Tests OBO parsing, the GO_PATH closure and the in-memory load plan.
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent / "scripts"))
+
+pytest.importorskip("requests")
+
+from cron.load_go import (
+    GOLoader,
+    compute_go_paths,
+    parse_obo,
+)
+
+SAMPLE_OBO = """format-version: 1.2
+ontology: go
+
+[Term]
+id: GO:0008150
+name: biological_process
+namespace: biological_process
+def: "A biological process." [GOC:pdt]
+
+[Term]
+id: GO:0009987
+name: cellular process
+namespace: biological_process
+def: "Any process that is carried out at the cellular level." [GOC:go_curators]
+synonym: "cell physiology" EXACT []
+synonym: "cellular \\"physiology\\"" RELATED []
+is_a: GO:0008150 ! biological_process
+
+[Term]
+id: GO:0007049
+name: cell cycle
+namespace: biological_process
+alt_id: GO:0000001
+def: "The progression of biochemical events." [GOC:go_curators]
+is_a: GO:0009987 ! cellular process
+relationship: part_of GO:0008150 ! biological_process
+relationship: regulates GO:0009987 ! cellular process
+
+[Term]
+id: GO:0000002
+name: obsolete old process
+namespace: biological_process
+is_obsolete: true
+
+[Typedef]
+id: part_of
+name: part of
+"""
+
+
+def loader_with(go_rows, synonyms=None, gosyn=None, paths=None):
+    """GOLoader on a mock session with a prepared snapshot."""
+    session = MagicMock()
+    session.execute.return_value = []
+    loader = GOLoader(session)
+    loader.snapshot.go = {
+        goid: {"go_no": go_no, "term": term, "aspect": "P", "definition": definition}
+        for goid, go_no, term, definition in go_rows
+    }
+    loader.snapshot.synonym_no = synonyms or {}
+    loader.snapshot.gosyn = gosyn or set()
+    loader.snapshot.paths = paths or {}
+    return loader
+
+
+def plan(loader, obo=SAMPLE_OBO):
+    tables = parse_obo(obo.splitlines())
+    loader.plan_terms(tables)
+    loader.check_deletes()
+    loader.plan_synonyms(tables)
+    loader.plan_paths(tables)
+    return loader.plan
+
+
+class TestParseObo:
+    """Tests for parse_obo."""
+
+    def test_term_columns(self):
+        tables = parse_obo(SAMPLE_OBO.splitlines())
+        assert tables.goid == ["8150", "9987", "7049", "2"]
+        assert tables.term[1] == "cellular process"
+        assert tables.aspect == ["P", "P", "P", "P"]
+        assert tables.definition[0] == "A biological process."
+        assert tables.obsolete == [False, False, False, True]
+
+    def test_synonyms_and_alt_ids(self):
+        tables = parse_obo(SAMPLE_OBO.splitlines())
+        assert list(zip(tables.synonym_goid, tables.synonym)) == [
+            ("9987", "cell physiology"),
+            ("9987", 'cellular "physiology"'),
+        ]
+        assert list(zip(tables.alt_goid, tables.alt_id)) == [("7049", "1")]
+
+    def test_parent_edges(self):
+        tables = parse_obo(SAMPLE_OBO.splitlines())
+        edges = list(zip(tables.parent_child, tables.parent_goid, tables.parent_relationship))
+        # regulates is not part of the closure
+        assert edges == [
+            ("9987", "8150", "is a"),
+            ("7049", "9987", "is a"),
+            ("7049", "8150", "part of"),
+        ]
+
+    def test_stops_at_typedef(self):
+        tables = parse_obo(SAMPLE_OBO.splitlines())
+        assert "part_of" not in tables.goid
+
+
+class TestComputeGoPaths:
+    """Tests for the GO_PATH closure."""
+
+    def test_all_paths(self):
+        paths = compute_go_paths(
+            ["2", "3", "4", "4"], ["1", "1", "2", "3"], ["is a", "is a", "is a", "part of"]
+        )
+        assert sorted(paths["4"]) == [
+            ("1", 2, "2::1", None),
+            ("1", 2, "3::1", None),
+            ("2", 1, "2", "is a"),
+            ("3", 1, "3", "part of"),
+        ]
+        assert paths["2"] == [("1", 1, "1", "is a")]
+        assert "1" not in paths
+
+    def test_duplicate_edge_keeps_last_relationship(self):
+        paths = compute_go_paths(["2", "2"], ["1", "1"], ["is a", "part of"])
+        assert paths["2"] == [("1", 1, "1", "part of")]
+
+    def test_cycle_raises(self):
+        with pytest.raises(ValueError):
+            compute_go_paths(["1", "2"], ["2", "1"], ["is a", "is a"])
+
+
+class TestPlan:
+    """Tests for planning writes against a snapshot."""
+
+    def test_new_terms_and_paths(self):
+        loader = loader_with([])
+        result = plan(loader)
+
+        assert [row["goid"] for row in result.go_inserts] == ["8150", "9987", "7049"]
+        assert [row["go_no"] for row in result.go_inserts] == [1, 2, 3]
+        assert {row["synonym"] for row in result.synonym_inserts} == {
+            "cell physiology", 'cellular "physiology"'
+        }
+        assert len(result.gosyn_inserts) == 2
+        assert sorted(
+            (row["child_go_no"], row["ancestor_path"], row["generation"])
+            for row in result.path_inserts
+        ) == [(2, "8150", 1), (3, "8150", 1), (3, "9987", 1), (3, "9987::8150", 2)]
+
+    def test_unchanged_database_plans_nothing(self):
+        loader = loader_with([])
+        first = plan(loader)
+        go_rows = [
+            (row["goid"], row["go_no"], row["term"], row["definition"])
+            for row in first.go_inserts
+        ]
+        synonyms = {row["synonym"]: row["syn_no"] for row in first.synonym_inserts}
+        gosyn = {(row["go_no"], row["syn_no"]) for row in first.gosyn_inserts}
+        paths = {
+            (row["ancestor_path"], row["child_go_no"], row["generation"]):
+                (n, row["ancestor_go_no"], row["relationship"])
+            for n, row in enumerate(first.path_inserts, 1)
+        }
+
+        second = plan(loader_with(go_rows, synonyms, gosyn, paths))
+        assert not (
+            second.go_inserts or second.go_updates or second.go_deletes
+            or second.synonym_inserts or second.synonym_deletes
+            or second.gosyn_inserts or second.gosyn_deletes
+            or second.path_inserts or second.path_updates or second.path_deletes
+        )
+
+    def test_updates_and_synonym_changes(self):
+        loader = loader_with(
+            [
+                ("8150", 10, "biological_process", "A biological process."),
+                ("9987", 11, "cellular process", "Old definition."),
+                ("7049", 12, "cell cycle", "The progression of biochemical events."),
+            ],
+            synonyms={"cell physiology": 5, "stale synonym": 6, "shared": 7},
+            gosyn={(11, 5), (11, 6), (11, 7), (10, 7)},
+        )
+        result = plan(loader)
+
+        assert result.go_updates == [{
+            "go_no": 11, "term": "cellular process", "aspect": "P",
+            "definition": "Any process that is carried out at the cellular level.",
+        }]
+        assert [row["synonym"] for row in result.synonym_inserts] == ['cellular "physiology"']
+        assert {(row["go_no"], row["syn_no"]) for row in result.gosyn_deletes} == {
+            (11, 6), (11, 7), (10, 7)
+        }
+        # "shared" loses both links; "stale synonym" its only one
+        assert [row["syn_no"] for row in result.synonym_deletes] == [6, 7]
+
+    def test_term_moved_to_another_goid_is_rejected(self):
+        loader = loader_with([("9999", 10, "cellular process", None)])
+        result = plan(loader)
+        assert "9987" not in [row["goid"] for row in result.go_inserts]
+        assert loader.check_term_err == 1
+
+    def test_obsolete_and_secondary_deletes(self):
+        loader = loader_with(
+            [
+                ("7049", 12, "cell cycle", "The progression of biochemical events."),
+                ("1", 20, "mitotic cell cycle old", None),
+                ("2", 21, "obsolete old process", None),
+            ],
+            paths={("7049", 20, 1): (1, 12, "is a")},
+        )
+        result = plan(loader)
+
+        assert result.go_deletes == {"1": "Synonymous", "2": "Obsolete"}
+        assert "mitotic cell cycle old" in {row["synonym"] for row in result.synonym_inserts}
+        assert result.path_deletes == [{"go_path_no": 1}]
+
+    def test_used_goid_is_not_deleted(self):
+        loader = loader_with([("2", 21, "obsolete old process", None)])
+        loader.session.execute.side_effect = [
+            [(21, 100, "orf19.1", "ACT1")],  # go_annotation
+            [],                               # go_set
+            [],                               # go_ref support
+        ]
+        tables = parse_obo(SAMPLE_OBO.splitlines())
+        loader.plan_terms(tables)
+        loader.check_deletes()
+
+        assert loader.plan.go_deletes == {}
+        assert loader.obsolete_err == 1
+        assert "feature_no=100" in loader.error_messages[0]
+
+    def test_missing_namespace_stops_load(self):
+        loader = loader_with([])
+        obo = "[Term]\nid: GO:0000005\nname: no namespace\n"
+        loader.plan_terms(parse_obo(obo.splitlines()))
+        assert loader.oracle_err == 1
+        assert loader.plan.go_inserts == []
+
+
+class TestRun:
+    """Tests for the phased run."""
+
+    def test_dry_run_writes_nothing_and_times_phases(self, temp_file):
+        obo_file = temp_file("go.obo", SAMPLE_OBO)
+        loader = loader_with([])
+        loader.read_snapshot = MagicMock()
+
+        assert loader.run(obo_file, dry_run=True)
+        assert loader.session.commit.call_count == 0
+        assert len(loader.plan.go_inserts) == 3
+        assert set(loader.get_summary()["timings"]) == {
+            "parse", "snapshot", "plan", "check_deletes", "plan_synonyms_and_paths",
+        }
+
+    def test_writes_in_batches(self, temp_file):
+        obo_file = temp_file("go.obo", SAMPLE_OBO)
+        loader = loader_with([])
+        loader.read_snapshot = MagicMock()
+
+        assert loader.run(obo_file)
+        summary = loader.get_summary()
+        assert summary["go_inserts"] == 3
+        assert summary["go_path_inserts"] == 4
+        assert loader.session.commit.call_count == 4
+        # executemany: one execute per statement with rows
+        batches = [
+            call.args[1] for call in loader.session.execute.call_args_list
+            if len(call.args) > 1 and isinstance(call.args[1], list)
+        ]
+        assert [len(batch) for batch in batches] == [3, 2, 2, 4]
+
+    def test_failed_phase_rolls_back_and_stops(self, temp_file):
+        obo_file = temp_file("go.obo", SAMPLE_OBO)
+        loader = loader_with([])
+        loader.read_snapshot = MagicMock()
+        loader.apply_synonyms = MagicMock(side_effect=RuntimeError("ORA-00001"))
+        loader.apply_paths = MagicMock()
+
+        assert not loader.run(obo_file)
+        assert loader.session.rollback.call_count == 1
+        assert loader.session.commit.call_count == 1
+        loader.apply_paths.assert_not_called()
+        assert "ORA-00001" in loader.error_messages[0]
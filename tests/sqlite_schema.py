@@ -0,0 +1,55 @@
+"""
+SQLite copies of Oracle model tables for service tests.
+
+The models are generated from the Oracle schema (MULTI schema, NUMBER
+keys filled by sequences, SYSDATE defaults), so they cannot be created on
+SQLite as they are. ``sqlite_session`` builds schema-less copies of the
+requested tables, with integer keys SQLite fills in and portable
+defaults, and returns a session whose ORM queries run against them.
+``schema_session`` does the same on another database (the query-plan
+tests can run against PostgreSQL).
+"""
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, create_engine, text
+from sqlalchemy.orm import Session
+
+
+def _copy_table(table: Table, metadata: MetaData) -> Table:
+    columns = []
+    for column in table.columns:
+        default = None
+        if column.server_default is not None:
+            default = (
+                text("CURRENT_TIMESTAMP") if "SYSDATE" in str(column.server_default.arg)
+                else text("'test'")
+            )
+        column_type = column.type.as_generic()
+        columns.append(Column(
+            column.name,
+            # Text keys (session ids) stay text
+            Integer if column.primary_key and not isinstance(column_type, String) else column_type,
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+            server_default=default,
+        ))
+    copy = Table(table.name, metadata, *columns)
+    for index in table.indexes:
+        # Function-based indexes are Oracle-specific; copy the plain ones
+        if index.columns and len(index.columns) == len(index.expressions):
+            Index(index.name, *[copy.c[c.name] for c in index.columns], unique=index.unique)
+    return copy
+
+
+def schema_session(url: str, *models) -> Session:
+    """Session on the database at ``url`` holding new empty tables for ``models``."""
+    engine = create_engine(url).execution_options(schema_translate_map={"MULTI": None})
+    metadata = MetaData()
+    for model in models:
+        _copy_table(model.__table__, metadata)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    return Session(bind=engine)
+
+
+def sqlite_session(path, *models) -> Session:
+    """Session on a SQLite file holding empty tables for ``models``."""
+    return schema_session(f"sqlite:///{path}", *models)